@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from src.backend.models import db, Coverage
+from src.backend.utils.http_cache import revision_cached
 from sqlalchemy.exc import IntegrityError
 from http import HTTPStatus
 import logging
@@ -8,6 +9,7 @@ bp = Blueprint("coverage", __name__, url_prefix="/api/v2/coverage")
 
 
 @bp.route("/", methods=["GET"])
+@revision_cached("coverage")
 def get_all_coverage():
     """Get all coverage requirements"""
     try:
@@ -20,6 +20,7 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
 from flask import current_app
 from ..services.scheduler import ScheduleGenerator, ScheduleGenerationError
+from ..services.schedule_versions import duplicate_schedule_version, version_exists
 import logging
 from sqlalchemy import and_
 from sqlalchemy.exc import SQLAlchemyError
@@ -1152,9 +1153,7 @@ def duplicate_version():
                 {"error": "Invalid date format, expected YYYY-MM-DD"}
             ), HTTPStatus.BAD_REQUEST
 
-        # Get source schedules
-        source_schedules = Schedule.query.filter_by(version=source_version).all()  # type: ignore
-        if not source_schedules:
+        if not version_exists(db.session, source_version):
             return jsonify(
                 {"error": f"Source version {source_version} not found"}
             ), HTTPStatus.NOT_FOUND
@@ -1184,23 +1183,10 @@ def duplicate_version():
             )
             db.session.add(new_meta)
 
-            # Duplicate schedules
-            for schedule in source_schedules:
-                # Skip if the date is outside our new range
-                if schedule.date < start_date or schedule.date > end_date:
-                    continue
-
-                new_schedule = Schedule(
-                    date=schedule.date,
-                    employee_id=schedule.employee_id,
-                    shift_id=schedule.shift_id,
-                    version=new_version,
-                    status=ScheduleStatus.DRAFT,
-                    break_start=schedule.break_start,
-                    break_end=schedule.break_end,
-                    notes=schedule.notes,
-                )
-                db.session.add(new_schedule)
+            # Duplicate schedules in the date range with one INSERT ... SELECT
+            copied_count = duplicate_schedule_version(
+                db.session, source_version, new_version, start_date, end_date
+            )
 
             db.session.commit()
 
@@ -1209,6 +1195,7 @@ def duplicate_version():
                     "message": f"Version {source_version} duplicated successfully",
                     "version": new_version,
                     "status": "DRAFT",
+                    "copied_count": copied_count,
                     "version_meta": new_meta.to_dict()
                     if hasattr(new_meta, "to_dict")
                     else None,
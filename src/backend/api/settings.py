@@ -3,6 +3,7 @@ import json
 import datetime
 from flask import Blueprint, jsonify, request, send_file
 from src.backend.models import db, Settings
+from src.backend.utils.http_cache import revision_cached
 from http import HTTPStatus
 from sqlalchemy import inspect
 
@@ -10,6 +11,7 @@ bp = Blueprint("settings", __name__, url_prefix="/api/v2/settings")
 
 
 @bp.route("/", methods=["GET"])
+@revision_cached("settings")
 def get_settings():
     """Get all settings or initialize with defaults if none exist"""
     try:
@@ -50,6 +50,8 @@ from src.backend.routes.schedules import schedules
 from src.backend.routes.settings import settings
 from src.backend.routes.shifts import shifts
 from src.backend.routes.special_days import special_days as special_days_bp
+from src.backend.services.job_queue import job_queue
+from src.backend.utils.http_cache import register_revision_events
 from src.backend.utils.logger import (
     CustomFormatter,
 )
@@ -166,6 +168,9 @@ def create_app(config_class=Config):
     )
     Migrate(app, db, directory=migrations_dir)
 
+    # Revision counters behind the ETag caching of polled GET endpoints
+    register_revision_events()
+
     # Ensure the instance folder exists
     try:
         os.makedirs(app.instance_path)
@@ -177,6 +182,9 @@ def create_app(config_class=Config):
     # Setup logging
     setup_logging(app)
 
+    # Worker pool for background schedule generation
+    job_queue.init_app(app)
+
     # Register blueprints
     app.register_blueprint(shifts, url_prefix="/api/v2")
     app.register_blueprint(settings, url_prefix="/api/v2")
@@ -14,6 +14,9 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-key-please-change-in-production"
 
+    # Background schedule generation; one worker keeps SQLite writes serialized
+    GENERATION_JOB_WORKERS = int(os.environ.get("GENERATION_JOB_WORKERS", 1))
+
     # Ensure directories exist
     INSTANCE_DIR.mkdir(exist_ok=True)
     LOGS_DIR.mkdir(exist_ok=True)
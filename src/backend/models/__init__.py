@@ -17,6 +17,7 @@ from .ai_models import (
 from .coverage import Coverage
 from .employee import Employee, EmployeeAvailability, EmployeeGroup
 from .fixed_shift import ShiftTemplate, ShiftType
+from .generation_job import GenerationJob, JobStatus
 from .schedule import Schedule, ScheduleStatus, ScheduleVersionMeta
 from .settings import Settings
 from .user import User, UserRole
@@ -34,6 +35,8 @@ __all__ = [
     "EmployeeGroup",
     "Absence",
     "Coverage",
+    "GenerationJob",
+    "JobStatus",
     "User",
     "UserRole",
     "AIConversation",
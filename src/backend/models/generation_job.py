@@ -0,0 +1,64 @@
+"""
+Background job model
+
+Persists schedule generation jobs run by services/job_queue.py so that
+their status, progress and result survive the request that queued them.
+"""
+
+import uuid
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import JSON, Column, DateTime, Enum as SQLEnum, String, Text
+
+from . import db
+
+
+class JobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+    @property
+    def is_finished(self) -> bool:
+        return self in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class GenerationJob(db.Model):
+    """A queued or finished schedule generation run."""
+
+    __tablename__ = "generation_jobs"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String(50), nullable=False)
+    status = Column(SQLEnum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    params = Column(JSON, nullable=True)
+    progress = Column(JSON, nullable=True)  # Latest progress event
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    owner = Column(String(64), nullable=True)  # "<boot id>:<pid>" of the running process
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def to_dict(self, include_result: bool = False):
+        """Convert to dictionary; the result is only included on request."""
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status.value if self.status else None,
+            "params": self.params,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+    def __repr__(self):
+        return f"<GenerationJob {self.id}: {self.kind} {self.status}>"
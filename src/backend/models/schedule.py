@@ -18,6 +18,14 @@ class ScheduleStatus(str, Enum):
 
 class Schedule(db.Model):
     __tablename__ = "schedules"
+    __table_args__ = (
+        # Version views, duplicate/compare and /availability/by_date
+        db.Index("ix_schedules_version_date_employee", "version", "date", "employee_id"),
+        # Date-range lookups without a version (export, version fallback)
+        db.Index("ix_schedules_date_version", "date", "version"),
+        # Per-employee history
+        db.Index("ix_schedules_employee_date", "employee_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
@@ -274,6 +282,18 @@ class ScheduleVersionMeta(db.Model):
     """Store metadata for schedule versions"""
 
     __tablename__ = "schedule_version_meta"
+    __table_args__ = (
+        # Overlap lookups are selective on the end date (recent versions)
+        db.Index(
+            "ix_schedule_version_meta_date_range", "date_range_end", "date_range_start"
+        ),
+        db.Index(
+            "ix_schedule_version_meta_status_date_range",
+            "status",
+            "date_range_end",
+            "date_range_start",
+        ),
+    )
 
     version = Column(Integer, primary_key=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -8,6 +8,7 @@ from flask_cors import CORS
 from src.backend.models import MessageType
 from src.backend.services.ai_agents import AgentRegistry, WorkflowCoordinator
 from src.backend.services.ai_integration import create_ai_orchestrator
+from src.backend.services.ai_telemetry import model_telemetry
 from src.backend.services.enhanced_agent_registry import (
     AgentCapability,
     AgentStatus,
@@ -818,6 +819,8 @@ def get_analytics():
                 "uptime": "99.9%",  # Mock for now
             },
             "performance_summary": perf_stats,
+            # Live per-model numbers used for model selection
+            "model_telemetry": model_telemetry.get_stats(),
         }
 
         return jsonify(analytics)
@@ -1,8 +1,10 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_cors import CORS  # Import CORS
 from src.backend.services.ai_scheduler_service import (
     AISchedulerService,
 )  # Now this should exist
+from src.backend.services.ai_response_cache import get_response_cache
+from src.backend.services.ai_windowed_generation import DEFAULT_WINDOW_CONCURRENCY
 from src.backend.utils.logger import (
     logger,
 )  # Corrected: import the global logger instance
@@ -35,6 +37,9 @@ def generate_ai_schedule():
     - "end_date": "YYYY-MM-DD" (required)
     - "version_id": any (optional, for associating the schedule)
     - "ai_model_params": {} (optional, to override default AI model parameters like temperature)
+    - "use_cache": bool (optional, false forces a fresh model call)
+    - "windowed": bool (optional, generate week by week with concurrent requests)
+    - "window_concurrency": int (optional, requests in flight per provider)
     """
     try:
         data = request.get_json()
@@ -73,6 +78,10 @@ def generate_ai_schedule():
             end_date_str=end_date_str,
             version_id=version_id,
             ai_model_params=ai_model_params,
+            use_cache=request_data.use_cache is not False,
+            windowed=request_data.windowed is True,
+            window_concurrency=request_data.window_concurrency
+            or DEFAULT_WINDOW_CONCURRENCY,
         )
 
         logger.app_logger.info(
@@ -105,6 +114,54 @@ def generate_ai_schedule():
         return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
 
 
+@ai_schedule_bp.route("/schedule/generate-ai/stream", methods=["POST"])
+def generate_ai_schedule_stream():
+    """
+    AI-based schedule generation with progress as server-sent events.
+    Takes the same JSON payload as /schedule/generate-ai. Assignments are
+    validated and stored while the model response streams in; the events are
+    "started", "progress" (per stored batch) and "completed" or "error".
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"error": "No input data provided"}), 400
+    try:
+        request_data = AIScheduleGenerateRequest(**data)
+    except ValidationError as e:
+        return jsonify({"error": "Invalid input.", "details": e.errors()}), 400
+
+    ai_service = AISchedulerService()
+    generation = ai_service.generate_schedule_via_ai_stream(
+        start_date_str=request_data.start_date.strftime("%Y-%m-%d"),
+        end_date_str=request_data.end_date.strftime("%Y-%m-%d"),
+        version_id=request_data.version_id,
+        ai_model_params=request_data.ai_model_params,
+        use_cache=request_data.use_cache is not False,
+    )
+
+    def events():
+        for event in generation:
+            yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@ai_schedule_bp.route("/schedule/generate-ai/cache", methods=["GET"])
+def get_ai_response_cache_stats():
+    """Hit/miss counters and size of the AI response cache"""
+    try:
+        return jsonify(get_response_cache().get_stats()), 200
+    except Exception as e:
+        logger.app_logger.error(
+            f"Error reading AI response cache stats: {str(e)}", exc_info=True
+        )
+        return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
+
+
 @ai_schedule_bp.route("/feedback", methods=["POST"])
 def submit_ai_schedule_feedback():
     """
@@ -4,12 +4,14 @@ from src.backend.models.employee import AvailabilityType
 from http import HTTPStatus
 from pydantic import ValidationError
 from src.backend.schemas.employees import EmployeeCreateRequest, EmployeeUpdateRequest
+from src.backend.utils.http_cache import revision_cached
 
 employees = Blueprint("employees", __name__)
 
 
 @employees.route("/employees", methods=["GET"])
 @employees.route("/employees/", methods=["GET"])
+@revision_cached("employees")
 def get_employees():
     """Get all employees"""
     employees = Employee.query.all()
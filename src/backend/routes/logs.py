@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime, timedelta
 import json
-from typing import List, Dict, Any, Optional, cast
+from typing import Dict, Any, Optional, cast
+
+from src.backend.utils.log_index import LOG_SOURCES
 
 bp = Blueprint("logs", __name__)
 
@@ -32,135 +34,69 @@ def save_logs():
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
+# Sources read for each value of the ``type`` query parameter
+LOG_TYPES = {
+    "all": ["user", "error", "schedule"],
+    "user": ["user"],
+    "error": ["error"],
+    "schedule": ["schedule"],
+}
+
+
 @bp.route("/", methods=["GET"])
 def get_logs():
-    """Get logs with filtering"""
+    """Get logs with filtering
+
+    Served from the log index (utils/log_index.py), newest first. ``limit``
+    (default 1000) and ``offset`` page through the matches, ``search``
+    matches message, module and action.
+    """
     try:
         log_type: str = request.args.get("type", "all")  # all, user, error, schedule
         days: int = int(request.args.get("days", "7"))
         level: Optional[str] = request.args.get("level")  # info, warning, error, debug
+        search: Optional[str] = request.args.get("search")
+        limit: int = min(int(request.args.get("limit", "1000")), 10000)
+        offset: int = int(request.args.get("offset", "0"))
 
-        logs: List[Dict[str, Any]] = []
         start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
         logger = current_app.config["logger"]
+        sources = LOG_TYPES.get(log_type, [])
 
-        def read_log_file(filename: str) -> List[Dict[str, Any]]:
-            filepath = logger.logs_dir / filename
-            current_app.logger.debug(f"Attempting to read log file: {filepath}")
-
-            if not filepath.exists():
-                current_app.logger.warning(f"Log file not found: {filepath}")
-                return []
-
-            logs: List[Dict[str, Any]] = []
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    for line in f:
-                        try:
-                            log_entry = json.loads(line.strip())
-                            log_entry["source_file"] = filename
-                            logs.append(log_entry)
-                        except json.JSONDecodeError:
-                            current_app.logger.warning(
-                                f"Failed to parse log entry: {line.strip()}"
-                            )
-                            continue
-
-            except Exception as e:
-                current_app.logger.error(f"Error reading log file {filename}: {str(e)}")
-                return []
-
-            current_app.logger.debug(
-                f"Successfully parsed {len(logs)} entries from {filename}"
-            )
-            return logs
-
-        # Read logs from each file based on type
-        all_logs: List[Dict[str, Any]] = []
         try:
-            if log_type in ["all", "user"]:
-                user_logs = read_log_file("user_actions.log")
-                if level:
-                    user_logs = [
-                        log
-                        for log in user_logs
-                        if log.get("level", "").lower() == level.lower()
-                    ]
-                all_logs.extend(user_logs)
-
-            if log_type in ["all", "error"]:
-                error_logs = read_log_file("errors.log")
-                if level:
-                    error_logs = [
-                        log
-                        for log in error_logs
-                        if log.get("level", "").lower() == level.lower()
-                    ]
-                all_logs.extend(error_logs)
-
-            if log_type in ["all", "schedule"]:
-                schedule_logs = read_log_file("schedule.log")
-                if level:
-                    schedule_logs = [
-                        log
-                        for log in schedule_logs
-                        if log.get("level", "").lower() == level.lower()
-                    ]
-                all_logs.extend(schedule_logs)
-
-            # Filter by date and sort
-            logs = [
-                log
-                for log in all_logs
-                if log.get("timestamp", "").split(" ")[0] >= start_date
-            ]
-            logs.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+            logs, total = logger.log_index.query(
+                sources, start_date, level=level, search=search, limit=limit, offset=offset
+            )
+            counts = logger.log_index.counts(sources, start_date, level=level)
 
             # Add debug information
             debug_info = {
                 "logs_dir": str(logger.logs_dir),
                 "files_found": [f.name for f in logger.logs_dir.glob("*.log")],
                 "log_counts": {
-                    "total": len(logs),
-                    "user": len([l for l in logs if l.get("module") == "user"]),
-                    "error": len(
-                        [l for l in logs if l.get("level", "").lower() == "error"]
-                    ),
-                    "schedule": len([l for l in logs if l.get("module") == "schedule"]),
+                    "total": counts["total"],
+                    "user": counts["by_module"].get("user", 0),
+                    "error": counts["by_level"].get("error", 0),
+                    "schedule": counts["by_module"].get("schedule", 0),
                 },
                 "raw_counts": {
-                    "total": len(all_logs),
-                    "filtered": len(logs),
+                    "total": counts["total"],
+                    "filtered": total,
                     "by_file": {
-                        "user_actions.log": len(
-                            [
-                                l
-                                for l in all_logs
-                                if l.get("source_file") == "user_actions.log"
-                            ]
-                        ),
-                        "errors.log": len(
-                            [
-                                l
-                                for l in all_logs
-                                if l.get("source_file") == "errors.log"
-                            ]
-                        ),
-                        "schedule.log": len(
-                            [
-                                l
-                                for l in all_logs
-                                if l.get("source_file") == "schedule.log"
-                            ]
-                        ),
+                        LOG_SOURCES[source]: counts["by_source"].get(source, 0)
+                        for source in LOG_TYPES["all"]
                     },
                 },
             }
 
-            current_app.logger.debug(
-                f"Returning {len(logs)} logs with debug info: {debug_info}"
+            return jsonify(
+                {
+                    "status": "success",
+                    "logs": logs,
+                    "pagination": {"total": total, "limit": limit, "offset": offset},
+                    "debug": debug_info,
+                }
             )
-            return jsonify({"status": "success", "logs": logs, "debug": debug_info})
 
         except Exception as e:
             current_app.logger.error(f"Error processing logs: {str(e)}")
@@ -185,101 +121,13 @@ def get_logs():
 
 @bp.route("/stats", methods=["GET"])
 def get_log_stats():
-    """Get log statistics"""
+    """Get log statistics, aggregated in the log index"""
     try:
         days = int(request.args.get("days", 7))
         start_date = datetime.now() - timedelta(days=days)
         logger = current_app.config["logger"]
 
-        stats = {
-            "total_logs": 0,
-            "errors": 0,
-            "warnings": 0,
-            "user_actions": 0,
-            "schedule_operations": 0,
-            "by_date": {},
-            "by_module": {},
-            "by_action": {},
-            "recent_errors": [],
-        }
-
-        # Read all log files
-        log_files = {
-            "user": "user_actions.log",
-            "error": "errors.log",
-            "schedule": "schedule.log",
-        }
-
-        for log_type, filename in log_files.items():
-            filepath = logger.logs_dir / filename
-            current_app.logger.debug(f"Processing log file for stats: {filepath}")
-
-            if not filepath.exists():
-                current_app.logger.warning(f"Log file not found for stats: {filepath}")
-                continue
-
-            try:
-                with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-                    for line in f:
-                        try:
-                            log = json.loads(line.strip())
-                            log_date = datetime.fromisoformat(
-                                log["timestamp"].replace("Z", "+00:00")
-                            )
-
-                            if log_date >= start_date:
-                                stats["total_logs"] += 1
-
-                                # Count by level
-                                if log.get("level") == "error":
-                                    stats["errors"] += 1
-                                elif log.get("level") == "warning":
-                                    stats["warnings"] += 1
-
-                                # Count by type
-                                if log_type == "user":
-                                    stats["user_actions"] += 1
-                                elif log_type == "schedule":
-                                    stats["schedule_operations"] += 1
-
-                                # Group by date
-                                date_key = log_date.strftime("%Y-%m-%d")
-                                stats["by_date"][date_key] = (
-                                    stats["by_date"].get(date_key, 0) + 1
-                                )
-
-                                # Group by module
-                                if "module" in log:
-                                    stats["by_module"][log["module"]] = (
-                                        stats["by_module"].get(log["module"], 0) + 1
-                                    )
-
-                                # Group by action
-                                if "action" in log:
-                                    stats["by_action"][log["action"]] = (
-                                        stats["by_action"].get(log["action"], 0) + 1
-                                    )
-
-                                # Track recent errors
-                                if log.get("level") == "error":
-                                    stats["recent_errors"].append(log)
-
-                        except (json.JSONDecodeError, KeyError) as e:
-                            current_app.logger.warning(
-                                f"Failed to parse log entry in {filename}: {str(e)}"
-                            )
-                            continue
-
-            except Exception as e:
-                current_app.logger.error(
-                    f"Error processing log file {filename}: {str(e)}"
-                )
-                continue
-
-        # Sort and limit recent errors
-        stats["recent_errors"].sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        stats["recent_errors"] = stats["recent_errors"][:10]  # Keep only 10 most recent
-
+        stats = logger.log_index.stats(start_date.strftime("%Y-%m-%d %H:%M:%S"))
         return jsonify({"status": "success", "stats": stats})
 
     except Exception as e:
@@ -292,7 +140,7 @@ def clear_logs():
     """Clear all log files"""
     try:
         logger = current_app.config["logger"]
-        log_files = ["user_actions.log", "errors.log", "schedule.log"]
+        log_files = list(LOG_SOURCES.values())
         cleared_files = []
 
         for filename in log_files:
@@ -303,6 +151,7 @@ def clear_logs():
                     pass  # Just open and close to clear the file
                 cleared_files.append(filename)
                 logger.app_logger.info(f"Cleared log file: {filename}")
+        logger.log_index.clear(LOG_SOURCES)
 
         # Log that logs were cleared (this will be the first entry in the cleared error log)
         logger.info("All logs were cleared by admin request")
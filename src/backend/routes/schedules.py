@@ -1,4 +1,14 @@
-from flask import Blueprint, request, jsonify, current_app, send_file
+import json
+
+from flask import (
+    Blueprint,
+    request,
+    jsonify,
+    current_app,
+    send_file,
+    stream_with_context,
+    url_for,
+)
 from http import HTTPStatus
 from datetime import datetime, date, timedelta
 from sqlalchemy import desc, text
@@ -13,15 +23,23 @@ from src.backend.models.fixed_shift import ShiftTemplate
 from src.backend.models.absence import Absence
 from src.backend.models.coverage import Coverage
 from src.backend.models.settings import Settings
+from src.backend.models.generation_job import JobStatus
+from src.backend.services.job_queue import job_queue
 from src.backend.services.pdf_generator import PDFGenerator
-from src.backend.services.scheduler.resources import (
-    ScheduleResources,
-    ScheduleResourceError,
+from src.backend.services.schedule_queries import fetch_schedule_page
+from src.backend.services.schedule_versions import (
+    compare_schedule_versions,
+    duplicate_schedule_version,
+    version_exists,
 )
+from src.backend.services.scheduler.resources import ScheduleResourceError
 from src.backend.services.scheduler.generator import ScheduleGenerator
+from src.backend.services.scheduler.resource_cache import CachedScheduleResources
+from src.backend.services.scheduler.logging_utils import ProcessTracker
 from src.backend.services.scheduler.config import SchedulerConfig
 from src.backend.services.scheduler.validator import ScheduleValidator, ScheduleConfig
 from src.backend.schemas.schedules import ScheduleUpdateRequest, ScheduleGenerateRequest
+from src.backend.utils.http_cache import revision_cached
 from src.backend.utils.logger import logger
 
 # Define blueprint
@@ -149,6 +167,7 @@ def get_versions_for_date_range(start_date, end_date):
 
 @schedules.route("/schedules", methods=["GET"])
 @schedules.route("/schedules/", methods=["GET"])
+@revision_cached("schedules", "schedule_version_meta", "shifts", "employees")
 def get_schedules():
     """Get all schedules within a date range"""
     try:
@@ -158,6 +177,31 @@ def get_schedules():
         include_empty = (
             request.args.get("include_empty", "false").lower() == "true"
         )  # Default to false
+        after_id = request.args.get("after_id", type=int)  # Keyset cursor
+        limit = request.args.get("limit", type=int)  # Page size
+        if limit is not None and limit < 1:
+            return jsonify(
+                {"status": "error", "message": "limit must be a positive integer"}
+            ), HTTPStatus.BAD_REQUEST
+
+        # employee_ids=1,2,3 or repeated employee_ids parameters
+        employee_ids = None
+        raw_employee_ids = request.args.getlist("employee_ids")
+        if raw_employee_ids:
+            try:
+                employee_ids = [
+                    int(value)
+                    for raw in raw_employee_ids
+                    for value in raw.split(",")
+                    if value.strip()
+                ]
+            except ValueError:
+                return jsonify(
+                    {
+                        "status": "error",
+                        "message": "employee_ids must be a comma-separated list of integers",
+                    }
+                ), HTTPStatus.BAD_REQUEST
 
         # Provide default date range (current week) if parameters are missing
         if not start_date or not end_date:
@@ -195,91 +239,25 @@ def get_schedules():
             version = available_versions[0].version if available_versions else 1
             logger.info(f"Using latest version for date range: {version}")
 
-        # Build query for schedules with eager loading of shift relationships
-        query = db.session.query(Schedule).options(
-            db.joinedload(Schedule.shift)  # Ensure shift relationship is loaded
-        )
-
-        # Apply date filters
-        query = query.filter(
-            Schedule.date >= start_date,
-            Schedule.date <= end_date,
-        )
-
-        # Apply version filter if specified
-        if version is not None:
-            query = query.filter(Schedule.version == version)
-
-        # Get all schedules
-        all_schedules = query.all()
-
         # Get the placeholder shift (00:00 - 00:00)
-        placeholder_shift = (
-            db.session.query(ShiftTemplate)
+        placeholder_shift_id = (
+            db.session.query(ShiftTemplate.id)
             .filter_by(start_time="00:00", end_time="00:00")
-            .first()
+            .limit(1)
+            .scalar()
         )
 
-        # Filter out empty schedules if requested
-        if not include_empty and placeholder_shift:
-            schedules = [s for s in all_schedules if s.shift_id != placeholder_shift.id]
-        else:
-            schedules = all_schedules
-
-        # Create a lookup of all shifts for data enrichment
-        all_shifts = db.session.query(ShiftTemplate).all()
-        shift_lookup = {shift.id: shift for shift in all_shifts}
-
-        # Enrich schedule data
-        enriched_schedules = []
-        for schedule in schedules:
-            schedule_dict = schedule.to_dict()
-
-            # Add break_duration to the response
-            if (
-                schedule.break_start is not None
-                and isinstance(schedule.break_start, str)
-                and schedule.break_end is not None
-                and isinstance(schedule.break_end, str)
-            ):
-                try:
-                    break_start = datetime.strptime(schedule.break_start, "%H:%M")
-                    break_end = datetime.strptime(schedule.break_end, "%H:%M")
-                    # Calculate duration in minutes
-                    break_duration_minutes = int(
-                        (break_end - break_start).total_seconds() / 60
-                    )
-                    schedule_dict["break_duration"] = break_duration_minutes
-                except Exception as e:
-                    logger.error(f"Error calculating break duration for schedule {schedule.id}: {str(e)}")
-                    schedule_dict["break_duration"] = 0
-            else:
-                schedule_dict["break_duration"] = 0
-
-            # If the schedule has a shift_id but missing relationship data, fix it
-            if schedule.shift_id is not None and (
-                not hasattr(schedule, "shift") or schedule.shift is None
-            ):
-                # Try to get the shift from our lookup
-                if schedule.shift_id in shift_lookup:
-                    shift = shift_lookup[schedule.shift_id]
-
-                    # Add shift details to the schedule dict
-                    schedule_dict["shift_start"] = shift.start_time
-                    schedule_dict["shift_end"] = shift.end_time
-                    schedule_dict["duration_hours"] = shift.duration_hours
-                    schedule_dict["requires_break"] = shift.requires_break
-                    schedule_dict["shift_type_id"] = shift.shift_type_id
-                    schedule_dict["shift_type_name"] = (
-                        shift.shift_type.value if shift.shift_type else None
-                    )
-
-                    # Log the enrichment
-                    logger.info(
-                        f"Enriched schedule {schedule.id} with missing shift data from shift {shift.id}"
-                    )
-
-            enriched_schedules.append(schedule_dict)
+        # Project only the response columns; page by id if requested
+        enriched_schedules, next_after_id = fetch_schedule_page(
+            db.session,
+            start_date,
+            end_date,
+            version=version,
+            employee_ids=employee_ids,
+            exclude_shift_id=None if include_empty else placeholder_shift_id,
+            after_id=after_id,
+            limit=limit,
+        )
 
         # Convert versions to a more suitable format for JSON (e.g., list of dicts)
         versions_list = [
@@ -304,6 +282,7 @@ def get_schedules():
                 "schedules": enriched_schedules,
                 "versions": versions_list,
                 "current_version": version,
+                "next_after_id": next_after_id,
             }
         ), HTTPStatus.OK
 
@@ -456,91 +435,144 @@ def create_schedule_entry():
         ), HTTPStatus.INTERNAL_SERVER_ERROR
 
 
+def _run_schedule_generation(params, progress):
+    """Job runner for POST /schedules/generate (see services/job_queue.py)"""
+    schedule_request = ScheduleGenerateRequest(**params)
+    generator = ScheduleGenerator(
+        resources=CachedScheduleResources(), progress_callback=progress
+    )
+    result = generator.generate_schedule(
+        start_date=schedule_request.start_date,
+        end_date=schedule_request.end_date,
+        external_config_dict=schedule_request.dict(exclude_unset=True),
+        version=schedule_request.version,
+        create_empty_schedules=schedule_request.create_empty_schedules or False,
+    )
+
+    # Add session_id to the result for diagnostic log retrieval
+    if result is not None:
+        result["session_id"] = generator.session_id
+    return result
+
+
+def _job_accepted(job):
+    """202 response pointing the client at the job endpoints"""
+    data = job.to_dict()
+    data["links"] = {
+        "status": url_for("schedules.get_generation_job", job_id=job.id),
+        "events": url_for("schedules.stream_generation_job", job_id=job.id),
+        "cancel": url_for("schedules.cancel_generation_job", job_id=job.id),
+        "result": url_for("schedules.get_generation_job_result", job_id=job.id),
+    }
+    return jsonify(data), HTTPStatus.ACCEPTED
+
+
 @schedules.route("/schedules/generate", methods=["POST"])
 @schedules.route("/schedules/generate/", methods=["POST"])
 def generate_schedule():
-    """Generate a schedule"""
+    """Queue a schedule generation job and return its id"""
     logger.info("Received request to generate schedule")
 
     try:
-        # Use Pydantic for request validation
+        # Use Pydantic for request validation before queueing
         request_data = request.get_json()
         schedule_request = ScheduleGenerateRequest(**request_data)
 
-        # The request might include other config like version, create_empty_schedules etc.
-        external_config_dict = schedule_request.dict(
-            exclude_unset=True
-        )  # Get all passed params as dict
-
         logger.info(
-            f"Generating schedule for date range: {schedule_request.start_date} to {schedule_request.end_date}"
+            f"Queueing schedule generation for date range: {schedule_request.start_date} to {schedule_request.end_date}"
         )
-
-        # --- FIX: Use dates directly from Pydantic validation ---
-        start_date = schedule_request.start_date
-        end_date = schedule_request.end_date
-
-        # Initialize the ScheduleGenerator
-        # Pass the app context to the generator if necessary, or ensure it's used within a context
-        generator = (
-            ScheduleGenerator()
-        )  # Assuming the generator is designed to work within a Flask app context
-
-        # The generator internally handles app context now, no need to wrap it here
-        result = generator.generate_schedule(
-            start_date=start_date,
-            end_date=end_date,
-            external_config_dict=external_config_dict,  # Pass the full config
-            version=schedule_request.version,  # Pass version explicitly
-            create_empty_schedules=schedule_request.create_empty_schedules or False,  # Pass create_empty_schedules explicitly with fallback
+        job = job_queue.submit(
+            "schedule_generation",
+            schedule_request.model_dump(mode="json", exclude_unset=True),
         )
-
-        # Check the status from the result returned by the generator
-        if result and result.get("status") == "failed":
-            # Log the failure reason which should be included in the result
-            failure_reason = result.get("reason", "Unknown scheduling error")
-            logger.error(f"Schedule generation failed: {failure_reason}")
-            # Return a 500 Internal Server Error with the failure reason
-            return jsonify(
-                {
-                    "status": "error",
-                    "message": f"Schedule generation failed: {failure_reason}",
-                }
-            ), HTTPStatus.INTERNAL_SERVER_ERROR
-
-        # Add session_id to the result for diagnostic log retrieval
-        if hasattr(generator, 'session_id'):
-            result['session_id'] = generator.session_id
-            logger.info(f"Schedule generation successful with session_id: {generator.session_id}")
-
-        logger.info("Schedule generation successful")
-        # Assuming generate_schedule returns a dict suitable for jsonify
-        return jsonify(result), HTTPStatus.OK
+        return _job_accepted(job)
 
     except ValidationError as e:
         logger.error(f"Validation error in schedule generation request: {e.errors()}")
         return jsonify(
             {"status": "error", "message": "Validation failed", "errors": e.errors()}
         ), HTTPStatus.BAD_REQUEST
-    except ScheduleResourceError as e:
-        logger.error(
-            f"Schedule resource error during generation: {str(e)}", exc_info=True
-        )
-        return jsonify(
-            {"status": "error", "message": f"Failed during resource loading: {str(e)}"}
-        ), HTTPStatus.INTERNAL_SERVER_ERROR
     except Exception as e:
         logger.error(
-            f"An unexpected error occurred during schedule generation: {str(e)}",
+            f"An unexpected error occurred while queueing schedule generation: {str(e)}",
             exc_info=True,
         )
-        # More specific error handling based on the type of exception might be needed
         db.session.rollback()  # Rollback session on error
         return jsonify(
             {"status": "error", "message": f"An unexpected error occurred: {str(e)}"}
         ), HTTPStatus.INTERNAL_SERVER_ERROR
 
 
+@schedules.route("/schedules/jobs/<job_id>", methods=["GET"])
+def get_generation_job(job_id):
+    """Status of a generation job, with its latest progress event"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), HTTPStatus.NOT_FOUND
+
+    data = job.to_dict()
+    if not job.status.is_finished:
+        data["progress"] = job_queue.latest_progress(job_id) or job.progress
+    return jsonify(data), HTTPStatus.OK
+
+
+@schedules.route("/schedules/jobs/<job_id>/cancel", methods=["POST"])
+def cancel_generation_job(job_id):
+    """Cancel a queued or running generation job"""
+    job = job_queue.cancel(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), HTTPStatus.NOT_FOUND
+    if job.status.is_finished and job.status != JobStatus.CANCELLED:
+        return jsonify(
+            {"status": "error", "message": f"Job already {job.status.value.lower()}", "job": job.to_dict()}
+        ), HTTPStatus.CONFLICT
+    # A running job stops at its next progress event
+    status_code = HTTPStatus.OK if job.status.is_finished else HTTPStatus.ACCEPTED
+    return jsonify(job.to_dict()), status_code
+
+
+@schedules.route("/schedules/jobs/<job_id>/result", methods=["GET"])
+def get_generation_job_result(job_id):
+    """Result of a finished generation job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), HTTPStatus.NOT_FOUND
+    if not job.status.is_finished:
+        return jsonify(job.to_dict()), HTTPStatus.ACCEPTED
+    if job.status != JobStatus.SUCCEEDED:
+        return jsonify(
+            {"status": "error", "message": job.error or f"Job {job.status.value.lower()}", "job": job.to_dict()}
+        ), HTTPStatus.CONFLICT
+    return jsonify(job.result), HTTPStatus.OK
+
+
+@schedules.route("/schedules/jobs/<job_id>/events", methods=["GET"])
+def stream_generation_job(job_id):
+    """Server-sent events with the job's progress until it finishes"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), HTTPStatus.NOT_FOUND
+    final_event = {"job_id": job_id, "event": "job_finished", "status": job.status.value}
+
+    def events():
+        streamed = False
+        for event in job_queue.stream(job_id):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            streamed = True
+            yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+        if not streamed:
+            # Not tracked by this process (e.g. finished before a restart)
+            yield f"event: job_finished\ndata: {json.dumps(final_event)}\n\n"
+
+    return current_app.response_class(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @schedules.route("/schedules/pdf", methods=["GET"])
 def get_schedule_pdf():
     """Get schedule as PDF"""
@@ -1175,13 +1207,10 @@ def validate_schedule():
                 {"status": "error", "message": "No schedules found"}
             ), HTTPStatus.NOT_FOUND
 
-        # Create resources and validator
-        resources = ScheduleResources()
+        # Create resources (shared snapshot while the data is unchanged) and validator
+        resources = CachedScheduleResources()
         resources.load()
-        validator = ScheduleValidator(resources)
-
-        # Create validator
-        validator = ScheduleValidator()
+        validator = ScheduleValidator(resources, engine="matrix")
 
         # Create config for validation
         # Updated to use the new from_scheduler_config method
@@ -1243,6 +1272,7 @@ def validate_schedule():
 
 @schedules.route("/schedules/versions", methods=["GET"])
 @schedules.route("/schedules/versions/", methods=["GET"])
+@revision_cached("schedules", "schedule_version_meta")
 def get_all_versions():
     """Get all schedule versions with their metadata"""
     try:
@@ -1681,8 +1711,7 @@ def duplicate_version():
             ), HTTPStatus.BAD_REQUEST
 
         # Check if source version exists
-        source_schedules = Schedule.query.filter_by(version=source_version).all()
-        if not source_schedules:
+        if not version_exists(db.session, source_version):
             return jsonify(
                 {
                     "status": "error",
@@ -1698,14 +1727,13 @@ def duplicate_version():
             f"Duplicating schedule version {source_version} to new version {new_version}"
         )
 
-        # Copy schedules from source version to new version, filtering by date range
-        schedules_to_copy = Schedule.query.filter(
-            Schedule.version == source_version,
-            Schedule.date >= start_date,
-            Schedule.date <= end_date,
-        ).all()
+        # Copy schedules from source version to new version in one INSERT ... SELECT
+        copied_count = duplicate_schedule_version(
+            db.session, source_version, new_version, start_date, end_date
+        )
 
-        if not schedules_to_copy:
+        if not copied_count:
+            db.session.rollback()
             return jsonify(
                 {
                     "status": "error",
@@ -1713,23 +1741,6 @@ def duplicate_version():
                 }
             ), HTTPStatus.BAD_REQUEST
 
-        # Create duplicates with new version number
-        new_schedules = []
-        for schedule in schedules_to_copy:
-            new_schedule = Schedule(
-                employee_id=schedule.employee_id,
-                shift_id=schedule.shift_id,
-                date=schedule.date,
-                version=new_version,
-                break_start=schedule.break_start,
-                break_end=schedule.break_end,
-                notes=schedule.notes,
-            )
-            new_schedule.status = ScheduleStatus.DRAFT  # Always start as DRAFT
-            new_schedules.append(new_schedule)
-
-        db.session.add_all(new_schedules)
-
         # Create version metadata
         version_meta = None
         try:
@@ -1753,6 +1764,7 @@ def duplicate_version():
             "status": "success",
             "message": f"Successfully duplicated version {source_version} to new version {new_version}",
             "version": new_version,
+            "copied_count": copied_count,
             "status_code": "DRAFT",
         }
 
@@ -1784,16 +1796,12 @@ def compare_versions():
                 }
             ), HTTPStatus.BAD_REQUEST
 
-        # Get schedules for both versions
-        base_schedules = Schedule.query.filter_by(version=base_version).all()
-        compare_schedules = Schedule.query.filter_by(version=compare_version).all()
-
-        if not base_schedules:
+        if not version_exists(db.session, base_version):
             return jsonify(
                 {"status": "error", "message": f"Base version {base_version} not found"}
             ), HTTPStatus.NOT_FOUND
 
-        if not compare_schedules:
+        if not version_exists(db.session, compare_version):
             return jsonify(
                 {
                     "status": "error",
@@ -1801,79 +1809,18 @@ def compare_versions():
                 }
             ), HTTPStatus.NOT_FOUND
 
-        # Create lookup dictionaries using employee_id and date as keys
-        base_dict = {f"{s.employee_id}_{s.date.isoformat()}": s for s in base_schedules}
-        compare_dict = {
-            f"{s.employee_id}_{s.date.isoformat()}": s for s in compare_schedules
-        }
-
-        # Track differences
-        added = []
-        removed = []
-        changed = []
-        unchanged = []
-
-        # Check schedules in base version
-        for key, base_schedule in base_dict.items():
-            if key in compare_dict:
-                compare_schedule = compare_dict[key]
-                if base_schedule.shift_id != compare_schedule.shift_id:
-                    changed.append(
-                        {
-                            "employee_id": base_schedule.employee_id,
-                            "date": base_schedule.date.isoformat(),
-                            "base_shift_id": base_schedule.shift_id,
-                            "compare_shift_id": compare_schedule.shift_id,
-                            "type": "changed",
-                        }
-                    )
-                else:
-                    unchanged.append(
-                        {
-                            "employee_id": base_schedule.employee_id,
-                            "date": base_schedule.date.isoformat(),
-                            "base_shift_id": base_schedule.shift_id,
-                            "compare_shift_id": compare_schedule.shift_id,
-                            "type": "unchanged",
-                        }
-                    )
-            else:
-                removed.append(
-                    {
-                        "employee_id": base_schedule.employee_id,
-                        "date": base_schedule.date.isoformat(),
-                        "base_shift_id": base_schedule.shift_id,
-                        "type": "removed",
-                    }
-                )
-
-        # Check for schedules in compare version that aren't in base
-        for key, compare_schedule in compare_dict.items():
-            if key not in base_dict:
-                added.append(
-                    {
-                        "employee_id": compare_schedule.employee_id,
-                        "date": compare_schedule.date.isoformat(),
-                        "compare_shift_id": compare_schedule.shift_id,
-                        "type": "added",
-                    }
-                )
-
-        # Combine all differences
-        all_differences = added + removed + changed + unchanged
+        # Only added/removed/changed rows come back from the database;
+        # unchanged rows are counted but not listed
+        differences, counts = compare_schedule_versions(
+            db.session, base_version, compare_version
+        )
 
         return jsonify(
             {
                 "status": "success",
                 "base_version": base_version,
                 "compare_version": compare_version,
-                "differences": {
-                    "added": len(added),
-                    "removed": len(removed),
-                    "changed": len(changed),
-                    "unchanged": len(unchanged),
-                    "details": all_differences,
-                },
+                "differences": {**counts, "details": differences},
             }
         )
 
@@ -2222,9 +2169,217 @@ def fix_schedule_display():
         logger.error(f"Error in fix_schedule_display: {str(e)}", exc_info=True)
 
 
+def _run_ai_generation(data, progress):
+    """Job runner for POST /schedules/ai-generate (see services/job_queue.py)"""
+    start_date = datetime.strptime(data.get("start_date"), "%Y-%m-%d").date()
+    end_date = datetime.strptime(data.get("end_date"), "%Y-%m-%d").date()
+
+    tracker = ProcessTracker(
+        process_name="AIScheduleGeneration",
+        schedule_logger=logger.schedule_logger,
+        diagnostic_logger=logger.schedule_logger,
+        progress_callback=progress,
+    )
+    tracker.start_process()
+
+    # Extract detailed AI options
+    generation_mode = data.get("generation_mode", "fast")  # fast or detailed
+    ai_options = data.get("ai_options", {})
+    
+    # Parse detailed AI options
+    priority_settings = ai_options.get("prioritySettings", {
+        "employeeSatisfaction": 50,
+        "fairness": 50,
+        "consistency": 50,
+        "workloadBalance": 50
+    })
+    
+    constraint_overrides = ai_options.get("constraintOverrides", {
+        "ignoreNonCriticalAvailability": False,
+        "allowOvertime": False,
+        "strictKeyholder": True,
+        "minimumRestPeriods": True
+    })
+    
+    employee_options = ai_options.get("employeeOptions", {
+        "onlyFixedPreferred": False,
+        "respectPreferenceWeights": True,
+        "considerHistoricalPatterns": True
+    })
+    
+    ai_model_params = ai_options.get("aiModelParams", {
+        "temperature": 0.7,
+        "creativity": 0.5
+    })
+
+    logger.info(
+        f"Generating AI schedule for date range: {start_date} to {end_date}, "
+        f"mode: {generation_mode}, options: {ai_options}"
+    )
+
+    # --- Data Collection ---
+    tracker.start_step("Data Collection")
+    logger.info("Collecting data for AI schedule generation...")
+
+    # Fetch employees
+    employees = Employee.query.filter_by(is_active=True).all()
+    logger.info(f"Fetched {len(employees)} active employees.")
+
+    # Fetch shifts (ShiftTemplates)
+    shifts = ShiftTemplate.query.all()
+    logger.info(f"Fetched {len(shifts)} shift templates.")
+
+    # Fetch coverage
+    coverage = Coverage.query.all()
+    logger.info(f"Fetched {len(coverage)} coverage entries.")
+
+    # Fetch employee availability for the date range
+    availabilities = EmployeeAvailability.query.filter(
+        EmployeeAvailability.start_date <= end_date,
+        EmployeeAvailability.end_date >= start_date,
+    ).all()
+    
+    # Apply availability filtering if requested
+    if employee_options.get("onlyFixedPreferred", False):
+        # Filter to only include FIXED and PREFERRED availability statuses
+        availabilities = [
+            av for av in availabilities 
+            if av.status in ["FIXED", "PREFERRED"]
+        ]
+        logger.info(f"Filtered to {len(availabilities)} fixed/preferred availabilities")
+    
+    # Also fetch recurring availabilities
+    recurring_availabilities = EmployeeAvailability.query.filter(
+        (EmployeeAvailability.start_date == None)
+        | (EmployeeAvailability.is_recurring == True)
+    ).all()
+    
+    # Apply same filtering for recurring availabilities
+    if employee_options.get("onlyFixedPreferred", False):
+        recurring_availabilities = [
+            av for av in recurring_availabilities 
+            if av.status in ["FIXED", "PREFERRED"]
+        ]
+    
+    # Combine and deduplicate availabilities
+    all_availabilities = {}
+    for av in availabilities + recurring_availabilities:
+        key = f"{av.employee_id}_{av.day_of_week}_{av.hour}"
+        if key not in all_availabilities or (
+            av.start_date is not None
+            and all_availabilities[key].start_date is None
+        ):
+            all_availabilities[key] = av
+
+    logger.info(
+        f"Fetched {len(all_availabilities)} employee availability entries (including recurring)."
+    )
+
+    # Fetch absences for the date range
+    absences = Absence.query.filter(
+        Absence.start_date <= end_date, Absence.end_date >= start_date
+    ).all()
+    logger.info(f"Fetched {len(absences)} absence entries.")
+
+    # Fetch settings
+    settings = Settings.query.first()
+    if not settings:
+        logger.warning("Settings not found in DB, using default.")
+        settings = Settings.get_default_settings()
+    logger.info("Fetched application settings.")
+
+    tracker.end_step(
+        {
+            "employees": len(employees),
+            "availabilities": len(all_availabilities),
+            "absences": len(absences),
+        }
+    )
+    # --- End Data Collection ---
+
+    # --- Data Structuring ---
+    logger.info("Structuring collected data...")
+
+    # Convert fetched objects to dictionaries for JSON serialization
+    structured_data = {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "version": data.get("version"),
+        "generation_mode": generation_mode,
+        "ai_options": {
+            "priority_settings": priority_settings,
+            "constraint_overrides": constraint_overrides,
+            "employee_options": employee_options,
+            "ai_model_params": ai_model_params
+        },
+        "employees": [emp.to_dict() for emp in employees] if employees else [],
+        "shifts": [shift.to_dict() for shift in shifts] if shifts else [],
+        "coverage": [cov.to_dict() for cov in coverage] if coverage else [],
+        "availabilities": [av.to_dict() for av in all_availabilities.values()]
+        if all_availabilities
+        else [],
+        "absences": [abs.to_dict() for abs in absences] if absences else [],
+        "settings": settings.to_dict() if settings else {},
+    }
+
+    logger.info("Data structuring complete.")
+    # --- End Data Structuring ---
+
+    # --- AI Model Interaction ---
+    tracker.start_step("AI Model Interaction")
+    logger.info("Sending data to AI model for generation...")
+
+    # TODO: Implement the actual API call to the external AI model (e.g., Gemini)
+    # This section needs to contain the code to send the 'structured_data' to the AI model.
+    # The detailed options should be included in the prompt to guide AI behavior
+
+    # Generate AI prompt based on options
+    ai_prompt = generate_ai_prompt_from_options(priority_settings, constraint_overrides, employee_options)
+    
+    # Placeholder for AI model response (replace with actual API call result)
+    ai_response_data = {
+        "generated_assignments": [],
+        "generation_metadata": {
+            "mode": generation_mode,
+            "options_applied": ai_options,
+            "prompt_used": ai_prompt
+        }
+    }
+
+    logger.info("Received response from AI model (placeholder).")
+    tracker.end_step()
+    # --- End AI Model Interaction ---
+
+    # --- Process AI Model Response and Update Database ---
+    tracker.start_step("Processing AI Response")
+    logger.info("Processing AI model response and updating database...")
+
+    # TODO: Implement logic to process the ai_response_data received from the AI model.
+    # The detailed options should influence how the response is processed
+
+    logger.info("Database update complete.")
+    tracker.end_step()
+    # --- End Process AI Model Response and Update Database ---
+
+    tracker.end_process({"status": "success"})
+
+    # Return enhanced response with detailed options metadata
+    return {
+        "status": "success",
+        "message": "AI schedule generation completed with detailed options",
+        "generation_mode": generation_mode,
+        "ai_options": ai_options,
+        "generated_assignments_count": len(ai_response_data.get("generated_assignments", [])),
+        "details": "Enhanced AI generation with detailed options support",
+        "diagnostic_log": f"Generated with mode: {generation_mode}, "
+                        f"only_fixed_preferred: {employee_options.get('onlyFixedPreferred', False)}, "
+                        f"priority_balance: {priority_settings.get('fairness', 50)}%"
+    }
+
+
 @schedules.route("/schedules/ai-generate", methods=["POST"])
 def generate_ai_schedule():
-    """Generate a schedule using AI with detailed options support"""
+    """Queue an AI schedule generation job with detailed options support"""
     try:
         logger.info("Received request to generate AI schedule")
 
@@ -2232,8 +2387,8 @@ def generate_ai_schedule():
         data = request.get_json()
 
         try:
-            start_date = datetime.strptime(data.get("start_date"), "%Y-%m-%d").date()
-            end_date = datetime.strptime(data.get("end_date"), "%Y-%m-%d").date()
+            datetime.strptime(data.get("start_date"), "%Y-%m-%d")
+            datetime.strptime(data.get("end_date"), "%Y-%m-%d")
         except (ValueError, TypeError):
             return jsonify(
                 {
@@ -2242,199 +2397,14 @@ def generate_ai_schedule():
                 }
             ), HTTPStatus.BAD_REQUEST
 
-        # Extract detailed AI options
-        generation_mode = data.get("generation_mode", "fast")  # fast or detailed
-        ai_options = data.get("ai_options", {})
-        
-        # Parse detailed AI options
-        priority_settings = ai_options.get("prioritySettings", {
-            "employeeSatisfaction": 50,
-            "fairness": 50,
-            "consistency": 50,
-            "workloadBalance": 50
-        })
-        
-        constraint_overrides = ai_options.get("constraintOverrides", {
-            "ignoreNonCriticalAvailability": False,
-            "allowOvertime": False,
-            "strictKeyholder": True,
-            "minimumRestPeriods": True
-        })
-        
-        employee_options = ai_options.get("employeeOptions", {
-            "onlyFixedPreferred": False,
-            "respectPreferenceWeights": True,
-            "considerHistoricalPatterns": True
-        })
-        
-        ai_model_params = ai_options.get("aiModelParams", {
-            "temperature": 0.7,
-            "creativity": 0.5
-        })
-
-        logger.info(
-            f"Generating AI schedule for date range: {start_date} to {end_date}, "
-            f"mode: {generation_mode}, options: {ai_options}"
-        )
+        job = job_queue.submit("ai_schedule_generation", data)
+        return _job_accepted(job)
 
-        # --- Data Collection ---
-        logger.info("Collecting data for AI schedule generation...")
-
-        with current_app.app_context():
-            # Fetch employees
-            employees = Employee.query.filter_by(is_active=True).all()
-            logger.info(f"Fetched {len(employees)} active employees.")
-
-            # Fetch shifts (ShiftTemplates)
-            shifts = ShiftTemplate.query.all()
-            logger.info(f"Fetched {len(shifts)} shift templates.")
-
-            # Fetch coverage
-            coverage = Coverage.query.all()
-            logger.info(f"Fetched {len(coverage)} coverage entries.")
-
-            # Fetch employee availability for the date range
-            availabilities = EmployeeAvailability.query.filter(
-                EmployeeAvailability.start_date <= end_date,
-                EmployeeAvailability.end_date >= start_date,
-            ).all()
-            
-            # Apply availability filtering if requested
-            if employee_options.get("onlyFixedPreferred", False):
-                # Filter to only include FIXED and PREFERRED availability statuses
-                availabilities = [
-                    av for av in availabilities 
-                    if av.status in ["FIXED", "PREFERRED"]
-                ]
-                logger.info(f"Filtered to {len(availabilities)} fixed/preferred availabilities")
-            
-            # Also fetch recurring availabilities
-            recurring_availabilities = EmployeeAvailability.query.filter(
-                (EmployeeAvailability.start_date == None)
-                | (EmployeeAvailability.is_recurring == True)
-            ).all()
-            
-            # Apply same filtering for recurring availabilities
-            if employee_options.get("onlyFixedPreferred", False):
-                recurring_availabilities = [
-                    av for av in recurring_availabilities 
-                    if av.status in ["FIXED", "PREFERRED"]
-                ]
-            
-            # Combine and deduplicate availabilities
-            all_availabilities = {}
-            for av in availabilities + recurring_availabilities:
-                key = f"{av.employee_id}_{av.day_of_week}_{av.hour}"
-                if key not in all_availabilities or (
-                    av.start_date is not None
-                    and all_availabilities[key].start_date is None
-                ):
-                    all_availabilities[key] = av
-
-            logger.info(
-                f"Fetched {len(all_availabilities)} employee availability entries (including recurring)."
-            )
-
-            # Fetch absences for the date range
-            absences = Absence.query.filter(
-                Absence.start_date <= end_date, Absence.end_date >= start_date
-            ).all()
-            logger.info(f"Fetched {len(absences)} absence entries.")
-
-            # Fetch settings
-            settings = Settings.query.first()
-            if not settings:
-                logger.warning("Settings not found in DB, using default.")
-                settings = Settings.get_default_settings()
-            logger.info("Fetched application settings.")
-        # --- End Data Collection ---
-
-        # --- Data Structuring ---
-        logger.info("Structuring collected data...")
-
-        # Convert fetched objects to dictionaries for JSON serialization
-        structured_data = {
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-            "version": data.get("version"),
-            "generation_mode": generation_mode,
-            "ai_options": {
-                "priority_settings": priority_settings,
-                "constraint_overrides": constraint_overrides,
-                "employee_options": employee_options,
-                "ai_model_params": ai_model_params
-            },
-            "employees": [emp.to_dict() for emp in employees] if employees else [],
-            "shifts": [shift.to_dict() for shift in shifts] if shifts else [],
-            "coverage": [cov.to_dict() for cov in coverage] if coverage else [],
-            "availabilities": [av.to_dict() for av in all_availabilities.values()]
-            if all_availabilities
-            else [],
-            "absences": [abs.to_dict() for abs in absences] if absences else [],
-            "settings": settings.to_dict() if settings else {},
-        }
-
-        logger.info("Data structuring complete.")
-        # --- End Data Structuring ---
-
-        # --- AI Model Interaction ---
-        logger.info("Sending data to AI model for generation...")
-
-        # TODO: Implement the actual API call to the external AI model (e.g., Gemini)
-        # This section needs to contain the code to send the 'structured_data' to the AI model.
-        # The detailed options should be included in the prompt to guide AI behavior
-
-        # Generate AI prompt based on options
-        ai_prompt = generate_ai_prompt_from_options(priority_settings, constraint_overrides, employee_options)
-        
-        # Placeholder for AI model response (replace with actual API call result)
-        ai_response_data = {
-            "generated_assignments": [],
-            "generation_metadata": {
-                "mode": generation_mode,
-                "options_applied": ai_options,
-                "prompt_used": ai_prompt
-            }
-        }
-
-        logger.info("Received response from AI model (placeholder).")
-        # --- End AI Model Interaction ---
-
-        # --- Process AI Model Response and Update Database ---
-        logger.info("Processing AI model response and updating database...")
-
-        # TODO: Implement logic to process the ai_response_data received from the AI model.
-        # The detailed options should influence how the response is processed
-
-        logger.info("Database update complete.")
-        # --- End Process AI Model Response and Update Database ---
-
-        # Return enhanced response with detailed options metadata
-        return jsonify(
-            {
-                "status": "success",
-                "message": "AI schedule generation completed with detailed options",
-                "generation_mode": generation_mode,
-                "ai_options": ai_options,
-                "generated_assignments_count": len(ai_response_data.get("generated_assignments", [])),
-                "details": "Enhanced AI generation with detailed options support",
-                "diagnostic_log": f"Generated with mode: {generation_mode}, "
-                                f"only_fixed_preferred: {employee_options.get('onlyFixedPreferred', False)}, "
-                                f"priority_balance: {priority_settings.get('fairness', 50)}%"
-            }
-        ), HTTPStatus.OK
-
-    except ValueError:
-        logger.error(
-            "Invalid date format received for AI schedule generation", exc_info=True
-        )
-        return jsonify(
-            {"status": "error", "message": "Invalid date format, expected YYYY-MM-DD"}
-        ), HTTPStatus.BAD_REQUEST
     except Exception as e:
         logger.error(
-            f"An error occurred during AI schedule generation: {str(e)}", exc_info=True
+            f"An error occurred while queueing AI schedule generation: {str(e)}", exc_info=True
         )
+        db.session.rollback()
         return jsonify(
             {"status": "error", "message": "An internal error occurred"}
         ), HTTPStatus.INTERNAL_SERVER_ERROR
@@ -2542,3 +2512,8 @@ def get_schedule_diagnostics(session_id):
         return jsonify(
             {"status": "error", "message": "An internal error occurred"}
         ), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+# Background generation jobs (services/job_queue.py)
+job_queue.register("schedule_generation", _run_schedule_generation)
+job_queue.register("ai_schedule_generation", _run_ai_generation)
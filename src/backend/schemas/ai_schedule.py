@@ -25,6 +25,20 @@ class AIScheduleGenerateRequest(BaseModel):
         le=1.0,
         description="Weight for seniority scoring (0-1). Higher values prioritize senior employees more."
     )
+    use_cache: Optional[bool] = Field(
+        True,
+        description="Reuse a cached model response for an identical request. Set to false to force a fresh call.",
+    )
+    windowed: Optional[bool] = Field(
+        False,
+        description="Generate week by week with one smaller prompt per week, sent concurrently.",
+    )
+    window_concurrency: Optional[int] = Field(
+        None,
+        ge=1,
+        le=8,
+        description="Windowed mode: requests in flight per AI provider.",
+    )
 
     class Config:
         schema_extra = {
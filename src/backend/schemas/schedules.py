@@ -1,5 +1,5 @@
 from datetime import date as datetime_date
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -23,6 +23,20 @@ class ScheduleGenerateRequest(BaseModel):
     enable_diagnostics: Optional[bool] = Field(
         False, description="Whether to enable diagnostic logging during generation."
     )
+    diagnostics: Optional[Literal["off", "summary", "full"]] = Field(
+        None,
+        description="Generation tracing: 'off', 'summary' (default) or 'full'. "
+        "enable_diagnostics=true means 'full'.",
+    )
+    distribution_engine: Optional[Literal["greedy", "assignment"]] = Field(
+        "greedy",
+        description="Shift distribution engine: 'greedy' or 'assignment' (optimal per day).",
+    )
+    parallel_workers: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Number of worker processes generating ISO weeks in parallel.",
+    )
 
 
 class ScheduleUpdateRequest(BaseModel):
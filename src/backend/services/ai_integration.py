@@ -8,6 +8,8 @@ managing prompts dynamically, and processing AI responses for tool usage.
 import json
 import logging
 import re
+import threading
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -18,6 +20,8 @@ import anthropic
 import google.generativeai as genai
 import openai
 
+from .ai_telemetry import ModelTelemetry, model_telemetry
+
 try:
     from .config import AIProviderConfig
 except ImportError:
@@ -896,16 +900,31 @@ Use tools as needed to gather additional data or test scenarios.""",
 
 
 class AIOrchestrator:
-    """Orchestrates AI interactions with tool usage."""
+    """Orchestrates AI interactions with tool usage.
+
+    Model selection uses the live numbers of ``telemetry`` (see
+    ai_telemetry.py) where there are enough recent samples, and the static
+    ``ModelInfo`` values otherwise. The model catalog of the providers is
+    cached for ``CATALOG_TTL_SECONDS``.
+    """
+
+    CATALOG_TTL_SECONDS = 3600.0
+    # Expected latency that scores 0 for speed in balanced selection
+    SLOW_RESPONSE_SECONDS = 10.0
 
     def __init__(
         self,
         providers: Dict[AIProvider, AIProviderInterface],
         prompt_manager: PromptManager,
+        telemetry: Optional[ModelTelemetry] = None,
     ):
         self.providers = providers
         self.prompt_manager = prompt_manager
+        self.telemetry = telemetry or model_telemetry
         self.logger = logging.getLogger(__name__)
+        self._catalog: Optional[List[tuple]] = None
+        self._catalog_loaded_at = 0.0
+        self._catalog_lock = threading.Lock()
 
         # Model selection strategy
         self.selection_strategies = {
@@ -930,6 +949,7 @@ class AIOrchestrator:
             request.model_preferences.insert(0, model_id)
 
         # Generate response
+        started = time.perf_counter()
         try:
             response = await provider.generate_response(request)
 
@@ -940,10 +960,16 @@ class AIOrchestrator:
 
         except Exception as e:
             self.logger.error(f"AI request failed: {e}")
+            self.telemetry.record_error(
+                model_id,
+                time.perf_counter() - started,
+                provider=self._provider_name(provider),
+            )
 
             # Try fallback provider if available
             fallback_response = await self._try_fallback(request, provider)
             if fallback_response:
+                self._log_metrics(fallback_response)
                 return fallback_response
 
             raise
@@ -960,12 +986,25 @@ class AIOrchestrator:
         if model_id not in request.model_preferences:
             request.model_preferences.insert(0, model_id)
 
+        started = time.perf_counter()
         try:
             async for chunk in provider.stream_response(request):
                 yield chunk
         except Exception as e:
             self.logger.error(f"AI streaming failed: {e}")
+            self.telemetry.record_error(
+                model_id,
+                time.perf_counter() - started,
+                provider=self._provider_name(provider),
+            )
             raise
+        # Streams only yield text, so there is no token count; a stream the
+        # caller abandons is recorded neither way
+        self.telemetry.record(
+            model_id,
+            time.perf_counter() - started,
+            provider=self._provider_name(provider),
+        )
 
     async def _select_provider_and_model(
         self, request: AIRequest, strategy: str
@@ -977,18 +1016,42 @@ class AIOrchestrator:
             strategy, self._select_balanced_model
         )
 
-        # Get all available models
-        all_models = []
-        for provider_type, provider in self.providers.items():
-            models = provider.get_available_models()
-            for model in models:
-                all_models.append((provider, model))
-
         # Select best model
-        selected_provider, selected_model = select_func(all_models, request)
+        selected_provider, selected_model = select_func(
+            self.get_model_catalog(), request
+        )
 
         return selected_provider, selected_model.model_id
 
+    def get_model_catalog(self, refresh: bool = False) -> List[tuple]:
+        """(provider, ModelInfo) pairs of all providers, cached"""
+        with self._catalog_lock:
+            if (
+                refresh
+                or self._catalog is None
+                or time.monotonic() - self._catalog_loaded_at > self.CATALOG_TTL_SECONDS
+            ):
+                self._catalog = [
+                    (provider, model)
+                    for provider in self.providers.values()
+                    for model in provider.get_available_models()
+                ]
+                self._catalog_loaded_at = time.monotonic()
+            return self._catalog
+
+    def _provider_name(self, provider: AIProviderInterface) -> Optional[str]:
+        for provider_type, candidate in self.providers.items():
+            if candidate is provider:
+                return provider_type.value
+        return None
+
+    def _expected_latency(self, model: ModelInfo) -> float:
+        """Live latency (with error retries) or the static average"""
+        stats = self.telemetry.live(model.model_id)
+        if stats is None:
+            return model.response_time_avg
+        return stats.expected_latency(default=model.response_time_avg)
+
     def _select_cost_effective_model(
         self, models: List[tuple], request: AIRequest
     ) -> tuple:
@@ -1007,7 +1070,7 @@ class AIOrchestrator:
             (p, m) for p, m in models if ModelCapability.FAST_RESPONSE in m.capabilities
         ]
         if fast_models:
-            return min(fast_models, key=lambda x: x[1].response_time_avg)
+            return min(fast_models, key=lambda x: self._expected_latency(x[1]))
         return models[0]  # Fallback
 
     def _select_balanced_model(self, models: List[tuple], request: AIRequest) -> tuple:
@@ -1016,14 +1079,26 @@ class AIOrchestrator:
         # Score each model
         scored_models = []
         for provider, model in models:
+            stats = self.telemetry.live(model.model_id)
+            cost_per_token = model.cost_per_token
+            if stats is not None and stats.cost_per_token is not None:
+                cost_per_token = stats.cost_per_token
+
             # Normalize scores (0-1)
             cost_score = 1.0 - min(
-                model.cost_per_token / 0.00001, 1.0
+                cost_per_token / 0.00001, 1.0
             )  # Lower cost is better
             quality_score = model.quality_score
-            speed_score = (
-                0.8 if ModelCapability.FAST_RESPONSE in model.capabilities else 0.4
-            )
+            if stats is None:
+                speed_score = (
+                    0.8 if ModelCapability.FAST_RESPONSE in model.capabilities else 0.4
+                )
+            else:
+                # Measured speed, and answers that fail are worth less
+                speed_score = 1.0 - min(
+                    self._expected_latency(model) / self.SLOW_RESPONSE_SECONDS, 1.0
+                )
+                quality_score *= 1.0 - stats.error_rate
 
             # Check for required capabilities
             capability_score = 1.0
@@ -1061,7 +1136,20 @@ class AIOrchestrator:
         return None
 
     def _log_metrics(self, response: AIResponse):
-        """Log response metrics."""
+        """Log response metrics and feed them to the telemetry store."""
+        if response.model_used:
+            provider_name = None
+            for provider, model in self.get_model_catalog():
+                if model.model_id == response.model_used:
+                    provider_name = model.provider.value
+                    break
+            self.telemetry.record(
+                response.model_used,
+                response.response_time,
+                tokens=response.tokens_used,
+                cost=response.cost,
+                provider=provider_name,
+            )
         self.logger.info(
             f"AI Response - Model: {response.model_used}, "
             f"Tokens: {response.tokens_used}, "
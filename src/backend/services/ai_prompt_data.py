@@ -0,0 +1,328 @@
+"""Set-based collection of the scheduling data sent to the AI model.
+
+``AISchedulerService._collect_data_for_ai_prompt`` used to run an
+availability and an absence query for every active employee and walk every
+availability row once per day of the range. The data is now read with a
+fixed number of queries:
+
+* one query over the active employees with correlated ``EXISTS`` columns for
+  "has availability in the range" and "absent for the whole range",
+* one ``GROUP BY`` over the availabilities of the kept employees, returning
+  the earliest and latest hour per employee, weekday and availability type,
+* one query each for shift templates, coverage and overlapping absences.
+
+The resulting prompt text only depends on the date range and the rows of
+``PROMPT_TABLES``, so ``PromptDataCache`` keeps it per (date range, data
+revision), like ``scheduler/resource_cache.py`` does for scheduler resources.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import exists, func
+
+from src.backend.models import (
+    Absence,
+    Coverage,
+    Employee,
+    EmployeeAvailability,
+    ShiftTemplate,
+    db,
+)
+from src.backend.models.employee import AvailabilityType
+from src.backend.utils.http_cache import register_revision_events, revisions
+
+# Tables read by collect_prompt_data()
+PROMPT_TABLES = (
+    "employees",
+    "employee_availabilities",
+    "absences",
+    "shifts",
+    "coverage",
+)
+
+DEFAULT_MAX_AGE_SECONDS = 300.0
+MAX_ENTRIES = 32
+
+AVAILABILITY_KEYS = {
+    AvailabilityType.FIXED: "fixed_hours",
+    AvailabilityType.PREFERRED: "preferred_hours",
+}
+
+
+def _overlaps(model, start_date, end_date):
+    """Rows whose (nullable) date range overlaps ``start_date``..``end_date``"""
+    return db.and_(
+        db.or_(model.start_date.is_(None), model.start_date <= end_date),
+        db.or_(model.end_date.is_(None), model.end_date >= start_date),
+    )
+
+
+def _weekday_in_range(weekday: int, start_date, end_date) -> bool:
+    """Whether a date with ``weekday`` falls into ``start_date``..``end_date``"""
+    if start_date > end_date:
+        return False
+    if (end_date - start_date).days >= 6:
+        return True
+    return (weekday - start_date.weekday()) % 7 <= (end_date - start_date).days
+
+
+def collect_prompt_data(start_date, end_date) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """The prompt data for ``start_date``..``end_date`` and the collection counts"""
+    collected_data: Dict[str, Any] = {}
+    target_weekdays = {
+        (start_date + timedelta(days=offset)).weekday()
+        for offset in range(min((end_date - start_date).days + 1, 7))
+    }
+
+    # 1. Active employees with their availability and absence summaries
+    has_availability = exists().where(
+        EmployeeAvailability.employee_id == Employee.id,
+        db.or_(
+            EmployeeAvailability.is_recurring.is_(True),
+            _overlaps(EmployeeAvailability, start_date, end_date),
+        ),
+    )
+    fully_absent = exists().where(
+        Absence.employee_id == Employee.id,
+        Absence.start_date <= start_date,
+        Absence.end_date >= end_date,
+    )
+    summaries = (
+        db.session.query(
+            Employee,
+            has_availability.label("has_availability"),
+            fully_absent.label("fully_absent"),
+        )
+        .filter(Employee.is_active.is_(True))
+        .order_by(Employee.id)
+        .all()
+    )
+    employees = [
+        emp for emp, available, absent in summaries if available and not absent
+    ]
+    collected_data["employees"] = [
+        {
+            "id": emp.id,
+            "name": f"{emp.first_name} {emp.last_name}",
+            "role": emp.employee_group.value if emp.employee_group else "UNKNOWN",
+            "is_keyholder": emp.is_keyholder,
+            "max_weekly_hours": emp.get_max_weekly_hours() or 40,
+        }
+        for emp in employees
+    ]
+
+    # 2. Shift templates active on one of the target weekdays. active_days is
+    # a JSON column, so it is filtered here rather than in SQL.
+    shift_data = []
+    for shift in ShiftTemplate.query.order_by(ShiftTemplate.id):
+        active_days = [
+            day
+            for day in range(7)
+            if shift.active_days
+            and str(day) in shift.active_days
+            and shift.active_days[str(day)]
+        ]
+        if target_weekdays.intersection(active_days):
+            shift_data.append(
+                {
+                    "id": shift.id,
+                    "start_time": shift.start_time,
+                    "end_time": shift.end_time,
+                    "active_days": active_days,
+                    "requires_keyholder": getattr(shift, "requires_keyholder", False),
+                }
+            )
+    collected_data["shifts"] = shift_data
+
+    # 3. Coverage rules of the target weekdays
+    collected_data["coverage_rules"] = [
+        {
+            "day_index": coverage.day_index,  # 0=Monday, 6=Sunday
+            "time_period": f"{coverage.start_time}-{coverage.end_time}",
+            "min_employees": coverage.min_employees,
+            "max_employees": coverage.max_employees,
+            "requires_keyholder": coverage.requires_keyholder,
+        }
+        for coverage in Coverage.query.filter(
+            Coverage.day_index.in_(target_weekdays)
+        ).order_by(Coverage.id)
+    ]
+
+    collected_data["schedule_period"] = {
+        "start_date": start_date.strftime("%Y-%m-%d"),
+        "end_date": end_date.strftime("%Y-%m-%d"),
+        "target_weekdays": sorted(target_weekdays),
+    }
+
+    employee_ids = [emp.id for emp in employees]
+
+    # 4. Availability as hour ranges per employee, weekday and type. Recurring
+    # rows collapse into one group; dated rows keep their range so we can check
+    # that the weekday actually occurs in the overlap with the schedule period.
+    counts = {"availability_windows": 0}
+    if employee_ids:
+        grouped = (
+            db.session.query(
+                EmployeeAvailability.employee_id,
+                EmployeeAvailability.day_of_week,
+                EmployeeAvailability.availability_type,
+                EmployeeAvailability.is_recurring,
+                EmployeeAvailability.start_date,
+                EmployeeAvailability.end_date,
+                func.min(EmployeeAvailability.hour),
+                func.max(EmployeeAvailability.hour),
+            )
+            .filter(
+                EmployeeAvailability.employee_id.in_(employee_ids),
+                EmployeeAvailability.is_available.is_(True),
+                EmployeeAvailability.day_of_week.in_(target_weekdays),
+                db.or_(
+                    EmployeeAvailability.is_recurring.is_(True),
+                    db.and_(
+                        EmployeeAvailability.start_date.isnot(None),
+                        EmployeeAvailability.end_date.isnot(None),
+                        EmployeeAvailability.start_date <= end_date,
+                        EmployeeAvailability.end_date >= start_date,
+                    ),
+                ),
+            )
+            .group_by(
+                EmployeeAvailability.employee_id,
+                EmployeeAvailability.day_of_week,
+                EmployeeAvailability.availability_type,
+                EmployeeAvailability.is_recurring,
+                EmployeeAvailability.start_date,
+                EmployeeAvailability.end_date,
+            )
+            .all()
+        )
+
+        windows: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        for (
+            employee_id,
+            day_of_week,
+            availability_type,
+            is_recurring,
+            avail_start,
+            avail_end,
+            min_hour,
+            max_hour,
+        ) in grouped:
+            if not is_recurring and not _weekday_in_range(
+                day_of_week, max(avail_start, start_date), min(avail_end, end_date)
+            ):
+                continue
+            window = windows.setdefault((employee_id, day_of_week), {})
+            key = AVAILABILITY_KEYS.get(availability_type, "available_hours")
+            low, high = window.get(key, (min_hour, max_hour))
+            window[key] = (min(low, min_hour), max(high, max_hour))
+
+        availability_data = []
+        for (employee_id, day_index), window in sorted(windows.items()):
+            simplified_window = {"employee_id": employee_id, "day_index": day_index}
+            for avail_type in ["fixed_hours", "preferred_hours", "available_hours"]:
+                if avail_type in window:
+                    low, high = window[avail_type]
+                    simplified_window[avail_type.replace("_hours", "_time_range")] = (
+                        f"{low:02d}:00-{high + 1:02d}:00"
+                    )
+            availability_data.append(simplified_window)
+        collected_data["availability"] = availability_data
+        counts["availability_windows"] = len(availability_data)
+
+    # 5. Absences overlapping the period
+    absences = (
+        Absence.query.filter(
+            Absence.employee_id.in_(employee_ids),
+            Absence.start_date <= end_date,
+            Absence.end_date >= start_date,
+        )
+        .order_by(Absence.employee_id, Absence.start_date)
+        .all()
+        if employee_ids
+        else []
+    )
+    collected_data["absences"] = [
+        {
+            "employee_id": absence.employee_id,
+            "start_date": absence.start_date.strftime("%Y-%m-%d"),
+            "end_date": absence.end_date.strftime("%Y-%m-%d"),
+            "reason": absence.note or "Absence",
+        }
+        for absence in absences
+    ]
+
+    counts.update(
+        {
+            "active_employees": len(summaries),
+            "employees": len(employees),
+            "shifts": len(shift_data),
+            "coverage_rules": len(collected_data["coverage_rules"]),
+            "absences": len(absences),
+        }
+    )
+    return collected_data, counts
+
+
+class PromptDataCache:
+    """Prompt data text per date range, keyed by data revision"""
+
+    def __init__(
+        self, max_age: float = DEFAULT_MAX_AGE_SECONDS, max_entries: int = MAX_ENTRIES
+    ):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        # (database URL, start, end) -> (revision, loaded at, text, counts)
+        self._entries: "OrderedDict[Tuple[str, Any, Any], Tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, start_date, end_date) -> Tuple[str, Dict[str, int], bool]:
+        """The prompt data text, its counts and whether it came from the cache.
+
+        Must run inside an app context.
+        """
+        register_revision_events()
+        key = (str(db.engine.url), start_date, end_date)
+        with self._lock:
+            # Read the revision before loading, see ResourceCache.snapshot()
+            revision = (revisions.epoch, *revisions.current(PROMPT_TABLES))
+            entry = self._entries.get(key)
+            if (
+                entry is not None
+                and entry[0] == revision
+                and time.monotonic() - entry[1] < self.max_age
+            ):
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[2], entry[3], True
+
+            self.misses += 1
+            collected_data, counts = collect_prompt_data(start_date, end_date)
+            text = json.dumps(collected_data, indent=2)
+            self._entries[key] = (revision, time.monotonic(), text, counts)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return text, counts, False
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+prompt_data_cache = PromptDataCache()
@@ -0,0 +1,206 @@
+"""Persistent, content-addressed cache of Gemini responses.
+
+Planners often resubmit the same date range with unchanged data and options,
+and every resubmission used to pay for a full model call. Responses are now
+stored in a small SQLite file under the key
+
+    sha256(model name, model params, normalized prompt)
+
+so an identical request is answered from disk. The prompt is normalized by
+stripping the indentation of the prompt template and surrounding blank
+lines, which do not change what the model is asked.
+
+Entries expire after ``ttl`` seconds. When the cache holds more than
+``max_entries`` responses or ``max_bytes`` of text, the least recently used
+entries are evicted. Hit, miss, expiry and eviction counts are kept per
+process and returned by ``get_stats()``.
+
+Real calls go through ``gemini_session()``, a shared ``requests.Session``
+whose pooled connections stay alive between calls.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+SRC_DIR = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_PATH = SRC_DIR / "instance" / "ai_response_cache.db"
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ai_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_ai_responses_last_used ON ai_responses (last_used);
+"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    """The prompt without template indentation and surrounding blank lines"""
+    return "\n".join(line.strip() for line in prompt.strip().splitlines())
+
+
+def cache_key(model_name: str, model_params: Dict[str, Any], prompt: str) -> str:
+    material = json.dumps(
+        {
+            "model": model_name,
+            "params": model_params,
+            "prompt": normalize_prompt(prompt),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class AIResponseCache:
+    """Model responses keyed by ``cache_key()``, with TTL and LRU eviction"""
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[str]:
+        """The cached response for ``key``, or None if missing or expired"""
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT response, created_at FROM ai_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            response, created_at = row
+            if now - created_at >= self.ttl:
+                self._connection.execute(
+                    "DELETE FROM ai_responses WHERE key = ?", (key,)
+                )
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE ai_responses SET last_used = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            return response
+
+    def put(self, key: str, model_name: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO ai_responses "
+                "(key, model, response, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name, response, size, now, now),
+            )
+            self._connection.execute(
+                "DELETE FROM ai_responses WHERE created_at <= ?", (now - self.ttl,)
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until both limits hold"""
+        count, total = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ai_responses"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM ai_responses ORDER BY last_used, created_at"
+        ).fetchall():
+            # Keep at least the newest entry, even if it alone exceeds max_bytes
+            if (count <= self.max_entries and total <= self.max_bytes) or count == 1:
+                break
+            evicted.append((key,))
+            count -= 1
+            total -= size
+        self._connection.executemany("DELETE FROM ai_responses WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM ai_responses")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, total = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ai_responses"
+            ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": count,
+                "bytes": total,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_cache: Optional[AIResponseCache] = None
+_session: Optional[requests.Session] = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache() -> AIResponseCache:
+    """The process-wide cache, at ``AI_RESPONSE_CACHE_PATH`` if set"""
+    global _cache
+    with _shared_lock:
+        if _cache is None:
+            _cache = AIResponseCache(
+                Path(os.environ.get("AI_RESPONSE_CACHE_PATH", DEFAULT_CACHE_PATH))
+            )
+        return _cache
+
+
+def gemini_session() -> requests.Session:
+    """Shared HTTP session with pooled keep-alive connections"""
+    global _session
+    with _shared_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE
+            )
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
@@ -2,24 +2,43 @@
 
 from src.backend.models import (
     db,
-    Employee,
     ShiftTemplate,
-    Coverage,
-    Absence,
-    EmployeeAvailability,
     Schedule,
 )  # Added Schedule model
 from src.backend.utils.logger import (
     logger,
 )  # Corrected: import the global logger instance
 from src.backend.services.scheduler.logging_utils import ProcessTracker
-import json
+from src.backend.services.scheduler.bulk_writer import write_schedules
+from src.backend.models.schedule import ScheduleStatus
+from src.backend.services.scheduler.resource_cache import resource_cache
+from src.backend.services.ai_prompt_data import prompt_data_cache
+from src.backend.services.ai_response_cache import (
+    cache_key,
+    gemini_session,
+    get_response_cache,
+)
+from src.backend.services.ai_stream_parser import (
+    AssignmentStreamParser,
+    AssignmentValidator,
+    iter_gemini_sse_text,
+)
+from src.backend.services.ai_windowed_generation import (
+    DEFAULT_WINDOW_CONCURRENCY,
+    SchedulerGeminiProvider,
+    add_boundary_context,
+    run_windows,
+    validation_entries,
+    weekly_windows,
+)
+from src.backend.services.ai_integration import AIProvider, AIRequest
+from src.backend.services.scheduler.resource_snapshot import SnapshotScheduleResources
+from src.backend.services.scheduler.validator import ScheduleValidator
 import requests
 import os
 import logging
-import csv
+import time
 import uuid
-from io import StringIO
 from datetime import datetime, timedelta
 from pathlib import Path
 from sqlalchemy.exc import SQLAlchemyError
@@ -32,13 +51,24 @@ SRC_DIR = Path(__file__).resolve().parent.parent.parent
 LOGS_DIR = SRC_DIR / "logs"
 DIAGNOSTICS_DIR = LOGS_DIR / "diagnostics"
 
+GEMINI_API_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+# Assignments written per INSERT batch while a response is streamed
+STREAM_BATCH_SIZE = 200
+
 
 class AISchedulerService:
-    def __init__(self):
+    def __init__(self, response_cache=None):
         self.gemini_api_key = self._load_api_key_from_settings()
         self.gemini_model_name = (
             "gemini-1.5-flash"  # Using the more available gemini-1.5-flash model
         )
+        # Overridable to point the service at a local stand-in for the API
+        self.gemini_api_base_url = os.environ.get(
+            "GEMINI_API_BASE_URL", GEMINI_API_BASE_URL
+        )
+        # Defaults to the process-wide cache (see services/ai_response_cache.py),
+        # False disables response caching
+        self.response_cache = response_cache
         self.default_model_params = {
             "generationConfig": {
                 "temperature": 0.6,
@@ -175,7 +205,11 @@ class AISchedulerService:
         return summary
 
     def _collect_data_for_ai_prompt(self, start_date, end_date, tracker=None):
-        """Collect optimized data for AI prompt generation with reduced redundancy"""
+        """Collect optimized data for AI prompt generation with reduced redundancy
+
+        The data is read with a fixed number of aggregated queries and cached
+        per date range and data revision (see services/ai_prompt_data.py).
+        """
         if tracker:
             tracker.start_step("Collect Data for AI Prompt")
             tracker.log_info(
@@ -187,206 +221,32 @@ class AISchedulerService:
             )
 
         try:
-            # Initialize an empty dictionary to hold collected data
-            collected_data = {}
-
-            # Get target weekdays for filtering
-            target_weekdays = set()
-            current_date = start_date
-            while current_date <= end_date:
-                target_weekdays.add(current_date.weekday())
-                current_date += timedelta(days=1)
-
-            # 1. Get active employees with availability pre-filtering
-            employees = Employee.query.filter_by(is_active=True).all()
-            
-            # Pre-filter employees who have some availability or no blocking absences
-            filtered_employees = []
-            for emp in employees:
-                # Check if employee has any availability during the period
-                has_availability = EmployeeAvailability.query.filter(
-                    EmployeeAvailability.employee_id == emp.id,
-                    db.or_(
-                        EmployeeAvailability.is_recurring.is_(True),
-                        db.and_(
-                            db.or_(EmployeeAvailability.start_date.is_(None), EmployeeAvailability.start_date <= end_date),
-                            db.or_(EmployeeAvailability.end_date.is_(None), EmployeeAvailability.end_date >= start_date)
-                        )
-                    )
-                ).first() is not None
-                
-                # Check if employee has blocking absences for entire period
-                blocking_absence = Absence.query.filter(
-                    Absence.employee_id == emp.id,
-                    Absence.start_date <= start_date,
-                    Absence.end_date >= end_date
-                ).first() is not None
-                
-                # Include employee if they have availability and no blocking absence
-                if has_availability and not blocking_absence:
-                    filtered_employees.append(emp)
-
-            employee_data = []
-            for emp in filtered_employees:
-                emp_dict = {
-                    "id": emp.id,
-                    "name": f"{emp.first_name} {emp.last_name}",
-                    "role": emp.employee_group.value if emp.employee_group else "UNKNOWN",
-                    "is_keyholder": emp.is_keyholder,
-                    "max_weekly_hours": emp.get_max_weekly_hours() or 40,
-                }
-                employee_data.append(emp_dict)
-
-            collected_data["employees"] = employee_data
-
-            if tracker:
-                tracker.log_info(f"Collected {len(employee_data)} filtered employees (from {len(employees)} total)")
-
-            # 2. Get shift templates - optimized with only essential fields
-            shifts = ShiftTemplate.query.all()
-            shift_data = []
-            for shift in shifts:
-                # Filter shifts that are active on target weekdays
-                if shift.active_days and any(str(day) in shift.active_days and shift.active_days[str(day)] for day in target_weekdays):
-                    shift_dict = {
-                        "id": shift.id,
-                        "start_time": shift.start_time,
-                        "end_time": shift.end_time,
-                        "active_days": [day for day in range(7) if str(day) in shift.active_days and shift.active_days[str(day)]],
-                        "requires_keyholder": getattr(shift, 'requires_keyholder', False),
-                    }
-                    shift_data.append(shift_dict)
-
-            collected_data["shifts"] = shift_data
-
-            if tracker:
-                tracker.log_info(f"Collected {len(shift_data)} relevant shift templates")
-
-            # 3. Get coverage needs - optimized with pattern-based structure
-            coverage_needs = Coverage.query.all()
-            coverage_rules = []
-            
-            for coverage in coverage_needs:
-                # Only include coverage rules for relevant weekdays
-                if coverage.day_index in target_weekdays:
-                    coverage_rule = {
-                        "day_index": coverage.day_index,  # 0=Monday, 6=Sunday
-                        "time_period": f"{coverage.start_time}-{coverage.end_time}",
-                        "min_employees": coverage.min_employees,
-                        "max_employees": coverage.max_employees,
-                        "requires_keyholder": coverage.requires_keyholder,
-                    }
-                    coverage_rules.append(coverage_rule)
-
-            collected_data["coverage_rules"] = coverage_rules
-            
-            # Also provide the date range for context
-            collected_data["schedule_period"] = {
-                "start_date": start_date.strftime("%Y-%m-%d"),
-                "end_date": end_date.strftime("%Y-%m-%d"),
-                "target_weekdays": sorted(list(target_weekdays))
-            }
+            collected_data_text, counts, cached = prompt_data_cache.get(
+                start_date, end_date
+            )
 
             if tracker:
-                tracker.log_info(f"Collected {len(coverage_rules)} coverage rules for weekdays {sorted(target_weekdays)}")
-
-            # 4. Get employee availability - optimized with time windows instead of hour-by-hour
-            employee_ids = [emp["id"] for emp in employee_data]
-            if employee_ids:
-                availabilities = EmployeeAvailability.query.filter(
-                    EmployeeAvailability.employee_id.in_(employee_ids),
-                    db.or_(
-                        EmployeeAvailability.is_recurring.is_(True),
-                        db.and_(
-                            db.or_(EmployeeAvailability.start_date.is_(None), EmployeeAvailability.start_date <= end_date),
-                            db.or_(EmployeeAvailability.end_date.is_(None), EmployeeAvailability.end_date >= start_date)
-                        )
-                    )
-                ).all()
-
-                # Convert to time windows per employee per day
-                availability_windows = {}
-                for avail in availabilities:
-                    current_date = start_date
-                    while current_date <= end_date:
-                        if avail.is_available_for_date(current_date):
-                            key = f"{avail.employee_id}_{current_date.weekday()}"
-                            if key not in availability_windows:
-                                availability_windows[key] = {
-                                    "employee_id": avail.employee_id,
-                                    "day_index": current_date.weekday(),
-                                    "available_hours": [],
-                                    "preferred_hours": [],
-                                    "fixed_hours": []
-                                }
-                            
-                            # Categorize by availability type
-                            hour_info = avail.hour
-                            if avail.availability_type.value == "FIXED":
-                                availability_windows[key]["fixed_hours"].append(hour_info)
-                            elif avail.availability_type.value == "PREFERRED":
-                                availability_windows[key]["preferred_hours"].append(hour_info)
-                            else:  # AVAILABLE
-                                availability_windows[key]["available_hours"].append(hour_info)
-                        current_date += timedelta(days=1)
-
-                # Convert to time ranges and create simplified availability data
-                availability_data = []
-                for window_data in availability_windows.values():
-                    # Convert hour lists to time ranges
-                    simplified_window = {
-                        "employee_id": window_data["employee_id"],
-                        "day_index": window_data["day_index"],
+                if cached:
+                    tracker.log_info("Reusing prompt data collected for this date range")
+                tracker.log_info(
+                    f"Collected {counts['employees']} filtered employees (from {counts['active_employees']} total)"
+                )
+                tracker.log_info(f"Collected {counts['shifts']} relevant shift templates")
+                tracker.log_info(f"Collected {counts['coverage_rules']} coverage rules")
+                tracker.log_info(
+                    f"Collected {counts['availability_windows']} availability windows"
+                )
+                tracker.log_info(f"Collected {counts['absences']} absence records")
+                tracker.end_step(
+                    {
+                        "employees": counts["employees"],
+                        "shifts": counts["shifts"],
+                        "coverage_rules": counts["coverage_rules"],
+                        "availability_windows": counts["availability_windows"],
+                        "absences": counts["absences"],
+                        "cached": cached,
                     }
-                    
-                    # Create time ranges for each availability type
-                    for avail_type in ["fixed_hours", "preferred_hours", "available_hours"]:
-                        hours = sorted(window_data[avail_type])
-                        if hours:
-                            # Convert hours to time ranges (simplified)
-                            time_range = f"{min(hours):02d}:00-{max(hours)+1:02d}:00"
-                            simplified_window[avail_type.replace("_hours", "_time_range")] = time_range
-                    
-                    availability_data.append(simplified_window)
-
-                collected_data["availability"] = availability_data
-
-                if tracker:
-                    tracker.log_info(f"Collected {len(availability_data)} availability windows")
-
-            # 5. Get absences - already optimized, only overlapping dates
-            absences = Absence.query.filter(
-                Absence.employee_id.in_(employee_ids) if employee_ids else False,
-                Absence.start_date <= end_date, 
-                Absence.end_date >= start_date
-            ).all()
-
-            absence_data = []
-            for absence in absences:
-                absence_dict = {
-                    "employee_id": absence.employee_id,
-                    "start_date": absence.start_date.strftime("%Y-%m-%d"),
-                    "end_date": absence.end_date.strftime("%Y-%m-%d"),
-                    "reason": absence.note or "Absence",
-                }
-                absence_data.append(absence_dict)
-
-            collected_data["absences"] = absence_data
-
-            if tracker:
-                tracker.log_info(f"Collected {len(absence_data)} absence records")
-
-            # Convert the collected data to a structured text format for the prompt
-            collected_data_text = json.dumps(collected_data, indent=2)
-
-            if tracker:
-                tracker.end_step({
-                    "employees": len(employee_data),
-                    "shifts": len(shift_data), 
-                    "coverage_rules": len(coverage_rules),
-                    "availability_windows": len(availability_data) if 'availability_data' in locals() else 0,
-                    "absences": len(absence_data)
-                })
+                )
 
             return collected_data_text
 
@@ -476,8 +336,29 @@ class AISchedulerService:
 
         return prompt
 
-    def _call_gemini_api(self, prompt, model_params=None, tracker=None):
-        """Call the Gemini API with diagnostics"""
+    def _get_response_cache(self, tracker=None):
+        """The response cache to use, or None if disabled or it cannot be opened"""
+        if self.response_cache is False:
+            return None
+        if self.response_cache is None:
+            try:
+                self.response_cache = get_response_cache()
+            except Exception as e:
+                message = f"AI response cache unavailable, calling the API directly: {e}"
+                if tracker:
+                    tracker.log_warning(message)
+                else:
+                    logger.app_logger.warning(message)
+                return None
+        return self.response_cache
+
+    def _call_gemini_api(self, prompt, model_params=None, tracker=None, use_cache=True):
+        """Call the Gemini API with diagnostics
+
+        Responses are cached by model, parameters and prompt; ``use_cache=False``
+        skips the lookup and always calls the API (the fresh response is still
+        stored).
+        """
         if tracker:
             tracker.start_step("Call Gemini API")
             tracker.log_info("Calling Gemini API for schedule generation")
@@ -504,8 +385,22 @@ class AISchedulerService:
                 )
             tracker.log_step_data("Model Parameters", safe_params)
 
+        response_cache = self._get_response_cache(tracker)
+        key = cache_key(self.gemini_model_name, params, prompt)
+        if response_cache is not None and use_cache:
+            cached_text = response_cache.get(key)
+            if cached_text is not None:
+                if tracker:
+                    tracker.log_info(
+                        f"Using cached Gemini response ({len(cached_text)} characters)"
+                    )
+                    tracker.end_step(
+                        {"response_length": len(cached_text), "cache": "hit"}
+                    )
+                return cached_text
+
         # Construct the API request payload
-        api_url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.gemini_model_name}:generateContent?key={self.gemini_api_key}"
+        api_url = f"{self.gemini_api_base_url}/models/{self.gemini_model_name}:generateContent?key={self.gemini_api_key}"
         payload = {
             "contents": [{"role": "user", "parts": [{"text": prompt}]}],
             **params,
@@ -516,7 +411,7 @@ class AISchedulerService:
                 tracker.log_debug("Sending request to Gemini API")
                 start_time = datetime.now()
 
-            response = requests.post(api_url, json=payload)
+            response = gemini_session().post(api_url, json=payload)
 
             if tracker:
                 duration = (datetime.now() - start_time).total_seconds()
@@ -574,13 +469,21 @@ class AISchedulerService:
                     logger.app_logger.error(error_message)
                 raise RuntimeError(error_message)
 
+            if response_cache is not None:
+                response_cache.put(key, self.gemini_model_name, generated_text)
+
             if tracker:
                 tracker.log_info(
                     f"Successfully retrieved response ({len(generated_text)} characters)"
                 )
                 tracker.log_step_data("Response Length", len(generated_text))
                 tracker.log_debug(f"Response preview: {generated_text[:200]}...")
-                tracker.end_step({"response_length": len(generated_text)})
+                tracker.end_step(
+                    {
+                        "response_length": len(generated_text),
+                        "cache": "miss" if use_cache else "bypass",
+                    }
+                )
 
             return generated_text
 
@@ -599,6 +502,62 @@ class AISchedulerService:
                 logger.app_logger.error(error_message, exc_info=True)
             raise RuntimeError(error_message) from e
 
+    def _stream_gemini_api(self, prompt, model_params=None, tracker=None, use_cache=True):
+        """Yield the Gemini response text in chunks while it is generated
+
+        Uses the ``streamGenerateContent`` endpoint. A cached response for the
+        same request is yielded as a single chunk; a completed stream is
+        added to the cache.
+        """
+        if not self.gemini_api_key:
+            raise RuntimeError("Gemini API key not configured")
+
+        params = self.default_model_params.copy()
+        if model_params:
+            params.update(model_params)
+
+        response_cache = self._get_response_cache(tracker)
+        key = cache_key(self.gemini_model_name, params, prompt)
+        if response_cache is not None and use_cache:
+            cached_text = response_cache.get(key)
+            if cached_text is not None:
+                if tracker:
+                    tracker.log_info(
+                        f"Using cached Gemini response ({len(cached_text)} characters)"
+                    )
+                yield cached_text
+                return
+
+        api_url = f"{self.gemini_api_base_url}/models/{self.gemini_model_name}:streamGenerateContent?alt=sse&key={self.gemini_api_key}"
+        payload = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            **params,
+        }
+        if tracker:
+            tracker.log_debug("Sending streaming request to Gemini API")
+
+        try:
+            response = gemini_session().post(api_url, json=payload, stream=True)
+        except requests.RequestException as e:
+            raise RuntimeError(f"Network error during Gemini API call: {str(e)}") from e
+        chunks = []
+        try:
+            if response.status_code != 200:
+                raise RuntimeError(
+                    f"Gemini API request failed with status code {response.status_code}: {response.text}"
+                )
+            for text in iter_gemini_sse_text(response.iter_lines()):
+                chunks.append(text)
+                yield text
+        except requests.RequestException as e:
+            raise RuntimeError(f"Network error during Gemini API stream: {str(e)}") from e
+        finally:
+            response.close()
+
+        generated_text = "".join(chunks)
+        if response_cache is not None and generated_text.strip():
+            response_cache.put(key, self.gemini_model_name, generated_text)
+
     def _parse_csv_response(
         self, csv_text, expected_start_date, expected_end_date, tracker=None
     ):
@@ -607,217 +566,28 @@ class AISchedulerService:
             tracker.start_step("Parse CSV Response")
             tracker.log_info(f"Parsing CSV response (length: {len(csv_text)})")
 
-        # Find the CSV content - strip out any non-CSV text
-        # Look for CSV header line
-        csv_header = "EmployeeID,Date,ShiftTemplateID,ShiftName,StartTime,EndTime"
-        if csv_header in csv_text:
-            csv_start = csv_text.find(csv_header)
-            if csv_start >= 0:
-                csv_text = csv_text[csv_start:]
-                if tracker:
-                    tracker.log_debug(f"Found CSV header at position {csv_start}")
-
-        # Trim any text after the CSV data (look for a line that doesn't contain commas)
-        lines = csv_text.split("\n")
-        end_line_index = len(lines)
-        for i, line in enumerate(lines):
-            if (
-                i > 0 and "," not in line and len(line.strip()) > 10
-            ):  # This might be text after the CSV
-                end_line_index = i
-                if tracker:
-                    tracker.log_debug(f"Found end of CSV data at line {i}")
-                break
-
-        if end_line_index < len(lines):
-            csv_text = "\n".join(lines[:end_line_index])
-
-        # Parse the CSV data
         try:
-            csv_reader = csv.reader(StringIO(csv_text))
-            header = next(csv_reader, None)
-            
-            # Handle empty CSV
-            if header is None:
+            parser = AssignmentStreamParser(
+                expected_start_date,
+                expected_end_date,
+                shift_name_for=self._generate_shift_name,
+                warn=tracker.log_warning if tracker else logger.app_logger.warning,
+            )
+            parsed_data = parser.feed(csv_text) + parser.close()
+
+            if parser.header is None:
                 if tracker:
                     tracker.log_warning("CSV response is empty or contains no header.")
                 else:
                     logger.app_logger.warning("CSV response is empty or contains no header.")
                 return []
 
-            # Verify the header matches expected format
-            expected_header = [
-                "EmployeeID",
-                "Date",
-                "ShiftTemplateID",
-                "ShiftName",
-                "StartTime",
-                "EndTime",
-            ]
-            if header != expected_header:
-                if tracker:
-                    tracker.log_warning(
-                        f"CSV header doesn't match expected format: {header}"
-                    )
-                    # Try to find the missing columns or rearrange
-                    header_map = {
-                        h.lower().replace(" ", ""): i for i, h in enumerate(header)
-                    }
-                    tracker.log_step_data("Header Map", header_map)
-                else:
-                    logger.app_logger.warning(
-                        f"CSV header doesn't match expected format: {header}"
-                    )
-
-                # We'll continue and try to map columns by name or position
-
-            parsed_data = []
-            date_format = "%Y-%m-%d"
-            row_count = 1  # Start at 1 since row 1 is the header
-            error_count = 0
-
-            for row in csv_reader:
-                row_count += 1
-                try:
-                    # Skip empty rows
-                    if not row or not any(row):
-                        continue
-
-                    # If header doesn't match expected, try to map columns intelligently
-                    if header != expected_header:
-                        mapped_row = [""] * len(expected_header)
-                        for exp_idx, exp_col in enumerate(expected_header):
-                            exp_col_lower = exp_col.lower().replace(" ", "")
-                            # Try to find this column in the header
-                            if exp_col_lower in header_map:
-                                actual_idx = header_map[exp_col_lower]
-                                if actual_idx < len(row):
-                                    mapped_row[exp_idx] = row[actual_idx]
-                        row = mapped_row
-
-                    # Ensure row has enough columns
-                    if len(row) < 6:
-                        if tracker:
-                            tracker.log_warning(
-                                f"Row {row_count} has insufficient columns: {row}"
-                            )
-                        else:
-                            logger.app_logger.warning(
-                                f"Row {row_count} has insufficient columns: {row}"
-                            )
-                        error_count += 1
-                        continue
-
-                    # Extract and validate data
-                    employee_id = int(row[0].strip())
-                    date_str = row[1].strip()
-                    shift_template_id = int(row[2].strip())
-                    shift_name = row[3].strip()
-                    start_time = row[4].strip()
-                    end_time = row[5].strip()
-
-                    # Validate IDs
-                    if employee_id <= 0:
-                        if tracker:
-                            tracker.log_warning(
-                                f"Row {row_count}: Invalid EmployeeID {employee_id}. Must be > 0. Row: {row}"
-                            )
-                        else:
-                            logger.app_logger.warning(
-                                f"Row {row_count}: Invalid EmployeeID {employee_id}. Must be > 0. Row: {row}"
-                            )
-                        error_count += 1
-                        continue
-
-                    if shift_template_id <= 0:
-                        if tracker:
-                            tracker.log_warning(
-                                f"Row {row_count}: Invalid ShiftTemplateID {shift_template_id}. Must be > 0. Row: {row}"
-                            )
-                        else:
-                            logger.app_logger.warning(
-                                f"Row {row_count}: Invalid ShiftTemplateID {shift_template_id}. Must be > 0. Row: {row}"
-                            )
-                        error_count += 1
-                        continue
-
-                    # Validate date format
-                    try:
-                        schedule_date = datetime.strptime(date_str, date_format).date()
-                        # Check if date is within expected range
-                        if (
-                            schedule_date < expected_start_date
-                            or schedule_date > expected_end_date
-                        ):
-                            if tracker:
-                                tracker.log_warning(
-                                    f"Row {row_count}: Assignment date {date_str} out of range. Row: {row}"
-                                )
-                            else:
-                                logger.app_logger.warning(
-                                    f"Row {row_count}: Assignment date {date_str} out of range. Row: {row}"
-                                )
-                            error_count += 1
-                            continue
-                    except ValueError:
-                        if tracker:
-                            tracker.log_warning(
-                                f"Row {row_count}: Invalid date format: {date_str}"
-                            )
-                        else:
-                            logger.app_logger.warning(
-                                f"Row {row_count}: Invalid date format: {date_str}"
-                            )
-                        error_count += 1
-                        continue
-
-                    # Validate shift name (generate if empty since we simplified the data)
-                    if not shift_name or shift_name.strip() == "":
-                        # Generate a name from the shift template data
-                        shift_name = self._generate_shift_name(shift_template_id, start_time, end_time)
-                        if tracker:
-                            tracker.log_info(
-                                f"Row {row_count}: Generated shift name '{shift_name}' for empty ShiftName"
-                            )
-                        else:
-                            logger.app_logger.info(
-                                "Row %d: Generated shift name '%s' for empty ShiftName", row_count, shift_name
-                            )
-
-                    # Create a structured record for each assignment
-                    assignment = {
-                        "employee_id": employee_id,
-                        "date": schedule_date,
-                        "shift_template_id": shift_template_id,
-                        "shift_name_from_ai": shift_name,
-                        "start_time": start_time,
-                        "end_time": end_time,
-                    }
-
-                    parsed_data.append(assignment)
-
-                except Exception as e:
-                    error_count += 1
-                    if tracker:
-                        tracker.log_warning(f"Error parsing row {row_count}: {str(e)}")
-                        tracker.log_step_data(f"Problem Row {row_count}", row)
-                    else:
-                        logger.app_logger.warning(
-                            f"Error parsing row {row_count}: {str(e)}"
-                        )
-
+            row_count, error_count = parser.row_count, parser.error_count
             if tracker:
                 tracker.log_info(
                     f"Parsed {len(parsed_data)} valid assignments from {row_count} rows with {error_count} errors"
                 )
-                tracker.log_step_data(
-                    "Parsing Stats",
-                    {
-                        "total_rows": row_count,
-                        "valid_assignments": len(parsed_data),
-                        "error_count": error_count,
-                    },
-                )
+                tracker.log_step_data("Parsing Stats", parser.stats)
                 tracker.end_step(
                     {"assignment_count": len(parsed_data), "error_count": error_count}
                 )
@@ -841,6 +611,45 @@ class AISchedulerService:
                 logger.app_logger.error(error_message, exc_info=True)
             raise RuntimeError(error_message) from e
 
+    def _clear_assignments(
+        self, version_id, schedule_start_date, schedule_end_date, tracker=None
+    ):
+        """Delete the version's assignments in the date range (not committed)"""
+        # Clear existing assignments for this version within the date range if version_id is provided
+        if version_id is not None:
+            # Using a filter approach that avoids the ambiguous class access issues
+            # We'll use string column names for filtering to avoid the linter errors
+            query = db.session.query(Schedule)
+
+            # Build criteria with column names as strings
+            if version_id is not None:
+                query = query.filter(getattr(Schedule, "version") == version_id)
+            if schedule_start_date is not None:
+                query = query.filter(getattr(Schedule, "date") >= schedule_start_date)
+            if schedule_end_date is not None:
+                query = query.filter(getattr(Schedule, "date") <= schedule_end_date)
+
+            # Execute the delete
+            delete_count = query.delete(synchronize_session="fetch")
+
+            if tracker:
+                tracker.log_info(
+                    f"Cleared {delete_count} existing assignments for version {version_id}"
+                )
+            else:
+                logger.app_logger.info(
+                    f"Cleared {delete_count} existing assignments for version {version_id} within the date range."
+                )
+        else:
+            if tracker:
+                tracker.log_info(
+                    "No version_id provided. Not clearing existing assignments."
+                )
+            else:
+                logger.app_logger.info(
+                    "version_id is None. Not clearing existing assignments."
+                )
+
     def _store_assignments(
         self,
         parsed_assignments,
@@ -857,77 +666,35 @@ class AISchedulerService:
             )
 
         try:
-            # Clear existing assignments for this version within the date range if version_id is provided
-            if version_id is not None:
-                # Using a filter approach that avoids the ambiguous class access issues
-                # We'll use string column names for filtering to avoid the linter errors
-                query = db.session.query(Schedule)
-
-                # Build criteria with column names as strings
-                if version_id is not None:
-                    query = query.filter(getattr(Schedule, "version") == version_id)
-                if schedule_start_date is not None:
-                    query = query.filter(
-                        getattr(Schedule, "date") >= schedule_start_date
-                    )
-                if schedule_end_date is not None:
-                    query = query.filter(getattr(Schedule, "date") <= schedule_end_date)
-
-                # Execute the delete
-                delete_count = query.delete(synchronize_session="fetch")
-
-                if tracker:
-                    tracker.log_info(
-                        f"Cleared {delete_count} existing assignments for version {version_id}"
-                    )
-                else:
-                    logger.app_logger.info(
-                        f"Cleared {delete_count} existing assignments for version {version_id} within the date range."
-                    )
-            else:
-                if tracker:
-                    tracker.log_info(
-                        "No version_id provided. Not clearing existing assignments."
-                    )
-                else:
-                    logger.app_logger.info(
-                        "version_id is None. Not clearing existing assignments."
-                    )
-
-            new_assignments = []
-            for assignment_data in parsed_assignments:
-                # Map parsed data to Schedule model attributes
-                # Ensure column names match your Schedule model exactly
-                new_assignment = Schedule(
-                    employee_id=assignment_data["employee_id"],
-                    date=assignment_data["date"],
-                    shift_id=assignment_data[
-                        "shift_template_id"
-                    ],  # Use shift_id based on likely schema
-                    # Assuming Schedule model has these columns or they are derivable/not needed directly from AI output
-                    # shift_name=assignment_data["shift_name_from_ai"], # If Schedule has shift_name
-                    # start_time=assignment_data["start_time"], # If Schedule has start_time
-                    # end_time=assignment_data["end_time"], # If Schedule has end_time
-                    version=version_id,  # Use version based on likely schema
-                    # Add other Schedule model attributes as needed, e.g., created_at, updated_at
-                )
-                new_assignments.append(new_assignment)
+            self._clear_assignments(
+                version_id, schedule_start_date, schedule_end_date, tracker
+            )
 
-            # Add all new assignments and commit
-            db.session.bulk_save_objects(new_assignments)
+            # Insert in bulk within the same transaction as the delete above
+            write_result = write_schedules(
+                db.session,
+                parsed_assignments,
+                default_version=version_id if version_id is not None else 1,
+                # New Schedule rows have always started as drafts here
+                default_status=ScheduleStatus.DRAFT,
+            )
             db.session.commit()
 
             if tracker:
                 tracker.log_info(
-                    f"Successfully stored {len(new_assignments)} new assignments"
+                    f"Successfully stored {write_result.rows} new assignments "
+                    f"({write_result.rows_per_second:.0f} rows/s)"
+                )
+                tracker.end_step(
+                    {"assignments_stored": write_result.rows, **write_result.to_dict()}
                 )
-                tracker.end_step({"assignments_stored": len(new_assignments)})
             else:
                 logger.app_logger.info(
-                    f"Successfully stored {len(new_assignments)} new assignments"
+                    f"Successfully stored {write_result.rows} new assignments "
+                    f"({write_result.rows_per_second:.0f} rows/s)"
                 )
 
-            return {"status": "success", "count": len(new_assignments)}
+            return {"status": "success", "count": write_result.rows}
 
         except SQLAlchemyError as e:
             db.session.rollback()
@@ -947,7 +714,15 @@ class AISchedulerService:
             raise RuntimeError(error_message) from e
 
     def generate_schedule_via_ai(
-        self, start_date_str, end_date_str, version_id=None, ai_model_params=None
+        self,
+        start_date_str,
+        end_date_str,
+        version_id=None,
+        ai_model_params=None,
+        use_cache=True,
+        windowed=False,
+        providers=None,
+        window_concurrency=DEFAULT_WINDOW_CONCURRENCY,
     ):
         """
         Generate a schedule using AI (Gemini) with detailed diagnostics
@@ -957,10 +732,26 @@ class AISchedulerService:
             end_date_str: End date in 'YYYY-MM-DD' format
             version_id: Optional version ID for the schedule
             ai_model_params: Optional parameters for the AI model
+            use_cache: Set to False to bypass cached model responses
+            windowed: Generate week by week with concurrent requests, see
+                generate_schedule_via_ai_windowed()
+            providers: Windowed mode only, the AI providers to use
+            window_concurrency: Windowed mode only, requests in flight per provider
 
         Returns:
             dict: Result of the generation process
         """
+        if windowed:
+            return self.generate_schedule_via_ai_windowed(
+                start_date_str,
+                end_date_str,
+                version_id=version_id,
+                ai_model_params=ai_model_params,
+                use_cache=use_cache,
+                providers=providers,
+                concurrency=window_concurrency,
+            )
+
         # Initialize process tracker for diagnostics
         tracker = self._initialize_process_tracker("AI Schedule Generation")
         tracker.log_info(
@@ -1030,7 +821,9 @@ class AISchedulerService:
 
         # 3. Call the Gemini API
         try:
-            ai_response = self._call_gemini_api(system_prompt, ai_model_params, tracker)
+            ai_response = self._call_gemini_api(
+                system_prompt, ai_model_params, tracker, use_cache=use_cache
+            )
             generation_metrics["response_length"] = len(ai_response)
         except Exception as e:
             tracker.log_error(f"Failed to get response from Gemini API: {e}")
@@ -1097,6 +890,352 @@ class AISchedulerService:
                 "generated_assignments_count": 0,
             }
 
+    def _previous_day_assignments(self, version_id, day):
+        """Stored assignments of ``version_id`` on ``day``, as prompt context"""
+        if version_id is None:
+            return []
+        rows = (
+            db.session.query(Schedule)
+            .filter(
+                Schedule.version == version_id,
+                Schedule.date >= day,
+                Schedule.date < day + timedelta(days=1),
+                Schedule.shift_id.isnot(None),
+            )
+            .order_by(Schedule.employee_id)
+            .all()
+        )
+        return [
+            {
+                "employee_id": row.employee_id,
+                "shift_template_id": row.shift_id,
+                "start_time": row.shift_start,
+                "end_time": row.shift_end,
+            }
+            for row in rows
+        ]
+
+    def generate_schedule_via_ai_windowed(
+        self,
+        start_date_str,
+        end_date_str,
+        version_id=None,
+        ai_model_params=None,
+        use_cache=True,
+        providers=None,
+        concurrency=DEFAULT_WINDOW_CONCURRENCY,
+    ):
+        """
+        Generate a schedule week by week with concurrent model requests
+
+        The range is split into weekly windows, each with its own prompt data
+        and boundary context (see services/ai_windowed_generation.py). The
+        parsed windows are merged, checked with the ScheduleValidator and
+        stored together; validation findings are returned, not enforced.
+
+        Args:
+            providers: AI providers keyed by AIProvider, defaults to the
+                service's Gemini call
+            concurrency: Requests in flight per provider (int or dict)
+
+        Returns:
+            dict: Result of the generation process, with per-window details
+        """
+        tracker = self._initialize_process_tracker("AI Schedule Generation (windowed)")
+        try:
+            start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+            end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
+        except ValueError as e:
+            tracker.log_error(f"Invalid date format provided: {e}")
+            tracker.end_process({"status": "failed", "reason": "invalid_date_format"})
+            raise ValueError("Invalid date format. Use YYYY-MM-DD.") from e
+        if start_date > end_date:
+            tracker.log_warning(
+                f"Start date ({start_date_str}) is after end date ({end_date_str}). Swapping dates."
+            )
+            start_date, end_date = end_date, start_date
+
+        if providers is None:
+            providers = {
+                AIProvider.GEMINI: SchedulerGeminiProvider(
+                    self, ai_model_params, use_cache=use_cache
+                )
+            }
+        generation_config = (ai_model_params or {}).get("generationConfig", {})
+        windows = weekly_windows(start_date, end_date)
+        tracker.log_info(
+            f"Generating {start_date} to {end_date} in {len(windows)} weekly windows"
+        )
+
+        # 1. One reduced prompt per window
+        try:
+            requests_by_window = []
+            for index, (window_start, window_end) in enumerate(windows):
+                collected_data_text = self._collect_data_for_ai_prompt(
+                    window_start, window_end, tracker
+                )
+                previous_day = window_start - timedelta(days=1)
+                collected_data_text = add_boundary_context(
+                    collected_data_text,
+                    (window_start, window_end),
+                    (start_date, end_date),
+                    index,
+                    len(windows),
+                    # Earlier windows are generated concurrently, so only the
+                    # day before the whole range has known assignments
+                    self._previous_day_assignments(version_id, previous_day)
+                    if index == 0
+                    else [],
+                )
+                prompt = self._generate_system_prompt(
+                    window_start, window_end, collected_data_text, tracker
+                )
+                requests_by_window.append(
+                    AIRequest(
+                        conversation_id=f"{self.session_id}-w{index + 1}",
+                        prompt=prompt,
+                        max_tokens=generation_config.get("maxOutputTokens"),
+                        temperature=generation_config.get("temperature", 0.6),
+                        metadata={
+                            "window": index,
+                            "start_date": window_start.isoformat(),
+                            "end_date": window_end.isoformat(),
+                        },
+                    )
+                )
+        except Exception as e:
+            tracker.log_error(f"Failed to prepare window prompts: {e}")
+            tracker.end_process({"status": "failed", "reason": "prompt_generation_failed"})
+            raise RuntimeError(f"Failed to prepare window prompts: {e}") from e
+
+        # 2. Dispatch the windows concurrently
+        tracker.start_step("Call AI Providers")
+        started_at = time.perf_counter()
+        responses = run_windows(requests_by_window, providers, concurrency)
+        failed = [r for r in responses if not r.ok]
+        tracker.end_step(
+            {
+                "windows": len(responses),
+                "failed": len(failed),
+                "seconds": round(time.perf_counter() - started_at, 3),
+            }
+        )
+        if failed:
+            details = "; ".join(
+                f"{r.request.metadata['start_date']}: {', '.join(r.errors)}"
+                for r in failed
+            )
+            tracker.log_error(f"AI requests failed for {len(failed)} windows: {details}")
+            tracker.end_process({"status": "failed", "reason": "ai_call_failed"})
+            raise RuntimeError(f"Failed to get AI responses for {len(failed)} windows: {details}")
+
+        # 3. Parse each window and merge
+        snapshot = resource_cache.snapshot()
+        assignment_validator = AssignmentValidator(snapshot)
+        merged, seen, window_details = [], set(), []
+        tracker.start_step("Parse Window Responses")
+        for (window_start, window_end), result in zip(windows, responses):
+            parser = AssignmentStreamParser(
+                window_start,
+                window_end,
+                validator=assignment_validator,
+                shift_name_for=self._generate_shift_name,
+                warn=tracker.log_warning,
+            )
+            assignments = parser.feed(result.response.content) + parser.close()
+            for assignment in assignments:
+                key = (
+                    assignment["employee_id"],
+                    assignment["date"],
+                    assignment["shift_template_id"],
+                )
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(assignment)
+            window_details.append(
+                {
+                    "start_date": window_start.isoformat(),
+                    "end_date": window_end.isoformat(),
+                    "provider": result.provider,
+                    "seconds": round(result.seconds, 3),
+                    "retries": len(result.errors),
+                    "parsing": parser.stats,
+                }
+            )
+        tracker.end_step({"assignments": len(merged), "windows": len(windows)})
+
+        # 4. Validate the merged schedule, including rules across window borders
+        tracker.start_step("Validate Merged Schedule")
+        resources = SnapshotScheduleResources(snapshot)
+        resources.load()
+        validator = ScheduleValidator(resources, engine="matrix")
+        validation_errors = validator.validate(
+            validation_entries(merged, assignment_validator.shifts)
+        )
+        validation = {
+            "valid": not validation_errors,
+            "errors": [
+                {
+                    "type": error.error_type,
+                    "message": error.message,
+                    "severity": error.severity,
+                    "details": error.details or {},
+                }
+                for error in validation_errors
+            ],
+        }
+        tracker.end_step({"validation_errors": len(validation_errors)})
+
+        # 5. Store the merged assignments
+        store_result = self._store_assignments(
+            merged, version_id, start_date, end_date, tracker
+        )
+        count = store_result.get("count", 0)
+        tracker.end_process(
+            {
+                "start_date": start_date_str,
+                "end_date": end_date_str,
+                "windows": len(windows),
+                "assignments_stored": count,
+                "validation_errors": len(validation_errors),
+            }
+        )
+        return {
+            "status": "success",
+            "message": f"Schedule generated in {len(windows)} windows and stored successfully. {count} assignments created.",
+            "generated_assignments_count": count,
+            "windows": window_details,
+            "validation": validation,
+            "session_id": self.session_id,
+            "diagnostic_log": self.diagnostic_log_path,
+            "version": version_id,
+            "start_date": start_date_str,
+            "end_date": end_date_str,
+        }
+
+    def generate_schedule_via_ai_stream(
+        self,
+        start_date_str,
+        end_date_str,
+        version_id=None,
+        ai_model_params=None,
+        use_cache=True,
+        batch_size=STREAM_BATCH_SIZE,
+    ):
+        """
+        Generate a schedule using AI, storing assignments while the response streams
+
+        Rows are parsed and validated against the scheduler resources as they
+        arrive and inserted every ``batch_size`` valid assignments. Everything
+        is committed once the response is complete.
+
+        Yields:
+            dict: ``started``, ``progress`` (after each stored batch) and
+            finally ``completed`` or ``error`` events
+        """
+        tracker = self._initialize_process_tracker("AI Schedule Generation (streaming)")
+        started_at = time.perf_counter()
+        try:
+            start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+            end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
+        except ValueError:
+            tracker.end_process({"status": "failed", "reason": "invalid_date_format"})
+            yield {"event": "error", "message": "Invalid date format. Use YYYY-MM-DD."}
+            return
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+
+        progress = {
+            "rows": 0,
+            "assignments": 0,
+            "stored": 0,
+            "errors": 0,
+            "first_assignment_seconds": None,
+        }
+        yield {
+            "event": "started",
+            "session_id": self.session_id,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+        }
+
+        try:
+            collected_data_text = self._collect_data_for_ai_prompt(
+                start_date, end_date, tracker
+            )
+            system_prompt = self._generate_system_prompt(
+                start_date, end_date, collected_data_text, tracker
+            )
+            validator = AssignmentValidator(resource_cache.snapshot())
+            parser = AssignmentStreamParser(
+                start_date,
+                end_date,
+                validator=validator,
+                shift_name_for=self._generate_shift_name,
+                warn=tracker.log_warning,
+            )
+
+            tracker.start_step("Stream and Store Assignments")
+            self._clear_assignments(version_id, start_date, end_date, tracker)
+            default_version = version_id if version_id is not None else 1
+            pending = []
+
+            def store(batch):
+                result = write_schedules(
+                    db.session,
+                    batch,
+                    templates=validator.shifts,
+                    default_version=default_version,
+                    default_status=ScheduleStatus.DRAFT,
+                )
+                progress["stored"] += result.rows
+                progress["rows"] = parser.row_count
+                progress["errors"] = parser.error_count
+                return {"event": "progress", **progress}
+
+            for chunk in self._stream_gemini_api(
+                system_prompt, ai_model_params, tracker, use_cache=use_cache
+            ):
+                assignments = parser.feed(chunk)
+                if assignments and progress["first_assignment_seconds"] is None:
+                    progress["first_assignment_seconds"] = round(
+                        time.perf_counter() - started_at, 3
+                    )
+                progress["assignments"] += len(assignments)
+                pending.extend(assignments)
+                if len(pending) >= batch_size:
+                    yield store(pending)
+                    pending = []
+
+            pending.extend(parser.close())
+            progress["assignments"] = parser.valid_count
+            if pending:
+                yield store(pending)
+            db.session.commit()
+
+            tracker.end_step({"assignments_stored": progress["stored"], **parser.stats})
+            tracker.end_process(
+                {"start_date": start_date_str, "end_date": end_date_str, **progress}
+            )
+            yield {
+                "event": "completed",
+                "status": "success",
+                "message": f"Schedule generated and stored successfully. {progress['stored']} assignments created.",
+                "generated_assignments_count": progress["stored"],
+                "parsing": parser.stats,
+                "session_id": self.session_id,
+                "diagnostic_log": self.diagnostic_log_path,
+                "version": version_id,
+                "start_date": start_date_str,
+                "end_date": end_date_str,
+                "seconds": round(time.perf_counter() - started_at, 3),
+            }
+        except Exception as e:
+            db.session.rollback()
+            tracker.log_error(f"Streaming AI schedule generation failed: {e}")
+            tracker.end_process({"status": "failed", "reason": str(e)})
+            yield {"event": "error", "message": str(e), **progress}
+
     def process_feedback(self, feedback_data: AIScheduleFeedbackRequest):
         """
         Processes user feedback on AI-generated schedules.
@@ -0,0 +1,256 @@
+"""Incremental parsing and validation of AI schedule responses.
+
+``AISchedulerService._parse_csv_response`` used to wait for the complete
+model output, split it into lines and only then validate the rows. With
+``AssignmentStreamParser`` the response is fed in chunks as it arrives.
+Every complete line is parsed and validated on the spot, and valid
+assignments are returned right away, so they can be stored in batches
+while the model is still writing:
+
+    parser = AssignmentStreamParser(start_date, end_date, validator)
+    for chunk in chunks:
+        store(parser.feed(chunk))
+    store(parser.close())
+
+Only the unfinished last line is buffered. A malformed row is counted and
+skipped, and text after the CSV block ends the parse, so a broken tail no
+longer costs the rows before it.
+
+``AssignmentValidator`` checks rows against a scheduler ``ResourceSnapshot``
+(see ``scheduler/resource_cache.py``): the employee and the shift template
+must exist, and the employee must not be absent on that day.
+"""
+
+import csv
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.backend.services.scheduler.absence_index import AbsenceIndex
+
+EXPECTED_HEADER = [
+    "EmployeeID",
+    "Date",
+    "ShiftTemplateID",
+    "ShiftName",
+    "StartTime",
+    "EndTime",
+]
+CSV_HEADER = ",".join(EXPECTED_HEADER)
+DATE_FORMAT = "%Y-%m-%d"
+
+
+class AssignmentValidator:
+    """Checks parsed assignments against the loaded scheduler resources"""
+
+    def __init__(self, snapshot):
+        self.employee_ids = {employee.id for employee in snapshot.employees}
+        self.shifts = {shift.id: shift for shift in snapshot.shifts}
+        self.absence_index = AbsenceIndex(snapshot.absences)
+
+    def check(self, assignment: Dict[str, Any]) -> Optional[str]:
+        """Why the assignment is rejected, or None if it is valid"""
+        employee_id = assignment["employee_id"]
+        if employee_id not in self.employee_ids:
+            return f"Unknown or inactive employee {employee_id}"
+        if assignment["shift_template_id"] not in self.shifts:
+            return f"Unknown shift template {assignment['shift_template_id']}"
+        if self.absence_index.is_absent(employee_id, assignment["date"]):
+            return f"Employee {employee_id} is absent on {assignment['date']}"
+        return None
+
+    def shift_name(self, shift_template_id: int) -> Optional[str]:
+        shift = self.shifts.get(shift_template_id)
+        return shift.name if shift is not None else None
+
+
+class AssignmentStreamParser:
+    """Turns chunks of CSV text into validated assignment dicts.
+
+    Args:
+        start_date, end_date: Assignments outside this range are rejected.
+        validator: Optional ``AssignmentValidator`` for resource checks.
+        shift_name_for: Called with (shift template id, start, end) to name
+            rows with an empty ShiftName.
+        warn: Called with a message for every skipped row.
+    """
+
+    def __init__(
+        self,
+        start_date,
+        end_date,
+        validator: Optional[AssignmentValidator] = None,
+        shift_name_for: Optional[Callable[[int, str, str], str]] = None,
+        warn: Optional[Callable[[str], None]] = None,
+    ):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.validator = validator
+        self.shift_name_for = shift_name_for
+        self.warn = warn
+        self.header: Optional[List[str]] = None
+        self.header_map: Dict[str, int] = {}
+        self.finished = False
+        self.row_count = 0  # CSV lines including the header, as before
+        self.valid_count = 0
+        self.error_count = 0
+        self.rejected_count = 0
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Parse the complete lines in ``chunk`` (plus the buffered rest)"""
+        if self.finished or not chunk:
+            return []
+        self._buffer += chunk
+        assignments: List[Dict[str, Any]] = []
+        while not self.finished:
+            newline = self._buffer.find("\n")
+            if newline < 0:
+                break
+            line, self._buffer = self._buffer[:newline], self._buffer[newline + 1 :]
+            assignment = self._line(line.rstrip("\r"))
+            if assignment is not None:
+                assignments.append(assignment)
+        return assignments
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Parse the last line, which has no trailing newline"""
+        line, self._buffer = self._buffer, ""
+        if self.finished or not line.strip():
+            return []
+        assignment = self._line(line.rstrip("\r"))
+        return [assignment] if assignment is not None else []
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "total_rows": self.row_count,
+            "valid_assignments": self.valid_count,
+            "error_count": self.error_count,
+            "rejected_count": self.rejected_count,
+        }
+
+    def _skip(self, message: str) -> None:
+        self.error_count += 1
+        if self.warn:
+            self.warn(message)
+
+    def _line(self, line: str) -> Optional[Dict[str, Any]]:
+        if self.header is None:
+            return self._header_line(line)
+        if "," not in line and len(line.strip()) > 10:
+            # Text after the CSV data
+            self.finished = True
+            return None
+        self.row_count += 1
+        row = next(csv.reader([line]), [])
+        if not row or not any(row):
+            return None
+        try:
+            return self._row(row)
+        except Exception as e:
+            self._skip(f"Error parsing row {self.row_count}: {str(e)}")
+            return None
+
+    def _header_line(self, line: str) -> None:
+        """Find the header; text before it (e.g. an introduction) is skipped"""
+        if CSV_HEADER in line:
+            self.header = list(EXPECTED_HEADER)
+        elif line.count(",") >= len(EXPECTED_HEADER) - 1:
+            self.header = next(csv.reader([line]))
+            self.header_map = {
+                h.lower().replace(" ", ""): i for i, h in enumerate(self.header)
+            }
+            if self.warn:
+                self.warn(f"CSV header doesn't match expected format: {self.header}")
+        else:
+            return None
+        self.row_count = 1
+        return None
+
+    def _row(self, row: List[str]) -> Optional[Dict[str, Any]]:
+        if self.header != EXPECTED_HEADER:
+            # Map the columns by name
+            mapped_row = [""] * len(EXPECTED_HEADER)
+            for exp_idx, exp_col in enumerate(EXPECTED_HEADER):
+                actual_idx = self.header_map.get(exp_col.lower())
+                if actual_idx is not None and actual_idx < len(row):
+                    mapped_row[exp_idx] = row[actual_idx]
+            row = mapped_row
+
+        if len(row) < 6:
+            self._skip(f"Row {self.row_count} has insufficient columns: {row}")
+            return None
+
+        employee_id = int(row[0].strip())
+        date_str = row[1].strip()
+        shift_template_id = int(row[2].strip())
+        shift_name = row[3].strip()
+        start_time = row[4].strip()
+        end_time = row[5].strip()
+
+        if employee_id <= 0:
+            self._skip(
+                f"Row {self.row_count}: Invalid EmployeeID {employee_id}. Must be > 0. Row: {row}"
+            )
+            return None
+        if shift_template_id <= 0:
+            self._skip(
+                f"Row {self.row_count}: Invalid ShiftTemplateID {shift_template_id}. Must be > 0. Row: {row}"
+            )
+            return None
+        try:
+            schedule_date = datetime.strptime(date_str, DATE_FORMAT).date()
+        except ValueError:
+            self._skip(f"Row {self.row_count}: Invalid date format: {date_str}")
+            return None
+        if schedule_date < self.start_date or schedule_date > self.end_date:
+            self._skip(
+                f"Row {self.row_count}: Assignment date {date_str} out of range. Row: {row}"
+            )
+            return None
+
+        assignment = {
+            "employee_id": employee_id,
+            "date": schedule_date,
+            "shift_template_id": shift_template_id,
+            "shift_name_from_ai": shift_name,
+            "start_time": start_time,
+            "end_time": end_time,
+        }
+        if self.validator is not None:
+            reason = self.validator.check(assignment)
+            if reason is not None:
+                self.rejected_count += 1
+                self._skip(f"Row {self.row_count}: {reason}. Row: {row}")
+                return None
+
+        if not shift_name:
+            if self.validator is not None:
+                shift_name = self.validator.shift_name(shift_template_id) or ""
+            if not shift_name and self.shift_name_for is not None:
+                shift_name = self.shift_name_for(
+                    shift_template_id, start_time, end_time
+                )
+            assignment["shift_name_from_ai"] = shift_name
+
+        self.valid_count += 1
+        return assignment
+
+
+def iter_gemini_sse_text(lines: Iterable[Any]) -> Iterator[str]:
+    """Text chunks of a ``streamGenerateContent?alt=sse`` response.
+
+    ``lines`` are the raw SSE lines (bytes or str), e.g. from
+    ``response.iter_lines()``.
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.startswith("data:"):
+            continue
+        data = json.loads(line[len("data:") :].strip())
+        for candidate in data.get("candidates", [])[:1]:
+            for part in candidate.get("content", {}).get("parts", []):
+                if part.get("text"):
+                    yield part["text"]
@@ -0,0 +1,227 @@
+"""Rolling per-model latency, reliability and throughput telemetry.
+
+``AIOrchestrator`` used to rank models by the static ``response_time_avg``,
+``cost_per_token`` and ``quality_score`` values of their ``ModelInfo``, so a
+provider that slowed down at peak times kept receiving the same share of
+requests. Every completed request is now recorded here (by
+``AIOrchestrator._log_metrics``, or at the end of a stream, without a token
+count) and every failed one by the orchestrator's error paths. Per model the
+store keeps:
+
+* an exponentially weighted moving average (EWMA) of the latency and of the
+  output rate in tokens per second, which follow a slowdown within a few
+  requests,
+* the latencies and outcomes of the last ``window`` requests, for the p95
+  latency and the error rate,
+* totals of requests, errors, tokens and cost.
+
+``live(model_id)`` only returns stats backed by at least ``min_samples``
+requests, the latest of them within ``stale_after`` seconds. Otherwise the
+selection falls back to the static ``ModelInfo`` values. That way a model
+that was avoided while slow gets traffic again once its numbers are stale,
+and its recovery is measured.
+
+    model_telemetry.record("gemini-1.5-flash", latency=1.2, tokens=800)
+    stats = model_telemetry.live("gemini-1.5-flash")
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Deque, Dict, Optional
+
+DEFAULT_ALPHA = 0.3
+DEFAULT_WINDOW = 100
+DEFAULT_MIN_SAMPLES = 3
+DEFAULT_STALE_AFTER_SECONDS = 900.0
+# Error rate used when estimating the time to a successful response
+MAX_ERROR_RATE = 0.9
+
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+@dataclass
+class ModelStats:
+    """Rolling numbers of one model"""
+
+    model_id: str
+    provider: Optional[str] = None
+    window: int = DEFAULT_WINDOW
+    ewma_latency: Optional[float] = None
+    ewma_tokens_per_second: Optional[float] = None
+    requests: int = 0
+    errors: int = 0
+    tokens: int = 0
+    cost: float = 0.0
+    last_seen: float = 0.0
+    latencies: Deque[float] = field(default_factory=deque)
+    outcomes: Deque[bool] = field(default_factory=deque)
+
+    def __post_init__(self):
+        self.latencies = deque(self.latencies, maxlen=self.window)
+        self.outcomes = deque(self.outcomes, maxlen=self.window)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def p95_latency(self) -> float:
+        return _percentile(self.latencies, 0.95)
+
+    @property
+    def cost_per_token(self) -> Optional[float]:
+        return self.cost / self.tokens if self.tokens else None
+
+    def expected_latency(self, default: Optional[float] = None) -> Optional[float]:
+        """EWMA latency stretched by the retries that errors cause.
+
+        ``default`` stands in for the EWMA while only errors were recorded.
+        """
+        latency = self.ewma_latency if self.ewma_latency is not None else default
+        if latency is None:
+            return None
+        return latency / (1.0 - min(self.error_rate, MAX_ERROR_RATE))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "model_id": self.model_id,
+            "provider": self.provider,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 3),
+            "ewma_latency": (
+                round(self.ewma_latency, 3) if self.ewma_latency is not None else None
+            ),
+            "p95_latency": round(self.p95_latency, 3),
+            "expected_latency": (
+                round(self.expected_latency(), 3)
+                if self.ewma_latency is not None
+                else None
+            ),
+            "tokens_per_second": (
+                round(self.ewma_tokens_per_second, 1)
+                if self.ewma_tokens_per_second is not None
+                else None
+            ),
+            "tokens": self.tokens,
+            "cost": round(self.cost, 6),
+            "last_seen": self.last_seen,
+        }
+
+
+class ModelTelemetry:
+    """Thread-safe store of ``ModelStats`` keyed by model id"""
+
+    def __init__(
+        self,
+        alpha: float = DEFAULT_ALPHA,
+        window: int = DEFAULT_WINDOW,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        stale_after: float = DEFAULT_STALE_AFTER_SECONDS,
+    ):
+        self.alpha = alpha
+        self.window = window
+        self.min_samples = min_samples
+        self.stale_after = stale_after
+        self._models: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, model_id: str, provider: Optional[str]) -> ModelStats:
+        stats = self._models.get(model_id)
+        if stats is None:
+            stats = self._models[model_id] = ModelStats(
+                model_id=model_id, provider=provider, window=self.window
+            )
+        elif provider and not stats.provider:
+            stats.provider = provider
+        return stats
+
+    def _ewma(self, current: Optional[float], value: float) -> float:
+        if current is None:
+            return value
+        return self.alpha * value + (1.0 - self.alpha) * current
+
+    def record(
+        self,
+        model_id: str,
+        latency: Optional[float],
+        tokens: int = 0,
+        cost: float = 0.0,
+        provider: Optional[str] = None,
+    ) -> None:
+        """Record a successful request"""
+        with self._lock:
+            stats = self._stats(model_id, provider)
+            stats.requests += 1
+            stats.tokens += tokens or 0
+            stats.cost += cost or 0.0
+            stats.outcomes.append(True)
+            stats.last_seen = time.time()
+            if latency is not None and latency > 0:
+                stats.latencies.append(latency)
+                stats.ewma_latency = self._ewma(stats.ewma_latency, latency)
+                if tokens:
+                    stats.ewma_tokens_per_second = self._ewma(
+                        stats.ewma_tokens_per_second, tokens / latency
+                    )
+
+    def record_error(
+        self,
+        model_id: str,
+        latency: Optional[float] = None,
+        provider: Optional[str] = None,
+    ) -> None:
+        """Record a failed request. A latency is only used for the p95,
+        since a failure says little about how fast the model answers."""
+        with self._lock:
+            stats = self._stats(model_id, provider)
+            stats.requests += 1
+            stats.errors += 1
+            stats.outcomes.append(False)
+            stats.last_seen = time.time()
+            if latency is not None and latency > 0:
+                stats.latencies.append(latency)
+
+    def live(self, model_id: str) -> Optional[ModelStats]:
+        """The model's stats if there are enough recent samples, else None"""
+        with self._lock:
+            stats = self._models.get(model_id)
+            if (
+                stats is None
+                or len(stats.outcomes) < self.min_samples
+                or time.time() - stats.last_seen > self.stale_after
+            ):
+                return None
+            # A copy, so callers can read it without holding the lock
+            return replace(stats)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "models": {
+                    model_id: stats.to_dict()
+                    for model_id, stats in sorted(self._models.items())
+                },
+                "settings": {
+                    "alpha": self.alpha,
+                    "window": self.window,
+                    "min_samples": self.min_samples,
+                    "stale_after": self.stale_after,
+                },
+            }
+
+
+model_telemetry = ModelTelemetry()
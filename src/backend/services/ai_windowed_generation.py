@@ -0,0 +1,228 @@
+"""Windowed, concurrent AI schedule generation.
+
+``AISchedulerService.generate_schedule_via_ai`` sends the whole date range in
+one prompt, so prompt and response grow with days x employees until the
+response hits the model's output token limit. In windowed mode the range is
+split into calendar weeks (``weekly_windows``). Every window gets its own,
+smaller prompt - the prompt data collected for just that week - plus a
+``boundary_context`` entry describing the neighbouring days, and the windows
+are sent to the model concurrently:
+
+    windows = weekly_windows(start_date, end_date)
+    responses = run_windows(requests, {AIProvider.GEMINI: provider}, concurrency=3)
+
+Requests go through ``AIProviderInterface`` implementations (see
+``ai_integration.py``), so a run can be pointed at any provider, including a
+local stub in tests. ``SchedulerGeminiProvider`` adapts the service's own
+Gemini call, with its response cache and pooled connections. Each provider
+gets an ``asyncio.Semaphore`` that bounds its requests in flight. Windows are
+spread round-robin over the providers; a window whose provider fails is
+retried on the others.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple, Union
+
+from src.backend.services.ai_integration import (
+    AIProvider,
+    AIProviderInterface,
+    AIRequest,
+    AIResponse,
+    ModelCapability,
+    ModelInfo,
+)
+
+# Requests in flight per provider
+DEFAULT_WINDOW_CONCURRENCY = 3
+
+BOUNDARY_NOTE = (
+    "This prompt covers one window of a longer schedule period. Only assign "
+    "dates inside schedule_period. The days before and after it are planned "
+    "separately; keep the minimum rest time with previous_day_assignments."
+)
+
+
+def weekly_windows(start_date: date, end_date: date) -> List[Tuple[date, date]]:
+    """Split ``start_date``..``end_date`` into Monday-to-Sunday windows.
+
+    The first and last window are shorter if the range does not start on a
+    Monday or end on a Sunday.
+    """
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        window_end = min(
+            window_start + timedelta(days=6 - window_start.weekday()), end_date
+        )
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+    return windows
+
+
+def add_boundary_context(
+    collected_data_text: str,
+    window: Tuple[date, date],
+    period: Tuple[date, date],
+    index: int,
+    count: int,
+    previous_day_assignments: Optional[List[Dict[str, Any]]] = None,
+) -> str:
+    """The window's prompt data with a ``boundary_context`` entry added"""
+    window_start, window_end = window
+    collected_data = json.loads(collected_data_text)
+    collected_data["boundary_context"] = {
+        "note": BOUNDARY_NOTE,
+        "window": f"{index + 1} of {count}",
+        "full_period": {
+            "start_date": period[0].isoformat(),
+            "end_date": period[1].isoformat(),
+        },
+        "previous_day": (window_start - timedelta(days=1)).isoformat(),
+        "next_day": (window_end + timedelta(days=1)).isoformat(),
+        "previous_day_assignments": previous_day_assignments or [],
+    }
+    return json.dumps(collected_data, indent=2)
+
+
+@dataclass
+class WindowResponse:
+    """The outcome of one window request"""
+
+    request: AIRequest
+    response: Optional[AIResponse] = None
+    provider: Optional[str] = None
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None
+
+
+def _provider_name(key: Any) -> str:
+    return key.value if isinstance(key, AIProvider) else str(key)
+
+
+async def dispatch_windows(
+    requests: List[AIRequest],
+    providers: Dict[Any, AIProviderInterface],
+    concurrency: Union[int, Dict[Any, int]] = DEFAULT_WINDOW_CONCURRENCY,
+) -> List[WindowResponse]:
+    """Send the window requests concurrently, in request order.
+
+    ``concurrency`` is the number of requests in flight per provider, either
+    one number for all providers or a dict keyed like ``providers``.
+    """
+    if not providers:
+        raise ValueError("No AI providers configured for windowed generation")
+    keys = list(providers)
+    semaphores = {
+        key: asyncio.Semaphore(
+            concurrency.get(key, DEFAULT_WINDOW_CONCURRENCY)
+            if isinstance(concurrency, dict)
+            else concurrency
+        )
+        for key in keys
+    }
+
+    async def run(position: int, request: AIRequest) -> WindowResponse:
+        result = WindowResponse(request=request)
+        first = position % len(keys)
+        for key in keys[first:] + keys[:first]:
+            async with semaphores[key]:
+                started = time.perf_counter()
+                try:
+                    result.response = await providers[key].generate_response(request)
+                except Exception as e:
+                    result.errors.append(f"{_provider_name(key)}: {e}")
+                    continue
+                finally:
+                    result.seconds += time.perf_counter() - started
+            result.provider = _provider_name(key)
+            break
+        return result
+
+    return list(
+        await asyncio.gather(*(run(i, request) for i, request in enumerate(requests)))
+    )
+
+
+def run_windows(
+    requests: List[AIRequest],
+    providers: Dict[Any, AIProviderInterface],
+    concurrency: Union[int, Dict[Any, int]] = DEFAULT_WINDOW_CONCURRENCY,
+) -> List[WindowResponse]:
+    """Synchronous wrapper around ``dispatch_windows`` for request handlers"""
+    return asyncio.run(dispatch_windows(requests, providers, concurrency))
+
+
+class SchedulerGeminiProvider(AIProviderInterface):
+    """``AISchedulerService``'s Gemini call as an ``AIProviderInterface``
+
+    The blocking call runs in a worker thread, so the event loop can keep
+    several windows in flight.
+    """
+
+    def __init__(self, service, model_params=None, use_cache: bool = True):
+        self.service = service
+        self.model_params = model_params
+        self.use_cache = use_cache
+
+    async def generate_response(self, request: AIRequest) -> AIResponse:
+        started = time.perf_counter()
+        content = await asyncio.to_thread(
+            self.service._call_gemini_api,
+            request.prompt,
+            self.model_params,
+            None,
+            use_cache=self.use_cache,
+        )
+        return AIResponse(
+            conversation_id=request.conversation_id,
+            content=content,
+            model_used=self.service.gemini_model_name,
+            response_time=time.perf_counter() - started,
+            metadata=dict(request.metadata),
+        )
+
+    async def stream_response(self, request: AIRequest) -> AsyncGenerator[str, None]:
+        response = await self.generate_response(request)
+        yield response.content
+
+    def get_available_models(self) -> List[ModelInfo]:
+        return [
+            ModelInfo(
+                provider=AIProvider.GEMINI,
+                model_id=self.service.gemini_model_name,
+                name=self.service.gemini_model_name,
+                max_tokens=8192,
+                capabilities=[ModelCapability.FAST_RESPONSE],
+            )
+        ]
+
+    async def validate_connection(self) -> bool:
+        return bool(self.service.gemini_api_key)
+
+
+def validation_entries(
+    assignments: List[Dict[str, Any]], shifts: Dict[int, Any]
+) -> List[Dict[str, Any]]:
+    """Parsed assignments in the dict shape ``ScheduleValidator`` reads"""
+    entries = []
+    for assignment in assignments:
+        shift = shifts.get(assignment["shift_template_id"])
+        entries.append(
+            {
+                "employee_id": assignment["employee_id"],
+                "date": assignment["date"],
+                "shift_id": assignment["shift_template_id"],
+                "start_time": assignment["start_time"],
+                "end_time": assignment["end_time"],
+                "duration_hours": getattr(shift, "duration_hours", None) or 0.0,
+            }
+        )
+    return entries
@@ -0,0 +1,233 @@
+"""Streaming database backup and restore.
+
+``/settings/backup`` used to load every row of every table into one dict
+and ``/settings/restore`` parsed the whole JSON upload at once, which no
+longer fits into worker memory once years of schedule versions pile up.
+
+Backups are now gzip-compressed newline-delimited JSON, written and read a
+line at a time:
+
+    {"format": "schichtplan-backup", "version": 1, "created_at": "..."}
+    {"table": "employees", "columns": ["id", "first_name", ...]}
+    [1, "Anna", ...]
+    [2, "Ben", ...]
+    {"table": "shifts", "columns": [...]}
+    ...
+    {"end": true, "rows": {"employees": 2, ...}}
+
+Rows hold the raw column values as stored in the database (SQLite keeps
+dates as text), so restoring them with plain INSERT statements round-trips
+exactly without going through the ORM types. Bytes are written as
+``{"$bytes": "<base64>"}``.
+"""
+
+import base64
+import datetime
+import gzip
+import io
+import json
+import zlib
+from decimal import Decimal
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import inspect, text
+
+from src.backend.models import db
+from src.backend.utils.http_cache import revisions
+
+BACKUP_FORMAT = "schichtplan-backup"
+BACKUP_VERSION = 1
+BATCH_SIZE = 1000
+# Compressed bytes collected before a chunk is sent
+CHUNK_SIZE = 64 * 1024
+
+SKIPPED_TABLES = ("alembic_version",)
+
+
+class BackupFormatError(ValueError):
+    """The uploaded file is not a streaming backup."""
+
+
+def backup_tables() -> List[str]:
+    """Tables to back up, parents before children"""
+    existing = set(inspect(db.engine).get_table_names())
+    ordered = [t.name for t in db.metadata.sorted_tables if t.name in existing]
+    # Tables without a model (e.g. created by migrations only) go last
+    ordered += sorted(existing - set(ordered))
+    return [
+        name
+        for name in ordered
+        if name not in SKIPPED_TABLES and not name.startswith("_alembic")
+    ]
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"$bytes": base64.b64encode(bytes(value)).decode("ascii")}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict) and "$bytes" in value:
+        return base64.b64decode(value["$bytes"])
+    return value
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_encode, separators=(",", ":")) + "\n"
+
+
+def iter_backup_lines(batch_size: int = BATCH_SIZE) -> Iterator[str]:
+    """The backup as NDJSON lines, reading ``batch_size`` rows at a time.
+
+    All tables are read in one transaction, so the backup is a consistent
+    snapshot.
+    """
+    tables = backup_tables()
+    yield _dumps(
+        {
+            "format": BACKUP_FORMAT,
+            "version": BACKUP_VERSION,
+            "created_at": datetime.datetime.now().isoformat(),
+            "tables": tables,
+        }
+    )
+    counts: Dict[str, int] = {}
+    with db.engine.connect() as connection, connection.begin():
+        if connection.dialect.name == "sqlite":
+            # pysqlite defers BEGIN until the first write, so without it
+            # every SELECT would see the data committed up to that point
+            connection.exec_driver_sql("BEGIN")
+        quote = connection.dialect.identifier_preparer.quote
+        for table in tables:
+            result = connection.execution_options(stream_results=True).exec_driver_sql(
+                f"SELECT * FROM {quote(table)}"
+            )
+            yield _dumps({"table": table, "columns": list(result.keys())})
+            counts[table] = 0
+            while True:
+                rows = result.fetchmany(batch_size)
+                if not rows:
+                    break
+                counts[table] += len(rows)
+                yield "".join(_dumps([_encode(v) for v in row]) for row in rows)
+    yield _dumps({"end": True, "rows": counts})
+
+
+def gzip_chunks(lines: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Gzip-compress text lines on the fly"""
+    compressor = zlib.compressobj(wbits=31)  # 31: gzip container
+    buffer: List[bytes] = []
+    buffered = 0
+    for line in lines:
+        data = compressor.compress(line.encode("utf-8"))
+        if data:
+            buffer.append(data)
+            buffered += len(data)
+        if buffered >= chunk_size:
+            yield b"".join(buffer)
+            buffer, buffered = [], 0
+    buffer.append(compressor.flush())
+    yield b"".join(buffer)
+
+
+def open_backup(stream: IO[bytes]) -> Iterator[str]:
+    """Text lines of an uploaded backup, gzip-compressed or not"""
+    stream = io.BufferedReader(stream) if not hasattr(stream, "peek") else stream
+    if stream.peek(2)[:2] == b"\x1f\x8b":
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+    return io.TextIOWrapper(stream, encoding="utf-8")
+
+
+def restore_backup(
+    lines: Iterable[str],
+    batch_size: int = BATCH_SIZE,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> Dict[str, int]:
+    """Replace the backed-up tables with the rows of a streaming backup.
+
+    Runs in one transaction on ``db.session``: the listed tables are
+    emptied, rows are inserted ``batch_size`` at a time and ``progress``
+    is called with the table name and the number of rows restored so far.
+    Returns the number of restored rows per table.
+    """
+    lines = iter(lines)
+    header = _parse(next(lines, ""), 1)
+    if not isinstance(header, dict) or header.get("format") != BACKUP_FORMAT:
+        raise BackupFormatError("Not a streaming backup file")
+    if header.get("version") != BACKUP_VERSION:
+        raise BackupFormatError(f"Unsupported backup version {header.get('version')}")
+
+    existing = set(inspect(db.engine).get_table_names())
+    unknown = [t for t in header.get("tables", []) if t not in existing]
+    if unknown:
+        raise BackupFormatError(f"Unknown tables in backup: {', '.join(unknown)}")
+
+    quote = db.engine.dialect.identifier_preparer.quote
+    counts: Dict[str, int] = {}
+    insert = None
+    table: Optional[str] = None
+    columns: List[str] = []
+    batch: List[Dict[str, Any]] = []
+    complete = False
+
+    def flush() -> None:
+        if batch:
+            db.session.execute(insert, batch)
+            counts[table] += len(batch)
+            batch.clear()
+            if progress is not None:
+                progress(table, counts[table])
+
+    try:
+        # Rows are inserted in dependency order, checks run at commit
+        if db.engine.dialect.name == "sqlite":
+            db.session.execute(text("PRAGMA defer_foreign_keys=ON"))
+        for name in reversed(header.get("tables", [])):
+            db.session.execute(text(f"DELETE FROM {quote(name)}"))
+
+        for number, line in enumerate(lines, start=2):
+            if not line.strip():
+                continue
+            item = _parse(line, number)
+            if isinstance(item, list):
+                if table is None or len(item) != len(columns):
+                    raise BackupFormatError(f"Unexpected row on line {number}")
+                batch.append({f"c{i}": _decode(v) for i, v in enumerate(item)})
+                if len(batch) >= batch_size:
+                    flush()
+            elif "table" in item:
+                flush()
+                table, columns = item["table"], item["columns"]
+                if table not in header.get("tables", []):
+                    raise BackupFormatError(f"Table {table} is not listed in the header")
+                counts[table] = 0
+                insert = text(
+                    f"INSERT INTO {quote(table)} ({', '.join(quote(c) for c in columns)}) "
+                    f"VALUES ({', '.join(f':c{i}' for i in range(len(columns)))})"
+                )
+            elif item.get("end"):
+                flush()
+                complete = True
+                break
+        if not complete:
+            raise BackupFormatError("Backup is truncated (no end marker)")
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    # Raw statements are not seen by the session revision events
+    revisions.bump(header.get("tables", []))
+    return counts
+
+
+def _parse(line: str, number: int) -> Any:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        raise BackupFormatError(f"Invalid JSON on line {number}: {e}") from e
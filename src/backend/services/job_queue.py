@@ -0,0 +1,323 @@
+"""Background queue for schedule generation.
+
+``POST /schedules/generate`` and ``/schedules/ai-generate`` used to run the
+whole generation inside the request thread, so long ranges ran into proxy
+timeouts and held a worker for the full run. They now store a
+``GenerationJob`` row and return its id. A small in-process thread pool runs
+the jobs. With the default of one worker, concurrent requests wait in the
+queue and do not compete for the SQLite writer lock.
+
+Progress events come from ``ProcessTracker`` through the ``progress`` callback
+handed to each runner. They are kept in memory, broadcast over SocketIO as
+``generation_job_updated`` and streamed over SSE by the jobs endpoints. Only
+status changes are written to the database, so the job table never competes
+with the generator's own transaction.
+
+Each job row records its owner, the boot id and pid of the process whose pool
+runs it. On start-up only jobs whose owner is gone are failed, so a new worker
+process does not fail jobs that another worker is still running.
+"""
+
+import json
+import os
+import socket
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+from sqlalchemy import inspect, or_, update
+
+from src.backend.models import db
+from src.backend.models.generation_job import GenerationJob, JobStatus
+from src.backend.utils.logger import logger
+
+# A runner receives the job params and a progress callback, returns the result
+JobRunner = Callable[[Dict[str, Any], Callable[[Dict[str, Any]], None]], Dict[str, Any]]
+
+# Number of jobs whose progress events are kept in memory
+MAX_TRACKED_JOBS = 100
+MAX_EVENTS_PER_JOB = 200
+
+BOOT_ID_PATH = Path("/proc/sys/kernel/random/boot_id")
+
+
+class JobCancelled(Exception):
+    """Raised from the progress callback once a running job has been cancelled."""
+
+
+class JobQueue:
+    """In-process worker pool with a persisted job table."""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._runners: Dict[str, JobRunner] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._events: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._condition = threading.Condition()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """Create the worker pool and fail jobs whose process is gone."""
+        self.shutdown(wait=False)
+        self.app = app
+        workers = int(app.config.get("GENERATION_JOB_WORKERS", 1))
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="generation-job"
+        )
+        app.extensions["generation_jobs"] = self
+        with app.app_context():
+            self._fail_interrupted_jobs()
+
+    def register(self, kind: str, runner: JobRunner) -> None:
+        self._runners[kind] = runner
+
+    # --- Submitting and controlling jobs ---
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> GenerationJob:
+        """Persist a queued job and hand it to the worker pool."""
+        if kind not in self._runners:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if self._executor is None:
+            raise RuntimeError("JobQueue is not initialized; call init_app() first")
+
+        job = GenerationJob(
+            kind=kind, status=JobStatus.QUEUED, params=params, owner=process_owner()
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        self._cancel_events[job.id] = threading.Event()
+        self._record(job.id, {"event": "job_queued", "status": JobStatus.QUEUED.value})
+        self._executor.submit(self._run, job.id)
+        logger.info(f"Queued {kind} job {job.id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        return db.session.get(GenerationJob, job_id)
+
+    def cancel(self, job_id: str) -> Optional[GenerationJob]:
+        """Cancel a job. Queued jobs stop at once, running jobs at their next step."""
+        job = self.get(job_id)
+        if job is None or job.status.is_finished:
+            return job
+
+        event = self._cancel_events.get(job_id)
+        if event is not None:
+            event.set()
+        if self._set_status(job_id, JobStatus.CANCELLED, expected=JobStatus.QUEUED):
+            self._record(
+                job_id, {"event": "job_finished", "status": JobStatus.CANCELLED.value}
+            )
+        db.session.expire(job)
+        return job
+
+    def latest_progress(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._condition:
+            events = self._events.get(job_id)
+            return events[-1] if events else None
+
+    def stream(self, job_id: str, timeout: float = 15.0) -> Iterator[Optional[Dict[str, Any]]]:
+        """Yield the job's progress events until it finishes.
+
+        Yields ``None`` after ``timeout`` seconds without an event so that SSE
+        responses can send a keep-alive comment.
+        """
+        last_sequence = 0
+        while True:
+            with self._condition:
+                events = self._events.get(job_id)
+                if events and events[-1]["sequence"] <= last_sequence:
+                    self._condition.wait(timeout)
+                    events = self._events.get(job_id)
+                if not events:
+                    return
+                pending = [e for e in events if e["sequence"] > last_sequence]
+            if not pending:
+                yield None
+                continue
+            for event in pending:
+                yield event
+                if event["event"] == "job_finished":
+                    return
+            last_sequence = pending[-1]["sequence"]
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    # --- Worker side ---
+
+    def _run(self, job_id: str) -> None:
+        with self.app.app_context():
+            try:
+                self._execute(job_id)
+            except Exception as e:
+                logger.error(f"Job {job_id} crashed: {str(e)}", exc_info=True)
+            finally:
+                db.session.remove()
+
+    def _execute(self, job_id: str) -> None:
+        if not self._set_status(
+            job_id, JobStatus.RUNNING, expected=JobStatus.QUEUED, started_at=datetime.utcnow()
+        ):
+            # Cancelled while queued
+            self._cancel_events.pop(job_id, None)
+            return
+
+        job = self.get(job_id)
+        runner = self._runners[job.kind]
+        params = dict(job.params or {})
+        cancel_event = self._cancel_events.setdefault(job_id, threading.Event())
+        self._record(job_id, {"event": "job_started", "status": JobStatus.RUNNING.value})
+
+        def progress(event: Dict[str, Any]) -> None:
+            self._record(job_id, event)
+            if cancel_event.is_set():
+                raise JobCancelled(job_id)
+
+        result, error = None, None
+        try:
+            result = _json_safe(self.app, runner(params, progress))
+            status = JobStatus.SUCCEEDED
+            if isinstance(result, dict) and result.get("status") in ("failed", "error"):
+                status = JobStatus.FAILED
+                error = result.get("reason") or result.get("message")
+        except JobCancelled:
+            status = JobStatus.CANCELLED
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}", exc_info=True)
+            status, error = JobStatus.FAILED, str(e)
+
+        # The generator turns step errors (JobCancelled included) into a failed result
+        if cancel_event.is_set() and status == JobStatus.FAILED:
+            status, error = JobStatus.CANCELLED, None
+        if status != JobStatus.SUCCEEDED:
+            db.session.rollback()
+        self._cancel_events.pop(job_id, None)
+
+        self._set_status(
+            job_id,
+            status,
+            finished_at=datetime.utcnow(),
+            progress=self.latest_progress(job_id),
+            result=result if status != JobStatus.CANCELLED else None,
+            error=error,
+        )
+        self._record(job_id, {"event": "job_finished", "status": status.value, "error": error})
+        logger.info(f"Job {job_id} finished with status {status.value}")
+
+    def _set_status(
+        self, job_id: str, status: JobStatus, expected: Optional[JobStatus] = None, **values
+    ) -> bool:
+        """Update a job row; with ``expected`` only if it still has that status."""
+        statement = update(GenerationJob).where(GenerationJob.id == job_id)
+        if expected is not None:
+            statement = statement.where(GenerationJob.status == expected)
+        updated = db.session.execute(statement.values(status=status, **values)).rowcount
+        db.session.commit()
+        return updated > 0
+
+    def _record(self, job_id: str, event: Dict[str, Any]) -> None:
+        with self._condition:
+            events = self._events.get(job_id)
+            if events is None:
+                events = self._events[job_id] = deque(maxlen=MAX_EVENTS_PER_JOB)
+                while len(self._events) > MAX_TRACKED_JOBS:
+                    self._events.popitem(last=False)
+            event = {
+                "job_id": job_id,
+                "sequence": events[-1]["sequence"] + 1 if events else 1,
+                "timestamp": datetime.utcnow().isoformat(),
+                **event,
+            }
+            events.append(event)
+            self._condition.notify_all()
+        _broadcast(event)
+
+    def _fail_interrupted_jobs(self) -> None:
+        """Jobs left queued or running by a process that is gone can never finish."""
+        try:
+            if not inspect(db.engine).has_table(GenerationJob.__tablename__):
+                return
+            unfinished = db.session.execute(
+                db.select(GenerationJob.owner)
+                .where(GenerationJob.status.in_((JobStatus.QUEUED, JobStatus.RUNNING)))
+                .distinct()
+            ).scalars()
+            gone = [owner for owner in unfinished if not owner_alive(owner)]
+            if not gone:
+                return
+            owned_by_gone = [GenerationJob.owner.in_([o for o in gone if o is not None])]
+            if None in gone:
+                owned_by_gone.append(GenerationJob.owner.is_(None))
+            db.session.execute(
+                update(GenerationJob)
+                .where(GenerationJob.status.in_((JobStatus.QUEUED, JobStatus.RUNNING)))
+                .where(or_(*owned_by_gone))
+                .values(
+                    status=JobStatus.FAILED,
+                    error="Interrupted by server restart",
+                    finished_at=datetime.utcnow(),
+                )
+            )
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Could not check for interrupted generation jobs: {str(e)}")
+
+
+def _boot_id() -> str:
+    """Changes on every reboot where the kernel exposes it, else the host name"""
+    try:
+        return BOOT_ID_PATH.read_text().strip()
+    except OSError:
+        return socket.gethostname()
+
+
+def process_owner() -> str:
+    """Owner value for the jobs queued by this process"""
+    return f"{_boot_id()}:{os.getpid()}"
+
+
+def owner_alive(owner: Optional[str]) -> bool:
+    """True if the process recorded as a job's owner may still be running.
+
+    Rows without an owner predate it and count as gone, as do owners from
+    another boot. On Windows, where ``os.kill`` would end the process, a pid
+    of the current boot is assumed alive.
+    """
+    boot_id, _, pid = (owner or "").rpartition(":")
+    if boot_id != _boot_id() or not pid.isdigit():
+        return False
+    if int(pid) == os.getpid() or os.name == "nt":
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # Running under another user
+    return True
+
+
+def _json_safe(app, result: Any) -> Any:
+    """Round-trip through the app's JSON provider (dates, enums) for the JSON column."""
+    return json.loads(app.json.dumps(result))
+
+
+def _broadcast(event: Dict[str, Any]) -> None:
+    try:
+        from src.backend.websocket import GENERATION_JOB_UPDATED, broadcast_event
+
+        broadcast_event(GENERATION_JOB_UPDATED, event)
+    except Exception as e:
+        logger.debug(f"Could not broadcast job event: {str(e)}")
+
+
+job_queue = JobQueue()
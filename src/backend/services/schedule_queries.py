@@ -0,0 +1,157 @@
+"""Column-projected read path for schedule listings.
+
+``GET /schedules`` used to load full ``Schedule`` objects (with the joined
+``shift`` and ``employee`` relationships), call ``to_dict()`` per row and
+re-parse the break times with ``strptime``. ``fetch_schedule_page`` selects
+only the columns of the response in one query, takes the break duration
+from the stored minutes (computed in SQL for older rows) and pages by id.
+"""
+
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, and_, case, cast, func, or_, select
+
+from src.backend.models.employee import AvailabilityType, Employee
+from src.backend.models.fixed_shift import ShiftTemplate
+from src.backend.models.schedule import Schedule
+from src.backend.services.schedule_versions import date_range_conditions
+
+MAX_PAGE_SIZE = 1000
+
+
+def _minutes(column):
+    """Minutes since midnight of an "HH:MM" column"""
+    return cast(func.substr(column, 1, 2), Integer) * 60 + cast(
+        func.substr(column, 4, 2), Integer
+    )
+
+
+def _break_duration():
+    """Stored break minutes, or end - start (wrapping midnight); 0 without times"""
+    has_times = and_(Schedule.break_start.is_not(None), Schedule.break_end.is_not(None))
+    difference = _minutes(Schedule.break_end) - _minutes(Schedule.break_start)
+    computed = case((difference < 0, difference + 24 * 60), else_=difference)
+    return case(
+        (has_times, func.coalesce(Schedule.break_duration, computed)), else_=0
+    ).label("break_duration")
+
+
+_COLUMNS = (
+    Schedule.id,
+    Schedule.employee_id,
+    Schedule.shift_id,
+    Schedule.date,
+    Schedule.version,
+    Schedule.shift_start,
+    Schedule.shift_end,
+    Schedule.duration_hours,
+    Schedule.requires_break,
+    Schedule.shift_type_id,
+    Schedule.break_start,
+    Schedule.break_end,
+    Schedule.notes,
+    Schedule.shift_type,
+    Schedule.availability_type,
+    Schedule.status,
+    Schedule.created_at,
+    Schedule.updated_at,
+)
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    """Same keys as Schedule.to_dict()"""
+    data = {
+        "id": row.id,
+        "employee_id": row.employee_id,
+        "shift_id": row.shift_id,
+        "date": _isoformat(row.date),
+        "version": row.version,
+        "shift_start": row.shift_start,
+        "shift_end": row.shift_end,
+        "duration_hours": row.duration_hours,
+        "requires_break": row.requires_break,
+        "shift_type_id": row.shift_type_id,
+        "break_start": row.break_start,
+        "break_end": row.break_end,
+        "break_duration": row.break_duration,
+        "notes": row.notes,
+        "shift_type": row.shift_type,
+        "availability_type": row.availability_type.value
+        if isinstance(row.availability_type, AvailabilityType)
+        else row.availability_type,
+        "status": row.status.value if row.status is not None else "DRAFT",
+        "created_at": _isoformat(row.created_at),
+        "updated_at": _isoformat(row.updated_at),
+    }
+    if row.template_id is not None:
+        data["shift_type_name"] = (
+            row.template_shift_type.value if row.template_shift_type else None
+        )
+    if row.first_name is not None:
+        data["employee_name"] = f"{row.first_name} {row.last_name}"
+    return data
+
+
+def fetch_schedule_page(
+    session,
+    start_date: date,
+    end_date: date,
+    version: Optional[int] = None,
+    employee_ids: Optional[Iterable[int]] = None,
+    exclude_shift_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Schedules between ``start_date`` and ``end_date`` (inclusive), by id.
+
+    Args:
+        session: SQLAlchemy session (normally ``db.session``).
+        version: Only rows of this version.
+        employee_ids: Only rows of these employees.
+        exclude_shift_id: Leave out rows with this shift (the empty placeholder).
+        after_id: Keyset cursor; only rows with a larger id.
+        limit: Page size, at most ``MAX_PAGE_SIZE``; all rows if omitted.
+
+    Returns the rows as ``to_dict()``-style dicts and the cursor for the next
+    page (``None`` on the last page).
+    """
+    statement = (
+        select(
+            *_COLUMNS,
+            _break_duration(),
+            ShiftTemplate.id.label("template_id"),
+            ShiftTemplate.shift_type.label("template_shift_type"),
+            Employee.first_name,
+            Employee.last_name,
+        )
+        .outerjoin(ShiftTemplate, Schedule.shift_id == ShiftTemplate.id)
+        .outerjoin(Employee, Schedule.employee_id == Employee.id)
+        .where(*date_range_conditions(Schedule.date, start_date, end_date))
+        .order_by(Schedule.id)
+    )
+    if version is not None:
+        statement = statement.where(Schedule.version == version)
+    if employee_ids is not None:
+        statement = statement.where(Schedule.employee_id.in_(list(employee_ids)))
+    if exclude_shift_id is not None:
+        statement = statement.where(
+            or_(Schedule.shift_id.is_(None), Schedule.shift_id != exclude_shift_id)
+        )
+    if after_id is not None:
+        statement = statement.where(Schedule.id > after_id)
+    page_size = min(limit, MAX_PAGE_SIZE) if limit is not None else None
+    if page_size is not None:
+        # One extra row tells whether there is a next page
+        statement = statement.limit(page_size + 1)
+
+    rows = session.execute(statement).all()
+    next_after_id = None
+    if page_size is not None and len(rows) > page_size:
+        rows = rows[:page_size]
+        next_after_id = rows[-1].id
+    return [_row_to_dict(row) for row in rows], next_after_id
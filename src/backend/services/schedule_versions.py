@@ -0,0 +1,166 @@
+"""Set-based operations on schedule versions.
+
+Duplicating and comparing versions used to load every ``Schedule`` row of the
+involved versions into Python. The helpers here leave the work to the
+database. A duplicate is one ``INSERT INTO schedules ... SELECT`` and a
+comparison is one ``UNION ALL`` query over the (employee_id, date) joins.
+SQLite has no FULL OUTER JOIN before 3.39, so the comparison uses the UNION
+form.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, exists, func, insert, literal, select, union_all
+from sqlalchemy.orm import aliased
+
+from src.backend.models.schedule import Schedule, ScheduleStatus
+
+# Columns copied verbatim from the source version
+_COPIED_COLUMNS = (
+    "employee_id",
+    "shift_id",
+    "date",
+    "shift_start",
+    "shift_end",
+    "duration_hours",
+    "requires_break",
+    "shift_type_id",
+    "break_start",
+    "break_end",
+    "break_duration",
+    "notes",
+    "shift_type",
+    "availability_type",
+)
+
+# Order of the difference types in compare results
+DIFFERENCE_TYPES = ("added", "removed", "changed")
+
+
+def version_exists(session, version: int) -> bool:
+    return bool(session.query(exists().where(Schedule.version == version)).scalar())
+
+
+def date_range_conditions(column, start_date: Optional[date], end_date: Optional[date]):
+    """Schedule.date is a DateTime; include the whole end day."""
+    conditions = []
+    if start_date is not None:
+        conditions.append(column >= datetime.combine(start_date, datetime.min.time()))
+    if end_date is not None:
+        conditions.append(
+            column < datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        )
+    return conditions
+
+
+def duplicate_schedule_version(
+    session,
+    source_version: int,
+    new_version: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+) -> int:
+    """Copy the rows of ``source_version`` into ``new_version`` as DRAFTs.
+
+    Runs a single ``INSERT ... SELECT`` in the session's transaction (not
+    committed). Returns the number of copied rows.
+    """
+    table = Schedule.__table__
+    now = datetime.utcnow()
+    source = select(
+        *(table.c[name] for name in _COPIED_COLUMNS),
+        literal(new_version).label("version"),
+        literal(ScheduleStatus.DRAFT.name).label("status"),
+        literal(now).label("created_at"),
+        literal(now).label("updated_at"),
+    ).where(
+        table.c.version == source_version,
+        *date_range_conditions(table.c.date, start_date, end_date),
+    )
+    statement = insert(table).from_select(
+        list(_COPIED_COLUMNS) + ["version", "status", "created_at", "updated_at"],
+        source,
+    )
+    return session.execute(statement).rowcount
+
+
+def compare_schedule_versions(
+    session, base_version: int, compare_version: int
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Differences between two versions, keyed by (employee_id, date).
+
+    Returns the added, removed and changed rows (in that order), and counts
+    for those three types plus ``unchanged``.
+    """
+    base = aliased(Schedule, name="base")
+    other = aliased(Schedule, name="other")
+    same_slot = and_(base.employee_id == other.employee_id, base.date == other.date)
+
+    def _select(rank, type_name, employee_id, day, base_shift, compare_shift):
+        return select(
+            literal(rank).label("rank"),
+            literal(type_name).label("type"),
+            employee_id.label("employee_id"),
+            day.label("date"),
+            base_shift.label("base_shift_id"),
+            compare_shift.label("compare_shift_id"),
+        )
+
+    added = (
+        _select(0, "added", other.employee_id, other.date, literal(None), other.shift_id)
+        .select_from(other)
+        .outerjoin(base, and_(same_slot, base.version == base_version))
+        .where(other.version == compare_version, base.id.is_(None))
+    )
+    removed = (
+        _select(1, "removed", base.employee_id, base.date, base.shift_id, literal(None))
+        .select_from(base)
+        .outerjoin(other, and_(same_slot, other.version == compare_version))
+        .where(base.version == base_version, other.id.is_(None))
+    )
+    changed = (
+        _select(2, "changed", base.employee_id, base.date, base.shift_id, other.shift_id)
+        .select_from(base)
+        .join(other, same_slot)
+        .where(
+            base.version == base_version,
+            other.version == compare_version,
+            base.shift_id.is_distinct_from(other.shift_id),
+        )
+    )
+    diff = union_all(added, removed, changed).subquery()
+    rows = session.execute(
+        select(diff).order_by(diff.c.rank, diff.c.employee_id, diff.c.date)
+    ).all()
+
+    differences: List[Dict[str, Any]] = []
+    counts = {type_name: 0 for type_name in DIFFERENCE_TYPES}
+    for row in rows:
+        counts[row.type] += 1
+        day = row.date
+        if isinstance(day, str):
+            day = datetime.fromisoformat(day)
+        entry: Dict[str, Any] = {
+            "employee_id": row.employee_id,
+            "date": day.isoformat() if day is not None else None,
+            "type": row.type,
+        }
+        if row.type != "added":
+            entry["base_shift_id"] = row.base_shift_id
+        if row.type != "removed":
+            entry["compare_shift_id"] = row.compare_shift_id
+        differences.append(entry)
+
+    counts["unchanged"] = (
+        session.query(func.count())
+        .select_from(base)
+        .join(other, same_slot)
+        .filter(
+            base.version == base_version,
+            other.version == compare_version,
+            base.shift_id.is_not_distinct_from(other.shift_id),
+        )
+        .scalar()
+    )
+    return differences, counts
@@ -0,0 +1,104 @@
+"""Per-employee interval index over absence records.
+
+``ScheduleResources.absences`` holds every absence ever recorded, and the
+distribution loop asks "is this employee absent on this date" once per
+candidate, per shift, per day. This module keeps each employee's absences
+sorted by start date so a point or range query only looks at the intervals
+that can overlap, and memoizes the set of absent employees per date for bulk
+filtering.
+"""
+
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+
+class _EmployeeAbsences:
+    """Sorted absence intervals for one employee.
+
+    ``max_end`` is the running maximum of the end dates in start order, which
+    lets point queries stop at the first interval that cannot reach the date.
+    """
+
+    __slots__ = ("starts", "ends", "max_end", "entries")
+
+    def __init__(self, entries: List[Tuple[date, date, int, object]]):
+        entries.sort(key=lambda entry: (entry[0], entry[2]))
+        self.entries = entries
+        self.starts = [entry[0] for entry in entries]
+        self.ends = [entry[1] for entry in entries]
+        self.max_end = []
+        running = None
+        for end in self.ends:
+            running = end if running is None or end > running else running
+            self.max_end.append(running)
+
+    def covers(self, check_date: date) -> bool:
+        # Only intervals starting on or before the date can contain it
+        position = bisect_right(self.starts, check_date) - 1
+        while position >= 0 and self.max_end[position] >= check_date:
+            if self.ends[position] >= check_date:
+                return True
+            position -= 1
+        return False
+
+    def overlapping(self, start_date: date, end_date: date) -> List[object]:
+        stop = bisect_right(self.starts, end_date)
+        found = [
+            (entry[2], entry[3])
+            for entry in self.entries[:stop]
+            if entry[1] >= start_date
+        ]
+        # Keep the order in which the absences were loaded
+        found.sort(key=lambda item: item[0])
+        return [absence for _, absence in found]
+
+
+class AbsenceIndex:
+    """Absence intervals grouped by employee, sorted by start date.
+
+    Absences without valid ``start_date``/``end_date`` values are ignored.
+    """
+
+    def __init__(self, absences: Iterable = ()):
+        grouped: Dict[int, List[Tuple[date, date, int, object]]] = {}
+        for position, absence in enumerate(absences or []):
+            start = getattr(absence, "start_date", None)
+            end = getattr(absence, "end_date", None)
+            if not isinstance(start, date) or not isinstance(end, date):
+                continue
+            employee_id = getattr(absence, "employee_id", None)
+            grouped.setdefault(employee_id, []).append((start, end, position, absence))
+
+        self._by_employee: Dict[int, _EmployeeAbsences] = {
+            employee_id: _EmployeeAbsences(entries)
+            for employee_id, entries in grouped.items()
+        }
+        self._absent_by_date: Dict[date, FrozenSet[int]] = {}
+
+    def is_absent(self, employee_id: int, check_date: date) -> bool:
+        intervals = self._by_employee.get(employee_id)
+        return intervals is not None and intervals.covers(check_date)
+
+    def absences_for(
+        self, employee_id: int, start_date: date, end_date: date
+    ) -> List[object]:
+        intervals = self._by_employee.get(employee_id)
+        if intervals is None:
+            return []
+        return intervals.overlapping(start_date, end_date)
+
+    def absent_employee_ids(self, check_date: date) -> FrozenSet[int]:
+        """Return the ids of all employees absent on ``check_date`` (memoized)."""
+        absent = self._absent_by_date.get(check_date)
+        if absent is None:
+            absent = frozenset(
+                employee_id
+                for employee_id, intervals in self._by_employee.items()
+                if intervals.covers(check_date)
+            )
+            self._absent_by_date[check_date] = absent
+        return absent
+
+    def __len__(self) -> int:
+        return sum(len(intervals.entries) for intervals in self._by_employee.values())
@@ -0,0 +1,158 @@
+"""Min-cost assignment (Hungarian algorithm) in pure Python.
+
+Used by ``DistributionManager`` when the ``"assignment"`` engine is selected:
+a day's shifts are expanded into staffing slots and every available employee
+is matched to at most one slot so that the summed cost is minimal. Forbidden
+pairs (constraint violations, missing availability) are passed as ``None``.
+
+With SciPy installed (the ``performance`` extra) the matrix is handed to
+``scipy.optimize.linear_sum_assignment``. Otherwise the classic
+potentials-based Hungarian method for rectangular problems runs in pure
+Python. It is O(rows^2 * columns), so above ``MAX_EXACT_ROWS`` rows a greedy
+matching (cheapest allowed pair first) is used instead; it is not always
+optimal, but keeps very large stores from stalling a generation run.
+"""
+
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # pragma: no cover - exercised only without scipy installed
+    np = None
+    linear_sum_assignment = None
+
+Cost = Optional[float]
+
+# Largest row count solved exactly by the pure-Python Hungarian method
+MAX_EXACT_ROWS = 150
+
+
+def is_available() -> bool:
+    """True if SciPy could be imported and large problems are solved exactly."""
+    return linear_sum_assignment is not None
+
+
+def solve_assignment(
+    costs: Sequence[Sequence[Cost]], max_exact_rows: int = MAX_EXACT_ROWS
+) -> List[Optional[int]]:
+    """Assign each row to a distinct column with minimal total cost.
+
+    Args:
+        costs: Row-major cost matrix with at least as many columns as rows.
+            ``None`` marks a forbidden pair.
+        max_exact_rows: Without SciPy, larger problems are matched greedily.
+
+    Returns:
+        The column chosen for each row, or None for rows that could only be
+        placed on a forbidden pair.
+    """
+    num_rows = len(costs)
+    if num_rows == 0:
+        return []
+    num_cols = len(costs[0])
+    if any(len(row) != num_cols for row in costs):
+        raise ValueError("All cost rows must have the same length")
+    if num_cols < num_rows:
+        raise ValueError(
+            f"Need at least as many columns as rows, got {num_rows}x{num_cols}"
+        )
+
+    # Forbidden pairs get a cost larger than any complete feasible assignment
+    finite = [abs(value) for row in costs for value in row if value is not None]
+    forbidden = (sum(finite) + 1.0) * (num_rows + 1)
+    matrix = [
+        [forbidden if value is None else float(value) for value in row]
+        for row in costs
+    ]
+
+    if linear_sum_assignment is not None:
+        columns = _solve_scipy(matrix)
+    elif num_rows > max_exact_rows:
+        columns = _solve_greedy(costs)
+    else:
+        columns = _solve_hungarian(matrix)
+    return [
+        column if column is not None and costs[row][column] is not None else None
+        for row, column in enumerate(columns)
+    ]
+
+
+def _solve_scipy(matrix: List[List[float]]) -> List[Optional[int]]:
+    rows, columns = linear_sum_assignment(np.array(matrix, dtype=float))
+    result: List[Optional[int]] = [None] * len(matrix)
+    for row, column in zip(rows.tolist(), columns.tolist()):
+        result[row] = column
+    return result
+
+
+def _solve_greedy(costs: Sequence[Sequence[Cost]]) -> List[Optional[int]]:
+    pairs = sorted(
+        (value, row, column)
+        for row, values in enumerate(costs)
+        for column, value in enumerate(values)
+        if value is not None
+    )
+    result: List[Optional[int]] = [None] * len(costs)
+    taken = set()
+    for _, row, column in pairs:
+        if result[row] is None and column not in taken:
+            result[row] = column
+            taken.add(column)
+    return result
+
+
+def _solve_hungarian(matrix: List[List[float]]) -> List[Optional[int]]:
+    num_rows = len(matrix)
+    num_cols = len(matrix[0])
+
+    # 1-based arrays as in the textbook formulation; column 0 is a sentinel
+    inf = float("inf")
+    row_potential = [0.0] * (num_rows + 1)
+    col_potential = [0.0] * (num_cols + 1)
+    col_owner = [0] * (num_cols + 1)  # Row assigned to each column, 0 = free
+    way = [0] * (num_cols + 1)
+
+    for row in range(1, num_rows + 1):
+        col_owner[0] = row
+        current_col = 0
+        min_slack = [inf] * (num_cols + 1)
+        used = [False] * (num_cols + 1)
+        while True:
+            used[current_col] = True
+            owner = col_owner[current_col]
+            owner_costs = matrix[owner - 1]
+            owner_potential = row_potential[owner]
+            delta = inf
+            next_col = 0
+            for col in range(1, num_cols + 1):
+                if used[col]:
+                    continue
+                slack = owner_costs[col - 1] - owner_potential - col_potential[col]
+                if slack < min_slack[col]:
+                    min_slack[col] = slack
+                    way[col] = current_col
+                if min_slack[col] < delta:
+                    delta = min_slack[col]
+                    next_col = col
+            for col in range(num_cols + 1):
+                if used[col]:
+                    row_potential[col_owner[col]] += delta
+                    col_potential[col] -= delta
+                else:
+                    min_slack[col] -= delta
+            current_col = next_col
+            if col_owner[current_col] == 0:
+                break
+        # Flip the augmenting path
+        while current_col:
+            previous_col = way[current_col]
+            col_owner[current_col] = col_owner[previous_col]
+            current_col = previous_col
+
+    result: List[Optional[int]] = [None] * num_rows
+    for col in range(1, num_cols + 1):
+        row = col_owner[col]
+        if row:
+            result[row - 1] = col - 1
+    return result
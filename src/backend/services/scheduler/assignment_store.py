@@ -0,0 +1,165 @@
+"""Indexed storage for the assignments tracked by ``DistributionManager``.
+
+``DistributionManager.assignments_by_employee`` maps employee IDs to lists of
+assignment dicts, and the distribution loop used to scan every list to answer
+"how many shifts does this employee have today" or "when did they last work".
+``AssignmentStore`` is a drop-in replacement for that mapping which also keeps
+indexes by date, by (employee, date) and by (employee, ISO week), plus the last
+worked date per employee.
+
+Assignments added through :meth:`AssignmentStore.add` update the indexes in
+place. Code that edits the mapping or the per-employee lists directly still
+works: the lists are stored as ``TrackedList`` copies, and any such edit marks
+the indexes stale, so they are rebuilt on the next lookup.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .tracked_list import TrackedList
+
+
+def _assignment_date(assignment: Any) -> Any:
+    if isinstance(assignment, dict):
+        return assignment.get("date")
+    return getattr(assignment, "date", None)
+
+
+def _iso_week(day: Any) -> Optional[Tuple[int, int]]:
+    if isinstance(day, datetime):
+        day = day.date()
+    if not isinstance(day, date):
+        return None
+    iso = day.isocalendar()
+    return iso[0], iso[1]
+
+
+class AssignmentStore(dict):
+    """employee_id -> list of assignments, with date and week indexes.
+
+    Missing employees read as an empty list, like ``defaultdict(list)``.
+    Dates are indexed by their raw value, so lookups must use the same type
+    (normally ``datetime.date``) as the stored assignments.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._stale = True
+        self._by_date: Dict[Any, List[Tuple[Any, Any]]] = {}
+        self._by_employee_date: Dict[Tuple[Any, Any], int] = {}
+        self._by_employee_week: Dict[Tuple[Any, Tuple[int, int]], List[Any]] = {}
+        self._last_date: Dict[Any, Any] = {}
+        self.update(*args, **kwargs)
+
+    def _invalidate(self):
+        self._stale = True
+
+    def _track(self, assignments) -> TrackedList:
+        return TrackedList(assignments, on_change=self._invalidate)
+
+    def __missing__(self, employee_id):
+        # An empty list does not change the indexes
+        assignments = self._track(())
+        dict.__setitem__(self, employee_id, assignments)
+        return assignments
+
+    # Direct edits of the mapping invalidate the indexes
+    def __setitem__(self, employee_id, assignments):
+        super().__setitem__(employee_id, self._track(assignments))
+        self._stale = True
+
+    def __delitem__(self, employee_id):
+        super().__delitem__(employee_id)
+        self._stale = True
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def clear(self):
+        super().clear()
+        self._stale = True
+
+    def pop(self, *args):
+        self._stale = True
+        return super().pop(*args)
+
+    def popitem(self):
+        self._stale = True
+        return super().popitem()
+
+    def setdefault(self, employee_id, default=None):
+        if employee_id not in self:
+            self[employee_id] = default if default is not None else ()
+        return self[employee_id]
+
+    def update(self, *args, **kwargs):
+        for employee_id, assignments in dict(*args, **kwargs).items():
+            self[employee_id] = assignments
+
+    def total(self) -> int:
+        """Number of assignments over all employees."""
+        return sum(len(assignments) for assignments in self.values())
+
+    def _index(self, employee_id, assignment):
+        assignment_date = _assignment_date(assignment)
+        if assignment_date is None:
+            return
+        self._by_date.setdefault(assignment_date, []).append((employee_id, assignment))
+        key = (employee_id, assignment_date)
+        self._by_employee_date[key] = self._by_employee_date.get(key, 0) + 1
+        week = _iso_week(assignment_date)
+        if week is not None:
+            self._by_employee_week.setdefault((employee_id, week), []).append(assignment)
+            last = self._last_date.get(employee_id)
+            if last is None or assignment_date > last:
+                self._last_date[employee_id] = assignment_date
+
+    def _ensure_indexed(self):
+        if not self._stale:
+            return
+        self._by_date = {}
+        self._by_employee_date = {}
+        self._by_employee_week = {}
+        self._last_date = {}
+        for employee_id, assignments in self.items():
+            for assignment in assignments:
+                self._index(employee_id, assignment)
+        self._stale = False
+
+    def add(self, employee_id, assignment):
+        """Append ``assignment`` to the employee's list and index it."""
+        self._ensure_indexed()
+        # list.append skips the TrackedList hook; the index is updated here
+        list.append(self[employee_id], assignment)
+        self._index(employee_id, assignment)
+
+    def on_date(self, day) -> List[Tuple[Any, Any]]:
+        """(employee_id, assignment) pairs on ``day``."""
+        self._ensure_indexed()
+        return list(self._by_date.get(day, []))
+
+    def counts_on(self, day) -> Dict[Any, int]:
+        """Number of assignments per employee on ``day``."""
+        self._ensure_indexed()
+        counts: Dict[Any, int] = defaultdict(int)
+        for employee_id, _ in self._by_date.get(day, []):
+            counts[employee_id] += 1
+        return counts
+
+    def count_on(self, employee_id, day) -> int:
+        self._ensure_indexed()
+        return self._by_employee_date.get((employee_id, day), 0)
+
+    def in_week(self, employee_id, day) -> List[Any]:
+        """The employee's assignments in the ISO week containing ``day``."""
+        week = _iso_week(day)
+        if week is None:
+            return []
+        self._ensure_indexed()
+        return list(self._by_employee_week.get((employee_id, week), []))
+
+    def last_date(self, employee_id) -> Optional[date]:
+        """Latest assignment date of the employee (dates only), or None."""
+        self._ensure_indexed()
+        return self._last_date.get(employee_id)
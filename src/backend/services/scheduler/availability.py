@@ -13,6 +13,8 @@ if src_backend_dir not in sys.path:
     sys.path.insert(0, src_backend_dir)
 
 # Use centralized import utilities
+from .absence_index import AbsenceIndex
+from .availability_index import AvailabilityIndex, hours_mask
 from .import_utils import ModelImportError, import_availability_type, safe_import_models
 
 # Import models using the centralized utility
@@ -130,6 +132,12 @@ class AvailabilityChecker:
             self.log_debug(f"Employee {employee_id} is on leave on {date_to_check}")
             return False, AvailabilityType.UNAVAILABLE.value
 
+        # Answer from the precomputed bitmask index when resources provide one
+        if isinstance(
+            getattr(self.resources, "availability_index", None), AvailabilityIndex
+        ):
+            return self._check_shift_against_masks(employee_id, date_to_check, shift)
+
         # Get availability records for this date
         availability_records = self.get_availability_records(employee_id, date_to_check)
 
@@ -188,6 +196,32 @@ class AvailabilityChecker:
             # Default to unavailable on error
             return False, AvailabilityType.UNAVAILABLE.value
 
+    def _check_shift_against_masks(self, employee_id, date_to_check, shift):
+        """
+        Bitmask variant of the per-hour loop in is_employee_available.
+        Returns a tuple of (available, availability_type)
+        """
+        masks = self.resources.get_availability_masks(
+            employee_id, date_to_check.weekday()
+        )
+        if masks is None or not masks.records:
+            self.log_debug(
+                f"No availability records for employee {employee_id} on {date_to_check}"
+            )
+            # Default to available if no records
+            return True, AvailabilityType.AVAILABLE.value
+
+        if not shift.start_time or not shift.end_time:
+            self.log_warning(f"Shift {shift.id} has invalid times")
+            return False, AvailabilityType.UNAVAILABLE.value
+
+        shift_mask = hours_mask(self.get_shift_hours(shift.start_time, shift.end_time))
+        effective_type = masks.effective_type(shift_mask)
+        self.log_debug(
+            f"Employee {employee_id} has {effective_type} availability for shift on {date_to_check}"
+        )
+        return effective_type != AvailabilityType.UNAVAILABLE.value, effective_type
+
     def is_hour_available(
         self, availability_records: List[Dict], hour: int
     ) -> Tuple[bool, str]:
@@ -493,6 +527,11 @@ class AvailabilityChecker:
             f"Checking availability for {len(employees)} employees on {check_date}"
         )
 
+        # Resolve absences for the whole day in one lookup when resources are indexed
+        absent_ids = None
+        if isinstance(getattr(self.resources, "absence_index", None), AbsenceIndex):
+            absent_ids = self.resources.absent_employee_ids(check_date)
+
         for employee in employees:
             try:
                 # Get employee ID
@@ -510,7 +549,11 @@ class AvailabilityChecker:
                     continue
 
                 # Check if employee is on leave
-                if self.is_employee_on_leave(employee_id, check_date):
+                if (
+                    employee_id in absent_ids
+                    if absent_ids is not None
+                    else self.is_employee_on_leave(employee_id, check_date)
+                ):
                     self.log_debug(
                         f"Employee {employee_id} is on leave on {check_date}"
                     )
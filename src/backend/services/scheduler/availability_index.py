@@ -0,0 +1,151 @@
+"""Bitmask index over hourly employee availability records.
+
+``EmployeeAvailability`` stores one row per employee x weekday x hour, so
+answering "is this employee available from 09:00 to 17:00 on Monday" by
+scanning the list is O(rows). This module folds those rows into one 24-bit
+mask per availability type for every (employee, weekday) pair, which turns a
+whole shift range check into a single AND/compare.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+HOURS_PER_DAY = 24
+
+AVAILABLE = "AVAILABLE"
+FIXED = "FIXED"
+PREFERRED = "PREFERRED"
+UNAVAILABLE = "UNAVAILABLE"
+
+
+def _type_value(availability_type) -> str:
+    """Normalize an AvailabilityType enum member or raw string to its value."""
+    if availability_type is None:
+        return AVAILABLE
+    return str(getattr(availability_type, "value", availability_type))
+
+
+def hour_range_mask(start_hour: int, end_hour: int) -> int:
+    """Return the mask covering hours ``start_hour`` (inclusive) to ``end_hour``
+    (exclusive).
+
+    Hours past 23 are not wrapped: they set bits above the 24-hour day, which
+    no availability record can cover, so such ranges never count as available.
+    Use :func:`hours_mask` for shifts that wrap past midnight.
+    """
+    start_hour = max(start_hour, 0)
+    if end_hour <= start_hour:
+        return 0
+    return ((1 << end_hour) - 1) ^ ((1 << start_hour) - 1)
+
+
+def hours_mask(hours: Iterable[int]) -> int:
+    """Return the mask for an arbitrary collection of hours (0-23)."""
+    mask = 0
+    for hour in hours:
+        mask |= 1 << (hour % HOURS_PER_DAY)
+    return mask
+
+
+class DayAvailabilityMasks:
+    """Availability masks for one employee on one weekday.
+
+    ``by_type`` holds the type of the *first* record seen for each hour, so the
+    per-type masks are disjoint and match the first-match semantics of
+    ``AvailabilityChecker.is_hour_available``. ``accepted`` is the union of all
+    hours that have at least one AVAILABLE/PREFERRED record or a record flagged
+    ``is_available``, mirroring ``ScheduleResources.is_employee_available``.
+    """
+
+    __slots__ = ("recorded", "accepted", "by_type", "records")
+
+    def __init__(self):
+        self.recorded = 0
+        self.accepted = 0
+        self.by_type: Dict[str, int] = {}
+        self.records: List = []
+
+    def add(self, record, hour: int, type_value: str):
+        bit = 1 << hour
+        if not self.recorded & bit:
+            self.by_type[type_value] = self.by_type.get(type_value, 0) | bit
+        self.recorded |= bit
+        if type_value in (AVAILABLE, PREFERRED) or (
+            getattr(record, "is_available", False) is True
+        ):
+            self.accepted |= bit
+
+    def type_mask(self, type_value: str) -> int:
+        return self.by_type.get(type_value, 0)
+
+    def covers(self, mask: int) -> bool:
+        """True if every hour in ``mask`` has an accepting record."""
+        return mask & self.accepted == mask
+
+    def effective_type(self, mask: int) -> str:
+        """Resolve the availability type for a range of hours.
+
+        Hours without a record count as AVAILABLE. Any UNAVAILABLE hour makes
+        the whole range UNAVAILABLE; otherwise FIXED beats PREFERRED beats
+        AVAILABLE.
+        """
+        if mask & self.type_mask(UNAVAILABLE):
+            return UNAVAILABLE
+        if mask & self.type_mask(FIXED):
+            return FIXED
+        if mask & self.type_mask(PREFERRED):
+            return PREFERRED
+        return AVAILABLE
+
+
+class AvailabilityIndex:
+    """Per-employee, per-weekday availability bitmasks.
+
+    Build once from the loaded availability rows with :meth:`from_records` and
+    query with :meth:`get`. Records with a missing or out-of-range hour or
+    weekday are kept in :attr:`DayAvailabilityMasks.records` but do not set
+    any bits.
+    """
+
+    def __init__(self):
+        self._days: Dict[Tuple[int, int], DayAvailabilityMasks] = {}
+
+    @classmethod
+    def from_records(cls, availabilities: Iterable) -> "AvailabilityIndex":
+        index = cls()
+        for record in availabilities or []:
+            index.add(record)
+        return index
+
+    def add(self, record):
+        employee_id = getattr(record, "employee_id", None)
+        day_of_week = getattr(record, "day_of_week", None)
+        if not isinstance(day_of_week, int):
+            return
+        day = self._days.get((employee_id, day_of_week))
+        if day is None:
+            day = self._days[(employee_id, day_of_week)] = DayAvailabilityMasks()
+        day.records.append(record)
+
+        hour = getattr(record, "hour", None)
+        if isinstance(hour, int) and 0 <= hour < HOURS_PER_DAY:
+            day.add(
+                record, hour, _type_value(getattr(record, "availability_type", None))
+            )
+
+    def get(self, employee_id: int, day_of_week: int) -> Optional[DayAvailabilityMasks]:
+        return self._days.get((employee_id, day_of_week))
+
+    def records(self, employee_id: int, day_of_week: int) -> List:
+        day = self._days.get((employee_id, day_of_week))
+        return list(day.records) if day else []
+
+    def is_range_available(
+        self, employee_id: int, day_of_week: int, start_hour: int, end_hour: int
+    ) -> bool:
+        day = self._days.get((employee_id, day_of_week))
+        if day is None:
+            return False
+        return day.covers(hour_range_mask(start_hour, end_hour))
+
+    def __len__(self) -> int:
+        return len(self._days)
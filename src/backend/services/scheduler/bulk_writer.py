@@ -0,0 +1,227 @@
+"""Bulk persistence of schedule assignments.
+
+Building one ``Schedule`` ORM object per assignment costs a
+``db.session.get(ShiftTemplate, ...)`` per row (``Schedule._copy_from_template``)
+plus per-object unit-of-work bookkeeping. ``write_schedules`` instead fetches
+the referenced templates once, turns every assignment into a plain column
+mapping and inserts them in chunked executemany ``INSERT`` statements. The
+session's transaction is left open unless ``commit=True``, so callers can
+combine the insert with a preceding delete.
+"""
+
+import time as time_module
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from sqlalchemy import insert
+
+from src.backend.models.employee import AvailabilityType
+from src.backend.models.fixed_shift import ShiftTemplate
+from src.backend.models.schedule import Schedule, ScheduleStatus
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Assignment fields that are copied to the row as they are
+_PASSTHROUGH_FIELDS = (
+    "shift_start",
+    "shift_end",
+    "duration_hours",
+    "requires_break",
+    "shift_type_id",
+    "break_start",
+    "break_end",
+    "notes",
+    "shift_type",
+)
+
+# Row fields filled from the shift template when the assignment has no times
+_TEMPLATE_FIELDS = {
+    "shift_start": "start_time",
+    "shift_end": "end_time",
+    "duration_hours": "duration_hours",
+    "requires_break": "requires_break",
+    "shift_type_id": "shift_type_id",
+}
+
+
+@dataclass
+class BulkWriteResult:
+    rows: int
+    skipped: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "skipped": self.skipped,
+            "seconds": round(self.seconds, 4),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def _value(assignment: Any, name: str, default: Any = None) -> Any:
+    if isinstance(assignment, Mapping):
+        return assignment.get(name, default)
+    return getattr(assignment, name, default)
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    """Schedule.date is a DateTime column; accept dates and ISO strings."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, time.min)
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return None
+
+
+def _as_enum(enum_cls, value: Any, default: Any) -> Any:
+    if value is None:
+        return default
+    if isinstance(value, enum_cls):
+        return value
+    return enum_cls(getattr(value, "value", value))
+
+
+def _break_minutes(break_start: Optional[str], break_end: Optional[str]) -> Optional[int]:
+    """Same calculation as Schedule._calculate_break_duration"""
+    if not break_start or not break_end:
+        return None
+    try:
+        start_hour, start_min = map(int, break_start.split(":"))
+        end_hour, end_min = map(int, break_end.split(":"))
+    except (AttributeError, ValueError):
+        return None
+    start_minutes = start_hour * 60 + start_min
+    end_minutes = end_hour * 60 + end_min
+    if end_minutes < start_minutes:
+        end_minutes += 24 * 60
+    return end_minutes - start_minutes
+
+
+def build_schedule_row(
+    assignment: Any,
+    templates: Mapping[Any, Any],
+    default_version: int = 1,
+    default_status: ScheduleStatus = ScheduleStatus.PENDING,
+) -> Dict[str, Any]:
+    """Column mapping for one assignment (dict or object).
+
+    Raises ValueError/KeyError for assignments that cannot be stored.
+    """
+    employee_id = _value(assignment, "employee_id")
+    if employee_id is None or employee_id < 0:
+        raise ValueError(f"Invalid employee_id {employee_id!r}")
+    row_date = _as_datetime(_value(assignment, "date"))
+    if row_date is None:
+        raise ValueError("Missing date")
+
+    shift_id = _value(assignment, "shift_id") or _value(assignment, "shift_template_id")
+    row: Dict[str, Any] = {
+        "employee_id": employee_id,
+        "shift_id": shift_id or None,
+        "date": row_date,
+        "version": _value(assignment, "version") or default_version,
+        "status": _as_enum(
+            ScheduleStatus, _value(assignment, "status"), default_status
+        ),
+        "availability_type": _as_enum(
+            AvailabilityType,
+            _value(assignment, "availability_type"),
+            AvailabilityType.AVAILABLE,
+        ),
+    }
+    for name in _PASSTHROUGH_FIELDS:
+        row[name] = _value(assignment, name)
+    # ScheduleAssignment exposes the legacy shift type as shift_type_str
+    if row["shift_type"] is None:
+        row["shift_type"] = _value(assignment, "shift_type_str")
+
+    template = templates.get(shift_id) if shift_id else None
+    if template is not None and not row["shift_start"]:
+        for row_field, template_field in _TEMPLATE_FIELDS.items():
+            row[row_field] = getattr(template, template_field, None)
+    row["break_duration"] = _value(assignment, "break_duration") or _break_minutes(
+        row["break_start"], row["break_end"]
+    )
+    return row
+
+
+def prefetch_templates(session, shift_ids: Iterable[Any]) -> Dict[Any, Any]:
+    """Load the referenced shift templates with a single query"""
+    ids = {shift_id for shift_id in shift_ids if shift_id}
+    if not ids:
+        return {}
+    templates = session.query(ShiftTemplate).filter(ShiftTemplate.id.in_(ids)).all()
+    return {template.id: template for template in templates}
+
+
+def write_schedules(
+    session,
+    assignments: Iterable[Any],
+    templates: Optional[Mapping[Any, Any]] = None,
+    default_version: int = 1,
+    default_status: ScheduleStatus = ScheduleStatus.PENDING,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    commit: bool = False,
+    logger=None,
+) -> BulkWriteResult:
+    """Insert ``assignments`` into the schedules table in bulk.
+
+    Args:
+        session: SQLAlchemy session (normally ``db.session``).
+        assignments: Assignment dicts or objects (e.g. ``ScheduleAssignment``).
+        templates: Shift templates by ID; fetched with one query if omitted.
+        default_version: Version for assignments without one.
+        default_status: Status for assignments without one. PENDING, as the
+            generator has always saved them.
+        chunk_size: Rows per executemany ``INSERT``.
+        commit: Commit the session's transaction after inserting.
+        logger: Optional logger for skipped rows and throughput.
+    """
+    started = time_module.perf_counter()
+    assignments = list(assignments)
+    if templates is None:
+        templates = prefetch_templates(
+            session,
+            (
+                _value(assignment, "shift_id") or _value(assignment, "shift_template_id")
+                for assignment in assignments
+            ),
+        )
+
+    rows: List[Dict[str, Any]] = []
+    skipped = 0
+    for assignment in assignments:
+        try:
+            rows.append(
+                build_schedule_row(
+                    assignment, templates, default_version, default_status
+                )
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            skipped += 1
+            if logger:
+                logger.warning(f"Skipping assignment {assignment!r}: {e}")
+
+    statement = insert(Schedule.__table__)
+    for offset in range(0, len(rows), chunk_size):
+        session.execute(statement, rows[offset : offset + chunk_size])
+    if commit:
+        session.commit()
+
+    result = BulkWriteResult(
+        rows=len(rows), skipped=skipped, seconds=time_module.perf_counter() - started
+    )
+    if logger:
+        logger.info(
+            f"Bulk wrote {result.rows} schedule rows ({result.skipped} skipped) "
+            f"in {result.seconds:.3f}s, {result.rows_per_second:.0f} rows/s"
+        )
+    return result
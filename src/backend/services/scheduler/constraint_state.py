@@ -0,0 +1,156 @@
+"""Incremental per-employee work state for constraint checks.
+
+The schedule-context checks in ``ConstraintChecker`` (consecutive days, weekly
+hours, rest between shifts) used to rescan the whole schedule on every call.
+``ConstraintState`` keeps, per employee, the days worked as a bitset, the hours
+worked per ISO week and the assignments per day, and is updated as assignments
+are added or removed, so each check only looks at the employee's own data.
+
+The state is model-agnostic: callers resolve shift templates and pass in the
+hours of each assignment. Rest between shifts is checked against the
+employee's entries (``entries_for``), not a single latest shift end, since
+assignments are not added in date order (parallel weeks, seam refills).
+"""
+
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+WeekKey = Tuple[int, int]
+
+
+def week_key(day: date) -> WeekKey:
+    """ISO (year, week) of ``day``; ISO weeks run Monday to Sunday."""
+    iso = day.isocalendar()
+    return iso[0], iso[1]
+
+
+class _TrackedAssignment:
+    __slots__ = ("entry", "hours")
+
+    def __init__(self, entry, hours: float):
+        self.entry = entry
+        self.hours = hours
+
+
+class EmployeeWorkState:
+    """Work state of one employee.
+
+    Bit ``n`` of ``worked_days`` is set when the employee has at least one
+    assignment on the date with ordinal ``base_ordinal + n``.
+    """
+
+    __slots__ = ("worked_days", "base_ordinal", "by_day", "weekly_hours")
+
+    def __init__(self):
+        self.worked_days = 0
+        self.base_ordinal: Optional[int] = None
+        self.by_day: Dict[int, List[_TrackedAssignment]] = {}
+        self.weekly_hours: Dict[WeekKey, float] = {}
+
+    def _set_day_bit(self, ordinal: int):
+        if self.base_ordinal is None:
+            self.base_ordinal = ordinal
+        elif ordinal < self.base_ordinal:
+            self.worked_days <<= self.base_ordinal - ordinal
+            self.base_ordinal = ordinal
+        self.worked_days |= 1 << (ordinal - self.base_ordinal)
+
+    def add(self, day: date, tracked: _TrackedAssignment):
+        ordinal = day.toordinal()
+        entries = self.by_day.setdefault(ordinal, [])
+        if not entries:
+            self._set_day_bit(ordinal)
+        entries.append(tracked)
+
+        week = week_key(day)
+        self.weekly_hours[week] = self.weekly_hours.get(week, 0.0) + tracked.hours
+
+    def remove(self, day: date, entry) -> bool:
+        ordinal = day.toordinal()
+        entries = self.by_day.get(ordinal, [])
+        for position, tracked in enumerate(entries):
+            if tracked.entry is entry:
+                break
+        else:
+            return False
+
+        del entries[position]
+        if not entries:
+            del self.by_day[ordinal]
+            self.worked_days &= ~(1 << (ordinal - self.base_ordinal))
+
+        week = week_key(day)
+        self.weekly_hours[week] -= tracked.hours
+        return True
+
+    def consecutive_days_before(self, day: date, limit: int) -> int:
+        """Number of worked days directly before ``day``, at most ``limit``."""
+        if self.base_ordinal is None or limit <= 0:
+            return 0
+        top = day.toordinal() - 1 - self.base_ordinal
+        if top < 0:
+            return 0
+        # Bits for day-limit .. day-1, with day-1 as the highest bit
+        low = top - limit + 1
+        window_mask = (1 << limit) - 1
+        if low >= 0:
+            window = (self.worked_days >> low) & window_mask
+        else:
+            window = (self.worked_days << -low) & window_mask
+        gaps = ~window & window_mask
+        return limit if gaps == 0 else limit - gaps.bit_length()
+
+    def entries_on(self, day: date) -> List:
+        return [tracked.entry for tracked in self.by_day.get(day.toordinal(), [])]
+
+    def entries(self) -> List:
+        return [
+            tracked.entry
+            for ordinal in sorted(self.by_day)
+            for tracked in self.by_day[ordinal]
+        ]
+
+
+class ConstraintState:
+    """Work state for all employees of a schedule."""
+
+    def __init__(self):
+        self._employees: Dict[int, EmployeeWorkState] = {}
+
+    def add(self, employee_id: int, day: date, entry, hours: float = 0.0):
+        state = self._employees.get(employee_id)
+        if state is None:
+            state = self._employees[employee_id] = EmployeeWorkState()
+        state.add(day, _TrackedAssignment(entry, hours))
+
+    def remove(self, employee_id: int, day: date, entry) -> bool:
+        """Forget ``entry``; returns False if it was not tracked."""
+        state = self._employees.get(employee_id)
+        return state is not None and state.remove(day, entry)
+
+    def consecutive_days_before(
+        self, employee_id: int, day: date, limit: int = 7
+    ) -> int:
+        state = self._employees.get(employee_id)
+        return state.consecutive_days_before(day, limit) if state else 0
+
+    def weekly_hours(self, employee_id: int, day: date) -> float:
+        """Hours tracked for the employee in the ISO week containing ``day``."""
+        state = self._employees.get(employee_id)
+        return state.weekly_hours.get(week_key(day), 0.0) if state else 0.0
+
+    def entries_on(self, employee_id: int, day: date) -> List:
+        state = self._employees.get(employee_id)
+        return state.entries_on(day) if state else []
+
+    def entries_for(self, employee_id: int) -> List:
+        """All tracked entries of the employee, in date order."""
+        state = self._employees.get(employee_id)
+        return state.entries() if state else []
+
+    def __len__(self) -> int:
+        return sum(
+            len(entries)
+            for state in self._employees.values()
+            for entries in state.by_day.values()
+        )
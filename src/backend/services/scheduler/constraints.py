@@ -24,6 +24,7 @@ if src_backend_dir not in sys.path:
 
 # Use centralized import utilities
 from .import_utils import safe_import_models, ModelImportError
+from .constraint_state import ConstraintState
 
 # Import models using the centralized utility
 try:
@@ -61,6 +62,27 @@ class ShiftDataError(ConstraintError):
     """Exception for invalid shift data"""
     pass
 
+
+def _entry_value(entry: Any, name: str) -> Any:
+    """Read a field from a schedule entry object or assignment dict."""
+    if isinstance(entry, dict):
+        return entry.get(name)
+    return getattr(entry, name, None)
+
+
+def _as_date(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
 class ConstraintChecker:
     """
     Validates employee shift assignments against a set of configurable constraints.
@@ -78,6 +100,9 @@ class ConstraintChecker:
             (Primarily used by older methods, newer methods prefer passed-in assignments).
         schedule_by_date (Dict[date, List[Dict]]): Assignments grouped by date.
             (Primarily used by older methods).
+        state (ConstraintState): Per-employee worked days, weekly hours and
+            assignments per day, derived from `schedule`/`schedule_by_date`
+            and kept up to date by `add_assignment`/`remove_assignment`.
     """
 
     def __init__(self, resources: Any, config: Any, logger: Any):
@@ -96,6 +121,9 @@ class ConstraintChecker:
         self.logger = logger
         self.schedule: List[Dict] = []  # For older methods
         self.schedule_by_date: Dict[date, List[Dict]] = {}  # For older methods
+        self._state = ConstraintState()
+        self._shift_index: Dict[Any, Any] = {}
+        self._shift_index_source: Optional[tuple] = None
 
     def set_schedule(
         self, schedule: List[Dict], schedule_by_date: Dict[date, List[Dict]]
@@ -114,6 +142,108 @@ class ConstraintChecker:
         """
         self.schedule = schedule
         self.schedule_by_date = schedule_by_date
+        self._rebuild_state()
+
+    @property
+    def state(self) -> ConstraintState:
+        """
+        Incremental per-employee state for the schedule context.
+
+        Only follows `set_schedule`, `add_assignment` and `remove_assignment`;
+        after editing `schedule` or `schedule_by_date` directly, call
+        `set_schedule` again.
+        """
+        return self._state
+
+    def _rebuild_state(self):
+        self._state = ConstraintState()
+        seen = set()
+        for entry_date, entries in self.schedule_by_date.items():
+            for entry in entries:
+                seen.add(id(entry))
+                self._track_entry(entry, entry_date)
+        for entry in self.schedule:
+            if id(entry) not in seen:
+                self._track_entry(entry, _entry_value(entry, "date"))
+
+    def _get_shift_template(self, shift_id: Any) -> Any:
+        """Look up a shift template in `resources.shifts` by ID."""
+        shifts = getattr(self.resources, "shifts", None) or []
+        source = (id(shifts), len(shifts))
+        if self._shift_index_source != source:
+            self._shift_index = {}
+            for shift in shifts:
+                self._shift_index.setdefault(getattr(shift, "id", None), shift)
+            self._shift_index_source = source
+        return self._shift_index.get(shift_id)
+
+    def _template_hours(self, shift: Any) -> float:
+        if getattr(shift, "duration_hours", None) is not None:
+            return shift.duration_hours
+        if getattr(shift, "start_time", None) and getattr(shift, "end_time", None):
+            try:
+                return self.calculate_shift_duration(shift.start_time, shift.end_time)
+            except TimeParsingError as e:
+                self.log_warning(f"Ignoring hours of shift {shift.id}: {e}")
+        return 0.0
+
+    def _track_entry(self, entry: Any, entry_date: Any) -> bool:
+        employee_id = _entry_value(entry, "employee_id")
+        entry_date = _as_date(entry_date)
+        if employee_id is None or entry_date is None:
+            return False
+
+        hours = 0.0
+        shift_id = _entry_value(entry, "shift_id")
+        if shift_id is not None:
+            shift = self._get_shift_template(shift_id)
+            if shift is None:
+                self.logger.warning(
+                    f"Shift with ID {shift_id} not found in resources for weekly hours calculation for employee {employee_id}."
+                )
+            else:
+                hours = self._template_hours(shift)
+        self._state.add(employee_id, entry_date, entry, hours)
+        return True
+
+    def add_assignment(self, entry: Any, entry_date: Optional[date] = None):
+        """
+        Adds an assignment to the schedule context and updates the state.
+
+        Args:
+            entry: Schedule entry (object or dict) with `employee_id`, `shift_id`
+                and, unless `entry_date` is given, `date`.
+            entry_date: The date of the assignment, if not taken from `entry`.
+        """
+        entry_date = _as_date(entry_date or _entry_value(entry, "date"))
+        self.schedule.append(entry)
+        if entry_date is not None:
+            self.schedule_by_date.setdefault(entry_date, []).append(entry)
+        self._track_entry(entry, entry_date)
+
+    def remove_assignment(self, entry: Any, entry_date: Optional[date] = None) -> bool:
+        """
+        Removes an assignment from the schedule context and updates the state.
+
+        Returns:
+            True if the assignment was part of the schedule context.
+        """
+        entry_date = _as_date(entry_date or _entry_value(entry, "date"))
+        removed = False
+        if any(existing is entry for existing in self.schedule):
+            self.schedule[:] = [e for e in self.schedule if e is not entry]
+            removed = True
+        if entry_date is not None and entry_date in self.schedule_by_date:
+            day_entries = self.schedule_by_date[entry_date]
+            if any(existing is entry for existing in day_entries):
+                day_entries[:] = [e for e in day_entries if e is not entry]
+                removed = True
+            if not day_entries:
+                del self.schedule_by_date[entry_date]
+        employee_id = _entry_value(entry, "employee_id")
+        if entry_date is not None:
+            self._state.remove(employee_id, entry_date, entry)
+        return removed
 
     def _calculate_shift_duration_from_datetimes(
         self, start_dt: Optional[datetime], end_dt: Optional[datetime]
@@ -342,12 +472,11 @@ class ConstraintChecker:
                 return False
             
             # Get existing assignments for context (exclude the current assignment being validated)
-            existing_assignments = []
-            if hasattr(self, 'schedule') and self.schedule:
-                existing_assignments = [
-                    asn for asn in self.schedule 
-                    if asn.get("employee_id") == employee_id and asn != assignment
-                ]
+            existing_assignments = [
+                asn
+                for asn in self.state.entries_for(employee_id)
+                if asn != assignment
+            ]
             
             # Check all constraints
             violations = self.check_all_constraints(
@@ -775,8 +904,11 @@ class ConstraintChecker:
         """
         # Get the total weekly working hours constraint from settings
         try:
-            from models.settings import Settings
-            settings = Settings.query.first()
+            # Loaded (or snapshot) settings first, the database only as fallback
+            settings = getattr(self.resources, "settings", None)
+            if settings is None:
+                from models.settings import Settings
+                settings = Settings.query.first()
             if not settings or not hasattr(settings, 'total_weekly_working_hours'):
                 # No constraint configured, so no violation
                 return None
@@ -964,9 +1096,10 @@ class ConstraintChecker:
         shifts on the previous day, and the employee's shifts on the next day.
         The minimum rest hours are defined in the configuration.
 
-        Note: This method relies on `self.schedule_by_date` and `self.resources.shifts`
-        which are part of the older schedule context pattern. The newer method
-        `_check_min_rest_between_shifts` is preferred for more direct control.
+        Note: This method relies on the schedule context (`self.state`) and
+        `self.resources.shifts`, which are part of the older schedule context
+        pattern. The newer method `_check_min_rest_between_shifts` is preferred
+        for more direct control.
 
         Args:
             employee: The `Employee` object.
@@ -989,14 +1122,12 @@ class ConstraintChecker:
 
         # Get previous day's shift if any
         previous_date = current_date - timedelta(days=1)
-        prev_entries = self.schedule_by_date.get(previous_date, [])
+        prev_entries = self.state.entries_on(employee.id, previous_date)
 
         for entry in prev_entries:
-            if entry.employee_id == employee.id and entry.shift_id is not None:
-                prev_shift = next(
-                    (s for s in self.resources.shifts if s.id == entry.shift_id),
-                    None,
-                )
+            shift_id = _entry_value(entry, "shift_id")
+            if shift_id is not None:
+                prev_shift = self._get_shift_template(shift_id)
                 if prev_shift:
                     # Calculate rest hours between shifts
                     prev_end_time = prev_shift.end_time
@@ -1012,14 +1143,12 @@ class ConstraintChecker:
 
         # Get next day's shift if any
         next_date = current_date + timedelta(days=1)
-        next_entries = self.schedule_by_date.get(next_date, [])
+        next_entries = self.state.entries_on(employee.id, next_date)
 
         for entry in next_entries:
-            if entry.employee_id == employee.id and entry.shift_id is not None:
-                next_shift = next(
-                    (s for s in self.resources.shifts if s.id == entry.shift_id),
-                    None,
-                )
+            shift_id = _entry_value(entry, "shift_id")
+            if shift_id is not None:
+                next_shift = self._get_shift_template(shift_id)
                 if next_shift:
                     # Calculate rest hours between shifts
                     curr_end_time = shift.end_time
@@ -1040,7 +1169,7 @@ class ConstraintChecker:
         Counts the number of consecutive days an employee has worked up to and
         including the `current_date`.
 
-        Relies on `self.schedule_by_date` for existing assignment data.
+        Relies on the worked-day bitset in `self.state`; looks at most 7 days back.
 
         Args:
             employee_id: The ID of the employee.
@@ -1049,56 +1178,14 @@ class ConstraintChecker:
         Returns:
             The number of consecutive workdays.
         """
-        consecutive_days = 0
-        check_date = current_date - timedelta(days=1)
-
-        while check_date >= current_date - timedelta(days=7):  # Check up to 7 days back
-            if any(
-                s.employee_id == employee_id and s.date == check_date
-                for s in self.schedule
-            ):
-                consecutive_days += 1
-                check_date -= timedelta(days=1)
-            else:
-                break
-
-        return consecutive_days
+        return self.state.consecutive_days_before(employee_id, current_date, limit=7)
 
     def would_exceed_weekly_hours(
         self, employee_id: int, current_date: date, start_time: str, end_time: str
     ) -> bool:
         """Check if adding this shift would exceed the employee's weekly hours"""
-        # Get the start of the week (Monday)
-        week_start = current_date - timedelta(days=current_date.weekday())
-        week_end = week_start + timedelta(days=6)
-
-        # Calculate current weekly hours
-        weekly_hours = 0.0
-        for schedule_entry in self.schedule:
-            if (
-                schedule_entry.employee_id == employee_id
-                and week_start <= schedule_entry.date <= week_end
-                and schedule_entry.shift_id is not None
-            ):
-                # Find the shift template
-                entry_shift = next(
-                    (
-                        s
-                        for s in self.resources.shifts
-                        if s.id == schedule_entry.shift_id
-                    ),
-                    None,
-                )
-                if entry_shift:
-                    if (
-                        hasattr(entry_shift, "duration_hours")
-                        and entry_shift.duration_hours is not None
-                    ):
-                        weekly_hours += entry_shift.duration_hours
-                    else:
-                        weekly_hours += self.calculate_shift_duration(
-                            entry_shift.start_time, entry_shift.end_time
-                        )
+        # Current weekly hours from the running per-week totals
+        weekly_hours = self.state.weekly_hours(employee_id, current_date)
 
         # Add hours from the new shift
         shift_duration = self.calculate_shift_duration(start_time, end_time)
@@ -1143,8 +1230,8 @@ class ConstraintChecker:
         Calculates the total hours worked by an employee in the week that includes
         the `current_date`.
 
-        The week is considered Monday to Sunday. Relies on `self.schedule_by_date`
-        and `self.resources.shifts`.
+        The week is considered Monday to Sunday (ISO week). Reads the running
+        per-week totals kept in `self.state`.
 
         Args:
             employee_id: The ID of the employee.
@@ -1153,53 +1240,7 @@ class ConstraintChecker:
         Returns:
             The total hours worked by the employee in that week.
         """
-        weekly_hours = 0.0
-        start_of_week = current_date - timedelta(days=current_date.weekday())
-        # end_of_week = start_of_week + timedelta(days=6) # Unused variable
-
-        for day_offset in range(7):
-            check_date = start_of_week + timedelta(days=day_offset)
-            entries_on_date = self.schedule_by_date.get(check_date, [])
-
-            for entry in entries_on_date:
-                if entry.employee_id == employee_id and entry.shift_id is not None:
-                    shift = next(
-                        (s for s in self.resources.shifts if s.id == entry.shift_id),
-                        None,
-                    )
-
-                    if (
-                        shift is not None
-                    ):  # This 'if' block should be correctly indented
-                        duration_hours = 0
-                        if (
-                            hasattr(shift, "duration_hours")
-                            and shift.duration_hours is not None
-                        ):
-                            duration_hours = shift.duration_hours
-                        elif (
-                            hasattr(shift, "start_time")
-                            and hasattr(shift, "end_time")
-                            and shift.start_time
-                            and shift.end_time
-                        ):
-                            duration_hours = self.calculate_shift_duration(
-                                shift.start_time, shift.end_time
-                            )
-
-                        weekly_hours += duration_hours
-                        # Commenting out the caching logic as it might be problematic and is not the primary goal here
-                        # if not hasattr(shift, "duration_hours") or shift.duration_hours is None:
-                        #     if duration_hours > 0:
-                        #         shift.duration_hours = duration_hours
-                        #         self.log_debug(
-                        #             f"Cached duration {duration_hours:.2f}h on shift {shift.id}"
-                        #         )
-                    else:
-                        self.logger.warning(
-                            f"Shift with ID {entry.shift_id} not found in resources for weekly hours calculation for employee {employee_id}."
-                        )
-        return weekly_hours
+        return self.state.weekly_hours(employee_id, current_date)
 
     def calculate_shift_duration(self, start_time_str: str, end_time_str: str) -> float:
         """
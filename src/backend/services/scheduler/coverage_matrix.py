@@ -0,0 +1,202 @@
+"""Vectorized interval staffing counts for coverage validation.
+
+``ScheduleValidator._validate_coverage`` walks every interval of every day and
+re-parses each assignment's times to find out who is working. This module does
+the counting once with NumPy: every assignment becomes a range of interval
+slots that is scattered into (day x slot) difference arrays and resolved with a
+cumulative sum. The requirement side is sampled from the compiled
+``CoverageTimeline``, so coverage, keyholder and employee-type checks become
+whole-array comparisons and the validator only has to build errors for the
+violating cells.
+
+NumPy is optional; callers should check :func:`is_available` and fall back to
+the per-interval loop when it is missing.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .coverage_timeline import MINUTES_PER_DAY, CoverageTimeline, SlotRequirement
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+
+def is_available() -> bool:
+    """True if NumPy could be imported and the matrix engine can be used."""
+    return np is not None
+
+
+def slots_per_day(interval_minutes: int) -> int:
+    """Number of intervals starting at 00:00, 00:00+step, ... before midnight."""
+    return -(-MINUTES_PER_DAY // interval_minutes)
+
+
+def _scatter_ranges(diff, leading_index, firsts, stops):
+    """Add +1 at each range start and -1 at each range stop of ``diff``."""
+    leading = tuple(np.asarray(axis, dtype=np.intp) for axis in leading_index)
+    np.add.at(diff, leading + (np.asarray(firsts, dtype=np.intp),), 1)
+    np.add.at(diff, leading + (np.asarray(stops, dtype=np.intp),), -1)
+
+
+class StaffingSpan:
+    """One assignment reduced to what the coverage check needs."""
+
+    __slots__ = ("day", "start_minute", "end_minute", "is_keyholder", "group_key", "details")
+
+    def __init__(
+        self,
+        day: int,
+        start_minute: int,
+        end_minute: int,
+        is_keyholder: bool = False,
+        group_key: Optional[str] = None,
+        details: Optional[Dict] = None,
+    ):
+        self.day = day
+        self.start_minute = start_minute
+        self.end_minute = end_minute
+        self.is_keyholder = is_keyholder
+        self.group_key = group_key
+        # Employee summary for error details; None if the employee is unknown
+        self.details = details
+
+
+class CoverageMatrix:
+    """Staffing and requirement matrices for a contiguous range of days.
+
+    An assignment covers the interval starting at ``t`` when
+    ``start <= t < end``; assignments ending before they start cover nothing.
+    """
+
+    def __init__(
+        self,
+        start_date: date,
+        num_days: int,
+        interval_minutes: int,
+        spans: Sequence[StaffingSpan],
+        timeline: CoverageTimeline,
+    ):
+        if np is None:
+            raise RuntimeError("NumPy is required for the coverage matrix engine")
+
+        self.start_date = start_date
+        self.num_days = num_days
+        self.interval_minutes = interval_minutes
+        self.num_slots = slots_per_day(interval_minutes)
+        self._spans_by_day: Dict[int, List[StaffingSpan]] = {}
+        for span in spans:
+            self._spans_by_day.setdefault(span.day, []).append(span)
+
+        self._build_requirements(timeline)
+        self._build_staffing(spans)
+
+    def _build_requirements(self, timeline: CoverageTimeline):
+        shape = (self.num_days, self.num_slots)
+        self.min_required = np.zeros(shape, dtype=np.int32)
+        self.keyholder_required = np.zeros(shape, dtype=bool)
+        self.type_required = np.zeros(shape, dtype=np.int64)
+        # Requirement records per cell for error details
+        self.requirements: List[List[Optional[SlotRequirement]]] = []
+
+        # Bits are assigned over str() of the required types, which is also how
+        # employee groups are keyed on the staffing side
+        self.type_bits: Dict[str, int] = {}
+        record_masks: Dict[int, int] = {}
+        sample_minutes = range(0, MINUTES_PER_DAY, self.interval_minutes)
+
+        for day in range(self.num_days):
+            slots = timeline.slots_for_date(self.start_date + timedelta(days=day))
+            day_records = [slots[minute] for minute in sample_minutes]
+            self.requirements.append(day_records)
+            for slot, record in enumerate(day_records):
+                if record is None:
+                    continue
+                self.min_required[day, slot] = record.min_employees
+                self.keyholder_required[day, slot] = record.requires_keyholder
+                mask = record_masks.get(id(record))
+                if mask is None:
+                    mask = 0
+                    for required_type in record.employee_types:
+                        key = str(required_type)
+                        if key not in self.type_bits:
+                            self.type_bits[key] = 1 << len(self.type_bits)
+                        mask |= self.type_bits[key]
+                    record_masks[id(record)] = mask
+                self.type_required[day, slot] = mask
+
+    def _slot_range(self, start_minute: int, end_minute: int) -> Tuple[int, int]:
+        step = self.interval_minutes
+        first = -(-start_minute // step)
+        stop = min(-(-end_minute // step), self.num_slots)
+        return first, stop
+
+    def _build_staffing(self, spans: Sequence[StaffingSpan]):
+        width = self.num_slots + 1
+        staff_diff = np.zeros((self.num_days, width), dtype=np.int32)
+        keyholder_diff = np.zeros((self.num_days, width), dtype=np.int32)
+        # Only groups that some requirement asks for need their own counts
+        group_diff = np.zeros((len(self.type_bits), self.num_days, width), dtype=np.int32)
+        group_index = {key: index for index, key in enumerate(self.type_bits)}
+
+        days, firsts, stops = [], [], []
+        kh_days, kh_firsts, kh_stops = [], [], []
+        grp, grp_days, grp_firsts, grp_stops = [], [], [], []
+        for span in spans:
+            if span.end_minute <= span.start_minute:
+                continue
+            first, stop = self._slot_range(span.start_minute, span.end_minute)
+            if first >= stop:
+                continue
+            days.append(span.day)
+            firsts.append(first)
+            stops.append(stop)
+            if span.is_keyholder:
+                kh_days.append(span.day)
+                kh_firsts.append(first)
+                kh_stops.append(stop)
+            if span.group_key in group_index:
+                grp.append(group_index[span.group_key])
+                grp_days.append(span.day)
+                grp_firsts.append(first)
+                grp_stops.append(stop)
+
+        _scatter_ranges(staff_diff, (days,), firsts, stops)
+        _scatter_ranges(keyholder_diff, (kh_days,), kh_firsts, kh_stops)
+        _scatter_ranges(group_diff, (grp, grp_days), grp_firsts, grp_stops)
+
+        self.staff = np.cumsum(staff_diff, axis=1)[:, : self.num_slots]
+        self.keyholders = np.cumsum(keyholder_diff, axis=1)[:, : self.num_slots]
+        group_counts = np.cumsum(group_diff, axis=2)[:, :, : self.num_slots]
+
+        self.type_present = np.zeros((self.num_days, self.num_slots), dtype=np.int64)
+        for key, index in group_index.items():
+            self.type_present |= np.where(group_counts[index] > 0, self.type_bits[key], 0)
+
+    @property
+    def understaffed(self):
+        return self.staff < self.min_required
+
+    @property
+    def keyholder_missing(self):
+        return self.keyholder_required & (self.keyholders == 0)
+
+    @property
+    def types_unmet(self):
+        return (self.type_required & ~self.type_present) != 0
+
+    def violating_cells(self) -> List[Tuple[int, int]]:
+        """(day, slot) pairs with any violation, in date then time order."""
+        violations = self.understaffed | self.keyholder_missing | self.types_unmet
+        return list(zip(*(axis.tolist() for axis in np.nonzero(violations))))
+
+    def spans_at(self, day: int, slot: int) -> List[StaffingSpan]:
+        """Spans working the given cell (used to describe violations)."""
+        minute = slot * self.interval_minutes
+        return [
+            span
+            for span in self._spans_by_day.get(day, [])
+            if span.start_minute <= minute < span.end_minute
+        ]
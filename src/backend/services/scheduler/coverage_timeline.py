@@ -0,0 +1,198 @@
+"""Precompiled per-weekday coverage requirements.
+
+``get_required_staffing_for_interval`` used to re-parse every coverage rule's
+``start_time``/``end_time`` string and rescan all rules for each interval it
+was asked about. ``CoverageTimeline`` does that work once: for every weekday it
+merges the applicable rules into one requirement record per stretch of time
+and keeps a minute-resolution table pointing at those records, so a lookup is
+a single list index.
+"""
+
+import datetime
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+MINUTES_PER_DAY = 24 * 60
+
+_REQUIRED_RULE_ATTRS = ("day_index", "start_time", "end_time", "min_employees")
+
+
+def _time_str_to_minutes(time_str) -> Optional[int]:
+    """Convert an 'HH:MM' string to minutes since midnight, None if malformed."""
+    if not isinstance(time_str, str) or len(time_str) != 5 or time_str[2] != ":":
+        return None
+    try:
+        parsed = datetime.time.fromisoformat(time_str)
+    except ValueError:
+        return None
+    return parsed.hour * 60 + parsed.minute
+
+
+def _max_optional(current: Optional[int], value: Optional[int]) -> Optional[int]:
+    if value is None:
+        return current
+    return value if current is None else max(current, value)
+
+
+class SlotRequirement:
+    """Merged staffing requirement for a stretch of minutes on one weekday.
+
+    ``employee_type_mask`` and ``allowed_group_mask`` encode the type and group
+    sets as bitmasks using the bit assignment of the owning timeline.
+    """
+
+    __slots__ = (
+        "min_employees",
+        "employee_types",
+        "allowed_employee_groups",
+        "requires_keyholder",
+        "keyholder_before_minutes",
+        "keyholder_after_minutes",
+        "employee_type_mask",
+        "allowed_group_mask",
+    )
+
+    def __init__(self):
+        self.min_employees = 0
+        self.employee_types: FrozenSet[str] = frozenset()
+        self.allowed_employee_groups: FrozenSet[str] = frozenset()
+        self.requires_keyholder = False
+        self.keyholder_before_minutes: Optional[int] = None
+        self.keyholder_after_minutes: Optional[int] = None
+        self.employee_type_mask = 0
+        self.allowed_group_mask = 0
+
+    def as_dict(self) -> Dict:
+        """Return the dict shape produced by get_required_staffing_for_interval."""
+        return {
+            "min_employees": self.min_employees,
+            "employee_types": set(self.employee_types),
+            "allowed_employee_groups": set(self.allowed_employee_groups),
+            "requires_keyholder": self.requires_keyholder,
+            "keyholder_before_minutes": self.keyholder_before_minutes,
+            "keyholder_after_minutes": self.keyholder_after_minutes,
+        }
+
+
+class CoverageTimeline:
+    """Coverage rules compiled into per-weekday, per-minute requirement tables.
+
+    A rule applies to an interval when ``start_time <= interval start <
+    end_time`` on its ``day_index``; overlapping rules are merged the same way
+    ``get_required_staffing_for_interval`` documents (max of minimums, union of
+    types and groups, OR of keyholder flags). Rules with malformed times, or
+    ending before they start, never apply. Dates marked closed in the
+    settings' ``special_days`` (or legacy ``special_hours``) have no
+    requirements at all.
+    """
+
+    def __init__(self, coverage_rules: Iterable, settings=None):
+        self.settings = settings
+        self._type_bits: Dict[str, int] = {}
+        self._group_bits: Dict[str, int] = {}
+        self._slots: List[List[Optional[SlotRequirement]]] = []
+        self._closed_dates: Dict[datetime.date, bool] = {}
+
+        rules_by_day: Dict[int, List] = {day: [] for day in range(7)}
+        for rule in coverage_rules or []:
+            if not all(hasattr(rule, attr) for attr in _REQUIRED_RULE_ATTRS):
+                continue
+            start = _time_str_to_minutes(rule.start_time)
+            end = _time_str_to_minutes(rule.end_time)
+            if start is None or end is None or start >= end:
+                continue
+            if rule.day_index in rules_by_day:
+                rules_by_day[rule.day_index].append((start, end, rule))
+
+        for day in range(7):
+            self._slots.append(self._compile_day(rules_by_day[day]))
+
+    def _bit(self, bits: Dict[str, int], name) -> int:
+        if name not in bits:
+            bits[name] = 1 << len(bits)
+        return bits[name]
+
+    def _compile_day(self, rules) -> List[Optional[SlotRequirement]]:
+        slots: List[Optional[SlotRequirement]] = [None] * MINUTES_PER_DAY
+        boundaries = sorted({minute for start, end, _ in rules for minute in (start, end)})
+        for seg_start, seg_end in zip(boundaries, boundaries[1:]):
+            active = [rule for start, end, rule in rules if start <= seg_start < end]
+            if not active:
+                continue
+            requirement = self._merge(active)
+            for minute in range(seg_start, seg_end):
+                slots[minute] = requirement
+        return slots
+
+    def _merge(self, rules) -> SlotRequirement:
+        requirement = SlotRequirement()
+        employee_types = set()
+        allowed_groups = set()
+        for rule in rules:
+            requirement.min_employees = max(requirement.min_employees, rule.min_employees)
+
+            rule_types = getattr(rule, "employee_types", [])
+            if isinstance(rule_types, list):
+                employee_types.update(rule_types)
+
+            rule_groups = getattr(rule, "allowed_employee_groups", [])
+            if isinstance(rule_groups, list):
+                allowed_groups.update(rule_groups)
+
+            if getattr(rule, "requires_keyholder", False):
+                requirement.requires_keyholder = True
+
+            requirement.keyholder_before_minutes = _max_optional(
+                requirement.keyholder_before_minutes,
+                getattr(rule, "keyholder_before_minutes", None),
+            )
+            requirement.keyholder_after_minutes = _max_optional(
+                requirement.keyholder_after_minutes,
+                getattr(rule, "keyholder_after_minutes", None),
+            )
+
+        requirement.employee_types = frozenset(employee_types)
+        requirement.allowed_employee_groups = frozenset(allowed_groups)
+        for name in employee_types:
+            requirement.employee_type_mask |= self._bit(self._type_bits, name)
+        for name in allowed_groups:
+            requirement.allowed_group_mask |= self._bit(self._group_bits, name)
+        return requirement
+
+    def type_bit(self, employee_type) -> int:
+        """Bit used for ``employee_type`` in employee_type_mask (0 if unused)."""
+        return self._type_bits.get(employee_type, 0)
+
+    def group_bit(self, group) -> int:
+        """Bit used for ``group`` in allowed_group_mask (0 if unused)."""
+        return self._group_bits.get(group, 0)
+
+    def is_closed(self, target_date: datetime.date) -> bool:
+        closed = self._closed_dates.get(target_date)
+        if closed is None:
+            closed = False
+            date_str = target_date.isoformat()
+            special_days = getattr(self.settings, "special_days", None)
+            special_hours = getattr(self.settings, "special_hours", None)
+            if isinstance(special_days, dict) and special_days:
+                closed = bool(special_days.get(date_str, {}).get("is_closed", False))
+            elif isinstance(special_hours, dict) and special_hours:
+                closed = bool(special_hours.get(date_str, {}).get("is_closed", False))
+            self._closed_dates[target_date] = closed
+        return closed
+
+    def slots_for_date(
+        self, target_date: datetime.date
+    ) -> List[Optional[SlotRequirement]]:
+        """Per-minute requirements for ``target_date`` (None where nothing applies)."""
+        if self.is_closed(target_date):
+            return [None] * MINUTES_PER_DAY
+        return self._slots[target_date.weekday()]
+
+    def requirement_at(
+        self, target_date: datetime.date, interval_start_time: datetime.time
+    ) -> Optional[SlotRequirement]:
+        """Requirement for the interval starting at ``interval_start_time``."""
+        if self.is_closed(target_date):
+            return None
+        minute = interval_start_time.hour * 60 + interval_start_time.minute
+        return self._slots[target_date.weekday()][minute]
@@ -8,6 +8,7 @@ from typing import Dict, Optional
 # Assuming ScheduleResources is in a sibling file resources.py
 # and Coverage model is two levels up in models directory
 # Adjust paths if necessary based on actual project structure
+from .coverage_timeline import CoverageTimeline
 from .resources import ScheduleResources
 
 
@@ -32,9 +33,11 @@ def get_required_staffing_for_interval(
     """
     Calculates the specific staffing needs for a given time interval on a target date.
 
-    This function iterates through all coverage rules defined in `resources.coverage`
-    and determines which ones apply to the specified `interval_start_time` on the
-    `target_date` based on the rule's `day_index` and `start_time`/`end_time`.
+    The coverage rules defined in `resources.coverage` are compiled once into a
+    `CoverageTimeline` (see coverage_timeline.py); this function looks up which
+    of them apply to the specified `interval_start_time` on the `target_date`
+    based on the rule's `day_index` and `start_time`/`end_time`. Dates marked as
+    closed special days have no requirements.
 
     Overlap Handling:
     If multiple `Coverage` rules overlap and apply to the same interval:
@@ -62,113 +65,31 @@ def get_required_staffing_for_interval(
         }
         Returns default zero/empty needs if no coverage applies.
     """
-    required_staffing = {
-        "min_employees": 0,
-        "employee_types": set(),
-        "allowed_employee_groups": set(),
-        "requires_keyholder": False,
-        "keyholder_before_minutes": None,  # Use None for no requirement
-        "keyholder_after_minutes": None,  # Use None for no requirement
-    }
-
-    target_day_index: int = target_date.weekday()  # Monday is 0 and Sunday is 6
-
-    # Calculate the end time of the interval for checking against Coverage.end_time
-    # interval_end_time will be exclusive for comparisons
-    interval_start_dt = datetime.datetime.combine(target_date, interval_start_time)
-    interval_end_dt = interval_start_dt + datetime.timedelta(
-        minutes=interval_duration_minutes
-    )
-    # interval_end_time_for_comparison = interval_end_dt.time() # This might cross midnight
-
-    applicable_coverage_found = False
-
-    for coverage_rule in resources.coverage:
-        # Ensure coverage_rule has the necessary attributes
-        if not all(
-            hasattr(coverage_rule, attr)
-            for attr in ["day_index", "start_time", "end_time", "min_employees"]
-        ):
-            # log a warning or skip
-            continue
-
-        if coverage_rule.day_index != target_day_index:
-            continue
-
-        coverage_start_time_obj = _time_str_to_datetime_time(coverage_rule.start_time)
-        coverage_end_time_obj = _time_str_to_datetime_time(coverage_rule.end_time)
-
-        if not coverage_start_time_obj or not coverage_end_time_obj:
-            # log a warning about invalid time format in coverage rule
-            continue
-
-        # Check if the interval_start_time is within the coverage rule's time span.
-        # Coverage applies if: coverage_start_time <= interval_start_time < coverage_end_time
-        if not (coverage_start_time_obj <= interval_start_time < coverage_end_time_obj):
-            continue
-
-        # If we reach here, this coverage rule applies to this interval
-        applicable_coverage_found = True
-
-        # 1. min_employees: take the maximum
-        required_staffing["min_employees"] = max(
-            required_staffing["min_employees"], coverage_rule.min_employees
-        )
-
-        # 2. employee_types: union of sets
-        current_employee_types = getattr(coverage_rule, "employee_types", [])
-        if isinstance(current_employee_types, list):  # Ensure it's iterable
-            required_staffing["employee_types"].update(current_employee_types)
-
-        # 3. allowed_employee_groups: union of sets
-        current_allowed_groups = getattr(coverage_rule, "allowed_employee_groups", [])
-        if isinstance(current_allowed_groups, list):  # Ensure it's iterable
-            required_staffing["allowed_employee_groups"].update(current_allowed_groups)
-
-        # 4. requires_keyholder: OR condition
-        if getattr(coverage_rule, "requires_keyholder", False):
-            required_staffing["requires_keyholder"] = True
-
-        # 5. keyholder_before_minutes: max of defined values
-        kb_minutes = getattr(coverage_rule, "keyholder_before_minutes", None)
-        if kb_minutes is not None:
-            if required_staffing["keyholder_before_minutes"] is None:
-                required_staffing["keyholder_before_minutes"] = kb_minutes
-            else:
-                required_staffing["keyholder_before_minutes"] = max(
-                    required_staffing["keyholder_before_minutes"], kb_minutes
-                )
-
-        # 6. keyholder_after_minutes: max of defined values
-        ka_minutes = getattr(coverage_rule, "keyholder_after_minutes", None)
-        if ka_minutes is not None:
-            if required_staffing["keyholder_after_minutes"] is None:
-                required_staffing["keyholder_after_minutes"] = ka_minutes
-            else:
-                required_staffing["keyholder_after_minutes"] = max(
-                    required_staffing["keyholder_after_minutes"], ka_minutes
-                )
-
-    # If no coverage rules applied, ensure min_employees is 0.
-    # The default employee_types and allowed_employee_groups will be empty sets,
-    # and requires_keyholder will be False, which is correct.
-    if not applicable_coverage_found:
-        required_staffing["min_employees"] = 0
-        # Defaults for keyholder_before/after_minutes remain None if no rule set them.
+    timeline = get_coverage_timeline(resources)
+    requirement = timeline.requirement_at(target_date, interval_start_time)
+    if requirement is None:
+        return {
+            "min_employees": 0,
+            "employee_types": set(),
+            "allowed_employee_groups": set(),
+            "requires_keyholder": False,
+            "keyholder_before_minutes": None,  # Use None for no requirement
+            "keyholder_after_minutes": None,  # Use None for no requirement
+        }
+    return requirement.as_dict()
 
-    # If min_employees > 0 but types/groups are empty, populate with all EmployeeGroup values as a fallback.
-    # This depends on business rules: should it enforce types/groups if specified by *any* rule,
-    # or only if *all* contributing rules agree, or have a default?
-    # For now, if any coverage applied, the union is used. If no coverage applied, types/groups are empty.
-    # If min_employees > 0 due to some coverage rule, but that rule had no types/groups,
-    # it might be desirable to fall back to all groups.
-    # The current logic: if a coverage rule contributes to min_employees, its types/groups (even if empty list)
-    # will be part of the union. So if min_employees > 0, but employee_types is empty, it means
-    # the contributing coverage rule(s) had empty employee_types.
 
-    # Consider if default 'employee_types' or 'allowed_employee_groups' should be applied
-    # if min_employees > 0 and these sets are still empty.
-    # For example, if min_employees > 0 and not required_staffing['allowed_employee_groups']:
-    #     required_staffing['allowed_employee_groups'] = {group.value for group in EmployeeGroup}
+def get_coverage_timeline(resources: ScheduleResources) -> CoverageTimeline:
+    """
+    Returns the compiled coverage timeline for `resources`.
 
-    return required_staffing
+    ScheduleResources keeps one cached on the instance; for any other
+    resources-like object (e.g. test doubles) the rules are compiled on demand.
+    """
+    timeline = getattr(resources, "coverage_timeline", None)
+    if isinstance(timeline, CoverageTimeline):
+        return timeline
+    return CoverageTimeline(
+        getattr(resources, "coverage", None) or [],
+        getattr(resources, "settings", None),
+    )
@@ -0,0 +1,124 @@
+"""Level-gated, lazily formatted diagnostics for the scheduler hot path.
+
+The generator and the DistributionManager used to build f-strings and
+``json.dumps(..., indent=2)`` dumps of whole shift lists for every day and
+candidate, even when the logger discarded them. A ``DiagnosticChannel``
+checks the level first and formats afterwards: messages take ``%``-style
+arguments or a callable (callable arguments such as ``lazy_json(...)`` are
+also only evaluated when logged), and per-candidate messages can be sampled.
+
+The generation option ``diagnostics`` selects how much is traced:
+
+- ``"off"``: warnings and errors only
+- ``"summary"``: per-step and per-day summaries (default)
+- ``"full"``: everything, including per-candidate decisions (sampled)
+"""
+
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Union
+
+DIAGNOSTICS_MODES = ("off", "summary", "full")
+DEFAULT_DIAGNOSTICS = "summary"
+
+_MODE_LEVELS = {
+    "off": logging.WARNING,
+    "summary": logging.INFO,
+    "full": logging.DEBUG,
+}
+
+Message = Union[str, Callable[[], str]]
+
+
+def diagnostics_level(mode: str) -> int:
+    """Logging level that corresponds to a diagnostics mode."""
+    if mode not in _MODE_LEVELS:
+        raise ValueError(
+            f"Unknown diagnostics mode {mode!r}, expected one of {DIAGNOSTICS_MODES}"
+        )
+    return _MODE_LEVELS[mode]
+
+
+def resolve_diagnostics(config: Optional[Dict[str, Any]]) -> str:
+    """The diagnostics mode of a generation config.
+
+    ``diagnostics`` wins; the older ``enable_diagnostics`` flag means "full".
+    """
+    config = config or {}
+    mode = config.get("diagnostics")
+    if mode:
+        diagnostics_level(mode)
+        return mode
+    return "full" if config.get("enable_diagnostics") else DEFAULT_DIAGNOSTICS
+
+
+def lazy_json(data: Any, indent: Optional[int] = 2) -> Callable[[], str]:
+    """A message callable that serializes ``data`` only when it is logged."""
+    return lambda: json.dumps(data, default=str, indent=indent)
+
+
+class DiagnosticChannel:
+    """Gates, formats and samples diagnostic messages for one logger
+
+    Works with standard ``logging.Logger`` instances and with the central
+    application logger, which only takes preformatted messages.
+    """
+
+    def __init__(
+        self,
+        logger: Any,
+        mode: str = DEFAULT_DIAGNOSTICS,
+        sample_first: int = 5,
+        sample_every: int = 100,
+    ):
+        self.logger = logger
+        self.sample_first = sample_first
+        self.sample_every = sample_every
+        self._sample_counts: Dict[str, int] = defaultdict(int)
+        self.set_mode(mode)
+
+    def set_mode(self, mode: str) -> None:
+        self.level = diagnostics_level(mode)
+        self.mode = mode
+
+    def is_enabled(self, level: int = logging.DEBUG) -> bool:
+        if level < self.level:
+            return False
+        is_enabled_for = getattr(self.logger, "isEnabledFor", None)
+        return is_enabled_for(level) if is_enabled_for is not None else True
+
+    def log(self, level: int, message: Message, *args: Any) -> None:
+        if not self.is_enabled(level):
+            return
+        if callable(message):
+            message = message()
+        elif args:
+            message = message % tuple(arg() if callable(arg) else arg for arg in args)
+        getattr(self.logger, logging.getLevelName(level).lower())(message)
+
+    def debug(self, message: Message, *args: Any) -> None:
+        self.log(logging.DEBUG, message, *args)
+
+    def info(self, message: Message, *args: Any) -> None:
+        self.log(logging.INFO, message, *args)
+
+    def sampled(
+        self, key: str, message: Message, *args: Any, level: int = logging.DEBUG
+    ) -> None:
+        """Log the first ``sample_first`` messages of ``key``, then every ``sample_every``-th."""
+        if not self.is_enabled(level):
+            return
+        self._sample_counts[key] += 1
+        count = self._sample_counts[key]
+        if count <= self.sample_first or count % self.sample_every == 0:
+            self.log(level, message, *args)
+
+    def sample_counts(self) -> Dict[str, int]:
+        """Number of sampled messages seen per key, logged or not"""
+        return dict(self._sample_counts)
+
+    def data(self, name: str, data: Any, level: int = logging.DEBUG) -> None:
+        """Log a structure as indented JSON, serialized only when enabled"""
+        if self.is_enabled(level):
+            self.log(level, "%s:\n%s", name, json.dumps(data, default=str, indent=2))
@@ -9,6 +9,10 @@ import logging
 from .resources import (
     ScheduleResources,
 )  # Assuming ScheduleResources is in resources.py
+from .absence_index import AbsenceIndex
+from .assignment_store import AssignmentStore
+from .assignment_solver import solve_assignment
+from .diagnostics import DEFAULT_DIAGNOSTICS, DiagnosticChannel
 
 try:
     from .coverage_utils import (
@@ -53,6 +57,11 @@ except ImportError:
 from .feature_extractor import FeatureExtractor  # Import the FeatureExtractor
 import random  # Import random for dummy predictions
 
+try:
+    import numpy as np
+except ImportError:  # Batched scoring falls back to the scalar path
+    np = None
+
 # Add parent directories to path if needed
 current_dir = os.path.dirname(os.path.abspath(__file__))
 src_backend_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
@@ -202,6 +211,16 @@ class ShiftScore:
 class DistributionManager:
     """Manages fair distribution of shifts among employees"""
 
+    # Base score per availability type; other types cannot be assigned
+    AVAILABILITY_TYPE_SCORES = {"FIXED": 100.0, "PREFERRED": 50.0, "AVAILABLE": 10.0}
+
+    # "greedy" fills shifts one at a time; "assignment" solves each day as a
+    # min-cost assignment problem (see assign_employees_optimal)
+    ENGINES = ("greedy", "assignment")
+    # Cost bonus of slots needed for minimum staffing; larger than any score
+    # difference so that coverage always wins over individual preferences
+    REQUIRED_SLOT_BONUS = 10000.0
+
     def __init__(
         self,
         resources,
@@ -213,17 +232,23 @@ class DistributionManager:
             FeatureExtractor
         ] = None,  # Add feature_extractor parameter
         ml_model: Any = None,  # Add placeholder for ML model
+        batched_scoring: bool = True,
+        engine: str = "greedy",
+        diagnostics: str = DEFAULT_DIAGNOSTICS,
     ):
         self.resources = resources
         self.constraint_checker = constraint_checker
         self.availability_checker = availability_checker
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
+        # Level-gated, sampled channel for per-day and per-candidate messages
+        self.diagnostics = DiagnosticChannel(self.logger, diagnostics)
         self.feature_extractor = feature_extractor  # Store feature extractor
         self.ml_model = ml_model  # Store ML model placeholder
 
         # Initialize assignments dictionary for all employees
-        self.assignments_by_employee = defaultdict(list)
+        self.assignments_by_employee = AssignmentStore()
+        self.shift_templates: Dict[Any, Any] = {}
         self.schedule_by_date = {}
         # MODIFIED: Use defaultdict(dict) to allow mixed types (int for counts, float for hours)
         self.employee_history = defaultdict(dict)
@@ -233,9 +258,25 @@ class DistributionManager:
         self.fair_distribution_weight = 1.0
         self.preference_weight = 1.0
         self.seniority_weight = 0.5
+        # Score all candidate pairs of a shift type at once (see calculate_assignment_score_matrix)
+        self.batched_scoring = batched_scoring
+        self.engine = "greedy"
+        self.set_engine(engine)
 
         self._initialize_assignments()
 
+    def set_engine(self, engine: str):
+        """Select the distribution engine ("greedy" or "assignment")."""
+        if engine not in self.ENGINES:
+            raise ValueError(
+                f"Unknown distribution engine {engine!r}, expected one of {self.ENGINES}"
+            )
+        self.engine = engine
+
+    def set_diagnostics(self, mode: str):
+        """Select how much is traced: "off", "summary" or "full" (see diagnostics.py)."""
+        self.diagnostics.set_mode(mode)
+
     def _initialize_assignments(self):
         """Initialize assignments dictionary for all employees"""
         try:
@@ -276,11 +317,10 @@ class DistributionManager:
     ) -> List[Dict]:
         """Assign employees to shifts of a specific type"""
         try:
-            self.logger.info(
-                f"Assigning employees for shift type {shift_type} on {current_date}"
+            self.diagnostics.info(
+                "Assigning employees for shift type %s on %s (%d shifts, %d employees)",
+                shift_type, current_date, len(shifts), len(available_employees),
             )
-            self.logger.info(f"Available shifts: {len(shifts)}")
-            self.logger.info(f"Available employees: {len(available_employees)}")
 
             assignments = []
 
@@ -289,22 +329,9 @@ class DistributionManager:
             shifts_assigned_today = defaultdict(int)
 
             # Get existing assignments for the current date
-            for (
-                employee_id,
-                employee_assignments,
-            ) in self.assignments_by_employee.items():
-                for assignment in employee_assignments:
-                    if (
-                        isinstance(assignment, dict)
-                        and assignment.get("date") == current_date
-                    ):
-                        shifts_assigned_today[employee_id] += 1
-                    # Corrected: Use .get("date") for dictionaries
-                    elif (
-                        isinstance(assignment, dict)
-                        and assignment.get("date") == current_date
-                    ):
-                        shifts_assigned_today[employee_id] += 1
+            shifts_assigned_today.update(
+                self.assignments_by_employee.counts_on(current_date)
+            )
 
             # Maximum shifts per employee per day
             max_shifts_per_day = 1  # Set to 1 to prevent multiple shifts per day
@@ -419,17 +446,30 @@ class DistributionManager:
             # and then select the best pairs to fill the shifts.
             # This requires iterating through shifts and, for each shift, iterating through available employees.
 
+            candidates = []
+            for employee in available_employees:
+                employee_id = self.get_id(employee, ["id", "employee_id"])
+                if employee_id is not None:
+                    candidates.append((employee, employee_id))
+
+            # Rule-based scores for all candidate pairs, computed in one batch
+            score_matrix = None
+            if self.batched_scoring and np is not None:
+                score_matrix = self.calculate_assignment_score_matrix(
+                    [employee_id for _, employee_id in candidates],
+                    shifts,
+                    current_date,
+                    {},
+                    AvailabilityType.AVAILABLE,
+                )
+
             scored_employee_shift_pairs = []
-            for shift in shifts:
+            for shift_index, shift in enumerate(shifts):
                 shift_id = self.get_id(shift, ["id", "shift_id", "shift_template_id"])
                 if shift_id is None:
                     continue
 
-                for employee in available_employees:
-                    employee_id = self.get_id(employee, ["id", "employee_id"])
-                    if employee_id is None:
-                        continue
-
+                for employee_index, (employee, employee_id) in enumerate(candidates):
                     # Check basic feasibility (e.g., daily shift limit, availability)
                     if shifts_assigned_today.get(employee_id, 0) >= max_shifts_per_day:
                         continue
@@ -447,9 +487,14 @@ class DistributionManager:
                     # You would use methods like self._calculate_history_adjustment, self._calculate_preference_adjustment, etc.
                     # Need to pass necessary context to these methods.
                     # For now, a simple placeholder combined score:
-                    rule_based_score = self.calculate_assignment_score(
-                        employee_id, shift, current_date, {}, AvailabilityType.AVAILABLE
-                    )
+                    if score_matrix is not None:
+                        rule_based_score = float(
+                            score_matrix[employee_index, shift_index]
+                        )
+                    else:
+                        rule_based_score = self.calculate_assignment_score(
+                            employee_id, shift, current_date, {}, AvailabilityType.AVAILABLE
+                        )
                     # Note: _calculate_assignment_score currently takes ShiftTemplate as input,
                     # you might need to adapt it or get the ShiftTemplate object here.
                     # The fourth argument ({}) is a placeholder for the context dictionary.
@@ -487,17 +532,8 @@ class DistributionManager:
                 days_since_last = 7  # Default to maximum if no previous shifts
 
                 if self.assignments_by_employee.get(employee_id):
-                    last_shift_date = max(
-                        d
-                        for assignment in self.assignments_by_employee[employee_id]
-                        if (
-                            d := (
-                                assignment.get("date")
-                                if isinstance(assignment, dict)
-                                else getattr(assignment, "date", None)
-                            )
-                        )
-                        is not None
+                    last_shift_date = self.assignments_by_employee.last_date(
+                        employee_id
                     )
                     # Check if max returned a valid date before calculating timedelta
                     if isinstance(last_shift_date, date):
@@ -546,13 +582,13 @@ class DistributionManager:
             # iterating through shifts and employees, checking constraints, etc.
             # I will not replicate the full code here but mark where the assignment loop happens.
 
-            self.logger.info(
+            self.diagnostics.debug(
                 "Employees sorted by priority score (Rule-based). ML predictions are available for use in assignment loop."
             )
 
             # --- Core Assignment Logic ---
             # Now, iterate through shifts and assign employees based on scores and coverage
-            self.logger.info(f"Selecting employees for {len(shifts)} shifts based on scores.")
+            self.diagnostics.debug("Selecting employees for %d shifts based on scores.", len(shifts))
 
             # Sort shifts by some criteria if needed (e.g., start time, priority)
             # For now, process in the order provided
@@ -561,7 +597,7 @@ class DistributionManager:
                 if shift_id is None:
                     continue
 
-                self.logger.debug(f"Processing shift: {shift_id}")
+                self.diagnostics.debug("Processing shift: %s", shift_id)
 
                 # Filter scored pairs for the current shift
                 shift_candidates = [
@@ -583,7 +619,10 @@ class DistributionManager:
                 # Keep track of employees already assigned to this specific shift to prevent duplicates
                 employees_assigned_to_this_shift = set()
 
-                self.logger.debug(f"Shift {shift_id} requires {min_required_employees}-{max_allowed_employees} employees, keyholder: {requires_keyholder}")
+                self.diagnostics.debug(
+                    "Shift %s requires %s-%s employees, keyholder: %s",
+                    shift_id, min_required_employees, max_allowed_employees, requires_keyholder,
+                )
 
                 # Phase 1: Assign employees up to the minimum required staffing
                 for candidate in shift_candidates:
@@ -596,22 +635,35 @@ class DistributionManager:
 
                     # Check if employee has reached daily shift limit
                     if shifts_assigned_today.get(employee_id, 0) >= max_shifts_per_day:
-                        self.logger.debug(f"Employee {employee_id} reached daily shift limit.")
+                        self.diagnostics.sampled(
+                            "daily_limit", "Employee %s reached daily shift limit.", employee_id
+                        )
                         continue
 
                     # Check if we have met the minimum required staffing for this shift
                     if assigned_count >= min_required_employees:
-                        self.logger.debug(f"Met minimum required staffing ({min_required_employees}) for shift {shift_id}.")
+                        self.diagnostics.debug(
+                            "Met minimum required staffing (%s) for shift %s.",
+                            min_required_employees, shift_id,
+                        )
                         break # Stop assigning once minimum is met
 
                     # Validate constraints before assignment
                     if not self._validate_assignment_constraints(employee, shift, current_date):
-                        self.logger.debug(f"Employee {employee_id} failed constraint validation for shift {shift_id}")
+                        self.diagnostics.sampled(
+                            "constraint_rejected",
+                            "Employee %s failed constraint validation for shift %s",
+                            employee_id, shift_id,
+                        )
                         continue
 
                     # Double-check availability as a safety measure
                     if not self._validate_employee_availability(employee, current_date):
-                        self.logger.debug(f"Employee {employee_id} failed availability check for {current_date}")
+                        self.diagnostics.sampled(
+                            "availability_rejected",
+                            "Employee %s failed availability check for %s",
+                            employee_id, current_date,
+                        )
                         continue
 
                     # Create the assignment
@@ -629,7 +681,10 @@ class DistributionManager:
                     if getattr(employee, 'is_keyholder', False):
                         keyholder_assigned = True
                     
-                    self.logger.info(f"Assigned employee {employee_id} to shift {shift_id} on {current_date} (assignment {assigned_count}/{min_required_employees})")
+                    self.diagnostics.debug(
+                        "Assigned employee %s to shift %s on %s (assignment %d/%s)",
+                        employee_id, shift_id, current_date, assigned_count, min_required_employees,
+                    )
 
                 # Phase 2: Check if minimum staffing was met
                 if assigned_count < min_required_employees:
@@ -658,12 +713,17 @@ class DistributionManager:
                                     shifts_assigned_today[employee_id] += 1
                                     employees_assigned_to_this_shift.add(employee_id)
                                     keyholder_assigned = True
-                                    self.logger.info(f"Assigned keyholder {employee_id} to shift {shift_id}")
+                                    self.diagnostics.debug(
+                                        "Assigned keyholder %s to shift %s", employee_id, shift_id
+                                    )
                                     break
 
                 # Phase 4: Assign additional employees up to maximum if beneficial
                 if assigned_count < max_allowed_employees:
-                    self.logger.debug(f"Considering additional assignments for shift {shift_id} (current: {assigned_count}, max: {max_allowed_employees})")
+                    self.diagnostics.debug(
+                        "Considering additional assignments for shift %s (current: %d, max: %s)",
+                        shift_id, assigned_count, max_allowed_employees,
+                    )
                     
                     for candidate in shift_candidates:
                         employee_id = candidate["employee_id"]
@@ -681,7 +741,11 @@ class DistributionManager:
                         # Only assign additional employees if their score is good enough
                         # (to avoid overstaffing with poorly suited employees)
                         if candidate["combined_score"] > 10.0:  # Threshold for additional assignments
-                            self.logger.debug(f"Employee {employee_id} score too high for additional assignment: {candidate['combined_score']}")
+                            self.diagnostics.sampled(
+                                "score_threshold",
+                                "Employee %s score too high for additional assignment: %s",
+                                employee_id, candidate["combined_score"],
+                            )
                             continue
 
                         # Validate constraints and availability
@@ -694,20 +758,26 @@ class DistributionManager:
                                 assigned_count += 1
                                 shifts_assigned_today[employee_id] += 1
                                 employees_assigned_to_this_shift.add(employee_id)
-                                self.logger.info(f"Assigned additional employee {employee_id} to shift {shift_id} (total: {assigned_count})")
+                                self.diagnostics.debug(
+                                    "Assigned additional employee %s to shift %s (total: %d)",
+                                    employee_id, shift_id, assigned_count,
+                                )
 
-                self.logger.info(f"Completed assignment for shift {shift_id}: {assigned_count} employees assigned (min: {min_required_employees}, max: {max_allowed_employees})")
+                self.diagnostics.info(
+                    "Completed assignment for shift %s: %d employees assigned (min: %s, max: %s)",
+                    shift_id, assigned_count, min_required_employees, max_allowed_employees,
+                )
 
             # --- End Core Assignment Logic ---
 
-            self.logger.info(f"Finished assigning employees for shift type {shift_type}. Total assignments: {len(assignments)}")
+            self.diagnostics.info(
+                "Finished assigning employees for shift type %s. Total assignments: %d",
+                shift_type, len(assignments),
+            )
 
-            # Update self.assignments_by_employee with the new assignments for downstream steps
+            # Record the new assignments for downstream steps and constraint checks
             for assignment in assignments:
-                employee_id = assignment["employee_id"]
-                if employee_id not in self.assignments_by_employee:
-                    self.assignments_by_employee[employee_id] = []
-                self.assignments_by_employee[employee_id].append(assignment)
+                self._record_assignment(assignment["employee_id"], assignment)
 
             return assignments
 
@@ -797,7 +867,11 @@ class DistributionManager:
             is_valid = self.constraint_checker.validate_assignment(temp_assignment, employee, shift)
             
             if not is_valid:
-                self.logger.debug(f"Constraint validation failed for employee {employee_id}, shift {shift_id}")
+                self.diagnostics.sampled(
+                    "constraint_failed",
+                    "Constraint validation failed for employee %s, shift %s",
+                    employee_id, shift_id,
+                )
             
             return is_valid
             
@@ -904,8 +978,9 @@ class DistributionManager:
             List of assignment dictionaries
         """
         try:
-            self.logger.info(f"Generating assignments for {current_date}")
-            self.logger.info(f"Processing {len(date_shifts)} shifts")
+            self.diagnostics.info(
+                "Generating assignments for %s (%d shifts)", current_date, len(date_shifts)
+            )
             
             # Get available employees if not provided
             if available_employees is None:
@@ -923,7 +998,17 @@ class DistributionManager:
                     self.logger.error("No employees available and no resources to get them from")
                     return []
             
-            self.logger.info(f"Found {len(available_employees)} available employees")
+            # Drop employees absent on this date with one bulk lookup instead of
+            # re-checking every absence per candidate and shift
+            if isinstance(getattr(self.resources, "absence_index", None), AbsenceIndex):
+                absent_ids = self.resources.absent_employee_ids(current_date)
+                if absent_ids:
+                    available_employees = [
+                        e for e in available_employees
+                        if self.get_id(e, ["id", "employee_id"]) not in absent_ids
+                    ]
+
+            self.diagnostics.info("Found %d available employees", len(available_employees))
             
             if not available_employees:
                 self.logger.warning(f"No available employees for {current_date}")
@@ -933,6 +1018,15 @@ class DistributionManager:
                 self.logger.warning(f"No shifts to assign for {current_date}")
                 return []
             
+            if self.engine == "assignment":
+                all_assignments = self.assign_employees_optimal(
+                    current_date, date_shifts, available_employees
+                )
+                self.diagnostics.info(
+                    "Generated %d total assignments for %s", len(all_assignments), current_date
+                )
+                return all_assignments
+
             # Group shifts by type for more efficient assignment
             shifts_by_type = defaultdict(list)
             for shift in date_shifts:
@@ -941,12 +1035,14 @@ class DistributionManager:
                 )
                 shifts_by_type[shift_type].append(shift)
             
-            self.logger.info(f"Grouped shifts into {len(shifts_by_type)} types: {list(shifts_by_type.keys())}")
+            self.diagnostics.debug(
+                "Grouped shifts into %d types: %s", len(shifts_by_type), list(shifts_by_type)
+            )
             
             # Generate assignments for each shift type
             all_assignments = []
             for shift_type, shifts in shifts_by_type.items():
-                self.logger.info(f"Processing {len(shifts)} shifts of type {shift_type}")
+                self.diagnostics.debug("Processing %d shifts of type %s", len(shifts), shift_type)
                 
                 # Get employees available for this shift type
                 type_available_employees = self._filter_employees_for_shift_type(
@@ -963,15 +1059,178 @@ class DistributionManager:
                 )
                 
                 all_assignments.extend(type_assignments)
-                self.logger.info(f"Created {len(type_assignments)} assignments for shift type {shift_type}")
+                self.diagnostics.debug(
+                    "Created %d assignments for shift type %s", len(type_assignments), shift_type
+                )
             
-            self.logger.info(f"Generated {len(all_assignments)} total assignments for {current_date}")
+            self.diagnostics.info(
+                "Generated %d total assignments for %s", len(all_assignments), current_date
+            )
             return all_assignments
             
         except Exception as e:
             self.logger.error(f"Error generating assignments for {current_date}: {str(e)}", exc_info=True)
             return []
 
+    def assign_employees_optimal(
+        self,
+        current_date: date,
+        shifts: List[Any],
+        available_employees: List[Any],
+    ) -> List[Dict]:
+        """Assign a whole day at once as a min-cost assignment problem.
+
+        Every shift is expanded into staffing slots: ``min_employees`` required
+        slots (one of them reserved for a keyholder if the shift needs one) and
+        optional slots up to ``max_employees``. Each employee is matched to at
+        most one slot, or left unassigned at zero cost. A pair costs minus its
+        ``calculate_assignment_score``, required slots get
+        ``REQUIRED_SLOT_BONUS`` on top, and pairs failing the shift type filter,
+        the constraint checks or the availability check are forbidden. The
+        result maximizes covered required slots first and the total score second,
+        so optional slots are only filled by employees with a positive score.
+        """
+        try:
+            already_assigned = self.assignments_by_employee.counts_on(current_date)
+            candidates = []
+            for employee in available_employees:
+                employee_id = self.get_id(employee, ["id", "employee_id"])
+                # Same daily limit as the greedy engine: one shift per employee
+                if employee_id is not None and not already_assigned.get(employee_id):
+                    candidates.append((employee, employee_id))
+
+            shifts = [
+                shift for shift in shifts
+                if self.get_id(shift, ["id", "shift_id", "shift_template_id"]) is not None
+            ]
+            if not candidates or not shifts:
+                return []
+
+            if self.batched_scoring and np is not None:
+                score_matrix = self.calculate_assignment_score_matrix(
+                    [employee_id for _, employee_id in candidates],
+                    shifts,
+                    current_date,
+                    {},
+                    AvailabilityType.AVAILABLE,
+                )
+                scores = [[float(value) for value in row] for row in score_matrix]
+            else:
+                scores = [
+                    [
+                        self.calculate_assignment_score(
+                            employee_id, shift, current_date, {}, AvailabilityType.AVAILABLE
+                        )
+                        for shift in shifts
+                    ]
+                    for _, employee_id in candidates
+                ]
+
+            # Hard constraints, checked once per employee-shift pair
+            eligible_by_type: Dict[Any, set] = {}
+            available_ids = set()
+            for employee, employee_id in candidates:
+                if self._validate_employee_availability(employee, current_date):
+                    available_ids.add(employee_id)
+            feasible = []
+            for employee_index, (employee, employee_id) in enumerate(candidates):
+                row = []
+                for shift_index, shift in enumerate(shifts):
+                    shift_type = getattr(shift, "shift_type", None) or (
+                        shift.get("shift_type") if isinstance(shift, dict) else "UNKNOWN"
+                    )
+                    if shift_type not in eligible_by_type:
+                        eligible_by_type[shift_type] = {
+                            self.get_id(e, ["id", "employee_id"])
+                            for e in self._filter_employees_for_shift_type(
+                                [e for e, _ in candidates], shift_type, current_date
+                            )
+                        }
+                    row.append(
+                        employee_id in available_ids
+                        and employee_id in eligible_by_type[shift_type]
+                        and scores[employee_index][shift_index] != -float("inf")
+                        and self._validate_assignment_constraints(employee, shift, current_date)
+                    )
+                feasible.append(row)
+
+            # Slots as (shift_index, required, keyholder_only)
+            slots = []
+            for shift_index, shift in enumerate(shifts):
+                staffing_info = self._get_required_staffing_info_for_shift(shift, current_date)
+                min_required = staffing_info.get("min_employees", 1)
+                max_allowed = max(
+                    staffing_info.get("max_employees", min_required + 1), min_required
+                )
+                requires_keyholder = staffing_info.get("requires_keyholder", False)
+                for slot_number in range(max_allowed):
+                    required = slot_number < min_required or (
+                        requires_keyholder and slot_number == 0
+                    )
+                    slots.append(
+                        (shift_index, required, requires_keyholder and slot_number == 0)
+                    )
+
+            costs = []
+            for employee_index, (employee, _) in enumerate(candidates):
+                is_keyholder = getattr(employee, "is_keyholder", False)
+                row = []
+                for shift_index, required, keyholder_only in slots:
+                    if not feasible[employee_index][shift_index] or (
+                        keyholder_only and not is_keyholder
+                    ):
+                        row.append(None)
+                        continue
+                    cost = -scores[employee_index][shift_index]
+                    if required:
+                        cost -= self.REQUIRED_SLOT_BONUS
+                    row.append(cost)
+                # One "unassigned" column per employee
+                row.extend(
+                    0.0 if column == employee_index else None
+                    for column in range(len(candidates))
+                )
+                costs.append(row)
+
+            chosen = solve_assignment(costs)
+
+            assignments_by_shift = defaultdict(list)
+            for employee_index, column in enumerate(chosen):
+                if column is None or column >= len(slots):
+                    continue
+                assignments_by_shift[slots[column][0]].append(
+                    candidates[employee_index][0]
+                )
+
+            assignments = []
+            for shift_index, shift in enumerate(shifts):
+                for employee in assignments_by_shift.get(shift_index, []):
+                    assignment_data = self._create_assignment_data(employee, shift, current_date)
+                    if assignment_data is not None:
+                        assignments.append(assignment_data)
+
+            filled_columns = set(chosen)
+            unfilled = sum(
+                1 for column, (_, required, _) in enumerate(slots)
+                if required and column not in filled_columns
+            )
+            if unfilled:
+                self.logger.warning(
+                    f"Could not fill {unfilled} required staffing slots on {current_date}"
+                )
+
+            for assignment in assignments:
+                self._record_assignment(assignment["employee_id"], assignment)
+
+            return assignments
+
+        except Exception as e:
+            self.logger.error(
+                f"Error solving assignments for {current_date}: {str(e)}",
+                exc_info=True,
+            )
+            return []
+
     def _filter_employees_for_shift_type(
         self, 
         employees: List[Any], 
@@ -1002,7 +1261,9 @@ class DistributionManager:
                 avoid_shifts = preferences.get("avoid_shifts", [])
                 
                 if shift_type in avoid_shifts:
-                    self.logger.debug(f"Employee {employee_id} avoids shift type {shift_type}")
+                    self.diagnostics.sampled(
+                        "avoided_shift_type", "Employee %s avoids shift type %s", employee_id, shift_type
+                    )
                     continue
                 
                 # Check if employee is available for this day of week
@@ -1010,7 +1271,9 @@ class DistributionManager:
                 avoid_days = preferences.get("avoid_days", [])
                 
                 if day_of_week in avoid_days:
-                    self.logger.debug(f"Employee {employee_id} avoids day {day_of_week}")
+                    self.diagnostics.sampled(
+                        "avoided_day", "Employee %s avoids day %s", employee_id, day_of_week
+                    )
                     continue
                 
                 # Additional checks can be added here (skills, certifications, etc.)
@@ -1073,7 +1336,13 @@ class DistributionManager:
         # Ensure adjustment doesn't become excessively large or small
         adjustment = max(min(adjustment, 20.0), -20.0) # Cap adjustment to a reasonable range
 
-        self.logger.debug(f"History adjustment for Emp {employee_id}, Shift {shift_type} ({shift_category}): {adjustment} (Employee count: {employee_category_count}, Avg count: {average_category_count}, Deviation: {deviation}, Employee ratio: {employee_ratio:.2f}, Overall ratio: {overall_ratio:.2f}, Ratio deviation: {ratio_deviation:.2f})")
+        self.diagnostics.sampled(
+            "history_adjustment",
+            "History adjustment for Emp %s, Shift %s (%s): %s (Employee count: %s, Avg count: %s, "
+            "Deviation: %s, Employee ratio: %.2f, Overall ratio: %.2f, Ratio deviation: %.2f)",
+            employee_id, shift_type, shift_category, adjustment, employee_category_count,
+            average_category_count, deviation, employee_ratio, overall_ratio, ratio_deviation,
+        )
 
         return adjustment
 
@@ -1096,10 +1365,18 @@ class DistributionManager:
         # Simple check based on lists
         if shift_type in preferred_shifts:
             adjustment -= 2.0 # Bonus for preferred shift type
-            self.logger.debug(f"Preference adjustment for Emp {employee_id}, Shift {shift_type}: Applied bonus for preferred shift type.")
+            self.diagnostics.sampled(
+                "preference_adjustment",
+                "Preference adjustment for Emp %s, Shift %s: Applied bonus for preferred shift type.",
+                employee_id, shift_type,
+            )
         elif shift_type in avoid_shifts:
             adjustment += 2.0 # Penalty for avoided shift type
-            self.logger.debug(f"Preference adjustment for Emp {employee_id}, Shift {shift_type}: Applied penalty for avoided shift type.")
+            self.diagnostics.sampled(
+                "preference_adjustment",
+                "Preference adjustment for Emp %s, Shift %s: Applied penalty for avoided shift type.",
+                employee_id, shift_type,
+            )
 
         # Check day of week preferences
         # Assuming preferences can have preferred_days and avoid_days as lists of weekday integers (0=Monday, 6=Sunday)
@@ -1109,16 +1386,28 @@ class DistributionManager:
         # Simple check based on lists
         if day_of_week in preferred_days:
             adjustment -= 1.0 # Bonus for preferred day of week
-            self.logger.debug(f"Preference adjustment for Emp {employee_id}, Shift {shift_type} on day {day_of_week}: Applied bonus for preferred day.")
+            self.diagnostics.sampled(
+                "preference_adjustment",
+                "Preference adjustment for Emp %s, Shift %s on day %s: Applied bonus for preferred day.",
+                employee_id, shift_type, day_of_week,
+            )
         elif day_of_week in avoid_days:
             adjustment += 1.0 # Penalty for avoided day of week
-            self.logger.debug(f"Preference adjustment for Emp {employee_id}, Shift {shift_type} on day {day_of_week}: Applied penalty for avoided day.")
+            self.diagnostics.sampled(
+                "preference_adjustment",
+                "Preference adjustment for Emp %s, Shift %s on day %s: Applied penalty for avoided day.",
+                employee_id, shift_type, day_of_week,
+            )
 
         # TODO: Implement logic to handle preference strength/scores if the preference data structure is more complex
         # e.g., if preferences = {'preferred_shifts': [{'type': 'EARLY', 'strength': 5}]},
         # the adjustment could be multiplied by strength.
 
-        self.logger.debug(f"Final preference adjustment for Emp {employee_id}, Shift {shift_type} on day {day_of_week}: {adjustment}")
+        self.diagnostics.sampled(
+            "preference_total",
+            "Final preference adjustment for Emp %s, Shift %s on day %s: %s",
+            employee_id, shift_type, day_of_week, adjustment,
+        )
 
         return adjustment
 
@@ -1130,6 +1419,12 @@ class DistributionManager:
 
         return any(self.get_id(a, ["shift_id"]) == shift_id for a in assignments)
 
+    def _record_assignment(self, employee_id, assignment):
+        """Store a committed assignment and add it to the constraint context."""
+        self.assignments_by_employee.add(employee_id, assignment)
+        if self.constraint_checker is not None:
+            self.constraint_checker.add_assignment(assignment)
+
     def initialize(self, employees, historical_data=None, shifts=None, resources=None):
         """Initialize the distribution manager with employee and historical data"""
         self.employees = employees or []
@@ -1139,9 +1434,16 @@ class DistributionManager:
         self.assignments = {}
 
         # Initialize assignments_by_employee for all employees
-        self.assignments_by_employee = defaultdict(list)
+        self.assignments_by_employee = AssignmentStore()
         for employee in self.employees:
             self.assignments_by_employee[employee.id] = []
+        if self.constraint_checker is not None:
+            self.constraint_checker.set_schedule([], {})
+
+        # Shift templates by ID (first template wins for duplicate IDs)
+        self.shift_templates = {}
+        for shift in self.shifts:
+            self.shift_templates.setdefault(shift.id, shift)
 
         # Log initialization
         self.logger.info(
@@ -1187,20 +1489,13 @@ class DistributionManager:
                 continue
 
             # Find shift details
-            shift = None
-            for s in self.shifts:
-                if s.id == shift_id:
-                    shift = s
-                    break
-
+            shift = self.shift_templates.get(shift_id)
             if not shift:
                 continue
 
             # Record the assignment
-            if employee_id not in self.assignments_by_employee:
-                self.assignments_by_employee[employee_id] = []
-
             assignment = {
+                "employee_id": employee_id,
                 "shift_id": shift_id,
                 "date": entry_date,
                 "start_time": shift.start_time
@@ -1215,10 +1510,10 @@ class DistributionManager:
                     "type", "unknown"
                 )
 
-            self.assignments_by_employee[employee_id].append(assignment)
+            self._record_assignment(employee_id, assignment)
 
         # Log loaded assignments
-        total_assignments = sum(len(a) for a in self.assignments_by_employee.values())
+        total_assignments = self.assignments_by_employee.total()
         self.logger.info(
             f"Loaded {total_assignments} historical assignments for "
             f"{len(self.assignments_by_employee)} employees"
@@ -1501,60 +1796,19 @@ class DistributionManager:
                 return -float("inf")
 
         # 1. AvailabilityType Scoring
-        # Determine availability string, prioritizing enum's .value if it's an enum member
-        if isinstance(
-            availability_type_override, AvailabilityType
-        ):  # Check if it's an instance of the Enum type
-            avail_type_str = availability_type_override.value
-        elif isinstance(availability_type_override, str):
-            avail_type_str = availability_type_override
-        else:  # Should not happen based on type hint Union[ActualAvailabilityType, str]
-            self.logger.warning(
-                f"Unexpected type for availability_type_override: {type(availability_type_override)}. Using as is."
-            )
-            avail_type_str = str(
-                availability_type_override
-            )  # Fallback to string conversion
-
-        if avail_type_str == "FIXED":
-            score += 100.0
-        elif avail_type_str == "PREFERRED":
-            score += 50.0
-        elif avail_type_str == "AVAILABLE":
-            score += 10.0
-        else:
+        avail_type_str = self._availability_type_str(availability_type_override)
+        availability_score = self.AVAILABILITY_TYPE_SCORES.get(avail_type_str)
+        if availability_score is None:
             self.logger.error(
                 f"calculate_assignment_score called for non-available state: {avail_type_str} for Emp {employee_id}"
             )
             return -float("inf")
+        score += availability_score
 
         # 2. Target Interval Needs Scoring
         target_interval_needs = context.get("target_interval_needs")
         if target_interval_needs:
-            if target_interval_needs.get("requires_keyholder"):
-                if getattr(employee, "is_keyholder", False):
-                    score += 150.0
-                else:
-                    score -= 1000.0
-            elif getattr(
-                employee, "is_keyholder", False
-            ):  # Not required, but is keyholder
-                score -= 10.0
-
-            required_target_employee_types = target_interval_needs.get(
-                "employee_types", []
-            )
-            if required_target_employee_types:
-                employee_group = getattr(employee, "employee_group", None)
-                if employee_group and employee_group in required_target_employee_types:
-                    score += 120.0
-                elif (
-                    employee_group
-                    and employee_group not in required_target_employee_types
-                ):
-                    score -= 750.0
-                elif not employee_group:
-                    score -= 100.0
+            score += self._interval_needs_adjustment(employee, target_interval_needs)
         else:
             self.logger.warning(
                 f"calculate_assignment_score: target_interval_needs not found in context for Emp {employee_id}, Shift {shift_template_id}, Date {shift_date}"
@@ -1569,21 +1823,7 @@ class DistributionManager:
         )
         
         # 3.5. Seniority Adjustment
-        # Higher seniority employees get priority (positive score adjustment)
-        employee_seniority = getattr(employee, "seniority", 1)  # Default to 1 if not set
-        if employee_seniority > 0:
-            # Normalize seniority score (assuming seniority ranges 1-10, adjust as needed)
-            max_seniority = 10  # Adjust based on your seniority scale
-            normalized_seniority = min(employee_seniority / max_seniority, 1.0)
-            
-            # Apply seniority bonus weighted by configuration
-            seniority_bonus = normalized_seniority * 50.0 * self.seniority_weight
-            score += seniority_bonus
-            
-            self.logger.debug(
-                f"Employee {employee_id} seniority: {employee_seniority}, "
-                f"normalized: {normalized_seniority:.2f}, bonus: {seniority_bonus:.2f}"
-            )
+        score += self._seniority_bonus(employee_id, employee)
 
         # 4. Shift Desirability Penalty
         cached_shift_info = self.shift_scores.get(shift_template_id)
@@ -1594,70 +1834,309 @@ class DistributionManager:
                 * base_penalty_factor
             )
 
-        # 5. Workload Penalty (Inline)
-        employee_assignments = self.assignments_by_employee.get(employee_id, [])
+        # 5. Workload Penalty
+        score -= self._workload_penalty(employee_id, employee) * self.fair_distribution_weight
+
+        # 6. Overstaffing Penalty
+        score -= self._overstaffing_penalty(context)
+
+        self.diagnostics.sampled(
+            "assignment_score",
+            "Final score for Emp %s, Shift %s, Date %s: %s",
+            employee_id, shift_template_id, shift_date, score,
+        )
+        return score
+
+    def _availability_type_str(self, availability_type_override: Any) -> str:
+        """Availability type as a string, using the enum value for enum members."""
+        if isinstance(availability_type_override, AvailabilityType):
+            return availability_type_override.value
+        if isinstance(availability_type_override, str):
+            return availability_type_override
+        # Should not happen based on type hint Union[ActualAvailabilityType, str]
+        self.logger.warning(
+            f"Unexpected type for availability_type_override: {type(availability_type_override)}. Using as is."
+        )
+        return str(availability_type_override)
+
+    def _interval_needs_adjustment(self, employee: Any, target_interval_needs: Dict) -> float:
+        """Keyholder and employee type part of the assignment score."""
+        adjustment = 0.0
+        is_keyholder = getattr(employee, "is_keyholder", False)
+        if target_interval_needs.get("requires_keyholder"):
+            adjustment += 150.0 if is_keyholder else -1000.0
+        elif is_keyholder:  # Not required, but is keyholder
+            adjustment -= 10.0
+
+        required_target_employee_types = target_interval_needs.get("employee_types", [])
+        if required_target_employee_types:
+            employee_group = getattr(employee, "employee_group", None)
+            if not employee_group:
+                adjustment -= 100.0
+            elif employee_group in required_target_employee_types:
+                adjustment += 120.0
+            else:
+                adjustment -= 750.0
+        return adjustment
+
+    def _seniority_bonus(self, employee_id: int, employee: Any) -> float:
+        """Higher seniority employees get priority (positive score adjustment)."""
+        employee_seniority = getattr(employee, "seniority", 1)  # Default to 1 if not set
+        if not employee_seniority > 0:
+            return 0.0
+        # Normalize seniority score (assuming seniority ranges 1-10, adjust as needed)
+        max_seniority = 10  # Adjust based on your seniority scale
+        normalized_seniority = min(employee_seniority / max_seniority, 1.0)
+
+        # Apply seniority bonus weighted by configuration
+        seniority_bonus = normalized_seniority * 50.0 * self.seniority_weight
+        self.diagnostics.sampled(
+            "seniority_bonus",
+            "Employee %s seniority: %s, normalized: %.2f, bonus: %.2f",
+            employee_id, employee_seniority, normalized_seniority, seniority_bonus,
+        )
+        return seniority_bonus
+
+    def _workload_penalty(self, employee_id: int, employee: Any) -> float:
+        """Penalty for the employee's current number of assignments and overtime."""
         num_assignments_processed = 0
         current_hours_worked = 0.0
-        for assignment_dict_for_workload in employee_assignments:
-            if isinstance(assignment_dict_for_workload, dict):
+        for assignment in self.assignments_by_employee.get(employee_id, []):
+            if isinstance(assignment, dict):
                 num_assignments_processed += 1
-                duration_for_workload = assignment_dict_for_workload.get(
-                    "duration_hours"
-                )
-                if duration_for_workload is None:
-                    start_t_for_workload = assignment_dict_for_workload.get(
-                        "start_time"
-                    )
-                    end_t_for_workload = assignment_dict_for_workload.get("end_time")
-                    if start_t_for_workload and end_t_for_workload:
-                        duration_for_workload = self.calculate_duration(
-                            start_t_for_workload, end_t_for_workload
-                        )
+                duration = assignment.get("duration_hours")
+                if duration is None:
+                    start_time_str = assignment.get("start_time")
+                    end_time_str = assignment.get("end_time")
+                    if start_time_str and end_time_str:
+                        duration = self.calculate_duration(start_time_str, end_time_str)
                     else:
-                        duration_for_workload = 0
-                current_hours_worked += duration_for_workload
+                        duration = 0
+                current_hours_worked += duration
 
         workload_penalty_val = num_assignments_processed * 10.0
-        contracted_hours_for_workload = getattr(employee, "contracted_hours", 40.0)
-        if (
-            contracted_hours_for_workload > 0
-            and current_hours_worked > contracted_hours_for_workload
-        ):
-            workload_penalty_val += (
-                current_hours_worked - contracted_hours_for_workload
-            ) * 1.5
-        score -= workload_penalty_val * self.fair_distribution_weight
-
-        # 6. Overstaffing Penalty (Inline)
-        overstaffing_penalty_val = 0.0
+        contracted_hours = getattr(employee, "contracted_hours", 40.0)
+        if contracted_hours > 0 and current_hours_worked > contracted_hours:
+            workload_penalty_val += (current_hours_worked - contracted_hours) * 1.5
+        return workload_penalty_val
+
+    def _overstaffing_penalty(self, context: Dict[str, Any]) -> float:
+        """Penalty for the share of the shift's intervals that are already fully staffed."""
         shift_covered_intervals = context.get("shift_covered_intervals", [])
         full_day_staffing_snapshot = context.get("full_day_staffing_snapshot")
-        if shift_covered_intervals and full_day_staffing_snapshot:
-            num_covered_intervals_overstaffed = 0
-            for interval_key in shift_covered_intervals:
-                if interval_key in full_day_staffing_snapshot:
-                    interval_staffing = full_day_staffing_snapshot[interval_key]
-                    current_staff = interval_staffing.get("current", 0)
-                    max_needed_staff = interval_staffing.get(
-                        "max_needed", interval_staffing.get("required", 0)
+        if not (shift_covered_intervals and full_day_staffing_snapshot):
+            return 0.0
+
+        num_covered_intervals_overstaffed = 0
+        for interval_key in shift_covered_intervals:
+            if interval_key in full_day_staffing_snapshot:
+                interval_staffing = full_day_staffing_snapshot[interval_key]
+                current_staff = interval_staffing.get("current", 0)
+                max_needed_staff = interval_staffing.get(
+                    "max_needed", interval_staffing.get("required", 0)
+                )
+                if current_staff >= max_needed_staff:
+                    num_covered_intervals_overstaffed += 1
+        if num_covered_intervals_overstaffed == 0:
+            return 0.0
+        return (
+            (num_covered_intervals_overstaffed / len(shift_covered_intervals))
+            * 25.0
+            * self.fair_distribution_weight
+        )
+
+    def _shift_template_id_for_scoring(self, shift_template: Any) -> Any:
+        if isinstance(shift_template, dict):
+            return (
+                shift_template.get("id")
+                or shift_template.get("shift_id")
+                or shift_template.get("shift_template_id")
+            )
+        return getattr(shift_template, "id", None)
+
+    def calculate_assignment_score_matrix(
+        self,
+        employee_ids: List[int],
+        shift_templates: List[Union[ShiftTemplate, Dict[str, Any]]],
+        shift_date: date,
+        context: Dict[str, Any],
+        availability_type_override: Union[AvailabilityType, str],
+    ):
+        """Score every (employee, shift) pair of a day at once.
+
+        Entry [i][j] equals calculate_assignment_score(employee_ids[i],
+        shift_templates[j], shift_date, context, availability_type_override).
+        Employee features (interval needs, seniority, workload, fairness
+        history, preferences) are computed once per employee and shift
+        features once per shift, then combined with array operations.
+
+        Returns:
+            A NumPy array of shape (len(employee_ids), len(shift_templates)),
+            or nested lists from the scalar path if NumPy is not installed.
+        """
+        if np is None:
+            return [
+                [
+                    self.calculate_assignment_score(
+                        employee_id,
+                        shift_template,
+                        shift_date,
+                        context,
+                        availability_type_override,
                     )
-                    if current_staff >= max_needed_staff:
-                        num_covered_intervals_overstaffed += 1
-            if (
-                num_covered_intervals_overstaffed > 0
-                and len(shift_covered_intervals) > 0
-            ):
-                overstaffing_penalty_val = (
-                    (num_covered_intervals_overstaffed / len(shift_covered_intervals))
-                    * 25.0
-                    * self.fair_distribution_weight
+                    for shift_template in shift_templates
+                ]
+                for employee_id in employee_ids
+            ]
+
+        num_employees = len(employee_ids)
+        num_shifts = len(shift_templates)
+        scores = np.full((num_employees, num_shifts), -np.inf)
+        if num_employees == 0 or num_shifts == 0:
+            return scores
+
+        avail_type_str = self._availability_type_str(availability_type_override)
+        availability_score = self.AVAILABILITY_TYPE_SCORES.get(avail_type_str)
+        if availability_score is None:
+            self.logger.error(
+                f"calculate_assignment_score_matrix called for non-available state: {avail_type_str}"
+            )
+            return scores
+
+        target_interval_needs = context.get("target_interval_needs")
+        if not target_interval_needs:
+            self.logger.warning(
+                f"calculate_assignment_score_matrix: target_interval_needs not found in context for {shift_date}"
+            )
+
+        # Shift features
+        valid_shift = np.zeros(num_shifts, dtype=bool)
+        desirability = np.zeros(num_shifts)
+        shift_categories = []
+        shift_types = []
+        for j, shift_template in enumerate(shift_templates):
+            shift_template_id = self._shift_template_id_for_scoring(shift_template)
+            shift_categories.append(self._categorize_shift(shift_template))
+            shift_types.append(getattr(shift_template, "shift_type", None))
+            if shift_template_id is None:
+                self.logger.warning(
+                    f"calculate_assignment_score_matrix: No ID found for shift template: {shift_template}"
                 )
-        score -= overstaffing_penalty_val
+                continue
+            valid_shift[j] = True
+            cached_shift_info = self.shift_scores.get(shift_template_id)
+            if cached_shift_info and isinstance(cached_shift_info, dict):
+                desirability[j] = (
+                    cached_shift_info.get("base_score", ShiftScore.STANDARD) * 5.0
+                )
+
+        # Employee features
+        valid_employee = np.zeros(num_employees, dtype=bool)
+        employee_base = np.zeros(num_employees)
+        seniority = np.zeros(num_employees)
+        workload = np.zeros(num_employees)
+        for i, employee_id in enumerate(employee_ids):
+            employee = self.resources.get_employee(employee_id) if self.resources else None
+            if not employee:
+                self.logger.warning(
+                    f"calculate_assignment_score_matrix: Employee {employee_id} not found in resources."
+                )
+                continue
+            valid_employee[i] = True
+            base = 0.0 + availability_score
+            if target_interval_needs:
+                base += self._interval_needs_adjustment(employee, target_interval_needs)
+            employee_base[i] = base
+            seniority[i] = self._seniority_bonus(employee_id, employee)
+            workload[i] = (
+                self._workload_penalty(employee_id, employee)
+                * self.fair_distribution_weight
+            )
 
-        self.logger.debug(
-            f"Final score for Emp {employee_id}, Shift {shift_template_id}, Date {shift_date}: {score}"
+        history = self._history_adjustment_matrix(employee_ids, shift_categories)
+        preference = self._preference_adjustment_matrix(
+            employee_ids, shift_types, shift_date
         )
-        return score
+
+        # Same order of operations as calculate_assignment_score
+        combined = employee_base[:, None] + history
+        combined = combined + preference
+        combined = combined + seniority[:, None]
+        combined = combined - desirability[None, :]
+        combined = combined - workload[:, None]
+        combined = combined - self._overstaffing_penalty(context)
+
+        valid = valid_employee[:, None] & valid_shift[None, :]
+        scores[valid] = combined[valid]
+        return scores
+
+    def _history_adjustment_matrix(self, employee_ids: List[int], shift_categories: List[str]):
+        """Vectorized _calculate_history_adjustment_v2 for employees x shifts."""
+        categories = sorted(set(shift_categories))
+        category_index = {category: c for c, category in enumerate(categories)}
+        histories = list(self.employee_history.values())
+        total_sum = sum(hist.get("total", 0) for hist in histories)
+
+        average_counts = np.zeros(len(categories))
+        overall_ratios = np.zeros(len(categories))
+        for c, category in enumerate(categories):
+            all_employee_counts = [
+                hist.get(category, 0) for hist in histories if hist.get("total", 0) > 0
+            ]
+            if all_employee_counts:
+                average_counts[c] = sum(all_employee_counts) / len(all_employee_counts)
+            if total_sum > 0:
+                overall_ratios[c] = (
+                    sum(hist.get(category, 0) for hist in histories) / total_sum
+                )
+
+        totals = np.zeros(len(employee_ids))
+        counts = np.zeros((len(employee_ids), len(categories)))
+        for i, employee_id in enumerate(employee_ids):
+            employee_history = self.employee_history.get(employee_id, {})
+            totals[i] = employee_history.get("total", 0)
+            for c, category in enumerate(categories):
+                counts[i, c] = employee_history.get(category, 0)
+
+        has_history = totals > 0
+        safe_totals = np.where(has_history, totals, 1.0)
+        adjustment = 0.0 - (counts - average_counts[None, :]) * 0.5
+        employee_ratio = counts / safe_totals[:, None]
+        adjustment = adjustment - (employee_ratio - overall_ratios[None, :]) * 10.0
+        adjustment = np.minimum(np.maximum(adjustment, -20.0), 20.0)
+        adjustment = np.where(has_history[:, None], adjustment, -0.1)
+
+        columns = [category_index[category] for category in shift_categories]
+        return adjustment[:, columns]
+
+    def _preference_adjustment_matrix(
+        self, employee_ids: List[int], shift_types: List[Any], shift_date: date
+    ):
+        """Vectorized _calculate_preference_adjustment_v2 for employees x shifts."""
+        adjustment = np.zeros((len(employee_ids), len(shift_types)))
+        day_of_week = shift_date.weekday()
+        for i, employee_id in enumerate(employee_ids):
+            preferences = self.employee_preferences.get(employee_id, {})
+            if not preferences:
+                continue
+            preferred_shifts = preferences.get("preferred_shifts", [])
+            avoid_shifts = preferences.get("avoid_shifts", [])
+            day_adjustment = 0.0
+            if day_of_week in preferences.get("preferred_days", []):
+                day_adjustment = -1.0
+            elif day_of_week in preferences.get("avoid_days", []):
+                day_adjustment = 1.0
+            type_adjustments = {}
+            for j, shift_type in enumerate(shift_types):
+                if shift_type not in type_adjustments:
+                    value = 0.0
+                    if shift_type in preferred_shifts:
+                        value = -2.0
+                    elif shift_type in avoid_shifts:
+                        value = 2.0
+                    type_adjustments[shift_type] = value + day_adjustment
+                adjustment[i, j] = type_adjustments[shift_type]
+        return adjustment
 
     def _get_employee_current_hours(self, employee_id: int) -> float:
         """Calculate total assigned hours for an employee from self.assignments_by_employee."""
@@ -1768,7 +2247,9 @@ class DistributionManager:
     def _coverage_applies_to_date(self, coverage, check_date: date) -> bool:
         """Check if a coverage record applies to the given date"""
         cov_id = getattr(coverage, "id", "N/A")
-        self.logger.debug(f"Checking if coverage {cov_id} applies to {check_date}")
+        self.diagnostics.sampled(
+            "coverage_check", "Checking if coverage %s applies to %s", cov_id, check_date
+        )
 
         # Check for specific date first (higher priority)
         if hasattr(coverage, "date") and coverage.date:
@@ -1790,8 +2271,10 @@ class DistributionManager:
                 return False
 
             applies = coverage_date == check_date
-            self.logger.debug(
-                f"Coverage {cov_id} has specific date {coverage_date}. Match with {check_date}: {applies}"
+            self.diagnostics.sampled(
+                "coverage_match",
+                "Coverage %s has specific date %s. Match with %s: %s",
+                cov_id, coverage_date, check_date, applies,
             )
             return applies
 
@@ -1814,8 +2297,10 @@ class DistributionManager:
                 # (0=Monday, 6=Sunday) so no conversion is needed
                 applies = check_weekday == coverage_day_index
 
-                self.logger.debug(
-                    f"Coverage {cov_id} day_index={coverage_day_index}. Check date {check_date} python_weekday={check_weekday}. Match: {applies}"
+                self.diagnostics.sampled(
+                    "coverage_match",
+                    "Coverage %s day_index=%s. Check date %s python_weekday=%s. Match: %s",
+                    cov_id, coverage_day_index, check_date, check_weekday, applies,
                 )
                 return applies
             except (ValueError, TypeError):
@@ -1824,8 +2309,10 @@ class DistributionManager:
                 )
                 return False
 
-        self.logger.debug(
-            f"Coverage {cov_id} has no specific date or applicable day of week. No match."
+        self.diagnostics.sampled(
+            "coverage_match",
+            "Coverage %s has no specific date or applicable day of week. No match.",
+            cov_id,
         )
         return False
 
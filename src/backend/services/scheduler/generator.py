@@ -13,7 +13,7 @@ import sys
 import uuid
 from collections import defaultdict
 from datetime import date, timedelta
-from typing import Any, Dict, List, Optional, TYPE_CHECKING, Union
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING, Union
 
 # Add parent directories to path if needed
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -83,6 +83,13 @@ from .availability import AvailabilityChecker
 from .distribution import DistributionManager
 from .serialization import ScheduleSerializer
 from .logging_utils import ProcessTracker  # Renamed from LoggingManager
+from .diagnostics import (
+    DiagnosticChannel,
+    diagnostics_level,
+    lazy_json,
+    resolve_diagnostics,
+)
+from .parallel import generate_weeks_parallel, iso_week_partitions
 from .resources import ScheduleResources as RuntimeScheduleResources  # Runtime alias
 from .validator import ScheduleValidator
 from .validator import (
@@ -456,6 +463,7 @@ class ScheduleGenerator:
         resources: Optional[RuntimeScheduleResources] = None,
         passed_config: Optional[SchedulerConfig] = None,
         app_instance: Optional[Any] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
     ):
         """
         Initializes the ScheduleGenerator.
@@ -470,6 +478,8 @@ class ScheduleGenerator:
                 for the generator. If None, a default config is loaded.
             app_instance: Optional Flask application instance, used by
                 `RuntimeScheduleResources` if it needs to be created.
+            progress_callback: Optional callable receiving the process tracker's
+                step events (used by background generation jobs).
         """
         # Use the centrally configured logger
         self.logger = central_logger  # Use the central logger directly
@@ -488,7 +498,12 @@ class ScheduleGenerator:
             process_name=f"ScheduleGeneration_{self.session_id}",
             schedule_logger=self.logger,
             diagnostic_logger=self.diagnostic_logger,
+            progress_callback=progress_callback,
         )
+        # Level-gated channels for per-day and per-shift output; generate()
+        # applies the ``diagnostics`` option ("off", "summary" or "full")
+        self.diagnostics = DiagnosticChannel(self.diagnostic_logger)
+        self.schedule_diagnostics = DiagnosticChannel(self.logger)
 
         # Initialize resources and config
         if TYPE_CHECKING:
@@ -549,6 +564,8 @@ class ScheduleGenerator:
             self.logger,
         )
         self.serializer = ScheduleSerializer(self.logger)
+        # Everything is logged until generate() applies the requested mode
+        self.set_diagnostics("full")
 
         # Initialize generation_errors list
         self.generation_errors: List[Any] = []
@@ -561,6 +578,20 @@ class ScheduleGenerator:
         self.assignments = []  # Deprecated
         self.schedule_by_date = {}  # Deprecated
 
+    def set_diagnostics(self, mode: str) -> None:
+        """Select how much generation output is produced (see diagnostics.py).
+
+        "off" keeps warnings and errors, "summary" adds per-step and per-day
+        summaries, "full" adds per-shift and (sampled) per-candidate detail
+        and step data dumps.
+        """
+        level = diagnostics_level(mode)
+        self.diagnostics.set_mode(mode)
+        self.schedule_diagnostics.set_mode(mode)
+        self.diagnostic_logger.setLevel(level)
+        self.process_tracker.set_level(level)
+        self.distribution_manager.set_diagnostics(mode)
+
     def generate(
         self,
         start_date: Union[date, str],
@@ -575,7 +606,12 @@ class ScheduleGenerator:
         Args:
             start_date: The start date of the schedule (date object or ISO string)
             end_date: The end date of the schedule (date object or ISO string)
-            config: Optional configuration dictionary
+            config: Optional configuration dictionary. ``distribution_engine``
+                selects how shifts are distributed: "greedy" (default) or
+                "assignment" for an optimal per-day assignment.
+                ``parallel_workers`` > 1 generates ISO weeks in a process pool
+                (see parallel.py). ``diagnostics`` is "off", "summary"
+                (default) or "full"; ``enable_diagnostics`` means "full".
             create_empty_schedules: Whether to create empty schedule entries for days with no coverage
             version: Optional version of the schedule
         """
@@ -584,6 +620,11 @@ class ScheduleGenerator:
             start_date = datetime.fromisoformat(start_date).date()
         if isinstance(end_date, str):
             end_date = datetime.fromisoformat(end_date).date()
+        self.set_diagnostics(resolve_diagnostics(external_config_dict))
+        if external_config_dict and external_config_dict.get("distribution_engine"):
+            self.distribution_manager.set_engine(
+                external_config_dict["distribution_engine"]
+            )
         # Ensure the entire generation process runs within a Flask application context
         try:
             # Try to get the current app context
@@ -602,8 +643,9 @@ class ScheduleGenerator:
             self.logger.info(
                 f"Generating schedule from {start_date} to {end_date} (Session: {self.session_id})"
             )
-            self.diagnostic_logger.info(
-                f"Generation parameters: start={start_date}, end={end_date}, config={external_config_dict}, create_empty={create_empty_schedules}, version={version}"
+            self.diagnostics.info(
+                "Generation parameters: start=%s, end=%s, config=%s, create_empty=%s, version=%s",
+                start_date, end_date, external_config_dict, create_empty_schedules, version,
             )
 
             # Start the process tracking
@@ -663,6 +705,18 @@ class ScheduleGenerator:
                 version=version or 1,
             )
 
+            # Optional: generate whole weeks in parallel, the loop below then
+            # only collects the precomputed assignments
+            precomputed_assignments: Optional[Dict[date, List[Dict]]] = None
+            parallel_workers = int(
+                (external_config_dict or {}).get("parallel_workers") or 1
+            )
+            weeks = iso_week_partitions(start_date, end_date)
+            if parallel_workers > 1 and len(weeks) > 1:
+                precomputed_assignments = self._generate_weeks_in_parallel(
+                    weeks, parallel_workers
+                )
+
             # Step 2: Date Processing Loop
             self.process_tracker.start_step("Daily Assignment Generation Loop")
             current_date = start_date
@@ -671,15 +725,16 @@ class ScheduleGenerator:
 
             while current_date <= end_date:
                 loop_date_str = current_date.isoformat()
-                self.diagnostic_logger.debug(
-                    f"--- Processing date: {loop_date_str} ---"
-                )
+                self.diagnostics.debug("--- Processing date: %s ---", loop_date_str)
                 try:
-                    assignments = self._generate_assignments_for_date(current_date)
+                    if precomputed_assignments is not None:
+                        assignments = precomputed_assignments.get(current_date, [])
+                    else:
+                        assignments = self._generate_assignments_for_date(current_date)
 
                     if assignments:
-                        self.logger.info(
-                            f"Generated {len(assignments)} assignments for {loop_date_str}"
+                        self.schedule_diagnostics.info(
+                            "Generated %d assignments for %s", len(assignments), loop_date_str
                         )
                         date_count += 1
                         
@@ -707,7 +762,12 @@ class ScheduleGenerator:
                             
                             # Add to schedule container
                             self.schedule.add_assignment(schedule_assignment)
-                            self.logger.debug(f"Added assignment to schedule: Employee {schedule_assignment.employee_id}, Shift {schedule_assignment.shift_id}, Date {schedule_assignment.date}")
+                            self.schedule_diagnostics.debug(
+                                "Added assignment to schedule: Employee %s, Shift %s, Date %s",
+                                schedule_assignment.employee_id,
+                                schedule_assignment.shift_id,
+                                schedule_assignment.date,
+                            )
                     elif create_empty_schedules:
                         self.logger.warning(
                             f"No coverage or shifts applicable for {loop_date_str}. Creating empty entry."
@@ -876,7 +936,7 @@ class ScheduleGenerator:
                         settings_for_validator
                     )
 
-                validator = ScheduleValidator(self.resources)
+                validator = ScheduleValidator(self.resources, engine="matrix")
                 # validator.validate expects List[ActualScheduleModel] or List[Dict] that maps to it.
                 # Cast to List[Dict[str, Any]] to satisfy Mypy due to List invariance with Union types.
                 validation_errors = validator.validate(
@@ -1006,6 +1066,33 @@ class ScheduleGenerator:
 
             return serialized_result
 
+    def _generate_weeks_in_parallel(
+        self, weeks: List[List[date]], workers: int
+    ) -> Dict[date, List[Dict]]:
+        """Generate ISO weeks in a process pool and reconcile the week seams."""
+        self.process_tracker.start_step("Parallel Week Generation")
+        try:
+            assignments_by_date, dropped = generate_weeks_parallel(
+                self, weeks, workers
+            )
+        except Exception as e:
+            error_msg = f"Error during parallel week generation: {str(e)}"
+            self.logger.error(error_msg, exc_info=True)
+            self.process_tracker.log_error(error_msg, exc_info=True)
+            self.process_tracker.end_step({"status": "failed", "error": str(e)})
+            self.process_tracker.end_process(
+                {"status": "failed", "reason": "Parallel generation error"}
+            )
+            raise ScheduleGenerationError(error_msg) from e
+
+        self.process_tracker.log_step_data(
+            "Seam Assignments Dropped", len(dropped), level=logging.INFO
+        )
+        self.process_tracker.end_step(
+            {"status": "success", "weeks": len(weeks), "workers": workers}
+        )
+        return assignments_by_date
+
     def _validate_shift_durations(self):
         """
         Validate that all shift templates have durations
@@ -1061,7 +1148,7 @@ class ScheduleGenerator:
         Process coverage requirements for a specific date.
         Returns a dictionary mapping time intervals to required staffing.
         """
-        self.diagnostic_logger.debug(f"Processing coverage for date {process_date}")
+        self.diagnostics.debug("Processing coverage for date %s", process_date)
         
         # Get coverage requirements for this day
         weekday = process_date.weekday()
@@ -1071,7 +1158,9 @@ class ScheduleGenerator:
             if hasattr(coverage, 'day_index') and coverage.day_index == weekday:
                 day_coverage.append(coverage)
         
-        self.logger.info(f"Found {len(day_coverage)} coverage blocks for {process_date} (weekday {weekday})")
+        self.schedule_diagnostics.debug(
+            "Found %d coverage blocks for %s (weekday %d)", len(day_coverage), process_date, weekday
+        )
         
         # Group coverage by time intervals
         coverage_by_interval = {}
@@ -1097,8 +1186,8 @@ class ScheduleGenerator:
         date_shifts = []
         weekday = date_to_create.weekday()  # 0 = Monday, 6 = Sunday
 
-        self.logger.info(
-            f"Creating shifts for date {date_to_create} (weekday {weekday})"
+        self.schedule_diagnostics.debug(
+            "Creating shifts for date %s (weekday %d)", date_to_create, weekday
         )
         
         # First, get coverage requirements for this date
@@ -1110,7 +1199,9 @@ class ScheduleGenerator:
         # Log coverage requirements
         for interval, requirements in coverage_by_interval.items():
             for req in requirements:
-                self.logger.info(f"Coverage needed {interval}: {req['min_employees']} employees")
+                self.schedule_diagnostics.debug(
+                    "Coverage needed %s: %s employees", interval, req["min_employees"]
+                )
 
         # Find all shift templates active on this day
         active_shift_templates = []
@@ -1196,7 +1287,9 @@ class ScheduleGenerator:
             # Add to active templates
             active_shift_templates.append(shift_template)
         
-        self.logger.info(f"Found {len(active_shift_templates)} active shift templates for weekday {weekday}")
+        self.schedule_diagnostics.debug(
+            "Found %d active shift templates for weekday %d", len(active_shift_templates), weekday
+        )
         
         # Now match active shifts to coverage intervals
         shifts_created = set()  # Track which shifts we've already created
@@ -1220,7 +1313,9 @@ class ScheduleGenerator:
                 # Check if shift times match the coverage interval
                 if shift_start == coverage_start and shift_end == coverage_end:
                     matching_shifts.append(shift_template)
-                    self.logger.debug(f"Shift {shift_template.id} matches coverage interval {interval_key}")
+                    self.schedule_diagnostics.debug(
+                        "Shift %s matches coverage interval %s", shift_template.id, interval_key
+                    )
             
             if not matching_shifts:
                 self.logger.warning(f"No shifts found matching coverage interval {interval_key}")
@@ -1318,13 +1413,15 @@ class ScheduleGenerator:
                         "coverage_interval": interval_key,  # Track which coverage this is for
                     }
 
-                    self.logger.info(
-                        f"Created shift instance: ID={shift_id}, type={shift_type}, time={shift_instance['start_time']}-{shift_instance['end_time']}, coverage={interval_key}, min_employees={min_employees}"
+                    self.schedule_diagnostics.debug(
+                        "Created shift instance: ID=%s, type=%s, time=%s-%s, coverage=%s, min_employees=%s",
+                        shift_id, shift_type, shift_instance["start_time"],
+                        shift_instance["end_time"], interval_key, min_employees,
                     )
                     date_shifts.append(shift_instance)
 
-        self.logger.info(
-            f"Created {len(date_shifts)} shift instances for {date_to_create}"
+        self.schedule_diagnostics.info(
+            "Created %d shift instances for %s", len(date_shifts), date_to_create
         )
         return date_shifts
 
@@ -1338,9 +1435,7 @@ class ScheduleGenerator:
            based on interval-based coverage needs (to be implemented in DistributionManager).
         """
         date_str = current_date.isoformat()
-        self.diagnostic_logger.debug(
-            f"--- Generating assignments for date: {date_str} ---"
-        )
+        self.diagnostics.debug("--- Generating assignments for date: %s ---", date_str)
         self.process_tracker.log_info(f"Starting assignment generation for {date_str}")
 
         assignments_for_date: List[Dict] = []
@@ -1397,12 +1492,12 @@ class ScheduleGenerator:
                 {"shifts_created": len(potential_daily_shifts)}
             )
 
-            self.diagnostic_logger.info(
-                f"DEBUG: Created {len(potential_daily_shifts)} potential shift instances for {date_str}"
+            self.diagnostics.debug(
+                "Created %d potential shift instances for %s", len(potential_daily_shifts), date_str
             )
             if potential_daily_shifts:
-                self.diagnostic_logger.info(
-                    f"DEBUG: First potential shift instance: {potential_daily_shifts[0]}"
+                self.diagnostics.debug(
+                    "First potential shift instance: %s", potential_daily_shifts[0]
                 )
 
             if not potential_daily_shifts:
@@ -1416,8 +1511,9 @@ class ScheduleGenerator:
                 self.process_tracker.end_step({"status": "no_shift_templates"})
                 return []
 
-            self.logger.info(
-                f"Proceeding with {len(potential_daily_shifts)} potential shifts for {date_str} to DistributionManager."
+            self.schedule_diagnostics.debug(
+                "Proceeding with %d potential shifts for %s to DistributionManager.",
+                len(potential_daily_shifts), date_str,
             )
             self.process_tracker.log_step_data(
                 "Potential Daily Shifts for Distribution", len(potential_daily_shifts)
@@ -1430,18 +1526,16 @@ class ScheduleGenerator:
                 "Shift Instances for Distribution", potential_daily_shifts
             )
 
-            self.diagnostic_logger.info("DEBUG: Parameters before distribution call:")
-            self.diagnostic_logger.info(f"  current_date: {current_date}")
-            self.diagnostic_logger.info(
-                f"  date_shifts (potential_daily_shifts): {len(potential_daily_shifts)}"
-            )
-            self.diagnostic_logger.info(
-                f"  constraint_checker: {self.constraint_checker is not None}"
-            )
-            self.diagnostic_logger.info(
-                f"  availability_checker: {self.availability_checker is not None}"
+            self.diagnostics.debug(
+                lambda: (
+                    "Parameters before distribution call:\n"
+                    f"  current_date: {current_date}\n"
+                    f"  date_shifts (potential_daily_shifts): {len(potential_daily_shifts)}\n"
+                    f"  constraint_checker: {self.constraint_checker is not None}\n"
+                    f"  availability_checker: {self.availability_checker is not None}\n"
+                    f"  resources: {self.resources is not None}"
+                )
             )
-            self.diagnostic_logger.info(f"  resources: {self.resources is not None}")
 
             # Call to DistributionManager - this will be the new core logic
             assignments_for_date = self.distribution_manager.generate_assignments_for_day(
@@ -1449,11 +1543,13 @@ class ScheduleGenerator:
             )
 
             if assignments_for_date:
-                self.logger.info(
-                    f"DistributionManager returned {len(assignments_for_date)} assignments for {date_str}"
+                self.schedule_diagnostics.debug(
+                    "DistributionManager returned %d assignments for %s",
+                    len(assignments_for_date), date_str,
                 )
-                self.diagnostic_logger.debug(
-                    f"Assignments from DM for {date_str}: {assignments_for_date}"
+                self.diagnostics.debug(
+                    "Assignments from DM for %s:\n%s",
+                    date_str, lazy_json(assignments_for_date, indent=None),
                 )
             else:
                 self.logger.warning(
@@ -1516,9 +1612,9 @@ class ScheduleGenerator:
             return 0
             
         try:
-            from src.backend.models.schedule import Schedule
             from flask import current_app
             from flask_sqlalchemy import SQLAlchemy
+            from .bulk_writer import write_schedules
             
             # Get database instance
             if hasattr(current_app, 'extensions') and 'sqlalchemy' in current_app.extensions:
@@ -1527,56 +1623,28 @@ class ScheduleGenerator:
                 # Fallback: create new instance
                 db = SQLAlchemy(current_app)
             
-            saved_count = 0
-            
-            for assignment in assignments:
-                try:
-                    # Handle both ScheduleAssignment objects and dictionaries
-                    if isinstance(assignment, ScheduleAssignment):
-                        # Create Schedule model instance from ScheduleAssignment
-                        schedule_obj = Schedule(
-                            employee_id=assignment.employee_id,
-                            shift_id=assignment.shift_id,
-                            date=assignment.date,
-                            status=assignment.status,
-                            version=assignment.version,
-                            shift_type=assignment.shift_type_str,
-                            availability_type=assignment.availability_type,
-                            break_start=assignment.break_start,
-                            break_end=assignment.break_end,
-                            notes=assignment.notes,
-                        )
-                    else:
-                        # Handle dictionary format
-                        schedule_obj = Schedule(
-                            employee_id=assignment["employee_id"],
-                            shift_id=assignment["shift_id"],
-                            date=assignment["date"],
-                            status=assignment.get("status", "PENDING"),
-                            version=assignment.get("version", 1),
-                            shift_type=assignment.get("shift_type"),
-                            availability_type=assignment.get("availability_type"),
-                            break_start=assignment.get("break_start"),
-                            break_end=assignment.get("break_end"),
-                            notes=assignment.get("notes"),
-                        )
-                    
-                    db.session.add(schedule_obj)
-                    saved_count += 1
-                    
-                except Exception as e:
-                    self.logger.error(f"Error creating schedule object: {e}")
-                    self.logger.error(f"Assignment data: {assignment}")
-                    continue
+            # Templates are already loaded, no per-row lookups needed
+            templates = {
+                shift.id: shift for shift in (self.resources.shifts or [])
+            }
+            result = write_schedules(
+                db.session,
+                assignments,
+                templates=templates,
+                default_version=self.schedule.version if self.schedule else 1,
+                commit=True,
+                logger=self.logger,
+            )
+            self.process_tracker.log_step_data(
+                "Bulk Write", result.to_dict(), level=logging.INFO
+            )
             
-            if saved_count > 0:
-                # Commit all at once
-                db.session.commit()
-                self.logger.info(f"Successfully saved {saved_count} assignments to database")
+            if result.rows > 0:
+                self.logger.info(f"Successfully saved {result.rows} assignments to database")
             else:
                 self.logger.warning("No valid assignment objects created for database save")
             
-            return saved_count
+            return result.rows
                 
         except Exception as e:
             self.logger.error(f"Error saving assignments to database: {str(e)}", exc_info=True)
@@ -6,7 +6,7 @@ import json
 import traceback
 import sys
 from datetime import datetime
-from typing import Optional, Dict, Any, TYPE_CHECKING
+from typing import Optional, Dict, Any, Callable, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from logging import Logger as LoggerType  # Avoid circular import issues
@@ -23,6 +23,7 @@ class ProcessTracker:
         process_name: str,
         schedule_logger: "LoggerType",
         diagnostic_logger: "LoggerType",
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
     ):
         """
         Initialize the tracker.
@@ -31,6 +32,9 @@ class ProcessTracker:
             process_name: A name for the overall process (e.g., "Schedule Generation").
             schedule_logger: Logger instance for general schedule process logging (e.g., logger).
             diagnostic_logger: Logger instance for detailed diagnostic logging (e.g., logger.create_diagnostic_logger).
+            progress_callback: Optional callable receiving a progress event dict on
+                every step start/end and at the end of the process. Exceptions it
+                raises propagate into the tracked process (used to cancel jobs).
         """
         self.process_name = process_name
         self.schedule_logger = schedule_logger
@@ -41,30 +45,61 @@ class ProcessTracker:
         self.steps_completed = []
         self.step_start_time = None
         self.process_start_time = None
+        self.progress_callback = progress_callback
+        # Info/debug output below this level is skipped before it is formatted;
+        # warnings, errors and progress events are not affected
+        self.level = logging.DEBUG
 
         # Log initialization immediately using the provided diagnostic logger
         self.diagnostic_logger.info(
             f"ProcessTracker initialized for '{process_name}' (Session: {self.session_id})"
         )
 
+    def set_level(self, level: int) -> None:
+        """Set the lowest level of info/debug output (see diagnostics.py)."""
+        self.level = level
+
+    def is_enabled(self, level: int) -> bool:
+        if level < self.level:
+            return False
+        is_enabled_for = getattr(self.diagnostic_logger, "isEnabledFor", None)
+        return is_enabled_for(level) if is_enabled_for is not None else True
+
+    def _notify(self, event: str, **data: Any) -> None:
+        """Pass a progress event to the progress callback, if any."""
+        if self.progress_callback is None:
+            return
+        self.progress_callback(
+            {
+                "event": event,
+                "session_id": self.session_id,
+                "step": self.step_count,
+                "step_name": self.current_step,
+                **data,
+            }
+        )
+
     def start_process(self) -> None:
         """Start timing the overall process."""
         self.process_start_time = datetime.now()
         self.step_count = 0
         self.steps_completed = []
-        start_msg = f"===== STARTING PROCESS: {self.process_name} (Session: {self.session_id}) ====="
-        self.schedule_logger.info(start_msg)
-        self.diagnostic_logger.info(start_msg)
+        if self.level <= logging.INFO:
+            start_msg = f"===== STARTING PROCESS: {self.process_name} (Session: {self.session_id}) ====="
+            self.schedule_logger.info(start_msg)
+            self.diagnostic_logger.info(start_msg)
 
     def start_step(self, step_name: str) -> None:
         """Log the start of a processing step."""
         self.step_count += 1
         self.current_step = step_name
         self.step_start_time = datetime.now()
-        step_msg = f"Step {self.step_count}: {step_name} - Started"
-        # Log step start to both loggers for different levels of detail/formats
-        self.schedule_logger.info(step_msg)
-        self.diagnostic_logger.info(f"--> START STEP {self.step_count}: {step_name}")
+        if self.level <= logging.INFO:
+            step_msg = f"Step {self.step_count}: {step_name} - Started"
+            # Log step start to both loggers for different levels of detail/formats
+            self.schedule_logger.info(step_msg)
+            self.diagnostic_logger.info(f"--> START STEP {self.step_count}: {step_name}")
+        self._notify("step_started")
 
     def end_step(self, results: Optional[Dict[str, Any]] = None) -> None:
         """Log the completion of a processing step with optional results."""
@@ -73,14 +108,16 @@ class ProcessTracker:
             self.steps_completed.append(self.current_step)
             duration_ms = duration.total_seconds() * 1000
 
-            completion_msg = f"Step {self.step_count}: {self.current_step} - Completed in {duration_ms:.1f}ms"
-            diag_completion_msg = f"<-- END STEP {self.step_count}: {self.current_step} ({duration_ms:.1f}ms)"
+            if self.level <= logging.INFO:
+                completion_msg = f"Step {self.step_count}: {self.current_step} - Completed in {duration_ms:.1f}ms"
+                diag_completion_msg = f"<-- END STEP {self.step_count}: {self.current_step} ({duration_ms:.1f}ms)"
 
-            self.schedule_logger.info(completion_msg)
-            self.diagnostic_logger.info(diag_completion_msg)
+                self.schedule_logger.info(completion_msg)
+                self.diagnostic_logger.info(diag_completion_msg)
+            self._notify("step_completed", duration_ms=round(duration_ms, 1))
 
             # Log results if provided (primarily to diagnostic for detail)
-            if results:
+            if results and self.is_enabled(logging.DEBUG):
                 try:
                     # Use indentation for readability in diagnostic log
                     result_str = json.dumps(results, default=str, indent=2)
@@ -117,6 +154,14 @@ class ProcessTracker:
             if stats:
                 summary.update(stats)
 
+            self._notify(
+                "process_completed",
+                duration_seconds=duration_sec,
+                status=(stats or {}).get("status"),
+            )
+            if self.level > logging.INFO:
+                return
+
             completion_msg = "===== PROCESS COMPLETED ====="
             summary_msg = f"Process summary: {json.dumps(summary, default=str)}"
             diag_summary_msg = (
@@ -152,7 +197,12 @@ class ProcessTracker:
     def log_step_data(
         self, data_name: str, data: Any, level: int = logging.DEBUG
     ) -> None:
-        """Log detailed data associated with the current step, primarily to the diagnostic log."""
+        """Log detailed data associated with the current step, primarily to the diagnostic log.
+
+        Nothing is serialized unless ``level`` is enabled.
+        """
+        if not self.is_enabled(level):
+            return
         if self.current_step:
             try:
                 # Format complex data nicely for diagnostic log
@@ -203,12 +253,16 @@ class ProcessTracker:
 
     # Convenience methods to log to both loggers if desired, or just one
     def log_info(self, message: str, log_to_diag: bool = True):
+        if self.level > logging.INFO:
+            return
         self.schedule_logger.info(message)
         if log_to_diag:
             self.diagnostic_logger.info(message)
 
     def log_debug(self, message: str, log_to_schedule: bool = False):
         # Debug usually goes only to diagnostic unless specified
+        if self.level > logging.DEBUG:
+            return
         self.diagnostic_logger.debug(message)
         if log_to_schedule:
             self.schedule_logger.debug(message)
@@ -0,0 +1,317 @@
+"""Week-parallel schedule generation.
+
+``ScheduleGenerator.generate`` normally walks the horizon one date at a time.
+With ``parallel_workers`` > 1 in its config, the horizon is split into ISO
+weeks that are generated in a process pool instead:
+
+* Workers are started with ``spawn``, not forked from the (multithreaded)
+  app process. Each one rebuilds a ``ScheduleGenerator`` from a pickled
+  ``ResourceSnapshot`` of the loaded resources (see :func:`generator_spec`),
+  so no database access happens in the workers.
+* Weeks run in two waves. The even weeks start from the distribution state
+  the generator had before the run (historical assignments). The odd weeks
+  are then seeded with everything the even weeks produced, so each of them is
+  generated against the actual tail of the previous week and head of the next
+  one, and its fairness and hour counts include those weeks.
+* Afterwards :func:`reconcile_week_seams` walks the weeks in order and passes
+  the last days of each week (:class:`WeekBoundary`) into the next one.
+  Assignments at the start of a week that break the rest-period or
+  consecutive-day rules against that boundary are dropped, and candidate
+  selection is re-run for those dates (:func:`regenerate_date`) so the
+  emptied slots are filled again.
+"""
+
+import copy
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .assignment_store import AssignmentStore
+from .resource_snapshot import ResourceSnapshot, SnapshotScheduleResources
+
+# Assignments by employee and employee history before the run
+DistributionBaseline = Tuple[Dict[Any, List[Any]], Dict[Any, Any]]
+# Picklable (factory, args) that builds a worker's generator
+WorkerSpec = Tuple[Callable[..., Any], tuple]
+
+# Generator built by each worker's initializer, plus the distribution state
+# every week starts from
+_worker_generator: Any = None
+_worker_baseline: Optional[DistributionBaseline] = None
+
+# Violations that can appear across a week boundary
+SEAM_VIOLATION_TYPES = ("max_consecutive_days", "min_rest_before")
+
+
+@dataclass
+class WeekBoundary:
+    """Assignments of the last ``days`` days up to and including ``end_date``."""
+
+    end_date: date
+    days: int
+    assignments: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_assignments(
+        cls, end_date: date, days: int, assignments_by_date: Dict[date, List[Dict]]
+    ) -> "WeekBoundary":
+        tail = []
+        for offset in range(days - 1, -1, -1):
+            tail.extend(assignments_by_date.get(end_date - timedelta(days=offset), []))
+        return cls(end_date=end_date, days=days, assignments=tail)
+
+
+def iso_week_partitions(start_date: date, end_date: date) -> List[List[date]]:
+    """Dates from ``start_date`` to ``end_date``, grouped by ISO week."""
+    weeks: List[List[date]] = []
+    current_date = start_date
+    while current_date <= end_date:
+        if not weeks or current_date.weekday() == 0:
+            weeks.append([])
+        weeks[-1].append(current_date)
+        current_date += timedelta(days=1)
+    return weeks
+
+
+def _build_generator(snapshot: ResourceSnapshot, config, engine: str, diagnostics: str):
+    # Imported here, generator.py imports this module
+    from .generator import ScheduleGenerator
+
+    resources = snapshot.to_resources()
+    resources.load()
+    generator = ScheduleGenerator(resources=resources, passed_config=config)
+    generator.distribution_manager.set_engine(engine)
+    generator.set_diagnostics(diagnostics)
+    return generator
+
+
+def generator_spec(generator) -> WorkerSpec:
+    """Picklable recipe for a copy of ``generator`` in a worker process."""
+    resources = generator.resources
+    if isinstance(resources, SnapshotScheduleResources):
+        snapshot = resources.snapshot
+    else:
+        snapshot = ResourceSnapshot.from_resources(resources)
+    return _build_generator, (
+        snapshot,
+        generator.config,
+        generator.distribution_manager.engine,
+        generator.diagnostics.mode,
+    )
+
+
+def snapshot_distribution_state(generator) -> DistributionBaseline:
+    manager = generator.distribution_manager
+    return (
+        {employee_id: list(entries) for employee_id, entries in manager.assignments_by_employee.items()},
+        copy.deepcopy(dict(manager.employee_history)),
+    )
+
+
+def restore_distribution_state(
+    generator, baseline: DistributionBaseline, assignments: Iterable[Dict] = ()
+):
+    """Reset the distribution state to ``baseline`` plus ``assignments``.
+
+    The assignments also go into the constraint checker's schedule context.
+    """
+    manager = generator.distribution_manager
+    history_assignments, history = baseline
+    manager.assignments_by_employee = AssignmentStore(
+        {employee_id: [] for employee_id in history_assignments}
+    )
+    if manager.constraint_checker is not None:
+        manager.constraint_checker.set_schedule([], {})
+    for employee_id, entries in history_assignments.items():
+        for entry in entries:
+            manager._record_assignment(employee_id, entry)
+    for entry in assignments:
+        manager._record_assignment(entry.get("employee_id"), entry)
+    manager.employee_history.clear()
+    manager.employee_history.update(copy.deepcopy(history))
+
+
+def _flatten(assignments_by_date: Dict[date, List[Dict]], skip: Optional[date] = None):
+    return [
+        assignment
+        for current_date, entries in sorted(assignments_by_date.items())
+        if current_date != skip
+        for assignment in entries
+    ]
+
+
+def _init_worker(worker_spec: WorkerSpec, baseline: DistributionBaseline):
+    global _worker_generator, _worker_baseline
+    factory, args = worker_spec
+    _worker_generator = factory(*args)
+    _worker_baseline = baseline
+
+
+def generate_week(week_dates: List[date], seed: Iterable[Dict] = ()) -> Dict[date, List[Dict]]:
+    """Worker entry point: generate all dates of one week on top of ``seed``."""
+    generator = _worker_generator
+    restore_distribution_state(generator, _worker_baseline, seed)
+    return {
+        current_date: generator._generate_assignments_for_date(current_date)
+        for current_date in week_dates
+    }
+
+
+def regenerate_date(
+    generator,
+    baseline: DistributionBaseline,
+    assignments_by_date: Dict[date, List[Dict]],
+    current_date: date,
+) -> List[Dict]:
+    """Re-run candidate selection for ``current_date`` in this process.
+
+    Every other generated date is part of the distribution state, so rest
+    periods are respected in both directions.
+    """
+    restore_distribution_state(
+        generator, baseline, _flatten(assignments_by_date, skip=current_date)
+    )
+    return generator._generate_assignments_for_date(current_date)
+
+
+def generate_weeks_parallel(
+    generator,
+    weeks: List[List[date]],
+    workers: int,
+    worker_spec: Optional[WorkerSpec] = None,
+) -> Tuple[Dict[date, List[Dict]], List[Dict[str, Any]]]:
+    """Generate ``weeks`` in a process pool, then reconcile the week seams.
+
+    ``worker_spec`` is a picklable ``(factory, args)`` pair that builds the
+    workers' generator; by default :func:`generator_spec`. Returns the
+    assignments by date and the violations dropped at the seams. Afterwards
+    the generator's distribution state holds the generated assignments, as
+    after a sequential run.
+    """
+    baseline = snapshot_distribution_state(generator)
+    assignments_by_date: Dict[date, List[Dict]] = {}
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(weeks)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(worker_spec or generator_spec(generator), baseline),
+    ) as executor:
+        for wave in (weeks[0::2], weeks[1::2]):
+            seed = _flatten(assignments_by_date)
+            for week_result in executor.map(generate_week, wave, repeat(seed)):
+                assignments_by_date.update(week_result)
+
+    dropped = reconcile_week_seams(
+        generator.constraint_checker,
+        weeks,
+        assignments_by_date,
+        generator.logger,
+        refill=lambda current_date: regenerate_date(
+            generator, baseline, assignments_by_date, current_date
+        ),
+    )
+    restore_distribution_state(generator, baseline, _flatten(assignments_by_date))
+    return assignments_by_date, dropped
+
+
+def reconcile_week_seams(
+    constraint_checker,
+    weeks: List[List[date]],
+    assignments_by_date: Dict[date, List[Dict]],
+    logger,
+    refill: Optional[Callable[[date], List[Dict]]] = None,
+) -> List[Dict[str, Any]]:
+    """Re-validate the first days of every week against the previous week.
+
+    Offending assignments are removed from ``assignments_by_date`` in place.
+    If ``refill`` is given, it is called with the date instead and its
+    assignments replace the date's (and are checked again). Returns the
+    violations (with ``employee_id`` and ``date`` added) of the removed
+    assignments.
+    """
+    boundary_days = max(
+        int(getattr(constraint_checker.config, "max_consecutive_days", 7) or 1), 1
+    )
+    removed: List[Dict[str, Any]] = []
+    for previous_week, week in zip(weeks, weeks[1:]):
+        boundary = WeekBoundary.from_assignments(
+            previous_week[-1], boundary_days, assignments_by_date
+        )
+        accepted = list(boundary.assignments)
+        for current_date in week[:boundary_days]:
+            kept, violations = _split_seam_violations(
+                constraint_checker,
+                assignments_by_date.get(current_date, []),
+                current_date,
+                accepted,
+            )
+            if violations and refill is not None:
+                logger.info(
+                    f"Regenerating {current_date.isoformat()} after "
+                    f"{len(violations)} seam violation(s)"
+                )
+                kept, still_violating = _split_seam_violations(
+                    constraint_checker, refill(current_date), current_date, accepted
+                )
+                violations.extend(still_violating)
+            for violation in violations:
+                logger.warning(
+                    f"Dropping assignment at week seam: {violation['message']} "
+                    f"(employee {violation['employee_id']})"
+                )
+            removed.extend(violations)
+            assignments_by_date[current_date] = kept
+            accepted.extend(kept)
+    return removed
+
+
+def _split_seam_violations(
+    constraint_checker, assignments: List[Dict], current_date: date, accepted: List[Dict]
+) -> Tuple[List[Dict], List[Dict[str, Any]]]:
+    kept: List[Dict] = []
+    violations: List[Dict[str, Any]] = []
+    for assignment in assignments:
+        violation = _seam_violation(constraint_checker, assignment, current_date, accepted)
+        if violation is None:
+            kept.append(assignment)
+        else:
+            violations.append(
+                dict(
+                    violation,
+                    employee_id=assignment.get("employee_id"),
+                    date=current_date.isoformat(),
+                )
+            )
+    return kept, violations
+
+
+def _seam_violation(
+    constraint_checker, assignment: Dict, current_date: date, accepted: List[Dict]
+) -> Optional[Dict[str, Any]]:
+    employee = constraint_checker.resources.get_employee(assignment.get("employee_id"))
+    if employee is None:
+        return None
+    violation = constraint_checker._check_max_consecutive_days(
+        employee, current_date, accepted
+    )
+    if violation:
+        return violation
+    start_dt = constraint_checker._parse_assignment_datetime(
+        assignment, "start_time", current_date
+    )
+    end_dt = constraint_checker._parse_assignment_datetime(
+        assignment, "end_time", current_date
+    )
+    if start_dt is None or end_dt is None:
+        return None
+    if end_dt <= start_dt:
+        end_dt += timedelta(days=1)
+    violation = constraint_checker._check_min_rest_between_shifts(
+        employee, start_dt, end_dt, accepted
+    )
+    if violation and violation.get("type") in SEAM_VIOLATION_TYPES:
+        return violation
+    return None
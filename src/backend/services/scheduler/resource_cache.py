@@ -0,0 +1,113 @@
+"""Process-wide cache of scheduler resource snapshots.
+
+Every ``ScheduleResources.load()`` re-queries settings, coverage, shifts,
+employees, absences and availabilities, although planners often regenerate
+or validate the same week several times in a row with unchanged data.
+``ResourceCache`` keeps one immutable ``ResourceSnapshot`` per database and
+reuses it while the data revision is unchanged.
+
+The data revision is read from the per-table counters of
+``utils/http_cache.py``, which SQLAlchemy session events bump whenever a
+transaction that changed one of the tables commits. Those counters only see
+writes made through a session of this process, so entries also expire after
+``max_age`` seconds to pick up changes made elsewhere.
+
+    generator = ScheduleGenerator(resources=CachedScheduleResources())
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.backend.models import db
+from src.backend.utils.http_cache import register_revision_events, revisions
+
+from .resource_snapshot import ResourceSnapshot, SnapshotScheduleResources
+from .resources import ScheduleResources
+
+# Tables read by ScheduleResources.load()
+RESOURCE_TABLES = (
+    "settings",
+    "coverage",
+    "shifts",
+    "employees",
+    "absences",
+    "employee_availabilities",
+)
+
+DEFAULT_MAX_AGE_SECONDS = 300.0
+
+
+class ResourceCache:
+    """Snapshots of the loaded scheduler resources, keyed by data revision"""
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE_SECONDS):
+        self.max_age = max_age
+        # database URL -> (revision, loaded at, snapshot)
+        self._entries: Dict[str, Tuple[Tuple[int, ...], float, ResourceSnapshot]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def snapshot(self, app_instance: Optional[Any] = None) -> ResourceSnapshot:
+        """The current snapshot, loading it from the database if it is stale.
+
+        Must run inside an app context (or get ``app_instance``) when a load
+        is needed. Concurrent callers wait for a single load.
+        """
+        register_revision_events()
+        database = self._database_key(app_instance)
+        with self._lock:
+            # Read the revision before loading: a commit that lands during
+            # the load makes the new entry stale instead of mislabelled
+            revision = (revisions.epoch, *revisions.current(RESOURCE_TABLES))
+            entry = self._entries.get(database)
+            if (
+                entry is not None
+                and entry[0] == revision
+                and time.monotonic() - entry[1] < self.max_age
+            ):
+                self.hits += 1
+                return entry[2]
+
+            self.misses += 1
+            resources = ScheduleResources(app_instance=app_instance)
+            resources.load()
+            snapshot = ResourceSnapshot.from_resources(resources)
+            self._entries[database] = (revision, time.monotonic(), snapshot)
+            return snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    @staticmethod
+    def _database_key(app_instance: Optional[Any]) -> str:
+        if app_instance is not None:
+            with app_instance.app_context():
+                return str(db.engine.url)
+        return str(db.engine.url)
+
+
+resource_cache = ResourceCache()
+
+
+class CachedScheduleResources(SnapshotScheduleResources):
+    """``ScheduleResources`` whose ``load()`` reuses the process-wide snapshot
+
+    Holds plain records instead of ORM instances, like every snapshot.
+    """
+
+    def __init__(
+        self, app_instance: Optional[Any] = None, cache: Optional[ResourceCache] = None
+    ):
+        self.cache = cache or resource_cache
+        super().__init__(ResourceSnapshot(None, (), (), (), (), ()), app_instance=app_instance)
+
+    def load(self):
+        self.snapshot = self.cache.snapshot(self.app_instance)
+        super().load()
@@ -0,0 +1,242 @@
+"""Detached, picklable snapshot of the scheduler resources.
+
+``ScheduleResources.load()`` returns live SQLAlchemy instances that belong to
+a session and an app context. ``ResourceSnapshot`` copies the columns the
+scheduler reads into frozen ``__slots__`` records once. After that, resources
+can be cached between requests, written to disk, or handed to worker processes
+without touching the database.
+
+    snapshot = ResourceSnapshot.from_resources(resources)  # after load()
+    snapshot.save(path)
+    generator = ScheduleGenerator(resources=ResourceSnapshot.load(path).to_resources())
+
+``SnapshotScheduleResources`` is the ``ScheduleResources`` view of a snapshot.
+Its ``load()`` only rebuilds the in-memory indexes, so ``ScheduleGenerator``,
+``ScheduleValidator`` and ``DistributionManager`` run on it unchanged.
+"""
+
+import copy
+import pickle
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+from .resources import ScheduleResources
+
+# Bump when a record layout changes; older snapshot files are rejected
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def _copy_columns(record_cls, obj):
+    """Build ``record_cls`` from the same-named attributes of ``obj``."""
+    values = {}
+    for record_field in fields(record_cls):
+        value = getattr(obj, record_field.name, None)
+        # JSON columns are mutable; the snapshot must not share them
+        if isinstance(value, (dict, list)):
+            value = copy.deepcopy(value)
+        values[record_field.name] = value
+    return record_cls(**values)
+
+
+@dataclass(frozen=True, slots=True)
+class EmployeeRecord:
+    id: int
+    employee_id: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    employee_group: Any = None
+    contracted_hours: Optional[float] = None
+    is_keyholder: bool = False
+    is_active: bool = True
+    birthday: Optional[date] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+
+    def get_max_daily_hours(self) -> float:
+        """Get maximum allowed daily hours (same rule as ``Employee``)"""
+        return 10.0
+
+    def get_max_weekly_hours(self) -> float:
+        """Get maximum allowed weekly hours (same rule as ``Employee``)"""
+        group = getattr(self.employee_group, "value", self.employee_group)
+        if group in ("VZ", "TL"):
+            return 48.0
+        if group == "TZ":
+            return self.contracted_hours
+        return 556 / 12.41 / 4.33
+
+
+@dataclass(frozen=True, slots=True)
+class ShiftTemplateRecord:
+    id: int
+    name: Optional[str] = None
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    duration_hours: Optional[float] = None
+    requires_break: bool = True
+    shift_type: Any = None
+    shift_type_id: Optional[str] = None
+    active_days: Any = None
+
+
+@dataclass(frozen=True, slots=True)
+class CoverageRecord:
+    id: int
+    day_index: int
+    start_time: str
+    end_time: str
+    min_employees: int = 1
+    max_employees: int = 3
+    employee_types: Any = None
+    allowed_employee_groups: Any = None
+    requires_keyholder: bool = False
+    keyholder_before_minutes: Optional[int] = None
+    keyholder_after_minutes: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class AbsenceRecord:
+    id: int
+    employee_id: int
+    start_date: date
+    end_date: date
+    absence_type_id: Optional[str] = None
+    note: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class AvailabilityRecord:
+    id: int
+    employee_id: int
+    day_of_week: int
+    hour: int
+    is_available: bool = True
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    is_recurring: bool = True
+    availability_type: Any = None
+
+
+@dataclass(frozen=True, slots=True)
+class SettingsRecord:
+    """The scheduling-related subset of ``Settings``"""
+
+    store_opening: Optional[str] = None
+    store_closing: Optional[str] = None
+    keyholder_before_minutes: Optional[int] = None
+    keyholder_after_minutes: Optional[int] = None
+    opening_days: Any = None
+    special_days: Any = None
+    availability_types: Any = None
+    scheduling_resource_type: Optional[str] = None
+    default_shift_duration: Optional[float] = None
+    min_break_duration: Optional[int] = None
+    max_daily_hours: Optional[float] = None
+    max_weekly_hours: Optional[float] = None
+    total_weekly_working_hours: Optional[float] = None
+    min_rest_between_shifts: Optional[float] = None
+    scheduling_period_weeks: Optional[int] = None
+    auto_schedule_preferences: Optional[bool] = None
+    generation_requirements: Any = None
+    scheduling_algorithm: Optional[str] = None
+    max_generation_attempts: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ResourceSnapshot:
+    """Everything ``ScheduleResources.load()`` provides, as plain records"""
+
+    settings: Optional[SettingsRecord]
+    coverage: Tuple[CoverageRecord, ...]
+    shifts: Tuple[ShiftTemplateRecord, ...]
+    employees: Tuple[EmployeeRecord, ...]
+    absences: Tuple[AbsenceRecord, ...]
+    availabilities: Tuple[AvailabilityRecord, ...]
+    created_at: datetime = field(default_factory=datetime.now)
+    format_version: int = SNAPSHOT_FORMAT_VERSION
+
+    @classmethod
+    def from_resources(cls, resources) -> "ResourceSnapshot":
+        """Snapshot already loaded resources (ORM instances or records)."""
+        settings = resources.settings
+        return cls(
+            settings=(
+                _copy_columns(SettingsRecord, settings) if settings is not None else None
+            ),
+            coverage=tuple(
+                _copy_columns(CoverageRecord, item) for item in resources.coverage or []
+            ),
+            shifts=tuple(
+                _copy_columns(ShiftTemplateRecord, item) for item in resources.shifts or []
+            ),
+            employees=tuple(
+                _copy_columns(EmployeeRecord, item) for item in resources.employees or []
+            ),
+            absences=tuple(
+                _copy_columns(AbsenceRecord, item) for item in resources.absences or []
+            ),
+            availabilities=tuple(
+                _copy_columns(AvailabilityRecord, item)
+                for item in resources.availabilities or []
+            ),
+        )
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "coverage": len(self.coverage),
+            "shifts": len(self.shifts),
+            "employees": len(self.employees),
+            "absences": len(self.absences),
+            "availabilities": len(self.availabilities),
+        }
+
+    def to_resources(self, app_instance: Optional[Any] = None) -> "SnapshotScheduleResources":
+        return SnapshotScheduleResources(self, app_instance=app_instance)
+
+    def save(self, path) -> None:
+        with open(path, "wb") as snapshot_file:
+            pickle.dump(self, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path) -> "ResourceSnapshot":
+        """Read a snapshot written by :meth:`save`. Only load trusted files."""
+        with open(path, "rb") as snapshot_file:
+            snapshot = pickle.load(snapshot_file)
+        if not isinstance(snapshot, cls):
+            raise TypeError(f"{path} does not contain a {cls.__name__}")
+        if snapshot.format_version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot format {snapshot.format_version}, "
+                f"expected {SNAPSHOT_FORMAT_VERSION}"
+            )
+        return snapshot
+
+
+class SnapshotScheduleResources(ScheduleResources):
+    """``ScheduleResources`` backed by a :class:`ResourceSnapshot`
+
+    Needs neither a database nor a Flask app context.
+    """
+
+    def __init__(self, snapshot: ResourceSnapshot, app_instance: Optional[Any] = None):
+        super().__init__(app_instance=app_instance)
+        self.snapshot = snapshot
+        self._apply_snapshot()
+
+    def _apply_snapshot(self):
+        self.settings = self.snapshot.settings
+        self.coverage = list(self.snapshot.coverage)
+        self.shifts = list(self.snapshot.shifts)
+        self.employees = list(self.snapshot.employees)
+        self.absences = list(self.snapshot.absences)
+        self.availabilities = list(self.snapshot.availabilities)
+
+    def load(self):
+        """Reset to the snapshot contents and rebuild the indexes"""
+        self.clear_caches()
+        self._apply_snapshot()
+        self._build_coverage_timeline()
+        self._build_absence_index()
+        self._build_availability_index()
+        self.logger.info(f"Resources loaded from snapshot: {self.snapshot.counts()}")
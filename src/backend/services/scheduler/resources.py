@@ -1,7 +1,7 @@
 """Resource management for the scheduler"""
 
 from datetime import date
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, FrozenSet, List, Optional, Tuple, Any
 import logging
 import functools
 import sys
@@ -16,6 +16,10 @@ if src_backend_dir not in sys.path:
 
 # Use centralized import utilities
 from .import_utils import safe_import_models, ModelImportError
+from .absence_index import AbsenceIndex
+from .coverage_timeline import CoverageTimeline
+from .availability_index import AvailabilityIndex, DayAvailabilityMasks, hour_range_mask
+from .tracked_list import TrackedList
 from .validation_utils import (
     validate_shift_template, validate_coverage_rule, validate_employee_data,
     validate_batch_data, log_validation_results, ValidationError
@@ -43,9 +47,44 @@ class ScheduleResourceError(Exception):
     pass
 
 
+class _IndexSource:
+    """Resource attribute that one or more cached indexes are built from.
+
+    Assigning the attribute, or editing the assigned list in place, resets
+    the named index attributes to None, so the next lookup rebuilds them.
+    """
+
+    def __init__(self, *index_attrs: str):
+        self.index_attrs = index_attrs
+
+    def __set_name__(self, owner, name):
+        self.storage = f"_{name}_value"
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance.__dict__.get(self.storage)
+
+    def __set__(self, instance, value):
+        invalidate = functools.partial(self.invalidate, instance)
+        if isinstance(value, list):
+            value = TrackedList(value, on_change=invalidate)
+        instance.__dict__[self.storage] = value
+        invalidate()
+
+    def invalidate(self, instance):
+        for attr in self.index_attrs:
+            instance.__dict__[attr] = None
+
+
 class ScheduleResources:
     """Centralized container for schedule generation resources"""
 
+    settings = _IndexSource("_coverage_timeline")
+    coverage = _IndexSource("_coverage_timeline")
+    absences = _IndexSource("_absence_index")
+    availabilities = _IndexSource("_availability_index")
+
     def __init__(self, app_instance: Optional[Any] = None):
         self.settings: Optional[Settings] = None
         self.coverage: List[Coverage] = []
@@ -58,6 +97,12 @@ class ScheduleResources:
         self._employee_cache = {}
         self._coverage_cache = {}
         self._date_caches_cleared = False
+        # Bitmask index over self.availabilities, see availability_index.py
+        self._availability_index: Optional[AvailabilityIndex] = None
+        # Interval index over self.absences, see absence_index.py
+        self._absence_index: Optional[AbsenceIndex] = None
+        # Compiled coverage requirements, see coverage_timeline.py
+        self._coverage_timeline: Optional[CoverageTimeline] = None
         self.logger = logger
         self.app_instance = app_instance
 
@@ -100,10 +145,13 @@ class ScheduleResources:
                 )
                 self.settings = self._load_settings()
                 self.coverage = self._load_coverage()
+                self._build_coverage_timeline()
                 self.shifts = self._load_shifts()
                 self.employees = self._load_employees()
                 self.absences = self._load_absences()
+                self._build_absence_index()
                 self.availabilities = self._load_availabilities()
+                self._build_availability_index()
 
                 # Load existing schedule data if needed
                 # This might be heavy, only do if necessary for initialization
@@ -210,15 +258,16 @@ class ScheduleResources:
                     )
                     return []  # Important: if demo data gen fails, and initial was empty, return empty.
 
-            self.logger.info(f"Loaded {len(coverage)} coverage records. Details:")
-            for cov_idx, cov_item in enumerate(coverage):
-                self.logger.info(
-                    f"  Coverage[{cov_idx}]: id={getattr(cov_item, 'id', 'N/A')}, "
-                    f"day={getattr(cov_item, 'day_index', 'N/A')}, "
-                    f"start={getattr(cov_item, 'start_time', 'N/A')}-end={getattr(cov_item, 'end_time', 'N/A')}, "
-                    f"min_emp={getattr(cov_item, 'min_employees', 'N/A')}, "
-                    f"req_keyholder={getattr(cov_item, 'requires_keyholder', 'N/A')}"
-                )
+            self.logger.info(f"Loaded {len(coverage)} coverage records")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                for cov_idx, cov_item in enumerate(coverage):
+                    self.logger.debug(
+                        f"  Coverage[{cov_idx}]: id={getattr(cov_item, 'id', 'N/A')}, "
+                        f"day={getattr(cov_item, 'day_index', 'N/A')}, "
+                        f"start={getattr(cov_item, 'start_time', 'N/A')}-end={getattr(cov_item, 'end_time', 'N/A')}, "
+                        f"min_emp={getattr(cov_item, 'min_employees', 'N/A')}, "
+                        f"req_keyholder={getattr(cov_item, 'requires_keyholder', 'N/A')}"
+                    )
 
             # Log coverage requirements by day
             by_day = {}
@@ -229,13 +278,13 @@ class ScheduleResources:
                     c for c in coverage if getattr(c, "day_index", -1) == day_idx
                 ]
                 if day_specific_coverage:
-                    self.logger.info(
+                    self.logger.debug(
                         f"  {day_name} ({day_idx}): {len(day_specific_coverage)} coverage blocks"
                     )
                     # for c_idx, c_item in enumerate(day_specific_coverage):
                     #    self.logger.debug(f"    {c_idx}: Start: {c_item.start_time}, End: {c_item.end_time}, MinEmp: {c_item.min_employees}, KeyH: {c_item.requires_keyholder}")
                 else:
-                    self.logger.info(f"  {day_name} ({day_idx}): No coverage blocks")
+                    self.logger.debug(f"  {day_name} ({day_idx}): No coverage blocks")
 
             self.logger.info(f"Successfully loaded {len(coverage)} coverage records")
             return coverage
@@ -281,7 +330,7 @@ class ScheduleResources:
                 active_days_val = getattr(shift, "active_days", "MISSING_ATTRIBUTE")
                 shift_name = getattr(shift, "name", "N/A")
 
-                self.logger.info(
+                self.logger.debug(
                     f"Loaded ShiftTemplate: id={shift.id}, name='{shift_name}', "
                     f"raw_start_time='{start_time_val}' (type: {type(start_time_val)}), "
                     f"raw_end_time='{end_time_val}' (type: {type(end_time_val)}), "
@@ -437,6 +486,19 @@ class ScheduleResources:
             cov for cov in self.coverage if getattr(cov, "day_index", None) == weekday
         ]
 
+    def _build_coverage_timeline(self) -> CoverageTimeline:
+        """(Re)compile the coverage timeline from self.coverage and settings"""
+        coverage = self.coverage or []
+        self._coverage_timeline = CoverageTimeline(coverage, self.settings)
+        return self._coverage_timeline
+
+    @property
+    def coverage_timeline(self) -> CoverageTimeline:
+        """Compiled coverage timeline, rebuilt if coverage or settings changed"""
+        if self._coverage_timeline is None:
+            return self._build_coverage_timeline()
+        return self._coverage_timeline
+
     def get_employee_absences(
         self, employee_id: int, start_date: date, end_date: date
     ) -> List[Absence]:
@@ -445,17 +507,25 @@ class ScheduleResources:
         if self.get_employee(employee_id) is None:
             return []
 
-        absences_found = []
-        for absence in self.absences:
-            # Use getattr for safety
-            if getattr(absence, "employee_id", None) == employee_id:
-                absence_end = getattr(absence, "end_date", None)
-                absence_start = getattr(absence, "start_date", None)
-                # Ensure dates are valid before comparing
-                if isinstance(absence_end, date) and isinstance(absence_start, date):
-                    if not (absence_end < start_date or absence_start > end_date):
-                        absences_found.append(absence)
-        return absences_found
+        return self.absence_index.absences_for(employee_id, start_date, end_date)
+
+    def _build_absence_index(self) -> AbsenceIndex:
+        """(Re)build the absence interval index from self.absences"""
+        absences = self.absences or []
+        self._absence_index = AbsenceIndex(absences)
+        self.logger.debug(f"Built absence index from {len(absences)} records")
+        return self._absence_index
+
+    @property
+    def absence_index(self) -> AbsenceIndex:
+        """Absence interval index, rebuilt if self.absences changed"""
+        if self._absence_index is None:
+            return self._build_absence_index()
+        return self._absence_index
+
+    def absent_employee_ids(self, day: date) -> FrozenSet[int]:
+        """Get the ids of all employees with an absence covering the given date"""
+        return self.absence_index.absent_employee_ids(day)
 
     def get_employee_availability(
         self, employee_id: int, day_of_week: int
@@ -466,11 +536,32 @@ class ScheduleResources:
         if self._employee_cache and employee_id not in self._employee_cache:
             return []
 
-        return [
-            avail
-            for avail in self.availabilities
-            if avail.employee_id == employee_id and avail.day_of_week == day_of_week
-        ]
+        return self.availability_index.records(employee_id, day_of_week)
+
+    def _build_availability_index(self) -> AvailabilityIndex:
+        """(Re)build the availability bitmask index from self.availabilities"""
+        availabilities = self.availabilities or []
+        self._availability_index = AvailabilityIndex.from_records(availabilities)
+        self.logger.debug(
+            f"Built availability index for {len(self._availability_index)} "
+            f"employee/weekday pairs from {len(availabilities)} records"
+        )
+        return self._availability_index
+
+    @property
+    def availability_index(self) -> AvailabilityIndex:
+        """Availability bitmask index, rebuilt if self.availabilities changed"""
+        if self._availability_index is None:
+            return self._build_availability_index()
+        return self._availability_index
+
+    def get_availability_masks(
+        self, employee_id: int, day_of_week: int
+    ) -> Optional[DayAvailabilityMasks]:
+        """Get the availability bitmasks for an employee on a day of week"""
+        if self._employee_cache and employee_id not in self._employee_cache:
+            return None
+        return self.availability_index.get(employee_id, day_of_week)
 
     def is_employee_available(
         self, employee_id: int, day: date, start_hour: int, end_hour: int
@@ -509,34 +600,22 @@ class ScheduleResources:
             return False
         # Check availability
         day_of_week = day.weekday()
-        availabilities = self.get_employee_availability(employee_id, day_of_week)
-        if not availabilities:
+        masks = self.get_availability_masks(employee_id, day_of_week)
+        if masks is None or not masks.records:
             logger.info(
                 f"Employee {employee_id} has no availability records for day {day_of_week}"
             )
             return False
-        # Check if employee is available for all hours in the range
-        for hour in range(start_hour, end_hour):
-            hour_available = False
-            for avail in availabilities:
-                if getattr(avail, "hour", None) == hour:
-                    avail_type = getattr(avail, "availability_type", None)
-                    # Accept AVAILABLE or PREFERRED as available
-                    if avail_type in (
-                        AvailabilityType.AVAILABLE,
-                        AvailabilityType.PREFERRED,
-                    ):
-                        hour_available = True
-                        break
-                    # Fallback: if is_available is True, also accept
-                    if getattr(avail, "is_available", False) is True:
-                        hour_available = True
-                        break
-            if not hour_available:
-                logger.info(
-                    f"Employee {employee_id} is not available at hour {hour} on day {day}"
-                )
-                return False
+        # Every hour in the range needs an AVAILABLE/PREFERRED (or is_available)
+        # record, which is a single subset test against the accepted mask
+        range_mask = hour_range_mask(start_hour, end_hour)
+        if not masks.covers(range_mask):
+            missing = range_mask & ~masks.accepted
+            first_missing = (missing & -missing).bit_length() - 1
+            logger.info(
+                f"Employee {employee_id} is not available at hour {first_missing} on day {day}"
+            )
+            return False
         logger.info(
             f"Employee {employee_id} is available on {day} from {start_hour} to {end_hour}"
         )
@@ -582,12 +661,7 @@ class ScheduleResources:
         self, employee_id: int, day: date
     ) -> List[EmployeeAvailability]:
         """Get all availabilities for an employee on a specific date"""
-        day_of_week = day.weekday()
-        return [
-            avail
-            for avail in self.availabilities
-            if avail.employee_id == employee_id and avail.day_of_week == day_of_week
-        ]
+        return self.availability_index.records(employee_id, day.weekday())
 
     def get_shift(self, shift_id: int) -> Optional[ShiftTemplate]:
         """Get a shift template by ID"""
@@ -601,15 +675,13 @@ class ScheduleResources:
         self._employee_cache = {}
         self._coverage_cache = {}
         self._date_caches_cleared = False
+        self._availability_index = None
+        self._absence_index = None
+        self._coverage_timeline = None
 
     def is_employee_on_leave(self, employee_id: int, date: date) -> bool:
         """Check if employee is on leave for given date"""
-        return any(
-            leave
-            for leave in self.absences
-            if leave.employee_id == employee_id
-            and leave.start_date <= date <= leave.end_date
-        )
+        return self.absence_index.is_absent(employee_id, date)
 
     def verify_loaded_resources(self):
         """
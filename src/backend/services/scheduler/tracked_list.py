@@ -0,0 +1,52 @@
+"""Lists that report in-place edits, for caches built from them.
+
+``AssignmentStore`` and the indexes of ``ScheduleResources`` are derived from
+plain lists that callers may still edit directly. Comparing ``id()`` and
+``len()`` of the list misses edits that keep the length (or a new list that
+reuses a freed id), and recounting every list on each lookup costs a pass over
+all entries. A ``TrackedList`` calls ``on_change`` from every mutating
+method instead, so the owner only has to keep a dirty flag.
+"""
+
+from typing import Any, Callable, Iterable, Optional
+
+
+def _mutating(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if self.on_change is not None:
+            self.on_change()
+        return result
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+class TrackedList(list):
+    """A list that calls ``on_change`` after every in-place modification."""
+
+    def __init__(
+        self, iterable: Iterable[Any] = (), on_change: Optional[Callable[[], None]] = None
+    ):
+        super().__init__(iterable)
+        self.on_change = on_change
+
+    __setitem__ = _mutating("__setitem__")
+    __delitem__ = _mutating("__delitem__")
+    __iadd__ = _mutating("__iadd__")
+    __imul__ = _mutating("__imul__")
+    append = _mutating("append")
+    extend = _mutating("extend")
+    insert = _mutating("insert")
+    remove = _mutating("remove")
+    pop = _mutating("pop")
+    clear = _mutating("clear")
+    sort = _mutating("sort")
+    reverse = _mutating("reverse")
+
+    def __reduce__(self):
+        # Copies and pickles are plain lists, not tied to the owner
+        return list, (list(self),)
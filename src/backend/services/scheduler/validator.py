@@ -43,9 +43,11 @@ from .resources import ScheduleResources
 from .utility import (
     calculate_rest_hours,
 )
+from . import coverage_matrix
 
 try:
     from .coverage_utils import (
+        get_coverage_timeline,
         get_required_staffing_for_interval,
         _time_str_to_datetime_time,
     )
@@ -326,8 +328,26 @@ class ScheduleValidator:
     """Handles validation of scheduling constraints"""
 
     INTERVAL_MINUTES = 60  # Define interval duration, should match DistributionManager
+    # Coverage engines: "interval" walks each interval in Python, "matrix" counts
+    # staffing for all days at once with NumPy (see coverage_matrix.py)
+    COVERAGE_ENGINES = ("interval", "matrix")
 
-    def __init__(self, resources: ScheduleResources, test_mode: bool = False):
+    def __init__(
+        self,
+        resources: ScheduleResources,
+        test_mode: bool = False,
+        engine: str = "interval",
+    ):
+        if engine not in self.COVERAGE_ENGINES:
+            raise ValueError(
+                f"Unknown coverage engine '{engine}', expected one of {self.COVERAGE_ENGINES}"
+            )
+        if engine == "matrix" and not coverage_matrix.is_available():
+            logger.warning(
+                "NumPy is not installed, falling back to the interval coverage engine"
+            )
+            engine = "interval"
+        self.engine = engine
         self.resources = resources
         self.errors: List[ValidationError] = []
         self.warnings: List[ValidationError] = []
@@ -456,6 +476,10 @@ class ScheduleValidator:
                 "No valid schedule entries with parseable dates to validate coverage for."
             )
             return
+        # Test mode restricts the intervals checked, which only the loop supports
+        if self.engine == "matrix" and not self.test_mode:
+            self._validate_coverage_matrix(valid_schedule_entries)
+            return
         min_parsed_date = min(item["parsed_date"] for item in valid_schedule_entries)
         max_parsed_date = max(item["parsed_date"] for item in valid_schedule_entries)
         current_validation_date = min_parsed_date
@@ -667,7 +691,7 @@ class ScheduleValidator:
                                                 "employee_group": str(emp_group),
                                             }
                                         )
-                                        if is_keyholder is not None:
+                                        if is_keyholder:
                                             actual_keyholders_present += 1
                                         if emp_group is not None:
                                             actual_employee_types_present[
@@ -779,6 +803,181 @@ class ScheduleValidator:
                     break
             current_validation_date += timedelta(days=1)
 
+    def _validate_coverage_matrix(self, valid_schedule_entries: List[Dict]) -> None:
+        """
+        Vectorized variant of the interval loop in _validate_coverage.
+
+        Staffing for all days and intervals is counted at once by CoverageMatrix
+        and compared against the compiled coverage timeline; ValidationErrors
+        are only built for the cells that violate a requirement.
+        """
+        min_parsed_date = min(item["parsed_date"] for item in valid_schedule_entries)
+        max_parsed_date = max(item["parsed_date"] for item in valid_schedule_entries)
+        num_days = (max_parsed_date - min_parsed_date).days + 1
+
+        employees: Dict[Any, Any] = {}
+        spans = []
+        for item in valid_schedule_entries:
+            assignment = item["original_entry"]
+            if isinstance(assignment, dict):
+                start_str = assignment.get("start_time")
+                end_str = assignment.get("end_time")
+                employee_id_val = assignment.get("employee_id")
+                assignment_id_val = assignment.get("id")
+            else:
+                start_str = getattr(assignment, "start_time", None)
+                end_str = getattr(assignment, "end_time", None)
+                employee_id_val = getattr(assignment, "employee_id", None)
+                assignment_id_val = getattr(assignment, "id", None)
+
+            start_t = _time_str_to_datetime_time(start_str) if start_str else None
+            end_t = _time_str_to_datetime_time(end_str) if end_str else None
+            if start_t is None or end_t is None:
+                logger.warning(
+                    f"Could not parse start/end time for assignment: {assignment}. Skipping interval check."
+                )
+                continue
+
+            span = coverage_matrix.StaffingSpan(
+                day=(item["parsed_date"] - min_parsed_date).days,
+                start_minute=start_t.hour * 60 + start_t.minute,
+                end_minute=end_t.hour * 60 + end_t.minute,
+            )
+            if employee_id_val is not None:
+                if employee_id_val not in employees:
+                    employees[employee_id_val] = self.resources.get_employee(
+                        employee_id_val
+                    )
+                employee = employees[employee_id_val]
+                if employee:
+                    emp_group = getattr(employee, "employee_group", "UNKNOWN_GROUP")
+                    span.is_keyholder = bool(getattr(employee, "is_keyholder", False))
+                    span.group_key = str(emp_group) if emp_group is not None else None
+                    span.details = {
+                        "employee_id": getattr(employee, "id", None),
+                        "is_keyholder": getattr(employee, "is_keyholder", False),
+                        "employee_group": str(emp_group),
+                    }
+                else:
+                    logger.warning(
+                        f"Could not find employee with ID {employee_id_val} for assignment {assignment_id_val}"
+                    )
+            spans.append(span)
+
+        matrix = coverage_matrix.CoverageMatrix(
+            min_parsed_date,
+            num_days,
+            self.INTERVAL_MINUTES,
+            spans,
+            get_coverage_timeline(self.resources),
+        )
+
+        understaffed = matrix.understaffed
+        keyholder_missing = matrix.keyholder_missing
+        types_unmet = matrix.types_unmet
+        self.total_intervals_checked += understaffed.size
+        self.intervals_met_min_employees += int((~understaffed).sum())
+        self.intervals_needed_keyholder += int(matrix.keyholder_required.sum())
+        self.intervals_met_keyholder += int(
+            (matrix.keyholder_required & ~keyholder_missing).sum()
+        )
+
+        empty_needs = {
+            "min_employees": 0,
+            "employee_types": set(),
+            "allowed_employee_groups": set(),
+            "requires_keyholder": False,
+            "keyholder_before_minutes": None,
+            "keyholder_after_minutes": None,
+        }
+        for day, slot in matrix.violating_cells():
+            current_validation_date = min_parsed_date + timedelta(days=day)
+            minute = slot * self.INTERVAL_MINUTES
+            interval_start_dt_time = time(minute // 60, minute % 60)
+            requirement = matrix.requirements[day][slot]
+            interval_needs = requirement.as_dict() if requirement else empty_needs
+            interval_needs_json = self._prepare_interval_needs_for_json(interval_needs)
+
+            working = matrix.spans_at(day, slot)
+            assigned_employee_details_for_interval = [
+                span.details for span in working if span.details is not None
+            ]
+            actual_assigned_employees = int(matrix.staff[day, slot])
+            details_base = {
+                "date": str(current_validation_date),
+                "interval_start": str(interval_start_dt_time),
+            }
+
+            if understaffed[day, slot]:
+                required_min_employees = interval_needs["min_employees"]
+                self.errors.append(
+                    ValidationError(
+                        error_type="Understaffing",
+                        message=(
+                            f"Understaffed for interval starting {interval_start_dt_time} on {current_validation_date}. "
+                            f"Required: {required_min_employees}, Actual: {actual_assigned_employees}."
+                        ),
+                        severity="critical",
+                        details={
+                            **details_base,
+                            "required_min_employees": required_min_employees,
+                            "actual_assigned_employees": actual_assigned_employees,
+                            "interval_needs": interval_needs_json,
+                            "assigned_employees_in_interval": assigned_employee_details_for_interval,
+                        },
+                    )
+                )
+
+            if keyholder_missing[day, slot]:
+                self.errors.append(
+                    ValidationError(
+                        error_type="MissingKeyholder",
+                        message=(
+                            f"Missing keyholder for interval starting {interval_start_dt_time} on {current_validation_date}."
+                        ),
+                        severity="critical",
+                        details={
+                            **details_base,
+                            "required_keyholder": True,
+                            "actual_keyholders_present": int(matrix.keyholders[day, slot]),
+                            "interval_needs": interval_needs_json,
+                            "assigned_employees_in_interval": assigned_employee_details_for_interval,
+                        },
+                    )
+                )
+
+            if types_unmet[day, slot]:
+                actual_employee_types_present = defaultdict(int)
+                for span in working:
+                    if span.group_key is not None:
+                        actual_employee_types_present[span.group_key] += 1
+                required_employee_types = interval_needs["employee_types"]
+                unmet_type_needs = [
+                    str(req_type)
+                    for req_type in required_employee_types
+                    if actual_employee_types_present.get(str(req_type), 0) == 0
+                ]
+                self.errors.append(
+                    ValidationError(
+                        error_type="MissingEmployeeType",
+                        message=(
+                            f"Missing required employee type(s) {', '.join(unmet_type_needs)} for interval "
+                            f"starting {interval_start_dt_time} on {current_validation_date}."
+                        ),
+                        severity="warning",
+                        details={
+                            **details_base,
+                            "required_types": required_employee_types,
+                            "actual_types_present_counts": dict(
+                                actual_employee_types_present
+                            ),
+                            "unmet_types": unmet_type_needs,
+                            "interval_needs": interval_needs_json,
+                            "assigned_employees_in_interval": assigned_employee_details_for_interval,
+                        },
+                    )
+                )
+
     def _prepare_interval_needs_for_json(self, interval_needs_dict: Dict) -> Dict:
         """Converts sets within interval_needs to lists for JSON serialization."""
         if not interval_needs_dict:
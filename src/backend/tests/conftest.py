@@ -1,4 +1,18 @@
+import atexit
+import os
+import shutil
+import tempfile
+
 import pytest
+from flask import Flask
+
+# Runtime files (log index, AI response cache) go to a temp dir, not the tree
+_runtime_dir = tempfile.mkdtemp(prefix="schichtplan-tests-")
+atexit.register(shutil.rmtree, _runtime_dir, ignore_errors=True)
+os.environ.setdefault("LOG_INDEX_PATH", os.path.join(_runtime_dir, "log_index.db"))
+os.environ.setdefault(
+    "AI_RESPONSE_CACHE_PATH", os.path.join(_runtime_dir, "ai_response_cache.db")
+)
 
 # Add the parent directory to the Python path
 # sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -57,6 +71,37 @@ def session(db, app):
         connection.close()
 
 
+@pytest.fixture
+def file_db_app(request):
+    """A bare Flask app on its own SQLite file, with its context pushed.
+
+    For tests that need real commits (worker threads, separate connections),
+    which the rollback-only ``session`` fixture cannot give them. In
+    unittest-style classes use ``@pytest.mark.usefixtures("file_db_app")``;
+    the app is set as ``self.app`` before ``setUp`` runs.
+    """
+    handle, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    _db.init_app(app)
+    # The session fixture may have replaced db.session with a connection-bound one
+    saved_session = _db.session
+    _db.session = _db._make_scoped_session({})
+    ctx = app.app_context()
+    ctx.push()
+    _db.create_all()
+    if request.instance is not None:
+        request.instance.app = app
+
+    yield app
+
+    _db.session.remove()
+    ctx.pop()
+    _db.session = saved_session
+    os.remove(db_path)
+
+
 @pytest.fixture
 def client(session, app):
     """Create a test client for the app, ensuring session is active."""
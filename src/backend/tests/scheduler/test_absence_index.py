@@ -0,0 +1,75 @@
+import unittest
+from datetime import date
+from unittest.mock import MagicMock
+
+from src.backend.services.scheduler.absence_index import AbsenceIndex
+from src.backend.services.scheduler.resources import ScheduleResources
+
+
+class MockAbsence:
+    def __init__(self, employee_id, start_date, end_date):
+        self.employee_id = employee_id
+        self.start_date = start_date
+        self.end_date = end_date
+
+
+class TestAbsenceIndex(unittest.TestCase):
+    def setUp(self):
+        self.long_leave = MockAbsence(1, date(2023, 1, 1), date(2023, 3, 31))
+        self.short_leave = MockAbsence(1, date(2023, 2, 10), date(2023, 2, 12))
+        self.other = MockAbsence(2, date(2023, 2, 11), date(2023, 2, 11))
+        self.index = AbsenceIndex(
+            [
+                self.short_leave,
+                self.long_leave,
+                self.other,
+                MockAbsence(3, None, date(2023, 2, 11)),
+            ]
+        )
+
+    def test_is_absent(self):
+        # A long interval starting earlier still covers dates after a shorter one
+        self.assertTrue(self.index.is_absent(1, date(2023, 3, 1)))
+        self.assertTrue(self.index.is_absent(2, date(2023, 2, 11)))
+        self.assertFalse(self.index.is_absent(2, date(2023, 2, 12)))
+        self.assertFalse(self.index.is_absent(1, date(2023, 4, 1)))
+        self.assertFalse(self.index.is_absent(3, date(2023, 2, 11)))
+
+    def test_absences_for_keeps_load_order(self):
+        self.assertEqual(
+            self.index.absences_for(1, date(2023, 2, 1), date(2023, 2, 10)),
+            [self.short_leave, self.long_leave],
+        )
+        self.assertEqual(
+            self.index.absences_for(1, date(2023, 2, 13), date(2023, 2, 20)),
+            [self.long_leave],
+        )
+        self.assertEqual(self.index.absences_for(4, date(2023, 1, 1), date(2023, 12, 31)), [])
+
+    def test_absent_employee_ids(self):
+        self.assertEqual(self.index.absent_employee_ids(date(2023, 2, 11)), {1, 2})
+        self.assertEqual(self.index.absent_employee_ids(date(2023, 5, 1)), frozenset())
+
+
+class TestResourcesAbsenceIndex(unittest.TestCase):
+    def test_index_follows_absence_list(self):
+        resources = ScheduleResources()
+        employee = MagicMock()
+        employee.id = 1
+        resources.employees = [employee]
+        resources.absences = [MockAbsence(1, date(2023, 1, 2), date(2023, 1, 4))]
+
+        self.assertTrue(resources.is_employee_on_leave(1, date(2023, 1, 3)))
+        self.assertEqual(resources.absent_employee_ids(date(2023, 1, 3)), {1})
+        self.assertEqual(
+            len(resources.get_employee_absences(1, date(2023, 1, 1), date(2023, 1, 2))),
+            1,
+        )
+
+        resources.absences = []
+        self.assertFalse(resources.is_employee_on_leave(1, date(2023, 1, 3)))
+        self.assertEqual(resources.absent_employee_ids(date(2023, 1, 3)), frozenset())
+
+
+if __name__ == "__main__":
+    unittest.main()
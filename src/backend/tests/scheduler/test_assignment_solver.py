@@ -0,0 +1,153 @@
+import itertools
+import logging
+import random
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.backend.services.scheduler import assignment_solver
+from src.backend.services.scheduler.assignment_solver import solve_assignment
+from src.backend.services.scheduler.distribution import DistributionManager
+
+MONDAY = date(2023, 3, 6)
+
+
+def random_costs(rng, rows, cols):
+    costs = [
+        [None if rng.random() < 0.2 else rng.uniform(-20, 20) for _ in range(cols)]
+        for _ in range(rows)
+    ]
+    # A zero-cost private column per row keeps every instance feasible
+    for row in range(rows):
+        costs[row].extend(0.0 if other == row else None for other in range(rows))
+    return costs
+
+
+def brute_force_cost(costs):
+    best = None
+    for columns in itertools.permutations(range(len(costs[0])), len(costs)):
+        values = [costs[row][column] for row, column in enumerate(columns)]
+        if None in values:
+            continue
+        total = sum(values)
+        if best is None or total < best:
+            best = total
+    return best
+
+
+class TestSolveAssignment(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            rows = rng.randint(1, 4)
+            costs = random_costs(rng, rows, rng.randint(rows, 5))
+
+            result = solve_assignment(costs)
+            self.assertEqual(len(set(result)), rows)
+            total = sum(costs[row][column] for row, column in enumerate(result))
+            self.assertAlmostEqual(total, brute_force_cost(costs))
+
+    def test_forbidden_only_rows_stay_unassigned(self):
+        self.assertEqual(solve_assignment([[None, 1.0], [None, None]]), [1, None])
+        self.assertEqual(solve_assignment([]), [])
+        with self.assertRaises(ValueError):
+            solve_assignment([[1.0], [2.0]])
+
+    @patch.object(assignment_solver, "linear_sum_assignment", None)
+    def test_large_problems_fall_back_to_greedy(self):
+        rng = random.Random(11)
+        costs = random_costs(rng, 6, 8)
+        exact = solve_assignment(costs)
+        greedy = solve_assignment(costs, max_exact_rows=5)
+        self.assertEqual(len(set(greedy)), 6)
+        self.assertTrue(all(costs[row][column] is not None for row, column in enumerate(greedy)))
+        self.assertGreaterEqual(
+            sum(costs[row][column] for row, column in enumerate(greedy)),
+            sum(costs[row][column] for row, column in enumerate(exact)),
+        )
+        # Greedy takes the cheapest pair first, even if that is not optimal
+        self.assertEqual(solve_assignment([[1.0, 2.0], [1.5, 9.0]], max_exact_rows=1), [0, 1])
+        self.assertEqual(solve_assignment([[1.0, 2.0], [1.5, 9.0]]), [1, 0])
+
+    @unittest.skipUnless(assignment_solver.is_available(), "scipy not installed")
+    def test_scipy_matches_hungarian(self):
+        rng = random.Random(3)
+        for _ in range(20):
+            rows = rng.randint(1, 6)
+            costs = random_costs(rng, rows, rng.randint(rows, 8))
+            with patch.object(assignment_solver, "linear_sum_assignment", None):
+                expected = solve_assignment(costs)
+            result = solve_assignment(costs)
+            self.assertAlmostEqual(
+                sum(costs[row][column] for row, column in enumerate(result)),
+                sum(costs[row][column] for row, column in enumerate(expected)),
+            )
+
+
+class TestAssignmentEngine(unittest.TestCase):
+    def setUp(self):
+        self.employees = [
+            SimpleNamespace(id=1, is_keyholder=True, is_active=True),
+            SimpleNamespace(id=2, is_keyholder=False, is_active=True),
+            SimpleNamespace(id=3, is_keyholder=False, is_active=True),
+        ]
+        resources = MagicMock()
+        resources.employees = self.employees
+        self.manager = DistributionManager(
+            resources, logger=MagicMock(spec=logging.Logger), engine="assignment"
+        )
+        self.shifts = [
+            SimpleNamespace(id=10, start_time="06:00", end_time="14:00", shift_type="EARLY"),
+            SimpleNamespace(id=11, start_time="14:00", end_time="22:00", shift_type="LATE"),
+        ]
+        self.staffing = {
+            10: {"min_employees": 1, "max_employees": 1, "requires_keyholder": True},
+            11: {"min_employees": 2, "max_employees": 2, "requires_keyholder": False},
+        }
+        self.manager._get_required_staffing_info_for_shift = (
+            lambda shift, shift_date: self.staffing[shift.id]
+        )
+        # Employee 1 strongly prefers the late shift, but only they can open
+        self.scores = {(1, 10): 0.0, (1, 11): 50.0, (2, 10): 5.0, (2, 11): 1.0,
+                       (3, 10): 5.0, (3, 11): 1.0}
+        self.manager.calculate_assignment_score = (
+            lambda employee_id, shift, *args: self.scores[(employee_id, shift.id)]
+        )
+        self.manager.batched_scoring = False
+
+    def test_day_is_solved_as_a_whole(self):
+        assignments = self.manager.generate_assignments_for_day(
+            MONDAY, self.shifts, self.employees
+        )
+        pairs = {(a["employee_id"], a["shift_id"]) for a in assignments}
+        self.assertEqual(pairs, {(1, 10), (2, 11), (3, 11)})
+        self.assertEqual(self.manager.assignments_by_employee.counts_on(MONDAY),
+                         {1: 1, 2: 1, 3: 1})
+
+        # Everyone already works today, so nothing is left to assign
+        self.assertEqual(
+            self.manager.generate_assignments_for_day(MONDAY, self.shifts, self.employees),
+            [],
+        )
+
+    def test_constraint_failures_are_forbidden(self):
+        self.manager._validate_assignment_constraints = (
+            lambda employee, shift, shift_date: employee.id != 1
+        )
+        assignments = self.manager.assign_employees_optimal(
+            MONDAY, self.shifts, self.employees
+        )
+        # Without a keyholder the opening shift stays empty
+        self.assertEqual(
+            {(a["employee_id"], a["shift_id"]) for a in assignments},
+            {(2, 11), (3, 11)},
+        )
+
+    def test_unknown_engine_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.manager.set_engine("simplex")
+
+
+if __name__ == "__main__":
+    unittest.main()
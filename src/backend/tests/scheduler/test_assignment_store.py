@@ -0,0 +1,100 @@
+import logging
+import unittest
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.backend.services.scheduler.assignment_store import AssignmentStore
+from src.backend.services.scheduler.constraints import ConstraintChecker
+from src.backend.services.scheduler.distribution import DistributionManager
+
+MONDAY = date(2023, 3, 6)
+
+
+class TestAssignmentStore(unittest.TestCase):
+    def test_indexes_follow_add(self):
+        store = AssignmentStore()
+        store.add(1, {"date": MONDAY, "shift_id": 1})
+        store.add(1, {"date": MONDAY + timedelta(days=2), "shift_id": 2})
+        store.add(2, {"date": MONDAY, "shift_id": 1})
+        store.add(2, {"date": MONDAY + timedelta(days=7), "shift_id": 1})
+
+        self.assertEqual(store.counts_on(MONDAY), {1: 1, 2: 1})
+        self.assertEqual(store.count_on(1, MONDAY + timedelta(days=2)), 1)
+        self.assertEqual(len(store.in_week(1, MONDAY + timedelta(days=6))), 2)
+        self.assertEqual(len(store.in_week(2, MONDAY)), 1)
+        self.assertEqual(store.last_date(2), MONDAY + timedelta(days=7))
+        self.assertEqual(store.total(), 4)
+        self.assertEqual(store[3], [])
+
+    def test_direct_edits_rebuild_indexes(self):
+        store = AssignmentStore()
+        store.add(1, {"date": MONDAY})
+        store[1].append({"date": MONDAY})
+        self.assertEqual(store.count_on(1, MONDAY), 2)
+
+        # Same number of assignments, different dates
+        store[1][1] = {"date": MONDAY + timedelta(days=3)}
+        self.assertEqual(store.count_on(1, MONDAY), 1)
+        self.assertEqual(store.last_date(1), MONDAY + timedelta(days=3))
+
+        store[1] = [{"date": MONDAY + timedelta(days=1)}]
+        self.assertEqual(store.count_on(1, MONDAY), 0)
+        self.assertEqual(store.last_date(1), MONDAY + timedelta(days=1))
+
+        # Lookups without edits do not rescan the lists
+        with patch.object(store, "_index", side_effect=AssertionError):
+            self.assertEqual(store.count_on(1, MONDAY + timedelta(days=1)), 1)
+
+        store.clear()
+        self.assertEqual(store.counts_on(MONDAY + timedelta(days=1)), {})
+        self.assertIsNone(store.last_date(1))
+
+
+class TestDistributionHistory(unittest.TestCase):
+    def test_historical_assignments_use_template_index(self):
+        manager = DistributionManager(
+            MagicMock(employees=[]), logger=MagicMock(spec=logging.Logger)
+        )
+        shifts = [SimpleNamespace(id=7, start_time="08:00", end_time="14:00")]
+        history = [
+            {"employee_id": 1, "shift_id": 7, "date": MONDAY},
+            {"employee_id": 1, "shift_id": 8, "date": MONDAY},  # unknown template
+        ]
+        manager.initialize(
+            [SimpleNamespace(id=1)], historical_data=history, shifts=shifts
+        )
+
+        self.assertEqual(manager.assignments_by_employee.counts_on(MONDAY), {1: 1})
+        self.assertEqual(
+            manager.assignments_by_employee[1][0]["start_time"], "08:00"
+        )
+
+    def test_assignments_reach_the_constraint_checker(self):
+        resources = MagicMock(employees=[])
+        resources.shifts = [
+            SimpleNamespace(id=7, start_time="08:00", end_time="14:00", duration_hours=6.0)
+        ]
+        checker = ConstraintChecker(resources, MagicMock(), MagicMock(spec=logging.Logger))
+        manager = DistributionManager(
+            resources, constraint_checker=checker, logger=MagicMock(spec=logging.Logger)
+        )
+        history = [{"employee_id": 1, "shift_id": 7, "date": MONDAY}]
+        manager.initialize(
+            [SimpleNamespace(id=1)], historical_data=history, shifts=resources.shifts
+        )
+        self.assertEqual(checker.get_weekly_hours(1, MONDAY), 6.0)
+
+        manager._record_assignment(
+            1, {"employee_id": 1, "shift_id": 7, "date": MONDAY + timedelta(days=1)}
+        )
+        self.assertEqual(checker.get_weekly_hours(1, MONDAY), 12.0)
+        self.assertEqual(checker.count_consecutive_days(1, MONDAY + timedelta(days=2)), 2)
+
+        # A new run starts from an empty constraint context
+        manager.initialize([SimpleNamespace(id=1)], shifts=resources.shifts)
+        self.assertEqual(checker.get_weekly_hours(1, MONDAY), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from datetime import date
+from unittest.mock import MagicMock
+
+from src.backend.models.employee import AvailabilityType
+from src.backend.services.scheduler.availability import AvailabilityChecker
+from src.backend.services.scheduler.availability_index import (
+    AvailabilityIndex,
+    hour_range_mask,
+    hours_mask,
+)
+from src.backend.services.scheduler.resources import ScheduleResources
+
+
+class MockAvailability:
+    def __init__(
+        self,
+        employee_id,
+        day_of_week,
+        hour,
+        availability_type=AvailabilityType.AVAILABLE,
+        is_available=True,
+    ):
+        self.employee_id = employee_id
+        self.day_of_week = day_of_week
+        self.hour = hour
+        self.availability_type = availability_type
+        self.is_available = is_available
+
+
+class TestAvailabilityIndex(unittest.TestCase):
+    def test_hour_range_mask(self):
+        self.assertEqual(hour_range_mask(9, 12), 0b111 << 9)
+        self.assertEqual(hour_range_mask(12, 12), 0)
+        # Hours past midnight are not wrapped by the range helper...
+        self.assertEqual(hour_range_mask(23, 25), (1 << 23) | (1 << 24))
+        # ...but can be expressed explicitly
+        self.assertEqual(hours_mask([23, 0]), (1 << 23) | 1)
+
+    def test_range_available(self):
+        index = AvailabilityIndex.from_records(
+            [MockAvailability(1, 0, hour) for hour in range(9, 17)]
+        )
+        self.assertTrue(index.is_range_available(1, 0, 9, 17))
+        self.assertFalse(index.is_range_available(1, 0, 8, 17))
+        self.assertFalse(index.is_range_available(1, 1, 9, 17))
+        self.assertFalse(index.is_range_available(2, 0, 9, 17))
+
+    def test_effective_type_priority(self):
+        index = AvailabilityIndex.from_records(
+            [
+                MockAvailability(1, 0, 9, AvailabilityType.AVAILABLE),
+                MockAvailability(1, 0, 10, AvailabilityType.PREFERRED),
+                MockAvailability(1, 0, 11, AvailabilityType.FIXED),
+                MockAvailability(1, 0, 12, AvailabilityType.UNAVAILABLE, False),
+                # Later records for an already recorded hour do not change its type
+                MockAvailability(1, 0, 9, AvailabilityType.UNAVAILABLE, False),
+            ]
+        )
+        masks = index.get(1, 0)
+        self.assertEqual(masks.effective_type(hour_range_mask(9, 10)), "AVAILABLE")
+        self.assertEqual(masks.effective_type(hour_range_mask(9, 11)), "PREFERRED")
+        self.assertEqual(masks.effective_type(hour_range_mask(9, 12)), "FIXED")
+        self.assertEqual(masks.effective_type(hour_range_mask(9, 13)), "UNAVAILABLE")
+        # Hours without records count as available
+        self.assertEqual(masks.effective_type(hour_range_mask(14, 16)), "AVAILABLE")
+        self.assertEqual(len(index.records(1, 0)), 5)
+
+
+class TestResourcesAvailabilityIndex(unittest.TestCase):
+    def setUp(self):
+        self.resources = ScheduleResources()
+        employee = MagicMock()
+        employee.id = 1
+        self.resources.employees = [employee]
+        self.resources.absences = []
+        self.resources.availabilities = [
+            MockAvailability(1, 0, hour) for hour in range(8, 14)
+        ]
+        self.monday = date(2023, 1, 2)
+
+    def test_index_rebuilt_when_availabilities_replaced(self):
+        self.assertTrue(self.resources.is_employee_available(1, self.monday, 8, 14))
+        self.resources.availabilities = [MockAvailability(1, 0, 8)]
+        self.assertFalse(self.resources.is_employee_available(1, self.monday, 8, 14))
+        self.assertEqual(len(self.resources.get_employee_availability(1, 0)), 1)
+
+    def test_checker_uses_masks(self):
+        self.assertEqual(len(self.resources.get_employee_availability(1, 0)), 6)
+        # In-place edits reach the index without replacing the list
+        self.resources.availabilities.append(
+            MockAvailability(1, 0, 14, AvailabilityType.UNAVAILABLE, False)
+        )
+        self.assertEqual(len(self.resources.get_employee_availability(1, 0)), 7)
+        checker = AvailabilityChecker(self.resources)
+
+        shift = MagicMock(id=1, start_time="08:00", end_time="14:00")
+        self.assertEqual(
+            checker.is_employee_available(1, self.monday, shift), (True, "AVAILABLE")
+        )
+        late_shift = MagicMock(id=2, start_time="10:00", end_time="16:00")
+        self.assertEqual(
+            checker.is_employee_available(1, self.monday, late_shift),
+            (False, "UNAVAILABLE"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import logging
+import unittest
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+
+from src.backend.models import db
+from src.backend.models.employee import AvailabilityType
+from src.backend.models.fixed_shift import ShiftTemplate, ShiftType
+from src.backend.models.schedule import Schedule, ScheduleStatus
+from src.backend.services.scheduler.bulk_writer import write_schedules
+
+
+class TestWriteSchedules(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        db.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        # Core insert: ShiftTemplate.__init__ needs an app context for settings
+        self.session.execute(
+            insert(ShiftTemplate.__table__).values(
+                id=1, start_time="08:00", end_time="16:00", duration_hours=8.0,
+                requires_break=True, shift_type=ShiftType.EARLY,
+                shift_type_id="EARLY", active_days={"0": True},
+            )
+        )
+        self.session.commit()
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement.split()[0].upper())
+
+    def test_rows_are_filled_from_prefetched_templates(self):
+        assignments = [
+            {"employee_id": 1, "shift_id": 1, "date": date(2024, 8, 1),
+             "break_start": "12:00", "break_end": "12:30"},
+            {"employee_id": 2, "shift_template_id": 1, "date": "2024-08-02",
+             "status": "PENDING", "availability_type": "FIXED"},
+            SimpleNamespace(employee_id=3, shift_id=1, date=date(2024, 8, 3),
+                            version=None, status=ScheduleStatus.DRAFT,
+                            shift_type_str="EARLY", availability_type=None),
+            {"employee_id": -1, "shift_id": 0, "date": date(2024, 8, 3), "status": "EMPTY"},
+            {"employee_id": 4, "shift_id": 1, "date": date(2024, 8, 4), "status": "BOGUS"},
+        ]
+        result = write_schedules(
+            self.session, assignments, default_version=3, commit=True,
+            logger=MagicMock(spec=logging.Logger),
+        )
+
+        self.assertEqual((result.rows, result.skipped), (3, 2))
+        self.assertGreater(result.rows_per_second, 0)
+        # One template lookup and one insert, no per-row SELECTs
+        self.assertEqual(self.statements.count("SELECT"), 1)
+        self.assertEqual(self.statements.count("INSERT"), 1)
+
+        rows = self.session.query(Schedule).order_by(Schedule.employee_id).all()
+        self.assertEqual([row.employee_id for row in rows], [1, 2, 3])
+        self.assertEqual(rows[0].date, datetime(2024, 8, 1))
+        self.assertEqual((rows[0].shift_start, rows[0].shift_end), ("08:00", "16:00"))
+        self.assertEqual(rows[0].shift_type_id, "EARLY")
+        self.assertEqual(rows[0].break_duration, 30)
+        self.assertEqual(rows[0].version, 3)
+        # Dicts without a status are PENDING, as the generator always saved them
+        self.assertEqual(rows[0].status, ScheduleStatus.PENDING)
+        self.assertEqual(rows[1].status, ScheduleStatus.PENDING)
+        self.assertEqual(rows[2].status, ScheduleStatus.DRAFT)
+        self.assertEqual(rows[1].availability_type, AvailabilityType.FIXED)
+        self.assertEqual(rows[2].shift_type, "EARLY")
+        self.assertIsNotNone(rows[2].created_at)
+
+    def test_default_status_can_be_overridden(self):
+        write_schedules(
+            self.session,
+            [
+                {"employee_id": 1, "shift_id": 1, "date": date(2024, 8, 1)},
+                {"employee_id": 2, "shift_id": 1, "date": date(2024, 8, 1),
+                 "status": "PUBLISHED"},
+            ],
+            default_status=ScheduleStatus.DRAFT,
+        )
+        rows = self.session.query(Schedule).order_by(Schedule.employee_id).all()
+        self.assertEqual(
+            [row.status for row in rows],
+            [ScheduleStatus.DRAFT, ScheduleStatus.PUBLISHED],
+        )
+
+    def test_chunks_stay_in_one_transaction(self):
+        assignments = [
+            {"employee_id": i, "shift_id": 1, "date": date(2024, 8, 1)} for i in range(1, 8)
+        ]
+        write_schedules(self.session, assignments, templates={}, chunk_size=3)
+        self.assertEqual(self.statements.count("INSERT"), 3)
+        self.session.rollback()
+        self.assertEqual(self.session.query(Schedule).count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import logging
+import unittest
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.backend.services.scheduler.constraint_state import ConstraintState
+from src.backend.services.scheduler.constraints import ConstraintChecker
+
+
+def make_entry(employee_id, shift_id, day):
+    return SimpleNamespace(employee_id=employee_id, shift_id=shift_id, date=day)
+
+
+MONDAY = date(2023, 3, 6)
+
+
+class TestConstraintState(unittest.TestCase):
+    def test_consecutive_days_bitset(self):
+        state = ConstraintState()
+        for offset in (1, 2, 3, 5):
+            state.add(1, MONDAY - timedelta(days=offset), object())
+        self.assertEqual(state.consecutive_days_before(1, MONDAY), 3)
+        self.assertEqual(state.consecutive_days_before(1, MONDAY, limit=2), 2)
+        self.assertEqual(state.consecutive_days_before(1, MONDAY - timedelta(days=3)), 0)
+        self.assertEqual(state.consecutive_days_before(2, MONDAY), 0)
+
+        # Adding a date before the first tracked one rebases the bitset
+        state.add(1, MONDAY - timedelta(days=4), object())
+        self.assertEqual(state.consecutive_days_before(1, MONDAY), 5)
+
+    def test_remove_updates_days_and_hours(self):
+        state = ConstraintState()
+        late = object()
+        early = object()
+        state.add(1, MONDAY, early, 6.0)
+        state.add(1, MONDAY, late, 6.0)
+        self.assertEqual(state.weekly_hours(1, MONDAY + timedelta(days=6)), 12.0)
+
+        self.assertTrue(state.remove(1, MONDAY, late))
+        self.assertFalse(state.remove(1, MONDAY, late))
+        self.assertEqual(state.weekly_hours(1, MONDAY), 6.0)
+        self.assertEqual(state.consecutive_days_before(1, MONDAY + timedelta(days=1)), 1)
+
+        state.remove(1, MONDAY, early)
+        self.assertEqual(state.consecutive_days_before(1, MONDAY + timedelta(days=1)), 0)
+        self.assertEqual(state.entries_for(1), [])
+
+
+class TestConstraintCheckerState(unittest.TestCase):
+    def setUp(self):
+        resources = MagicMock()
+        resources.shifts = [
+            SimpleNamespace(id=1, start_time="08:00", end_time="14:00", duration_hours=None),
+            SimpleNamespace(id=2, start_time="20:00", end_time="02:00", duration_hours=6.0),
+        ]
+        self.checker = ConstraintChecker(
+            resources, MagicMock(), MagicMock(spec=logging.Logger)
+        )
+
+    def test_add_and_remove_assignments(self):
+        sunday = MONDAY + timedelta(days=6)
+        entries = [make_entry(1, 1, MONDAY + timedelta(days=i)) for i in range(3)]
+        for entry in entries:
+            self.checker.add_assignment(entry)
+        self.checker.add_assignment(make_entry(1, 2, sunday))
+
+        self.assertEqual(self.checker.get_weekly_hours(1, sunday), 24.0)
+        self.assertEqual(self.checker.count_consecutive_days(1, MONDAY + timedelta(days=3)), 3)
+        self.assertEqual(self.checker.state.entries_on(1, sunday), [self.checker.schedule[-1]])
+
+        self.assertTrue(self.checker.remove_assignment(entries[1]))
+        self.assertEqual(self.checker.get_weekly_hours(1, MONDAY), 18.0)
+        self.assertEqual(self.checker.count_consecutive_days(1, MONDAY + timedelta(days=3)), 1)
+        self.assertNotIn(entries[1], self.checker.schedule)
+
+    def test_state_follows_replaced_schedule(self):
+        self.checker.set_schedule([make_entry(1, 1, MONDAY)], {})
+        self.assertEqual(self.checker.get_weekly_hours(1, MONDAY), 6.0)
+
+        self.checker.set_schedule([make_entry(1, 1, MONDAY), make_entry(1, 2, MONDAY)], {})
+        self.assertEqual(self.checker.get_weekly_hours(1, MONDAY), 12.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
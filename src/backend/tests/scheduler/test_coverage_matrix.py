@@ -0,0 +1,125 @@
+import unittest
+from datetime import date
+from types import SimpleNamespace
+
+from src.backend.services.scheduler import coverage_matrix
+from src.backend.services.scheduler.coverage_matrix import (
+    CoverageMatrix,
+    StaffingSpan,
+)
+from src.backend.services.scheduler.coverage_timeline import CoverageTimeline
+from src.backend.services.scheduler.resources import ScheduleResources
+from src.backend.services.scheduler.validator import ScheduleConfig, ScheduleValidator
+
+
+def make_coverage(day_index, start, end, min_employees, **kwargs):
+    return SimpleNamespace(
+        day_index=day_index,
+        start_time=start,
+        end_time=end,
+        min_employees=min_employees,
+        employee_types=kwargs.get("employee_types", []),
+        allowed_employee_groups=kwargs.get("allowed_employee_groups", []),
+        requires_keyholder=kwargs.get("requires_keyholder", False),
+        keyholder_before_minutes=None,
+        keyholder_after_minutes=None,
+    )
+
+
+def make_employee(employee_id, group, is_keyholder=False):
+    return SimpleNamespace(
+        id=employee_id,
+        employee_group=group,
+        is_keyholder=is_keyholder,
+        is_active=True,
+    )
+
+
+MONDAY = date(2023, 10, 23)
+
+
+@unittest.skipUnless(coverage_matrix.is_available(), "numpy not installed")
+class TestCoverageMatrix(unittest.TestCase):
+    def setUp(self):
+        self.timeline = CoverageTimeline(
+            [
+                make_coverage(0, "09:00", "12:00", 2, requires_keyholder=True),
+                make_coverage(0, "10:00", "11:00", 1, employee_types=["VZ"]),
+            ]
+        )
+
+    def test_counts_half_open_spans(self):
+        spans = [
+            StaffingSpan(0, 9 * 60, 11 * 60, is_keyholder=True, group_key="TZ"),
+            StaffingSpan(0, 10 * 60 + 30, 12 * 60, group_key="VZ"),
+            StaffingSpan(0, 14 * 60, 13 * 60),  # ends before it starts
+        ]
+        matrix = CoverageMatrix(MONDAY, 1, 60, spans, self.timeline)
+
+        self.assertEqual(matrix.staff[0, 9:12].tolist(), [1, 1, 1])
+        self.assertEqual(matrix.keyholders[0, 9:12].tolist(), [1, 1, 0])
+        self.assertEqual(matrix.understaffed[0, 9:12].tolist(), [True, True, True])
+        self.assertEqual(matrix.keyholder_missing[0, 9:12].tolist(), [False, False, True])
+        # The VZ employee only starts at 10:30, after the 10:00 interval began
+        self.assertTrue(matrix.types_unmet[0, 10])
+        self.assertEqual(matrix.violating_cells(), [(0, 9), (0, 10), (0, 11)])
+        self.assertEqual(len(matrix.spans_at(0, 10)), 1)
+
+
+@unittest.skipUnless(coverage_matrix.is_available(), "numpy not installed")
+class TestMatrixEngineMatchesIntervalLoop(unittest.TestCase):
+    def setUp(self):
+        self.resources = ScheduleResources()
+        self.resources.coverage = [
+            make_coverage(0, "08:00", "16:00", 2, requires_keyholder=True),
+            make_coverage(0, "12:00", "14:00", 3, employee_types=["VZ"]),
+            make_coverage(1, "09:00", "18:00", 1, employee_types=["TZ"]),
+        ]
+        self.resources.employees = [
+            make_employee(1, "VZ", is_keyholder=True),
+            make_employee(2, "TZ"),
+            make_employee(3, "GFB"),
+        ]
+        tuesday = date(2023, 10, 24)
+        self.schedule = [
+            {"id": 1, "employee_id": 1, "date": MONDAY, "start_time": "08:00", "end_time": "13:00"},
+            {"id": 2, "employee_id": 2, "date": MONDAY, "start_time": "10:00", "end_time": "16:00"},
+            {"id": 3, "employee_id": 3, "date": MONDAY, "start_time": "12:00", "end_time": "14:00"},
+            {"id": 4, "employee_id": 99, "date": tuesday, "start_time": "09:00", "end_time": "12:00"},
+            {"id": 5, "employee_id": 2, "date": tuesday, "start_time": "bad", "end_time": "12:00"},
+        ]
+
+    def _validate(self, engine):
+        validator = ScheduleValidator(self.resources, engine=engine)
+        config = ScheduleConfig(
+            enforce_min_coverage=True,
+            enforce_contracted_hours=False,
+            enforce_keyholder=False,
+            enforce_rest_periods=False,
+            enforce_max_shifts=False,
+            enforce_max_hours=False,
+        )
+        errors = validator.validate(self.schedule, config)
+        counters = (
+            validator.total_intervals_checked,
+            validator.intervals_met_min_employees,
+            validator.intervals_needed_keyholder,
+            validator.intervals_met_keyholder,
+        )
+        return [(e.error_type, e.severity, e.message, e.details) for e in errors], counters
+
+    def test_same_errors_and_counters(self):
+        interval_errors, interval_counters = self._validate("interval")
+        matrix_errors, matrix_counters = self._validate("matrix")
+
+        self.assertTrue(interval_errors)
+        self.assertEqual(matrix_errors, interval_errors)
+        self.assertEqual(matrix_counters, interval_counters)
+
+    def test_rejects_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            ScheduleValidator(self.resources, engine="vector")
+
+
+if __name__ == "__main__":
+    unittest.main()
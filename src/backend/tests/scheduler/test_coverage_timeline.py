@@ -0,0 +1,93 @@
+import unittest
+from datetime import date, time
+from types import SimpleNamespace
+
+from src.backend.services.scheduler.coverage_timeline import CoverageTimeline
+from src.backend.services.scheduler.coverage_utils import (
+    get_required_staffing_for_interval,
+)
+from src.backend.services.scheduler.resources import ScheduleResources
+
+
+def make_coverage(day_index, start, end, min_employees, **kwargs):
+    return SimpleNamespace(
+        day_index=day_index,
+        start_time=start,
+        end_time=end,
+        min_employees=min_employees,
+        employee_types=kwargs.get("employee_types", []),
+        allowed_employee_groups=kwargs.get("allowed_employee_groups", []),
+        requires_keyholder=kwargs.get("requires_keyholder", False),
+        keyholder_before_minutes=kwargs.get("keyholder_before_minutes"),
+        keyholder_after_minutes=kwargs.get("keyholder_after_minutes"),
+    )
+
+
+MONDAY = date(2023, 10, 23)
+
+
+class TestCoverageTimeline(unittest.TestCase):
+    def setUp(self):
+        self.coverage = [
+            make_coverage(0, "09:00", "17:00", 2, employee_types=["TZ"]),
+            make_coverage(
+                0,
+                "12:00",
+                "14:00",
+                3,
+                employee_types=["VZ"],
+                requires_keyholder=True,
+                keyholder_before_minutes=15,
+            ),
+            make_coverage(0, "22:00", "06:00", 5),  # ends before it starts
+            make_coverage(0, "9:00", "10:00", 9),  # malformed time
+            make_coverage(1, "08:00", "12:00", 1),
+        ]
+        self.timeline = CoverageTimeline(self.coverage)
+
+    def test_merges_overlapping_rules(self):
+        requirement = self.timeline.requirement_at(MONDAY, time(12, 30))
+        self.assertEqual(requirement.min_employees, 3)
+        self.assertEqual(requirement.employee_types, {"TZ", "VZ"})
+        self.assertTrue(requirement.requires_keyholder)
+        self.assertEqual(requirement.keyholder_before_minutes, 15)
+        self.assertEqual(
+            requirement.employee_type_mask,
+            self.timeline.type_bit("TZ") | self.timeline.type_bit("VZ"),
+        )
+
+    def test_boundaries_are_half_open(self):
+        self.assertEqual(self.timeline.requirement_at(MONDAY, time(9, 0)).min_employees, 2)
+        self.assertEqual(self.timeline.requirement_at(MONDAY, time(14, 0)).min_employees, 2)
+        self.assertIsNone(self.timeline.requirement_at(MONDAY, time(8, 45)))
+        self.assertIsNone(self.timeline.requirement_at(MONDAY, time(17, 0)))
+        self.assertIsNone(self.timeline.requirement_at(MONDAY, time(23, 0)))
+
+    def test_closed_special_day_has_no_requirements(self):
+        settings = SimpleNamespace(
+            special_days={MONDAY.isoformat(): {"is_closed": True}}, special_hours={}
+        )
+        timeline = CoverageTimeline(self.coverage, settings)
+        self.assertIsNone(timeline.requirement_at(MONDAY, time(10, 0)))
+        self.assertTrue(all(slot is None for slot in timeline.slots_for_date(MONDAY)))
+
+    def test_interval_lookup_uses_resources_timeline(self):
+        resources = ScheduleResources()
+        resources.coverage = self.coverage
+        needs = get_required_staffing_for_interval(MONDAY, time(12, 0), resources)
+        self.assertEqual(needs["min_employees"], 3)
+        self.assertEqual(needs["employee_types"], {"TZ", "VZ"})
+        self.assertIs(resources.coverage_timeline, resources.coverage_timeline)
+
+        resources.coverage = [make_coverage(0, "12:00", "13:00", 1)]
+        needs = get_required_staffing_for_interval(MONDAY, time(12, 0), resources)
+        self.assertEqual(needs["min_employees"], 1)
+        self.assertEqual(needs["employee_types"], set())
+
+        empty = get_required_staffing_for_interval(MONDAY, time(18, 0), resources)
+        self.assertEqual(empty["min_employees"], 0)
+        self.assertIsNone(empty["keyholder_after_minutes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import logging
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.backend.services.scheduler.diagnostics import (
+    DiagnosticChannel,
+    lazy_json,
+    resolve_diagnostics,
+)
+from src.backend.services.scheduler.distribution import DistributionManager
+from src.backend.services.scheduler.logging_utils import ProcessTracker
+
+
+class RecordingLogger:
+    """Collects messages like the central logger, without level support"""
+
+    def __init__(self):
+        self.messages = []
+
+    def debug(self, message):
+        self.messages.append(("DEBUG", message))
+
+    def info(self, message):
+        self.messages.append(("INFO", message))
+
+    def warning(self, message):
+        self.messages.append(("WARNING", message))
+
+    def error(self, message, exc_info=None):
+        self.messages.append(("ERROR", message))
+
+    def log(self, level, message):
+        self.messages.append((logging.getLevelName(level), message))
+
+
+class Unprintable:
+    """Fails the test if it is ever formatted"""
+
+    def __str__(self):
+        raise AssertionError("formatted although the level is disabled")
+
+    __repr__ = __str__
+
+
+class TestDiagnosticChannel(unittest.TestCase):
+    def setUp(self):
+        self.logger = RecordingLogger()
+
+    def test_disabled_levels_are_not_formatted(self):
+        channel = DiagnosticChannel(self.logger, "summary")
+        channel.debug("value: %s", Unprintable())
+        channel.debug(lambda: str(Unprintable()))
+        channel.data("dump", [Unprintable()])
+        channel.info("%d shifts", 3)
+        self.assertEqual(self.logger.messages, [("INFO", "3 shifts")])
+
+    def test_modes(self):
+        channel = DiagnosticChannel(self.logger, "off")
+        channel.info("summary")
+        self.assertEqual(self.logger.messages, [])
+
+        channel.set_mode("full")
+        channel.debug("%s:\n%s", "rows", lazy_json([1, 2], indent=None))
+        self.assertEqual(self.logger.messages, [("DEBUG", "rows:\n[1, 2]")])
+        with self.assertRaises(ValueError):
+            channel.set_mode("verbose")
+
+    def test_respects_logger_level(self):
+        std_logger = logging.getLogger("test_diagnostics")
+        std_logger.setLevel(logging.INFO)
+        channel = DiagnosticChannel(std_logger, "full")
+        self.assertFalse(channel.is_enabled(logging.DEBUG))
+        self.assertTrue(channel.is_enabled(logging.INFO))
+
+    def test_sampling(self):
+        channel = DiagnosticChannel(self.logger, "full", sample_first=2, sample_every=5)
+        for i in range(1, 11):
+            channel.sampled("candidate", "candidate %d", i)
+        self.assertEqual(
+            [message for _, message in self.logger.messages],
+            ["candidate 1", "candidate 2", "candidate 5", "candidate 10"],
+        )
+        self.assertEqual(channel.sample_counts(), {"candidate": 10})
+
+    def test_resolve_diagnostics(self):
+        self.assertEqual(resolve_diagnostics(None), "summary")
+        self.assertEqual(resolve_diagnostics({"enable_diagnostics": True}), "full")
+        self.assertEqual(
+            resolve_diagnostics({"diagnostics": "off", "enable_diagnostics": True}), "off"
+        )
+
+
+class TestProcessTrackerLevels(unittest.TestCase):
+    def setUp(self):
+        self.schedule_logger = RecordingLogger()
+        self.diagnostic_logger = RecordingLogger()
+        self.events = []
+        self.tracker = ProcessTracker(
+            "Test",
+            self.schedule_logger,
+            self.diagnostic_logger,
+            progress_callback=self.events.append,
+        )
+        self.diagnostic_logger.messages.clear()
+
+    def run_steps(self):
+        self.tracker.start_process()
+        self.tracker.start_step("Assign")
+        self.tracker.log_step_data("Shift Instances", [{"id": 1}])
+        self.tracker.end_step({"assignments": 1})
+        self.tracker.end_process({"status": "success"})
+
+    def test_step_data_is_not_serialized_above_debug(self):
+        self.tracker.set_level(logging.INFO)
+        with patch("src.backend.services.scheduler.logging_utils.json.dumps") as dumps:
+            self.run_steps()
+            # Only the end-of-process summary and stats are serialized
+            self.assertEqual(dumps.call_count, 2)
+        messages = [message for _, message in self.diagnostic_logger.messages]
+        self.assertIn("--> START STEP 1: Assign", messages)
+        self.assertFalse(any("Shift Instances" in message for message in messages))
+
+    def test_off_keeps_progress_and_warnings(self):
+        self.tracker.set_level(logging.WARNING)
+        self.run_steps()
+        self.tracker.log_warning("No shift templates")
+        self.assertEqual(self.schedule_logger.messages, [("WARNING", "No shift templates")])
+        self.assertEqual(
+            [event["event"] for event in self.events],
+            ["step_started", "step_completed", "process_completed"],
+        )
+
+
+class TestDistributionDiagnostics(unittest.TestCase):
+    def test_candidate_messages_follow_the_mode(self):
+        logger = RecordingLogger()
+        manager = DistributionManager(resources=None, logger=logger, diagnostics="off")
+        logger.messages.clear()
+        manager.employee_preferences = {1: {"avoid_shifts": ["EARLY"]}}
+        shift = SimpleNamespace(shift_type="EARLY")
+
+        manager._calculate_preference_adjustment_v2(1, shift, date(2024, 8, 5), None)
+        self.assertEqual(logger.messages, [])
+
+        manager.set_diagnostics("full")
+        manager._calculate_preference_adjustment_v2(1, shift, date(2024, 8, 5), None)
+        self.assertEqual([level for level, _ in logger.messages], ["DEBUG", "DEBUG"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import logging
+import pickle
+import unittest
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.backend.services.scheduler import parallel
+from src.backend.services.scheduler.constraints import ConstraintChecker
+from src.backend.services.scheduler.distribution import DistributionManager
+from src.backend.services.scheduler.generator import ScheduleGenerator
+from src.backend.services.scheduler.resource_snapshot import (
+    EmployeeRecord,
+    ResourceSnapshot,
+)
+
+MONDAY = date(2023, 3, 6)
+
+
+def make_assignment(employee_id, day, start="08:00", end="16:00"):
+    return {"employee_id": employee_id, "date": day, "start_time": start, "end_time": end}
+
+
+def make_checker(max_consecutive_days):
+    resources = MagicMock()
+    resources.get_employee.side_effect = lambda employee_id: SimpleNamespace(id=employee_id)
+    config = SimpleNamespace(
+        max_consecutive_days=max_consecutive_days, min_rest_hours=11, enforce_rest_periods=True
+    )
+    return ConstraintChecker(resources, config, MagicMock(spec=logging.Logger))
+
+
+class FakeGenerator:
+    """Records the distribution state each date was generated from."""
+
+    def __init__(self):
+        self.logger = MagicMock(spec=logging.Logger)
+        self.constraint_checker = make_checker(max_consecutive_days=30)
+        self.distribution_manager = DistributionManager(
+            MagicMock(employees=[]), self.constraint_checker, logger=self.logger
+        )
+        self.distribution_manager._record_assignment(
+            1, make_assignment(1, MONDAY - timedelta(days=1))
+        )
+
+    def _generate_assignments_for_date(self, current_date):
+        manager = self.distribution_manager
+        assignment = dict(
+            make_assignment(1, current_date),
+            seen=manager.assignments_by_employee.total(),
+            context=len(self.constraint_checker.schedule),
+        )
+        manager._record_assignment(1, assignment)
+        return [assignment]
+
+
+def make_fake_generator():
+    # Top-level, so spawned workers can unpickle it
+    return FakeGenerator()
+
+
+class TestIsoWeekPartitions(unittest.TestCase):
+    def test_partitions_follow_iso_weeks(self):
+        weeks = parallel.iso_week_partitions(MONDAY + timedelta(days=5), MONDAY + timedelta(days=15))
+        self.assertEqual([len(week) for week in weeks], [2, 7, 2])
+        self.assertTrue(all(week[0].weekday() == 0 for week in weeks[1:]))
+        self.assertEqual(parallel.iso_week_partitions(MONDAY, MONDAY - timedelta(days=1)), [])
+
+
+class TestGenerateWeeksParallel(unittest.TestCase):
+    def test_odd_weeks_are_seeded_with_the_even_weeks(self):
+        generator = FakeGenerator()
+        weeks = parallel.iso_week_partitions(MONDAY, MONDAY + timedelta(days=20))
+        result, dropped = parallel.generate_weeks_parallel(
+            generator, weeks, workers=2, worker_spec=(make_fake_generator, ())
+        )
+
+        self.assertEqual((len(result), dropped), (21, []))
+        # Even weeks: one historical assignment plus the earlier days of the week
+        for week in weeks[0::2]:
+            self.assertEqual([result[day][0]["seen"] for day in week], list(range(1, 8)))
+        # The odd week also sees both neighbouring weeks, in the constraint context too
+        self.assertEqual([result[day][0]["seen"] for day in weeks[1]], list(range(15, 22)))
+        self.assertEqual([result[day][0]["context"] for day in weeks[1]], list(range(15, 22)))
+        # The generator ends up with every assignment, as after a sequential run
+        self.assertEqual(generator.distribution_manager.assignments_by_employee.total(), 22)
+        self.assertEqual(len(generator.constraint_checker.schedule), 22)
+
+    def test_generator_spec_rebuilds_the_generator(self):
+        snapshot = ResourceSnapshot(
+            settings=None,
+            coverage=(),
+            shifts=(),
+            employees=(EmployeeRecord(id=1, contracted_hours=40),),
+            absences=(),
+            availabilities=(),
+        )
+        generator = ScheduleGenerator(resources=snapshot.to_resources())
+        generator.distribution_manager.set_engine("assignment")
+        generator.set_diagnostics("off")
+
+        factory, args = pickle.loads(pickle.dumps(parallel.generator_spec(generator)))
+        copy = factory(*args)
+
+        self.assertEqual([e.id for e in copy.resources.employees], [1])
+        self.assertEqual(copy.distribution_manager.engine, "assignment")
+        self.assertEqual(copy.diagnostics.mode, "off")
+
+
+class TestReconcileWeekSeams(unittest.TestCase):
+    def setUp(self):
+        self.checker = make_checker(max_consecutive_days=3)
+        self.weeks = parallel.iso_week_partitions(MONDAY, MONDAY + timedelta(days=13))
+
+    def seam_assignments(self):
+        sunday = self.weeks[0][-1]
+        next_monday = self.weeks[1][0]
+        return {
+            # Employee 1 works the last three days of week one
+            sunday - timedelta(days=2): [make_assignment(1, sunday - timedelta(days=2))],
+            sunday - timedelta(days=1): [make_assignment(1, sunday - timedelta(days=1))],
+            sunday: [
+                make_assignment(1, sunday),
+                make_assignment(2, sunday, "14:00", "22:00"),
+            ],
+            next_monday: [
+                make_assignment(1, next_monday),  # fourth consecutive day
+                make_assignment(2, next_monday, "06:00", "14:00"),  # 8h rest
+                make_assignment(3, next_monday),
+            ],
+        }
+
+    def test_drops_seam_violations_only(self):
+        sunday, next_monday = self.weeks[0][-1], self.weeks[1][0]
+        assignments_by_date = self.seam_assignments()
+        dropped = parallel.reconcile_week_seams(
+            self.checker, self.weeks, assignments_by_date, MagicMock(spec=logging.Logger)
+        )
+
+        self.assertEqual(
+            sorted((v["employee_id"], v["type"]) for v in dropped),
+            [(1, "max_consecutive_days"), (2, "min_rest_before")],
+        )
+        self.assertEqual([a["employee_id"] for a in assignments_by_date[next_monday]], [3])
+        self.assertEqual(len(assignments_by_date[sunday]), 2)
+
+    def test_refills_dates_with_dropped_assignments(self):
+        next_monday = self.weeks[1][0]
+        assignments_by_date = self.seam_assignments()
+        regenerated = []
+
+        def refill(current_date):
+            regenerated.append(current_date)
+            return [
+                make_assignment(2, current_date, "06:00", "14:00"),  # still too little rest
+                make_assignment(3, current_date),
+                make_assignment(4, current_date),
+            ]
+
+        dropped = parallel.reconcile_week_seams(
+            self.checker,
+            self.weeks,
+            assignments_by_date,
+            MagicMock(spec=logging.Logger),
+            refill=refill,
+        )
+
+        self.assertEqual(regenerated, [next_monday])
+        self.assertEqual(
+            [a["employee_id"] for a in assignments_by_date[next_monday]], [3, 4]
+        )
+        self.assertEqual(
+            sorted((v["employee_id"], v["type"]) for v in dropped),
+            [(1, "max_consecutive_days"), (2, "min_rest_before"), (2, "min_rest_before")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from flask import Flask
+from sqlalchemy.orm import Session
+
+from src.backend.models import db
+from src.backend.models.absence import Absence
+from src.backend.models.schedule import ScheduleVersionMeta
+from src.backend.services.scheduler import resource_cache as cache_module
+from src.backend.services.scheduler.resource_cache import (
+    CachedScheduleResources,
+    ResourceCache,
+)
+
+
+class FakeResources:
+    """Stands in for ScheduleResources and counts database loads"""
+
+    loads = 0
+
+    def __init__(self, app_instance=None):
+        self.settings = SimpleNamespace(store_opening="08:00", store_closing="20:00")
+        self.coverage = [
+            SimpleNamespace(
+                id=1, day_index=0, start_time="08:00", end_time="16:00",
+                min_employees=1, max_employees=2,
+            )
+        ]
+        self.shifts = [SimpleNamespace(id=10, start_time="08:00", end_time="16:00")]
+        self.employees = [SimpleNamespace(id=1, employee_group="VZ", is_keyholder=True)]
+        self.absences = []
+        self.availabilities = []
+
+    def load(self):
+        FakeResources.loads += 1
+
+
+class TestResourceCache(unittest.TestCase):
+    def setUp(self):
+        FakeResources.loads = 0
+        self.app = Flask(__name__)
+        self.app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.metadata.create_all(db.engine)
+        self.session = Session(db.engine)
+        self.cache = ResourceCache()
+        patcher = patch.object(cache_module, "ScheduleResources", FakeResources)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.session.close()
+        self.ctx.pop()
+
+    def test_snapshot_reused_until_a_resource_table_changes(self):
+        first = self.cache.snapshot()
+        self.assertIs(self.cache.snapshot(), first)
+        self.assertEqual(FakeResources.loads, 1)
+
+        # Tables the scheduler does not read leave the snapshot alone
+        self.session.add(
+            ScheduleVersionMeta(
+                version=1, date_range_start=date(2024, 8, 5), date_range_end=date(2024, 8, 11)
+            )
+        )
+        self.session.commit()
+        self.assertIs(self.cache.snapshot(), first)
+
+        self.session.add(
+            Absence(
+                employee_id=1, absence_type_id="URL",
+                start_date=date(2024, 8, 5), end_date=date(2024, 8, 6),
+            )
+        )
+        self.session.flush()
+        # Uncommitted changes are not visible yet
+        self.assertIs(self.cache.snapshot(), first)
+        self.session.commit()
+
+        second = self.cache.snapshot()
+        self.assertIsNot(second, first)
+        self.assertEqual(FakeResources.loads, 2)
+        self.assertEqual(self.cache.get_stats(), {"entries": 1, "hits": 3, "misses": 2})
+
+    def test_entries_expire(self):
+        self.cache.max_age = 0
+        self.cache.snapshot()
+        self.cache.snapshot()
+        self.assertEqual(FakeResources.loads, 2)
+
+    def test_cached_resources_build_indexes_from_snapshot(self):
+        resources = CachedScheduleResources(cache=self.cache)
+        resources.load()
+        other = CachedScheduleResources(cache=self.cache)
+        other.load()
+
+        self.assertEqual(FakeResources.loads, 1)
+        self.assertIs(resources.snapshot, other.snapshot)
+        self.assertEqual([shift.id for shift in resources.shifts], [10])
+        self.assertEqual(len(resources.get_daily_coverage(date(2024, 8, 5))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import dataclasses
+import logging
+import os
+import pickle
+import tempfile
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.backend.services.scheduler.distribution import DistributionManager
+from src.backend.services.scheduler.resource_snapshot import (
+    ResourceSnapshot,
+    SnapshotScheduleResources,
+)
+
+MONDAY = date(2023, 3, 6)
+
+
+def make_resources():
+    """Loaded-resources stand-in with ORM-like objects."""
+    return SimpleNamespace(
+        settings=SimpleNamespace(
+            store_opening="08:00",
+            store_closing="20:00",
+            special_days={"2023-03-07": {"is_closed": True}},
+            max_daily_hours=10.0,
+            company_name="not part of the snapshot",
+        ),
+        coverage=[
+            SimpleNamespace(
+                id=1, day_index=0, start_time="08:00", end_time="16:00",
+                min_employees=2, max_employees=2, employee_types=["VZ", "TZ"],
+                allowed_employee_groups=None, requires_keyholder=True,
+                keyholder_before_minutes=None, keyholder_after_minutes=None,
+            )
+        ],
+        shifts=[
+            SimpleNamespace(
+                id=10, name="Early", start_time="08:00", end_time="16:00",
+                duration_hours=8.0, requires_break=True, shift_type="EARLY",
+                shift_type_id="EARLY", active_days={"0": True},
+            )
+        ],
+        employees=[
+            SimpleNamespace(id=1, employee_group="VZ", contracted_hours=40.0, is_keyholder=True, is_active=True),
+            SimpleNamespace(id=2, employee_group="TZ", contracted_hours=20.0, is_keyholder=False, is_active=True),
+            SimpleNamespace(id=3, employee_group="TZ", contracted_hours=20.0, is_keyholder=False, is_active=True),
+        ],
+        absences=[
+            SimpleNamespace(id=5, employee_id=3, start_date=MONDAY, end_date=MONDAY, absence_type_id="SICK", note=None)
+        ],
+        availabilities=[
+            SimpleNamespace(
+                id=7, employee_id=1, day_of_week=0, hour=9, is_available=True,
+                start_date=None, end_date=None, is_recurring=True, availability_type="FIXED",
+            )
+        ],
+    )
+
+
+class TestResourceSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.source = make_resources()
+        self.snapshot = ResourceSnapshot.from_resources(self.source)
+
+    def test_records_are_detached_copies(self):
+        self.assertEqual(self.snapshot.counts()["employees"], 3)
+        self.assertEqual(self.snapshot.employees[1].get_max_weekly_hours(), 20.0)
+        self.assertFalse(hasattr(self.snapshot.settings, "company_name"))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            self.snapshot.employees[0].is_keyholder = False
+
+        self.source.settings.special_days["2023-03-08"] = {"is_closed": True}
+        self.assertEqual(list(self.snapshot.settings.special_days), ["2023-03-07"])
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "resources.snapshot")
+            self.snapshot.save(path)
+            self.assertEqual(ResourceSnapshot.load(path), self.snapshot)
+
+            with open(path, "wb") as snapshot_file:
+                pickle.dump({"not": "a snapshot"}, snapshot_file)
+            with self.assertRaises(TypeError):
+                ResourceSnapshot.load(path)
+
+    def test_resources_view_runs_without_database(self):
+        resources = self.snapshot.to_resources()
+        resources.load()
+        self.assertTrue(resources.verify_loaded_resources())
+        self.assertEqual(resources.absent_employee_ids(MONDAY), frozenset({3}))
+        self.assertEqual(len(resources.get_employee_availabilities(1, MONDAY)), 1)
+        self.assertEqual(resources.get_shift(10).name, "Early")
+
+        # The view itself survives a trip to another process
+        copied = pickle.loads(pickle.dumps(resources))
+        self.assertIsInstance(copied, SnapshotScheduleResources)
+        self.assertEqual(copied.absent_employee_ids(MONDAY), frozenset({3}))
+
+    def test_distribution_on_snapshot(self):
+        resources = self.snapshot.to_resources()
+        resources.load()
+        manager = DistributionManager(
+            resources, logger=MagicMock(spec=logging.Logger), engine="assignment"
+        )
+        assignments = manager.generate_assignments_for_day(
+            MONDAY, list(resources.shifts), list(resources.employees)
+        )
+        # Employee 3 is absent; the keyholder and employee 2 cover the shift
+        self.assertEqual(sorted(a["employee_id"] for a in assignments), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import logging
+import unittest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.backend.services.scheduler import distribution
+from src.backend.services.scheduler.distribution import DistributionManager
+
+MONDAY = date(2023, 3, 6)
+
+
+def make_employee(employee_id, group, is_keyholder=False, seniority=1, **preferences):
+    return SimpleNamespace(
+        id=employee_id,
+        employee_group=group,
+        is_keyholder=is_keyholder,
+        contracted_hours=20.0,
+        seniority=seniority,
+        is_active=True,
+        preferences=preferences,
+    )
+
+
+def make_shift(shift_id, start, end, shift_type):
+    return SimpleNamespace(
+        id=shift_id, start_time=start, end_time=end, shift_type=shift_type
+    )
+
+
+@unittest.skipIf(distribution.np is None, "numpy not installed")
+class TestAssignmentScoreMatrix(unittest.TestCase):
+    def setUp(self):
+        employees = [
+            make_employee(1, "VZ", is_keyholder=True, seniority=7, preferred_shifts=["EARLY"]),
+            make_employee(2, "TZ", seniority=12, avoid_days=[0]),
+            make_employee(3, "GFB", seniority=0, avoid_shifts=["LATE"], preferred_days=[0]),
+            make_employee(4, None),
+        ]
+        resources = MagicMock()
+        resources.employees = employees
+        resources.get_employee.side_effect = lambda employee_id: next(
+            (e for e in employees if e.id == employee_id), None
+        )
+        self.manager = DistributionManager(
+            resources, logger=MagicMock(spec=logging.Logger)
+        )
+        self.shifts = [
+            make_shift(10, "06:00", "14:00", "EARLY"),
+            make_shift(11, "11:00", "17:00", "MIDDLE"),
+            make_shift(12, "16:00", "22:00", "LATE"),
+            {"start_time": "08:00", "end_time": "12:00"},  # no ID
+        ]
+        self.manager.shifts = self.shifts[:3]
+        self.manager._calculate_shift_scores()
+        self.manager.employee_history[1].update(total=5, EARLY=4, LATE=1)
+        self.manager.employee_history[2].update(total=3, MIDDLE=2, LATE=1)
+        self.manager.assignments_by_employee.add(
+            2, {"date": MONDAY, "start_time": "08:00", "end_time": "20:00"}
+        )
+        self.manager.assignments_by_employee.add(
+            2, {"date": MONDAY, "start_time": "08:00", "end_time": "20:00"}
+        )
+        self.employee_ids = [1, 2, 3, 4, 99]  # 99 is unknown
+
+    def assert_matches_scalar(self, context, availability):
+        matrix = self.manager.calculate_assignment_score_matrix(
+            self.employee_ids, self.shifts, MONDAY, context, availability
+        )
+        self.assertEqual(matrix.shape, (5, 4))
+        # Only the unknown employee and the shift without an ID are scored out
+        self.assertTrue(distribution.np.isfinite(matrix[:4, :3]).all())
+        for i, employee_id in enumerate(self.employee_ids):
+            for j, shift in enumerate(self.shifts):
+                expected = self.manager.calculate_assignment_score(
+                    employee_id, shift, MONDAY, context, availability
+                )
+                self.assertEqual(matrix[i, j], expected, (employee_id, j))
+
+    def test_matches_scalar_without_context(self):
+        self.assert_matches_scalar({}, "AVAILABLE")
+
+    def test_matches_scalar_with_interval_needs(self):
+        context = {
+            "target_interval_needs": {
+                "requires_keyholder": True,
+                "employee_types": ["VZ", "TZ"],
+            },
+            "shift_covered_intervals": ["09:00", "10:00"],
+            "full_day_staffing_snapshot": {"09:00": {"current": 2, "max_needed": 1}},
+        }
+        self.assert_matches_scalar(context, "PREFERRED")
+
+    def test_unavailable_scores_everything_out(self):
+        matrix = self.manager.calculate_assignment_score_matrix(
+            self.employee_ids, self.shifts, MONDAY, {}, "UNAVAILABLE"
+        )
+        self.assertTrue((matrix == -float("inf")).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+import json
+import unittest
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from src.backend.models import (
+    Absence,
+    Coverage,
+    Employee,
+    EmployeeAvailability,
+    ShiftTemplate,
+    db,
+)
+from src.backend.models.employee import AvailabilityType, EmployeeGroup
+from src.backend.services.ai_prompt_data import PromptDataCache, collect_prompt_data
+
+# Monday to Wednesday
+START, END = date(2024, 8, 5), date(2024, 8, 7)
+
+
+@pytest.mark.usefixtures("file_db_app")
+class TestAIPromptData(unittest.TestCase):
+    def setUp(self):
+        anna = self.add_employee("Anna", is_keyholder=True)
+        ben = self.add_employee("Ben")
+        cleo = self.add_employee("Cleo")
+        self.add_employee("Dana", is_active=False)
+        self.add_employee("Emil")  # no availability at all
+
+        for hour in (9, 10, 11):
+            db.session.add(EmployeeAvailability(anna.id, 0, hour))
+        db.session.add(
+            EmployeeAvailability(
+                anna.id, 1, 14, availability_type=AvailabilityType.FIXED
+            )
+        )
+        db.session.add(EmployeeAvailability(anna.id, 2, 8, is_available=False))
+        # Dated availability: Tuesday is inside the overlap, Wednesday is not
+        for day in (1, 2):
+            db.session.add(
+                EmployeeAvailability(
+                    ben.id,
+                    day,
+                    16,
+                    start_date=date(2024, 8, 1),
+                    end_date=date(2024, 8, 6),
+                    is_recurring=False,
+                    availability_type=AvailabilityType.PREFERRED,
+                )
+            )
+        db.session.add(EmployeeAvailability(cleo.id, 0, 9))
+        db.session.add(
+            Absence(
+                employee_id=cleo.id,
+                start_date=date(2024, 8, 1),
+                end_date=date(2024, 8, 9),
+                absence_type_id="SICK",
+            )
+        )
+        db.session.add(
+            Absence(
+                employee_id=ben.id,
+                start_date=date(2024, 8, 7),
+                end_date=date(2024, 8, 8),
+                absence_type_id="VACATION",
+                note="Vacation",
+            )
+        )
+
+        db.session.add(
+            ShiftTemplate(
+                "08:00", "16:00", active_days={"0": True, "1": True}, shift_type="EARLY"
+            )
+        )
+        db.session.add(
+            ShiftTemplate(
+                "10:00", "18:00", active_days={"5": True}, shift_type="MIDDLE"
+            )
+        )
+        db.session.add(Coverage(0, "08:00", "16:00", requires_keyholder=True))
+        db.session.add(Coverage(6, "10:00", "14:00"))
+        db.session.commit()
+        self.anna, self.ben = anna.id, ben.id
+
+    def add_employee(self, name, is_keyholder=False, is_active=True):
+        employee = Employee(
+            name,
+            "Test",
+            EmployeeGroup.TZ,
+            20,
+            is_keyholder=is_keyholder,
+            is_active=is_active,
+        )
+        db.session.add(employee)
+        db.session.flush()
+        return employee
+
+    def count_queries(self, func):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            result = func()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+        return result, len(statements)
+
+    def test_collects_filtered_data(self):
+        data, counts = collect_prompt_data(START, END)
+
+        self.assertEqual([e["id"] for e in data["employees"]], [self.anna, self.ben])
+        self.assertEqual(counts["active_employees"], 4)
+        self.assertEqual(data["employees"][0]["max_weekly_hours"], 20)
+        self.assertEqual(data["schedule_period"]["target_weekdays"], [0, 1, 2])
+        self.assertEqual([s["active_days"] for s in data["shifts"]], [[0, 1]])
+        self.assertEqual([c["day_index"] for c in data["coverage_rules"]], [0])
+        self.assertEqual(
+            data["availability"],
+            [
+                {
+                    "employee_id": self.anna,
+                    "day_index": 0,
+                    "available_time_range": "09:00-12:00",
+                },
+                {
+                    "employee_id": self.anna,
+                    "day_index": 1,
+                    "fixed_time_range": "14:00-15:00",
+                },
+                {
+                    "employee_id": self.ben,
+                    "day_index": 1,
+                    "preferred_time_range": "16:00-17:00",
+                },
+            ],
+        )
+        self.assertEqual(
+            data["absences"],
+            [
+                {
+                    "employee_id": self.ben,
+                    "start_date": "2024-08-07",
+                    "end_date": "2024-08-08",
+                    "reason": "Vacation",
+                }
+            ],
+        )
+
+    def test_query_count_does_not_grow_with_employees(self):
+        _, queries = self.count_queries(lambda: collect_prompt_data(START, END))
+        for i in range(10):
+            employee = self.add_employee(f"Extra{i}")
+            db.session.add(EmployeeAvailability(employee.id, 0, 12))
+        db.session.commit()
+
+        data, more_queries = self.count_queries(lambda: collect_prompt_data(START, END))
+        self.assertEqual(len(data[0]["employees"]), 12)
+        self.assertEqual(more_queries, queries)
+
+    def test_cache_follows_data_revision(self):
+        cache = PromptDataCache()
+        text, counts, cached = cache.get(START, END)
+        self.assertFalse(cached)
+        self.assertEqual(json.loads(text)["employees"][0]["id"], self.anna)
+
+        (_, _, cached), queries = self.count_queries(lambda: cache.get(START, END))
+        self.assertTrue(cached)
+        self.assertEqual(queries, 0)
+        self.assertFalse(cache.get(START, date(2024, 8, 11))[2])
+
+        db.session.get(Employee, self.anna).is_active = False
+        db.session.commit()
+        text, counts, cached = cache.get(START, END)
+        self.assertFalse(cached)
+        self.assertEqual(counts["employees"], 1)
+        self.assertEqual(cache.get_stats(), {"entries": 2, "hits": 1, "misses": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from src.backend.services.ai_response_cache import AIResponseCache, cache_key
+from src.backend.services.ai_scheduler_service import AISchedulerService
+
+CSV_TEXT = "EmployeeID,Date,ShiftTemplateID,ShiftName,StartTime,EndTime\n1,2024-08-05,1,Early,08:00,16:00"
+
+
+class StubGeminiHandler(BaseHTTPRequestHandler):
+    """Answers generateContent requests like the Gemini API"""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((self.path, body))
+        if self.server.status != 200:
+            self.send_response(self.server.status)
+            self.end_headers()
+            self.wfile.write(b"quota exceeded")
+            return
+        data = json.dumps(
+            {"candidates": [{"content": {"parts": [{"text": CSV_TEXT}]}}]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAIResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def test_ttl_and_lru_eviction(self):
+        clock = [1000.0]
+        patcher = patch(
+            "src.backend.services.ai_response_cache.time.time",
+            side_effect=lambda: clock[0],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        cache = AIResponseCache(self.cache_dir / "cache.db", ttl=60, max_entries=2)
+        cache.put("a", "model", "A")
+        clock[0] += 1
+        cache.put("b", "model", "B")
+        clock[0] += 1
+        self.assertEqual(cache.get("a"), "A")
+        cache.put("c", "model", "C")  # evicts "b", the least recently used
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "C")
+
+        clock[0] = 1060.0  # "a" was stored at 1000, "c" at 1002
+        self.assertIsNone(cache.get("a"))
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+        self.assertEqual(
+            (stats["evictions"], stats["expired"], stats["entries"]), (1, 1, 1)
+        )
+
+        small = AIResponseCache(self.cache_dir / "small.db", max_bytes=3)
+        small.put("x", "model", "xx")
+        clock[0] += 1
+        small.put("y", "model", "yy")
+        self.assertEqual(small.get_stats()["entries"], 1)
+        self.assertEqual(small.get("y"), "yy")
+
+    def test_key_ignores_prompt_indentation(self):
+        params = {"generationConfig": {"temperature": 0.6}}
+        self.assertEqual(
+            cache_key("m", params, "\n        Plan the week.\n        Data: {}\n"),
+            cache_key("m", params, "Plan the week.\nData: {}"),
+        )
+        self.assertNotEqual(
+            cache_key("m", params, "Plan the week."),
+            cache_key(
+                "m", {"generationConfig": {"temperature": 0.7}}, "Plan the week."
+            ),
+        )
+        self.assertNotEqual(
+            cache_key("m", params, "Plan the week."),
+            cache_key("n", params, "Plan the week."),
+        )
+
+
+class TestCachedGeminiCalls(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubGeminiHandler)
+        self.server.requests = []
+        self.server.status = 200
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        cache_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, cache_dir)
+        self.cache = AIResponseCache(cache_dir / "cache.db")
+        self.service = AISchedulerService(response_cache=self.cache)
+        self.service.gemini_api_key = "test-key"
+        host, port = self.server.server_address
+        self.service.gemini_api_base_url = f"http://{host}:{port}/v1beta"
+
+    def test_identical_requests_are_served_from_cache(self):
+        prompt = "\n        Plan the week of 2024-08-05.\n"
+        self.assertEqual(self.service._call_gemini_api(prompt), CSV_TEXT)
+        self.assertEqual(self.service._call_gemini_api(prompt.strip()), CSV_TEXT)
+        self.assertEqual(len(self.server.requests), 1)
+        path, body = self.server.requests[0]
+        self.assertTrue(
+            path.startswith("/v1beta/models/gemini-1.5-flash:generateContent")
+        )
+        self.assertEqual(body["contents"][0]["parts"][0]["text"], prompt)
+
+        self.service._call_gemini_api(
+            prompt, {"generationConfig": {"temperature": 0.1}}
+        )
+        self.assertEqual(len(self.server.requests), 2)
+
+        self.service._call_gemini_api(prompt, use_cache=False)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+
+    def test_failed_calls_are_not_cached(self):
+        self.server.status = 429
+        with self.assertRaises(RuntimeError):
+            self.service._call_gemini_api("Plan the week.")
+        self.server.status = 200
+        self.assertEqual(self.service._call_gemini_api("Plan the week."), CSV_TEXT)
+        self.assertEqual(len(self.server.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+import json
+import threading
+import unittest
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from src.backend.models import Schedule, db
+from src.backend.services.ai_stream_parser import (
+    AssignmentStreamParser,
+    AssignmentValidator,
+    iter_gemini_sse_text,
+)
+from src.backend.services.ai_scheduler_service import AISchedulerService
+from src.backend.services.scheduler.resource_snapshot import (
+    AbsenceRecord,
+    EmployeeRecord,
+    ResourceSnapshot,
+    ShiftTemplateRecord,
+)
+
+RESPONSE = (
+    "Here is the schedule:\n"
+    "EmployeeID,Date,ShiftTemplateID,ShiftName,StartTime,EndTime\n"
+    "1,2024-08-05,10,Early,08:00,16:00\n"
+    "2,2024-08-05,10,,08:00,16:00\n"
+    "1,2024-08-06,10,Early,08:00,16:00\n"
+    "2,2024-08-06,10,Early,08:00,16:00\n"  # absent
+    "3,2024-08-06,10,Early,08:00,16:00\n"  # unknown employee
+    "1,2024-08-20,10,Early,08:00,16:00\n"  # out of range
+    "x,2024-08-07,10,Early,08:00,16:00\n"
+    "1,2024-08-07,10,Early,08:00,16:00\n"
+    "These assignments respect all constraints.\n"
+    "1,2024-08-08,10,Early,08:00,16:00\n"
+)
+
+
+def snapshot():
+    return ResourceSnapshot(
+        settings=None,
+        coverage=(),
+        shifts=(
+            ShiftTemplateRecord(
+                id=10,
+                name="Early",
+                start_time="08:00",
+                end_time="16:00",
+                duration_hours=8.0,
+            ),
+        ),
+        employees=(EmployeeRecord(id=1), EmployeeRecord(id=2)),
+        absences=(
+            AbsenceRecord(
+                id=1,
+                employee_id=2,
+                start_date=date(2024, 8, 6),
+                end_date=date(2024, 8, 6),
+            ),
+        ),
+        availabilities=(),
+    )
+
+
+def sse_body(text, chunk_size=7):
+    events = []
+    for i in range(0, len(text), chunk_size):
+        data = {
+            "candidates": [{"content": {"parts": [{"text": text[i : i + chunk_size]}]}}]
+        }
+        events.append(f"data: {json.dumps(data)}\r\n\r\n")
+    return "".join(events).encode()
+
+
+class TestAssignmentStreamParser(unittest.TestCase):
+    def parse(self, chunks, validator=None):
+        warnings = []
+        parser = AssignmentStreamParser(
+            date(2024, 8, 5),
+            date(2024, 8, 11),
+            validator=validator,
+            warn=warnings.append,
+        )
+        assignments = []
+        for chunk in chunks:
+            assignments.extend(parser.feed(chunk))
+        assignments.extend(parser.close())
+        return parser, assignments, warnings
+
+    def test_rows_arrive_with_their_line(self):
+        parser = AssignmentStreamParser(date(2024, 8, 5), date(2024, 8, 11))
+        self.assertEqual(
+            parser.feed(
+                "EmployeeID,Date,ShiftTemplateID,ShiftName,StartTime,EndTime\n1,2024-08-05,10,Ea"
+            ),
+            [],
+        )
+        self.assertEqual(
+            parser.feed("rly,08:00,16:00\n1,2024"),
+            [
+                {
+                    "employee_id": 1,
+                    "date": date(2024, 8, 5),
+                    "shift_template_id": 10,
+                    "shift_name_from_ai": "Early",
+                    "start_time": "08:00",
+                    "end_time": "16:00",
+                }
+            ],
+        )
+        self.assertEqual(len(parser.close()), 0)  # "1,2024" is malformed
+        self.assertEqual(parser.error_count, 1)
+
+    def test_chunking_does_not_change_the_result(self):
+        _, whole, _ = self.parse([RESPONSE])
+        parser, by_char, warnings = self.parse(list(RESPONSE))
+        self.assertEqual(whole, by_char)
+        # Rows after the closing text are ignored
+        self.assertEqual(
+            [(a["employee_id"], a["date"].day) for a in by_char],
+            [(1, 5), (2, 5), (1, 6), (2, 6), (3, 6), (1, 7)],
+        )
+        self.assertEqual(parser.stats["error_count"], 2)
+        self.assertEqual(len(warnings), 2)
+
+    def test_validator_checks_resources(self):
+        parser, assignments, warnings = self.parse(
+            [RESPONSE], AssignmentValidator(snapshot())
+        )
+        self.assertEqual(
+            [(a["employee_id"], a["date"].day) for a in assignments],
+            [(1, 5), (2, 5), (1, 6), (1, 7)],
+        )
+        # Empty ShiftName is filled from the template
+        self.assertEqual(assignments[1]["shift_name_from_ai"], "Early")
+        self.assertEqual(parser.stats["rejected_count"], 2)
+        self.assertTrue(any("absent" in w for w in warnings))
+
+    def test_sse_text(self):
+        self.assertEqual(
+            "".join(iter_gemini_sse_text(sse_body(RESPONSE).splitlines())), RESPONSE
+        )
+
+
+class StubStreamingHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.paths.append(self.path)
+        body = sse_body(RESPONSE)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.mark.usefixtures("file_db_app")
+class TestStreamingGeneration(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubStreamingHandler)
+        self.server.paths = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.service = AISchedulerService(response_cache=False)
+        self.service.gemini_api_key = "test-key"
+        host, port = self.server.server_address
+        self.service.gemini_api_base_url = f"http://{host}:{port}/v1beta"
+        for name, value in (
+            ("_collect_data_for_ai_prompt", "{}"),
+            ("_generate_system_prompt", "Plan the week."),
+        ):
+            patcher = patch.object(AISchedulerService, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch("src.backend.services.ai_scheduler_service.resource_cache")
+        patcher.start().snapshot.return_value = snapshot()
+        self.addCleanup(patcher.stop)
+
+    def test_assignments_are_stored_in_batches(self):
+        events = list(
+            self.service.generate_schedule_via_ai_stream(
+                "2024-08-05", "2024-08-11", version_id=3, batch_size=2
+            )
+        )
+        self.assertTrue(
+            self.server.paths[0].startswith(
+                "/v1beta/models/gemini-1.5-flash:streamGenerateContent?alt=sse"
+            )
+        )
+        self.assertEqual(
+            [e["event"] for e in events],
+            ["started", "progress", "progress", "completed"],
+        )
+        self.assertEqual([e["stored"] for e in events[1:3]], [2, 4])
+        self.assertIsNotNone(events[1]["first_assignment_seconds"])
+        self.assertEqual(events[-1]["generated_assignments_count"], 4)
+        self.assertEqual(events[-1]["parsing"]["rejected_count"], 2)
+
+        db.session.expire_all()
+        rows = (
+            db.session.query(Schedule)
+            .order_by(Schedule.date, Schedule.employee_id)
+            .all()
+        )
+        self.assertEqual(
+            [(r.employee_id, r.date.day, r.version) for r in rows],
+            [(1, 5, 3), (2, 5, 3), (1, 6, 3), (1, 7, 3)],
+        )
+        self.assertEqual(rows[0].shift_start, "08:00")
+
+
+if __name__ == "__main__":
+    unittest.main()
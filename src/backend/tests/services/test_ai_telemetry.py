@@ -0,0 +1,176 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from src.backend.services.ai_integration import (
+    AIOrchestrator,
+    AIProvider,
+    AIProviderInterface,
+    AIRequest,
+    AIResponse,
+    ModelCapability,
+    ModelInfo,
+    PromptManager,
+)
+from src.backend.services.ai_telemetry import ModelTelemetry
+
+
+class StubProvider(AIProviderInterface):
+    """One fast model whose reported latency can be changed"""
+
+    def __init__(self, provider, model_id, static_latency, latency):
+        self.model = ModelInfo(
+            provider=provider,
+            model_id=model_id,
+            name=model_id,
+            max_tokens=4096,
+            capabilities=[ModelCapability.FAST_RESPONSE],
+            cost_per_token=0.000001,
+            response_time_avg=static_latency,
+            quality_score=0.8,
+        )
+        self.latency = latency
+        self.fail = False
+        self.catalog_calls = 0
+        self.calls = 0
+
+    async def generate_response(self, request: AIRequest) -> AIResponse:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("unavailable")
+        return AIResponse(
+            conversation_id=request.conversation_id,
+            content="ok",
+            model_used=self.model.model_id,
+            tokens_used=500,
+            response_time=self.latency,
+            cost=0.0005,
+        )
+
+    async def stream_response(self, request):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("unavailable")
+        yield "o"
+        yield "k"
+
+    def get_available_models(self):
+        self.catalog_calls += 1
+        return [self.model]
+
+    async def validate_connection(self):
+        return True
+
+
+class TestModelTelemetry(unittest.TestCase):
+    def test_rolling_numbers(self):
+        telemetry = ModelTelemetry(alpha=0.5, min_samples=3)
+        telemetry.record("m", 1.0, tokens=100, cost=0.01, provider="local")
+        telemetry.record("m", 3.0, tokens=300)
+        self.assertIsNone(telemetry.live("m"))  # too few samples
+        telemetry.record_error("m", 10.0)
+        telemetry.record("m", 2.0, tokens=100)
+
+        stats = telemetry.live("m")
+        self.assertEqual(stats.ewma_latency, 2.0)  # (1 + 3) / 2, then (2 + 2) / 2
+        self.assertEqual(stats.ewma_tokens_per_second, 75.0)
+        self.assertEqual(stats.error_rate, 0.25)
+        self.assertEqual(stats.p95_latency, 10.0)
+        self.assertAlmostEqual(stats.expected_latency(), 2.0 / 0.75)
+        self.assertAlmostEqual(stats.cost_per_token, 0.01 / 500)
+
+        model = telemetry.get_stats()["models"]["m"]
+        self.assertEqual((model["provider"], model["requests"]), ("local", 4))
+        self.assertEqual(model["errors"], 1)
+
+    def test_stale_numbers_are_not_live(self):
+        telemetry = ModelTelemetry(min_samples=1, stale_after=60)
+        with patch("src.backend.services.ai_telemetry.time.time", return_value=1000):
+            telemetry.record("m", 1.0)
+        with patch("src.backend.services.ai_telemetry.time.time", return_value=1030):
+            self.assertIsNotNone(telemetry.live("m"))
+        with patch("src.backend.services.ai_telemetry.time.time", return_value=1061):
+            self.assertIsNone(telemetry.live("m"))
+
+
+class TestTelemetryDrivenSelection(unittest.TestCase):
+    def setUp(self):
+        self.openai = StubProvider(AIProvider.OPENAI, "fast-a", 1.0, latency=1.0)
+        self.gemini = StubProvider(AIProvider.GEMINI, "fast-b", 2.0, latency=2.0)
+        self.telemetry = ModelTelemetry()
+        self.orchestrator = AIOrchestrator(
+            {AIProvider.OPENAI: self.openai, AIProvider.GEMINI: self.gemini},
+            PromptManager(),
+            telemetry=self.telemetry,
+        )
+
+    def run_requests(self, count, strategy="fast_response"):
+        return [
+            asyncio.run(
+                self.orchestrator.process_request(
+                    AIRequest(conversation_id="c", prompt="hi"), strategy
+                )
+            ).model_used
+            for _ in range(count)
+        ]
+
+    def test_routing_follows_live_latency(self):
+        self.assertEqual(self.run_requests(3), ["fast-a"] * 3)
+
+        # Peak time: the first provider slows down
+        self.openai.latency = 9.0
+        used = self.run_requests(5)
+        self.assertEqual(used[0], "fast-a")
+        self.assertEqual(used[-1], "fast-b")
+        self.assertEqual(self.telemetry.live("fast-b").requests, 4)
+
+        # The catalog is enumerated once, not on every request
+        self.assertEqual((self.openai.catalog_calls, self.gemini.catalog_calls), (1, 1))
+
+    def test_errors_steer_balanced_selection(self):
+        # Same static scores; the first provider wins ties
+        self.gemini.model.response_time_avg = 1.0
+        self.assertEqual(self.run_requests(1, "balanced"), ["fast-a"])
+
+        self.openai.fail = True
+        used = self.run_requests(3, "balanced")
+        # The first two fail over to the other provider, then the errors
+        # take the first provider out of the rotation
+        self.assertEqual(used, ["fast-b"] * 3)
+        self.assertEqual(self.openai.calls, 3)
+        self.openai.fail = False
+        self.assertEqual(self.run_requests(1, "balanced"), ["fast-b"])
+
+        models = self.telemetry.get_stats()["models"]
+        self.assertEqual(models["fast-a"]["errors"], 2)
+        self.assertEqual(models["fast-a"]["error_rate"], 0.667)
+        self.assertEqual(models["fast-a"]["provider"], "openai")
+
+    def stream(self):
+        async def collect():
+            return [
+                chunk
+                async for chunk in self.orchestrator.stream_request(
+                    AIRequest(conversation_id="c", prompt="hi")
+                )
+            ]
+
+        return "".join(asyncio.run(collect()))
+
+    def test_streams_are_recorded(self):
+        for _ in range(3):
+            self.assertEqual(self.stream(), "ok")
+        stats = self.telemetry.live("fast-a")
+        self.assertEqual((stats.requests, stats.errors), (3, 0))
+        self.assertEqual(stats.provider, "openai")
+        self.assertIsNotNone(stats.ewma_latency)
+
+        self.openai.fail = True
+        with self.assertRaises(RuntimeError):
+            self.stream()
+        stats = self.telemetry.live("fast-a")
+        self.assertEqual((stats.requests, stats.errors), (4, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
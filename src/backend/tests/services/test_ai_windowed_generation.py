@@ -0,0 +1,231 @@
+import asyncio
+import json
+import re
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.backend.models import Schedule, db
+from src.backend.services.ai_integration import (
+    AIProvider,
+    AIProviderInterface,
+    AIRequest,
+    AIResponse,
+)
+from src.backend.services.ai_scheduler_service import AISchedulerService
+from src.backend.services.ai_windowed_generation import (
+    dispatch_windows,
+    weekly_windows,
+)
+from src.backend.services.scheduler.resource_snapshot import (
+    EmployeeRecord,
+    ResourceSnapshot,
+    ShiftTemplateRecord,
+)
+
+HEADER = "EmployeeID,Date,ShiftTemplateID,ShiftName,StartTime,EndTime\n"
+
+
+class StubProvider(AIProviderInterface):
+    """Answers every weekday of the requested window with one shift"""
+
+    def __init__(self, delay=0.01, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_response(self, request: AIRequest) -> AIResponse:
+        self.prompts.append(request.prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("overloaded")
+        finally:
+            self.in_flight -= 1
+        day = date.fromisoformat(request.metadata["start_date"])
+        end = date.fromisoformat(request.metadata["end_date"])
+        rows = []
+        while day <= end:
+            if day.weekday() < 5:
+                rows.append(f"1,{day.isoformat()},10,Early,08:00,16:00\n")
+            day += timedelta(days=1)
+        # Out of window, must be dropped by the window's parser
+        rows.append(f"1,{(end + timedelta(days=1)).isoformat()},10,Early,08:00,16:00\n")
+        return AIResponse(
+            conversation_id=request.conversation_id, content=HEADER + "".join(rows)
+        )
+
+    async def stream_response(self, request):
+        yield (await self.generate_response(request)).content
+
+    def get_available_models(self):
+        return []
+
+    async def validate_connection(self):
+        return True
+
+
+def window_request(start, end):
+    return AIRequest(
+        conversation_id="test",
+        prompt=f"{start}..{end}",
+        metadata={"start_date": start.isoformat(), "end_date": end.isoformat()},
+    )
+
+
+class TestWindowDispatch(unittest.TestCase):
+    def test_weekly_windows(self):
+        self.assertEqual(
+            weekly_windows(date(2024, 8, 7), date(2024, 8, 20)),
+            [
+                (date(2024, 8, 7), date(2024, 8, 11)),
+                (date(2024, 8, 12), date(2024, 8, 18)),
+                (date(2024, 8, 19), date(2024, 8, 20)),
+            ],
+        )
+        self.assertEqual(
+            weekly_windows(date(2024, 8, 11), date(2024, 8, 11)),
+            [(date(2024, 8, 11), date(2024, 8, 11))],
+        )
+
+    def test_concurrency_is_bounded_per_provider(self):
+        provider = StubProvider(delay=0.02)
+        requests = [
+            window_request(date(2024, 8, 5) + timedelta(weeks=i), date(2024, 8, 11))
+            for i in range(6)
+        ]
+        responses = asyncio.run(
+            dispatch_windows(requests, {AIProvider.LOCAL: provider}, concurrency=2)
+        )
+        self.assertEqual(provider.max_in_flight, 2)
+        self.assertTrue(all(r.ok and r.provider == "local" for r in responses))
+        self.assertEqual([r.request for r in responses], requests)
+
+    def test_failed_window_moves_to_next_provider(self):
+        failing, working = StubProvider(fail=True), StubProvider()
+        requests = [
+            window_request(date(2024, 8, 5), date(2024, 8, 11)),
+            window_request(date(2024, 8, 12), date(2024, 8, 18)),
+        ]
+        responses = asyncio.run(
+            dispatch_windows(
+                requests, {AIProvider.GEMINI: failing, AIProvider.LOCAL: working}
+            )
+        )
+        self.assertEqual([r.provider for r in responses], ["local", "local"])
+        self.assertEqual(responses[0].errors, ["gemini: overloaded"])
+        self.assertEqual(responses[1].errors, [])
+
+
+@pytest.mark.usefixtures("file_db_app")
+class TestWindowedGeneration(unittest.TestCase):
+    def setUp(self):
+        self.service = AISchedulerService(response_cache=False)
+        patcher = patch.object(
+            AISchedulerService,
+            "_collect_data_for_ai_prompt",
+            side_effect=lambda start, end, tracker=None: json.dumps(
+                {"schedule_period": {"start_date": start.isoformat()}}
+            ),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("src.backend.services.ai_scheduler_service.resource_cache")
+        patcher.start().snapshot.return_value = ResourceSnapshot(
+            settings=None,
+            coverage=(),
+            shifts=(
+                ShiftTemplateRecord(
+                    id=10,
+                    name="Early",
+                    start_time="08:00",
+                    end_time="16:00",
+                    duration_hours=8.0,
+                ),
+            ),
+            employees=(EmployeeRecord(id=1, contracted_hours=40),),
+            absences=(),
+            availabilities=(),
+        )
+        self.addCleanup(patcher.stop)
+
+    def test_windows_are_merged_validated_and_stored(self):
+        # An existing late shift the day before the range is boundary context
+        db.session.add(
+            Schedule(
+                employee_id=1,
+                shift_id=10,
+                date=date(2024, 8, 4),
+                version=3,
+                shift_start="14:00",
+                shift_end="22:00",
+            )
+        )
+        db.session.commit()
+
+        provider = StubProvider()
+        result = self.service.generate_schedule_via_ai(
+            "2024-08-05",
+            "2024-08-21",
+            version_id=3,
+            windowed=True,
+            providers={AIProvider.LOCAL: provider},
+            window_concurrency=2,
+        )
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(
+            [(w["start_date"], w["end_date"]) for w in result["windows"]],
+            [
+                ("2024-08-05", "2024-08-11"),
+                ("2024-08-12", "2024-08-18"),
+                ("2024-08-19", "2024-08-21"),
+            ],
+        )
+        self.assertEqual(provider.max_in_flight, 2)
+        self.assertEqual(result["windows"][0]["parsing"]["error_count"], 1)
+        self.assertIn("validation", result)
+        self.assertEqual(result["generated_assignments_count"], 13)
+
+        # Each prompt only covers its own window
+        prompts = sorted(provider.prompts)
+        self.assertIn("Schedule Period: 2024-08-12 to 2024-08-18", prompts[1])
+        contexts = [
+            json.loads(re.search(r"Provided Data:\s*(\{.*\})", p, re.S).group(1))[
+                "boundary_context"
+            ]
+            for p in prompts
+        ]
+        self.assertEqual(contexts[0]["window"], "1 of 3")
+        self.assertEqual(
+            contexts[0]["previous_day_assignments"],
+            [
+                {
+                    "employee_id": 1,
+                    "shift_template_id": 10,
+                    "start_time": "14:00",
+                    "end_time": "22:00",
+                }
+            ],
+        )
+        self.assertEqual(contexts[1]["previous_day_assignments"], [])
+
+        days = [
+            row.date.date()
+            for row in db.session.query(Schedule)
+            .filter(Schedule.date >= date(2024, 8, 5))
+            .order_by(Schedule.date)
+        ]
+        self.assertEqual(len(days), 13)
+        self.assertEqual(days[-1], date(2024, 8, 21))
+        self.assertNotIn(date(2024, 8, 10), days)
+
+
+if __name__ == "__main__":
+    unittest.main()
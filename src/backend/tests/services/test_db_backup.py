@@ -0,0 +1,136 @@
+import gzip
+import io
+import json
+import unittest
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from src.backend.models import db
+from src.backend.models.generation_job import GenerationJob, JobStatus
+from src.backend.models.schedule import ScheduleVersionMeta
+from src.backend.routes.settings import settings
+from src.backend.services.db_backup import (
+    BackupFormatError,
+    gzip_chunks,
+    iter_backup_lines,
+    open_backup,
+    restore_backup,
+)
+
+
+@pytest.mark.usefixtures("file_db_app")
+class TestDbBackup(unittest.TestCase):
+    def setUp(self):
+        self.app.register_blueprint(settings, url_prefix="/api/v2")
+        for version in (1, 2, 3):
+            db.session.add(
+                ScheduleVersionMeta(
+                    version=version,
+                    date_range_start=date(2024, 8, 5),
+                    date_range_end=date(2024, 8, 11),
+                    notes=f"Version {version}",
+                )
+            )
+        db.session.add(
+            GenerationJob(
+                kind="schedule_generation",
+                status=JobStatus.SUCCEEDED,
+                params={"start_date": "2024-08-05"},
+            )
+        )
+        db.session.commit()
+
+    def snapshot(self):
+        db.session.expire_all()
+        versions = [
+            (m.version, m.date_range_start, m.notes)
+            for m in ScheduleVersionMeta.query.order_by(ScheduleVersionMeta.version)
+        ]
+        jobs = [(j.id, j.status, j.params) for j in GenerationJob.query]
+        return versions, jobs
+
+    def wipe(self):
+        ScheduleVersionMeta.query.delete()
+        GenerationJob.query.delete()
+        db.session.commit()
+
+    def test_round_trip_in_batches(self):
+        before = self.snapshot()
+        backup = b"".join(gzip_chunks(iter_backup_lines(batch_size=2), chunk_size=16))
+        lines = gzip.decompress(backup).decode().splitlines()
+        self.assertEqual(json.loads(lines[0])["format"], "schichtplan-backup")
+        self.assertEqual(json.loads(lines[-1])["rows"]["schedule_version_meta"], 3)
+
+        self.wipe()
+        progress = []
+        counts = restore_backup(
+            open_backup(io.BytesIO(backup)),
+            batch_size=2,
+            progress=lambda table, rows: progress.append((table, rows)),
+        )
+        self.assertEqual(counts["schedule_version_meta"], 3)
+        self.assertIn(("schedule_version_meta", 2), progress)
+        self.assertIn(("schedule_version_meta", 3), progress)
+        self.assertEqual(self.snapshot(), before)
+
+    def test_backup_is_a_snapshot(self):
+        # WAL lets the commit below go through while the backup is reading
+        db.session.execute(text("PRAGMA journal_mode=WAL"))
+        db.session.commit()
+
+        lines = iter_backup_lines(batch_size=1)
+        read = [next(lines), next(lines)]  # Header and the first table's columns
+        self.assertIn("table", json.loads(read[1]))
+        db.session.add(
+            ScheduleVersionMeta(
+                version=4,
+                date_range_start=date(2024, 8, 12),
+                date_range_end=date(2024, 8, 18),
+            )
+        )
+        db.session.add(GenerationJob(kind="schedule_generation", params={}))
+        db.session.commit()
+        read.extend(lines)
+
+        rows = json.loads(read[-1])["rows"]
+        self.assertEqual(rows["schedule_version_meta"], 3)
+        self.assertEqual(rows["generation_jobs"], 1)
+
+    def test_truncated_backup_leaves_data_alone(self):
+        before = self.snapshot()
+        lines = list(iter_backup_lines())[:-1]
+        with self.assertRaises(BackupFormatError):
+            restore_backup(lines)
+        self.assertEqual(self.snapshot(), before)
+
+    def test_backup_and_restore_endpoints(self):
+        before = self.snapshot()
+        client = self.app.test_client()
+        response = client.get("/api/v2/settings/backup")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/gzip")
+        self.assertIn(".ndjson.gz", response.headers["Content-Disposition"])
+        backup = response.get_data()
+
+        self.wipe()
+        response = client.post(
+            "/api/v2/settings/restore",
+            data={"file": (io.BytesIO(backup), "backup.ndjson.gz")},
+            content_type="multipart/form-data",
+        )
+        self.assertEqual(response.status_code, 200, response.get_json())
+        self.assertEqual(response.get_json()["restored_rows"]["generation_jobs"], 1)
+        self.assertEqual(self.snapshot(), before)
+
+        response = client.post(
+            "/api/v2/settings/restore",
+            data=b'{"not": "a backup"}\n',
+            content_type="application/x-ndjson",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
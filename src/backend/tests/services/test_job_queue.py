@@ -0,0 +1,130 @@
+import logging
+import os
+import subprocess
+import sys
+import threading
+import unittest
+
+import pytest
+
+from src.backend.models import db
+from src.backend.models.generation_job import GenerationJob, JobStatus
+from src.backend.services.job_queue import JobQueue, owner_alive, process_owner
+from src.backend.services.scheduler.logging_utils import ProcessTracker
+
+
+def tracked_runner(params, progress):
+    """Two tracked steps, like the generator"""
+    quiet = logging.getLogger("test_job_queue")
+    tracker = ProcessTracker("Test", quiet, quiet, progress_callback=progress)
+    tracker.start_process()
+    for name in ("Load", "Assign"):
+        tracker.start_step(name)
+        tracker.end_step()
+    tracker.end_process({"status": "success"})
+    return {"status": "success", "days": params["days"]}
+
+
+@pytest.mark.usefixtures("file_db_app")
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.queue = JobQueue(self.app)
+        self.queue.register("tracked", tracked_runner)
+        self.queue.register("blocking", self.blocking_runner)
+        self.queue.register("broken", self.broken_runner)
+
+    def tearDown(self):
+        self.release.set()
+        self.queue.shutdown()
+
+    def blocking_runner(self, params, progress):
+        progress({"event": "step_started", "step_name": "Waiting"})
+        self.release.wait(5)
+        progress({"event": "step_completed", "step_name": "Waiting"})
+        return {"status": "success"}
+
+    @staticmethod
+    def broken_runner(params, progress):
+        raise RuntimeError("no shifts")
+
+    def wait(self, job_id):
+        events = [e["event"] for e in self.queue.stream(job_id, timeout=5) if e]
+        db.session.expire_all()
+        return events, self.queue.get(job_id)
+
+    def test_progress_and_result(self):
+        job_id = self.queue.submit("tracked", {"days": 7}).id
+        events, job = self.wait(job_id)
+
+        self.assertEqual(job.status, JobStatus.SUCCEEDED)
+        self.assertEqual(job.result, {"status": "success", "days": 7})
+        self.assertIsNotNone(job.started_at)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(
+            events,
+            ["job_queued", "job_started"]
+            + ["step_started", "step_completed"] * 2
+            + ["process_completed", "job_finished"],
+        )
+        self.assertEqual(job.progress["event"], "process_completed")
+
+    def test_failed_job(self):
+        job_id = self.queue.submit("broken", {}).id
+        _, job = self.wait(job_id)
+        self.assertEqual(job.status, JobStatus.FAILED)
+        self.assertEqual(job.error, "no shifts")
+        self.assertIsNone(job.result)
+
+    def test_jobs_queue_behind_a_running_job(self):
+        running = self.queue.submit("blocking", {}).id
+        queued = self.queue.submit("tracked", {"days": 1}).id
+        self.assertEqual(self.queue.get(queued).status, JobStatus.QUEUED)
+
+        # Cancelling the queued job stops it before it starts
+        self.assertEqual(self.queue.cancel(queued).status, JobStatus.CANCELLED)
+        # The running one stops at its next progress event
+        self.queue.cancel(running)
+        self.release.set()
+
+        _, job = self.wait(running)
+        self.assertEqual(job.status, JobStatus.CANCELLED)
+        self.assertIsNone(job.result)
+        self.queue.shutdown()
+        db.session.expire_all()
+        job = self.queue.get(queued)
+        self.assertEqual(job.status, JobStatus.CANCELLED)
+        self.assertIsNone(job.started_at)
+
+    def test_unfinished_jobs_fail_on_restart(self):
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+        boot_id = process_owner().rpartition(":")[0]
+        owners = {
+            "legacy": None,
+            "exited": f"{boot_id}:{exited.pid}",
+            "rebooted": f"another-boot:{os.getppid()}",
+            "other worker": f"{boot_id}:{os.getppid()}",
+        }
+        for kind, owner in owners.items():
+            db.session.add(GenerationJob(kind=kind, status=JobStatus.RUNNING, owner=owner))
+        db.session.commit()
+        JobQueue(self.app).shutdown()
+        db.session.expire_all()
+
+        jobs = {job.kind: job for job in GenerationJob.query}
+        for kind in ("legacy", "exited", "rebooted"):
+            self.assertEqual(jobs[kind].status, JobStatus.FAILED)
+            self.assertEqual(jobs[kind].error, "Interrupted by server restart")
+        # Still running in another live process
+        self.assertEqual(jobs["other worker"].status, JobStatus.RUNNING)
+
+    def test_jobs_record_their_owner(self):
+        job_id = self.queue.submit("tracked", {"days": 1}).id
+        _, job = self.wait(job_id)
+        self.assertEqual(job.owner, process_owner())
+        self.assertTrue(owner_alive(job.owner))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from datetime import date, datetime
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+
+from src.backend.models import db
+from src.backend.models.employee import AvailabilityType, Employee, EmployeeGroup
+from src.backend.models.fixed_shift import ShiftTemplate, ShiftType
+from src.backend.models.schedule import Schedule, ScheduleStatus
+from src.backend.services.schedule_queries import fetch_schedule_page
+
+
+def schedule_row(employee_id, day, shift_id, break_start=None, break_end=None, break_duration=None):
+    return {
+        "employee_id": employee_id,
+        "shift_id": shift_id,
+        "date": datetime.combine(day, datetime.min.time()),
+        "version": 1,
+        "shift_start": "08:00",
+        "shift_end": "16:00",
+        "break_start": break_start,
+        "break_end": break_end,
+        "break_duration": break_duration,
+        "availability_type": AvailabilityType.FIXED,
+        "status": ScheduleStatus.DRAFT,
+        "created_at": datetime(2024, 1, 1),
+        "updated_at": datetime(2024, 1, 1),
+    }
+
+
+class TestFetchSchedulePage(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        db.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        # Core inserts: the model constructors need an app context
+        self.session.execute(
+            insert(ShiftTemplate.__table__),
+            [
+                {"id": 1, "start_time": "08:00", "end_time": "16:00", "duration_hours": 8.0,
+                 "requires_break": True, "shift_type": ShiftType.EARLY, "active_days": {}},
+                {"id": 2, "start_time": "00:00", "end_time": "00:00", "duration_hours": 0.0,
+                 "requires_break": False, "shift_type": ShiftType.EARLY, "active_days": {}},
+            ],
+        )
+        self.session.execute(
+            insert(Employee.__table__),
+            [
+                {"id": employee_id, "employee_id": f"E{employee_id}", "first_name": "Anna",
+                 "last_name": f"Muster{employee_id}", "employee_group": EmployeeGroup.VZ,
+                 "contracted_hours": 40.0, "is_keyholder": False, "is_active": True,
+                 "created_at": datetime(2024, 1, 1), "updated_at": datetime(2024, 1, 1)}
+                for employee_id in (1, 2)
+            ],
+        )
+        self.session.execute(
+            insert(Schedule.__table__),
+            [
+                schedule_row(1, date(2024, 8, 5), 1, "12:00", "12:30"),
+                schedule_row(2, date(2024, 8, 5), 1, "23:50", "00:20"),
+                schedule_row(1, date(2024, 8, 6), 2),
+                schedule_row(2, date(2024, 8, 11), 1, "12:00", "12:45", 45),
+                schedule_row(3, date(2024, 8, 12), 1),
+            ],
+        )
+        self.session.commit()
+        self.statements = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_rows_match_to_dict_shape(self):
+        rows, next_after_id = fetch_schedule_page(
+            self.session, date(2024, 8, 5), date(2024, 8, 11), version=1
+        )
+        self.assertIsNone(next_after_id)
+        self.assertEqual(len(self.statements), 1)
+        # The end date is inclusive; employee 3 on 2024-08-12 is outside
+        self.assertEqual([row["id"] for row in rows], [1, 2, 3, 4])
+        self.assertEqual([row["break_duration"] for row in rows], [30, 30, 0, 45])
+        self.assertEqual(rows[0]["date"], "2024-08-05T00:00:00")
+        self.assertEqual(rows[0]["availability_type"], "FIXED")
+        self.assertEqual(rows[0]["status"], "DRAFT")
+        self.assertEqual(rows[0]["shift_type_name"], "EARLY")
+        self.assertEqual(rows[0]["employee_name"], "Anna Muster1")
+
+    def test_keyset_pages_and_filters(self):
+        first, cursor = fetch_schedule_page(
+            self.session, date(2024, 8, 5), date(2024, 8, 12), exclude_shift_id=2, limit=2
+        )
+        self.assertEqual(([row["id"] for row in first], cursor), ([1, 2], 2))
+        second, cursor = fetch_schedule_page(
+            self.session, date(2024, 8, 5), date(2024, 8, 12), exclude_shift_id=2,
+            after_id=cursor, limit=2,
+        )
+        self.assertEqual(([row["id"] for row in second], cursor), ([4, 5], None))
+        self.assertNotIn("employee_name", second[1])
+
+        rows, _ = fetch_schedule_page(
+            self.session, date(2024, 8, 5), date(2024, 8, 12), employee_ids=[2]
+        )
+        self.assertEqual([row["id"] for row in rows], [2, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
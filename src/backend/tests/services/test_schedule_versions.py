@@ -0,0 +1,104 @@
+import unittest
+from datetime import date, datetime
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+
+from src.backend.models import db
+from src.backend.models.schedule import Schedule, ScheduleStatus
+from src.backend.services.schedule_versions import (
+    compare_schedule_versions,
+    duplicate_schedule_version,
+    version_exists,
+)
+
+
+def schedule_row(version, employee_id, day, shift_id, **extra):
+    row = {
+        "version": version,
+        "employee_id": employee_id,
+        "date": datetime.combine(day, datetime.min.time()),
+        "shift_id": shift_id,
+        "shift_start": None,
+        "break_duration": None,
+        "status": ScheduleStatus.PUBLISHED,
+        "created_at": datetime(2024, 1, 1),
+        "updated_at": datetime(2024, 1, 1),
+    }
+    row.update(extra)
+    return row
+
+
+class TestScheduleVersions(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        db.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+        self.session.execute(
+            insert(Schedule.__table__),
+            [
+                schedule_row(1, 1, date(2024, 8, 1), 10, shift_start="08:00", break_duration=30),
+                schedule_row(1, 2, date(2024, 8, 1), 11),
+                schedule_row(1, 3, date(2024, 8, 7), None),
+                schedule_row(1, 4, date(2024, 8, 8), 10),
+                schedule_row(2, 1, date(2024, 8, 1), 10),
+                schedule_row(2, 2, date(2024, 8, 1), 12),
+                schedule_row(2, 3, date(2024, 8, 7), None),
+                schedule_row(2, 5, date(2024, 8, 2), 10),
+            ],
+        )
+        self.session.commit()
+        self.statements = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: self.statements.append(statement),
+        )
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_duplicate_copies_range_in_one_statement(self):
+        copied = duplicate_schedule_version(
+            self.session, 1, 3, date(2024, 8, 1), date(2024, 8, 7)
+        )
+        self.assertEqual(copied, 3)
+        self.assertEqual(len(self.statements), 1)
+        self.assertIn("INSERT INTO schedules", self.statements[0])
+        self.assertIn("SELECT", self.statements[0])
+
+        rows = (
+            self.session.query(Schedule)
+            .filter(Schedule.version == 3)
+            .order_by(Schedule.employee_id)
+            .all()
+        )
+        # The end date is inclusive although Schedule.date is a DateTime
+        self.assertEqual([row.employee_id for row in rows], [1, 2, 3])
+        self.assertTrue(all(row.status == ScheduleStatus.DRAFT for row in rows))
+        self.assertEqual((rows[0].shift_start, rows[0].break_duration), ("08:00", 30))
+        self.assertGreater(rows[0].created_at, datetime(2024, 1, 1))
+        self.assertTrue(version_exists(self.session, 3))
+        self.assertFalse(version_exists(self.session, 4))
+
+    def test_compare_returns_only_differences(self):
+        differences, counts = compare_schedule_versions(self.session, 1, 2)
+        self.assertEqual(
+            counts, {"added": 1, "removed": 1, "changed": 1, "unchanged": 2}
+        )
+        self.assertEqual(
+            differences,
+            [
+                {"employee_id": 5, "date": "2024-08-02T00:00:00", "type": "added",
+                 "compare_shift_id": 10},
+                {"employee_id": 4, "date": "2024-08-08T00:00:00", "type": "removed",
+                 "base_shift_id": 10},
+                {"employee_id": 2, "date": "2024-08-01T00:00:00", "type": "changed",
+                 "base_shift_id": 11, "compare_shift_id": 12},
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
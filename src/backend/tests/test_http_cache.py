@@ -0,0 +1,174 @@
+import unittest
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pytest
+from flask import Flask, jsonify
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+from src.backend.models import db
+from src.backend.models.employee import Employee, EmployeeGroup
+from src.backend.models.schedule import Schedule, ScheduleStatus, ScheduleVersionMeta
+from src.backend.routes.employees import employees
+from src.backend.routes.settings import settings
+from src.backend.utils.http_cache import (
+    register_revision_events,
+    response_cache,
+    revision_cached,
+    revisions,
+)
+
+
+class TestRevisionEvents(unittest.TestCase):
+    def setUp(self):
+        register_revision_events()
+        self.engine = create_engine("sqlite://")
+        db.metadata.create_all(self.engine)
+        self.session = Session(self.engine)
+
+    def tearDown(self):
+        self.session.close()
+        self.engine.dispose()
+
+    def test_commit_bumps_flushed_and_bulk_tables(self):
+        before = revisions.current(("schedules", "schedule_version_meta", "coverage"))
+        self.session.add(
+            ScheduleVersionMeta(
+                version=1, date_range_start=date(2024, 8, 5), date_range_end=date(2024, 8, 11)
+            )
+        )
+        self.session.flush()
+        self.session.execute(
+            insert(Schedule.__table__).values(
+                employee_id=1, date=datetime(2024, 8, 5), version=1,
+                status=ScheduleStatus.DRAFT, created_at=datetime(2024, 8, 1),
+                updated_at=datetime(2024, 8, 1),
+            )
+        )
+        # Nothing is visible before the commit
+        self.assertEqual(
+            revisions.current(("schedules", "schedule_version_meta", "coverage")), before
+        )
+        self.session.commit()
+        after = revisions.current(("schedules", "schedule_version_meta", "coverage"))
+        self.assertEqual(after, (before[0] + 1, before[1] + 1, before[2]))
+
+    def test_rollback_discards_changes(self):
+        before = revisions.current(("schedule_version_meta",))
+        self.session.add(
+            ScheduleVersionMeta(
+                version=2, date_range_start=date(2024, 8, 5), date_range_end=date(2024, 8, 11)
+            )
+        )
+        self.session.flush()
+        self.session.rollback()
+        self.session.commit()
+        self.assertEqual(revisions.current(("schedule_version_meta",)), before)
+
+    def test_raw_writes_start_a_new_epoch(self):
+        epoch = revisions.epoch
+        self.session.execute(text("SELECT COUNT(*) FROM coverage"))
+        self.session.commit()
+        self.assertEqual(revisions.epoch, epoch)
+
+        self.session.execute(text("DELETE FROM coverage"))
+        self.assertEqual(revisions.epoch, epoch)
+        self.session.commit()
+        self.assertNotEqual(revisions.epoch, epoch)
+
+
+class TestRevisionCached(unittest.TestCase):
+    def setUp(self):
+        response_cache.clear()
+        self.calls = 0
+        app = Flask(__name__)
+
+        @app.route("/items/<int:group>")
+        @revision_cached("test_items")
+        def items(group):
+            self.calls += 1
+            return jsonify({"group": group, "calls": self.calls})
+
+        self.client = app.test_client()
+
+    def test_etag_and_cached_body(self):
+        first = self.client.get("/items/1")
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["ETag"]
+        self.assertFalse(etag.startswith("W/"))
+
+        not_modified = self.client.get("/items/1", headers={"If-None-Match": etag})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.headers["ETag"], etag)
+
+        cached = self.client.get("/items/1")
+        self.assertEqual(cached.get_json(), {"group": 1, "calls": 1})
+        self.assertEqual(cached.headers["ETag"], etag)
+        self.assertEqual(self.calls, 1)
+
+        # Other view or query arguments get their own entry
+        self.assertNotEqual(self.client.get("/items/2").headers["ETag"], etag)
+        self.assertNotEqual(self.client.get("/items/1?week=3").headers["ETag"], etag)
+        self.assertEqual(self.calls, 3)
+
+    def test_revision_bump_invalidates(self):
+        etag = self.client.get("/items/1").headers["ETag"]
+        revisions.bump(["test_items"])
+        response = self.client.get("/items/1", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.get_json()["calls"], 2)
+
+    def test_bodies_and_etags_expire(self):
+        with patch("src.backend.utils.http_cache.time.monotonic", return_value=1000.0):
+            etag = self.client.get("/items/1").headers["ETag"]
+        with patch(
+            "src.backend.utils.http_cache.time.monotonic",
+            return_value=1000.0 + response_cache.max_age + 1,
+        ):
+            response = self.client.get("/items/1", headers={"If-None-Match": etag})
+        # Same revision, but the view runs again instead of confirming the ETag
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["calls"], 2)
+
+
+@pytest.mark.usefixtures("file_db_app")
+class TestWipeInvalidates(unittest.TestCase):
+    def setUp(self):
+        response_cache.clear()
+        register_revision_events()
+        self.app.register_blueprint(settings, url_prefix="/api/v2")
+        self.app.register_blueprint(employees, url_prefix="/api/v2")
+        db.session.add(
+            Employee(
+                first_name="Test",
+                last_name="User",
+                employee_group=EmployeeGroup.VZ,
+                contracted_hours=40.0,
+            )
+        )
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def test_wiped_table_is_not_served_from_cache(self):
+        first = self.client.get("/api/v2/employees/")
+        self.assertEqual(len(first.get_json()), 1)
+        etag = first.headers["ETag"]
+        # The fixture's app context outlives the request; end its session
+        # like the request teardown would
+        db.session.remove()
+
+        response = self.client.post(
+            "/api/v2/settings/wipe-tables", json={"tables": ["employees"]}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        after = self.client.get("/api/v2/employees/", headers={"If-None-Match": etag})
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual(after.get_json(), [])
+        self.assertNotEqual(after.headers["ETag"], etag)
+
+
+if __name__ == "__main__":
+    unittest.main()
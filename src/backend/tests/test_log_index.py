@@ -0,0 +1,137 @@
+import json
+import logging
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+from flask import Flask
+
+from src.backend.routes.logs import bp
+from src.backend.utils.log_index import LogIndex, LogIndexHandler
+from src.backend.utils.logger import CustomFormatter
+
+
+def entry(timestamp, level="INFO", message="saved", module="schedule", action="unknown"):
+    return {
+        "timestamp": timestamp,
+        "level": level,
+        "module": module,
+        "message": message,
+        "action": action,
+    }
+
+
+class TestLogIndex(unittest.TestCase):
+    def setUp(self):
+        self.logs_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.logs_dir)
+        self.index = LogIndex(self.logs_dir / "log_index.db")
+        self.today = datetime.now().strftime("%Y-%m-%d")
+        self.old_day = (datetime.now() - timedelta(days=20)).strftime("%Y-%m-%d")
+
+    def test_filters_and_pages_newest_first(self):
+        for i in range(5):
+            self.index.append("schedule", entry(f"{self.today} 10:00:0{i},000", message=f"m{i}"))
+        self.index.append("error", entry(f"{self.today} 11:00:00,000", level="ERROR"))
+        self.index.append("user", entry(f"{self.old_day} 09:00:00,000", module="user"))
+
+        logs, total = self.index.query(["schedule"], self.today, limit=2, offset=1)
+        self.assertEqual(total, 5)
+        self.assertEqual([log["message"] for log in logs], ["m3", "m2"])
+        self.assertEqual(logs[0]["source_file"], "schedule.log")
+
+        logs, total = self.index.query(["user", "error", "schedule"], self.today, level="error")
+        self.assertEqual((total, logs[0]["level"]), (1, "ERROR"))
+        self.assertEqual(self.index.query(["user"], self.today)[1], 0)
+        self.assertEqual(self.index.query(["schedule"], self.today, search="m4")[1], 1)
+
+        counts = self.index.counts(["user", "error", "schedule"], self.old_day)
+        self.assertEqual(counts["by_source"], {"schedule": 5, "error": 1, "user": 1})
+
+    def test_stats(self):
+        self.index.append("user", entry(f"{self.today} 09:00:00,000", module="user", action="login"))
+        self.index.append("error", entry(f"{self.today} 09:30:00,000", level="ERROR"))
+        self.index.append("schedule", entry(f"{self.old_day} 09:00:00,000", level="WARNING"))
+
+        stats = self.index.stats(f"{self.today} 00:00:00")
+        self.assertEqual(stats["total_logs"], 2)
+        self.assertEqual((stats["errors"], stats["warnings"]), (1, 0))
+        self.assertEqual((stats["user_actions"], stats["schedule_operations"]), (1, 0))
+        self.assertEqual(stats["by_date"], {self.today: 2})
+        self.assertEqual(stats["by_action"], {"login": 1, "unknown": 1})
+        self.assertEqual(len(stats["recent_errors"]), 1)
+
+    def test_import_prune_and_clear(self):
+        log_file = self.logs_dir / "errors.log"
+        log_file.write_text(
+            json.dumps(entry(f"{self.today} 08:00:00,000", level="ERROR"))
+            + "\nnot json\n"
+            + json.dumps(entry(f"{self.old_day} 08:00:00,000", level="ERROR"))
+            + "\n"
+        )
+        # Rotated backups are imported as well
+        (self.logs_dir / "errors.log.2").write_text(
+            json.dumps(entry(f"{self.today} 06:00:00,000", level="ERROR")) + "\n"
+        )
+        (self.logs_dir / "errors.log.1").write_text(
+            json.dumps(entry(f"{self.today} 07:00:00,000", level="ERROR")) + "\n"
+        )
+        self.assertEqual(self.index.import_file(log_file, "error"), 4)
+        self.assertEqual(self.index.import_file(self.logs_dir / "missing.log", "error"), 0)
+        self.index.prune(self.today)
+        self.assertEqual(self.index.query(["error"], self.old_day)[1], 3)
+        self.index.clear(["error"])
+        self.assertEqual(self.index.query(["error"], self.old_day)[1], 0)
+
+    def test_handler_writes_the_file_entry(self):
+        formatter = CustomFormatter()
+        test_logger = logging.getLogger("test_log_index")
+        test_logger.propagate = False
+        handler = LogIndexHandler(self.index, "schedule", formatter)
+        test_logger.addHandler(handler)
+        self.addCleanup(test_logger.removeHandler, handler)
+
+        test_logger.warning("Coverage not met")
+        logs, _ = self.index.query(["schedule"], self.today)
+        self.assertEqual(logs[0]["message"], "Coverage not met")
+        self.assertEqual(logs[0]["level"], "WARNING")
+        self.assertEqual(logs[0]["function"], "test_handler_writes_the_file_entry")
+
+
+class TestLogRoutes(unittest.TestCase):
+    def setUp(self):
+        logs_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, logs_dir)
+        index = LogIndex(logs_dir / "log_index.db")
+        today = datetime.now().strftime("%Y-%m-%d")
+        for i in range(3):
+            index.append("schedule", entry(f"{today} 10:00:0{i},000", level="INFO"))
+        index.append("error", entry(f"{today} 10:00:05,000", level="ERROR"))
+
+        app = Flask(__name__)
+        app.config["logger"] = SimpleNamespace(logs_dir=logs_dir, log_index=index)
+        app.register_blueprint(bp, url_prefix="/logs")
+        self.client = app.test_client()
+
+    def test_get_logs_pages(self):
+        data = self.client.get("/logs/?type=all&days=7&limit=2").get_json()
+        self.assertEqual(data["status"], "success")
+        self.assertEqual(len(data["logs"]), 2)
+        self.assertEqual(data["pagination"], {"total": 4, "limit": 2, "offset": 0})
+        self.assertEqual(data["logs"][0]["source_file"], "errors.log")
+
+        data = self.client.get("/logs/?type=schedule&level=error").get_json()
+        self.assertEqual(data["logs"], [])
+
+    def test_get_stats(self):
+        data = self.client.get("/logs/stats?days=1").get_json()
+        self.assertEqual(data["stats"]["total_logs"], 4)
+        self.assertEqual(data["stats"]["errors"], 1)
+        self.assertEqual(data["stats"]["schedule_operations"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+"""EXPLAIN QUERY PLAN checks for the hot schedule queries.
+
+The functions of services/schedule_versions.py and services/schedule_queries.py
+are called against a seeded and analyzed SQLite database; the statements they
+execute are captured and must be answered from an index, not by a full table
+scan. Queries written inline in routes/schedules.py and routes/availability.py
+cannot be called on their own, so their tests mirror the statement.
+"""
+
+import importlib.util
+import os
+import unittest
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, desc, event, insert, select, text
+from sqlalchemy.orm import Session
+
+from src.backend.models import db
+from src.backend.models.fixed_shift import ShiftTemplate
+from src.backend.models.schedule import Schedule, ScheduleStatus, ScheduleVersionMeta
+from src.backend.services.schedule_queries import fetch_schedule_page
+from src.backend.services.schedule_versions import (
+    compare_schedule_versions,
+    duplicate_schedule_version,
+)
+
+MIGRATION_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "..", "..", "instance", "migrations", "versions", "add_schedule_composite_indexes.py",
+)
+
+START = date(2024, 1, 1)
+
+
+def seed(connection):
+    versions = []
+    schedules = []
+    for version in range(1, 41):
+        range_start = START + timedelta(weeks=version - 1)
+        versions.append(
+            {
+                "version": version,
+                "created_at": datetime(2024, 1, 1),
+                "status": ScheduleStatus.PUBLISHED if version % 2 else ScheduleStatus.DRAFT,
+                "date_range_start": range_start,
+                "date_range_end": range_start + timedelta(days=6),
+                "month_boundary_mode": "keep_intact",
+                "is_week_based": True,
+            }
+        )
+        for offset in range(7):
+            day = datetime.combine(range_start + timedelta(days=offset), datetime.min.time())
+            for employee_id in range(1, 21):
+                schedules.append(
+                    {
+                        "employee_id": employee_id,
+                        "shift_id": 1 + employee_id % 3,
+                        "date": day,
+                        "version": version,
+                        "status": ScheduleStatus.DRAFT,
+                        "created_at": day,
+                        "updated_at": day,
+                    }
+                )
+    connection.execute(insert(ScheduleVersionMeta.__table__), versions)
+    connection.execute(insert(Schedule.__table__), schedules)
+    connection.execute(text("ANALYZE"))
+
+
+class TestScheduleQueryPlans(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine("sqlite://")
+        db.metadata.create_all(cls.engine)
+        with cls.engine.begin() as connection:
+            seed(connection)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.dispose()
+
+    def query_plan(self, statement):
+        compiled = statement.compile(
+            dialect=self.engine.dialect, compile_kwargs={"render_postcompile": True}
+        )
+        # Parameter values do not change the plan
+        params = (None,) * len(compiled.positiontup or ())
+        return self.sql_plan(str(compiled), params)
+
+    def sql_plan(self, sql, params):
+        with self.engine.connect() as connection:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+        return [row[-1] for row in rows]
+
+    def executed_statements(self, call):
+        """SQL and parameters of every statement ``call(session)`` executes.
+
+        The session is rolled back afterwards.
+        """
+        statements = []
+
+        def capture(connection, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(self.engine, "before_cursor_execute", capture)
+        try:
+            with Session(self.engine) as session:
+                call(session)
+                session.rollback()
+        finally:
+            event.remove(self.engine, "before_cursor_execute", capture)
+        return statements
+
+    def assertNoFullScan(self, statement, *tables):
+        return self.assertPlanIndexed(self.query_plan(statement), *tables)
+
+    def assertPlanIndexed(self, plan, *tables):
+        for detail in plan:
+            for table in tables:
+                if detail.startswith("SCAN") and f" {table}" in detail:
+                    self.assertIn(
+                        "INDEX", detail, f"Full scan of {table}: {' | '.join(plan)}"
+                    )
+        return plan
+
+    def test_get_schedules_for_version_and_range(self):
+        statement = select(Schedule).where(
+            Schedule.date >= datetime(2024, 3, 4),
+            Schedule.date <= datetime(2024, 3, 10),
+            Schedule.version == 10,
+        )
+        plan = self.assertNoFullScan(statement, "schedules")
+        self.assertTrue(
+            any("ix_schedules_version_date_employee" in detail for detail in plan), plan
+        )
+
+    def test_versions_in_schedules_fallback(self):
+        statement = (
+            select(Schedule.version)
+            .where(Schedule.date >= datetime(2024, 3, 4), Schedule.date <= datetime(2024, 3, 10))
+            .distinct()
+            .order_by(desc(Schedule.version))
+        )
+        self.assertNoFullScan(statement, "schedules")
+
+    def test_version_meta_for_range(self):
+        # With ORDER BY version DESC and no LIMIT, SQLite walks the primary key
+        # backwards to skip the sort; the overlap filter itself must be indexed.
+        statement = select(ScheduleVersionMeta).where(
+            ScheduleVersionMeta.date_range_start <= date(2024, 3, 10),
+            ScheduleVersionMeta.date_range_end >= date(2024, 3, 4),
+        )
+        plan = self.assertNoFullScan(statement, "schedule_version_meta")
+        self.assertTrue(
+            any("ix_schedule_version_meta_date_range" in detail for detail in plan), plan
+        )
+
+    def test_version_meta_by_date_and_status(self):
+        target = date(2024, 3, 6)
+        statement = (
+            select(ScheduleVersionMeta)
+            .where(
+                ScheduleVersionMeta.date_range_start.isnot(None),
+                ScheduleVersionMeta.date_range_end.isnot(None),
+                ScheduleVersionMeta.date_range_start <= target,
+                ScheduleVersionMeta.date_range_end >= target,
+                ScheduleVersionMeta.status == ScheduleStatus.PUBLISHED,
+            )
+            .order_by(desc(ScheduleVersionMeta.version))
+            .limit(1)
+        )
+        self.assertNoFullScan(statement, "schedule_version_meta")
+
+    def test_availability_by_date_schedules(self):
+        statement = (
+            select(Schedule, ShiftTemplate)
+            .join(ShiftTemplate, Schedule.shift_id == ShiftTemplate.id)
+            .where(
+                Schedule.employee_id.in_([1, 2, 3]),
+                Schedule.date == datetime(2024, 3, 6),
+                Schedule.version == 10,
+            )
+        )
+        self.assertNoFullScan(statement, "schedules")
+
+    def test_export_date_range(self):
+        statement = select(Schedule).where(
+            Schedule.date >= datetime(2024, 3, 4), Schedule.date <= datetime(2024, 3, 10)
+        )
+        self.assertNoFullScan(statement, "schedules")
+
+    def test_duplicate_schedule_version(self):
+        copied = []
+        statements = self.executed_statements(
+            lambda session: copied.append(
+                duplicate_schedule_version(
+                    session, 3, 99, date(2024, 1, 15), date(2024, 1, 21)
+                )
+            )
+        )
+        self.assertEqual(copied, [7 * 20])
+        self.assertEqual(len(statements), 1)
+        plan = self.assertPlanIndexed(self.sql_plan(*statements[0]), "schedules")
+        self.assertTrue(
+            any("ix_schedules_version_date_employee" in detail for detail in plan), plan
+        )
+
+    def test_compare_schedule_versions(self):
+        statements = self.executed_statements(
+            lambda session: compare_schedule_versions(session, 3, 4)
+        )
+        # The UNION ALL of added, removed and changed rows, then the unchanged count
+        self.assertEqual(len(statements), 2)
+        self.assertIn("UNION ALL", statements[0][0])
+        for sql, params in statements:
+            plan = self.assertPlanIndexed(self.sql_plan(sql, params), "base", "other")
+            self.assertTrue(
+                all(
+                    "ix_schedules_version_date_employee" in detail
+                    for detail in plan
+                    if " base " in detail or " other " in detail
+                ),
+                plan,
+            )
+
+    def test_fetch_schedule_page(self):
+        statements = self.executed_statements(
+            lambda session: (
+                # Version, employee, shift and keyset filters
+                fetch_schedule_page(
+                    session,
+                    date(2024, 3, 4),
+                    date(2024, 3, 10),
+                    version=10,
+                    employee_ids=[1, 2],
+                    exclude_shift_id=1,
+                    after_id=5,
+                    limit=50,
+                ),
+                # Date range only
+                fetch_schedule_page(session, date(2024, 3, 4), date(2024, 3, 10), limit=50),
+            )
+        )
+        self.assertEqual(len(statements), 2)
+        for sql, params in statements:
+            self.assertIn("ORDER BY schedules.id", sql)
+            self.assertPlanIndexed(
+                self.sql_plan(sql, params), "schedules", "shifts", "employees"
+            )
+
+    def test_migration_matches_model_indexes(self):
+        spec = importlib.util.spec_from_file_location("composite_indexes", MIGRATION_PATH)
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+
+        model_indexes = {
+            (index.name, table.name, tuple(column.name for column in index.columns))
+            for table in (Schedule.__table__, ScheduleVersionMeta.__table__)
+            for index in table.indexes
+            if index.name.startswith(("ix_schedules_", "ix_schedule_version_meta_"))
+            and len(index.columns) > 1
+        }
+        migration_indexes = {
+            (name, table, tuple(columns)) for name, table, columns in migration.INDEXES
+        }
+        self.assertEqual(model_indexes, migration_indexes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+"""
+Revision-based HTTP caching for frequently polled GET endpoints.
+
+Every table has a revision counter that increases when a transaction that
+changed it commits. A cached endpoint derives a strong ETag from the
+request (endpoint, view and query arguments) and the revisions of the
+tables it reads, answers ``If-None-Match`` with 304 and keeps the
+serialized JSON body of recent responses, so an unchanged poll costs a
+counter lookup.
+
+Changed tables are collected from ``after_flush`` (ORM units of work) and
+``do_orm_execute`` (bulk INSERT/UPDATE/DELETE statements run through a
+session) and only counted once the transaction commits; a reader that runs
+between flush and commit can therefore never cache old data under the new
+revision. Raw ``text()`` statements other than reads name no table, so
+committing one counts as a change to every table (a new epoch). The
+counters live in this process: writes made by other processes or with raw
+SQL outside a session are not seen, so cached bodies also expire after
+``max_age`` seconds.
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date
+from functools import wraps
+from typing import Dict, Iterable, Optional, Tuple
+
+from flask import Response, make_response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+_PENDING_KEY = "revision_tables"
+# Pending marker for a raw statement that may have changed any table
+_ALL_TABLES = "*"
+# Leading keywords of raw statements that do not change data
+_READ_KEYWORDS = ("SELECT", "EXPLAIN", "PRAGMA")
+
+
+class RevisionTracker:
+    """Monotonic per-table revision counters."""
+
+    def __init__(self):
+        self._revisions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Distinguishes ETags across restarts, when the counters start over,
+        # and across bump_all()
+        self.epoch = uuid.uuid4().hex[:8]
+
+    def bump(self, tables: Iterable[str]) -> None:
+        with self._lock:
+            for table in tables:
+                self._revisions[table] = self._revisions.get(table, 0) + 1
+
+    def bump_all(self) -> None:
+        """Invalidate every table, for changes that name no table"""
+        with self._lock:
+            self.epoch = uuid.uuid4().hex[:8]
+
+    def current(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        revisions = self._revisions
+        return tuple(revisions.get(table, 0) for table in tables)
+
+
+class ResponseCache:
+    """Bounded LRU of serialized response bodies, each kept ``max_age`` seconds."""
+
+    def __init__(self, max_entries: int = 256, max_age: float = 300.0):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        # key -> (stored at, body)
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.max_age:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+revisions = RevisionTracker()
+response_cache = ResponseCache()
+
+
+def _pending(session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+def _after_flush(session, flush_context):
+    pending = _pending(session)
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(instance, "__table__", None)
+        if table is not None:
+            pending.add(table.name)
+
+
+def _do_orm_execute(orm_execute_state):
+    statement = orm_execute_state.statement
+    if isinstance(statement, TextClause):
+        keyword = statement.text.lstrip().split(None, 1)[:1]
+        if not keyword or keyword[0].upper() not in _READ_KEYWORDS:
+            _pending(orm_execute_state.session).add(_ALL_TABLES)
+    elif orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(statement, "table", None)
+        name = getattr(table, "name", None)
+        if name:
+            _pending(orm_execute_state.session).add(name)
+
+
+def _after_commit(session):
+    tables = session.info.pop(_PENDING_KEY, None)
+    if tables and _ALL_TABLES in tables:
+        revisions.bump_all()
+        tables.discard(_ALL_TABLES)
+    if tables:
+        revisions.bump(tables)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def register_revision_events() -> None:
+    """Track table changes of every SQLAlchemy session (idempotent)."""
+    for name, listener in (
+        ("after_flush", _after_flush),
+        ("do_orm_execute", _do_orm_execute),
+        ("after_commit", _after_commit),
+        ("after_rollback", _after_rollback),
+    ):
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
+
+
+def _cache_key(tables: Tuple[str, ...], view_args: dict) -> str:
+    key = (
+        request.endpoint,
+        tuple(sorted(view_args.items())),
+        tuple(sorted(request.args.items(multi=True))),
+        # Endpoints default to the current week when no dates are given
+        date.today().isoformat(),
+        tables,
+        revisions.current(tables),
+    )
+    return f"{revisions.epoch}-{hashlib.sha1(repr(key).encode()).hexdigest()}"
+
+
+def revision_cached(*tables: str):
+    """Serve a JSON GET endpoint with ETags keyed on the revisions of ``tables``."""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # Read the revisions before the view runs, so a concurrent
+            # commit makes the stored body stale instead of mislabelled
+            etag = _cache_key(tables, kwargs)
+            # Only confirm ETags whose body has not expired, so a change the
+            # counters missed is picked up after ``max_age``
+            body = response_cache.get(etag)
+            if body is not None:
+                if etag in request.if_none_match:
+                    response = Response(status=304)
+                else:
+                    response = Response(body, mimetype="application/json")
+                response.set_etag(etag)
+                return response
+
+            response = make_response(func(*args, **kwargs))
+            if response.status_code == 200 and response.is_json:
+                response_cache.set(etag, response.get_data())
+                response.set_etag(etag)
+            return response
+
+        return wrapper
+
+    return decorator
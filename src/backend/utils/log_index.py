@@ -0,0 +1,308 @@
+"""Append-only SQLite index of the JSON log files.
+
+``GET /logs`` and ``GET /logs/stats`` used to open the user, error and
+schedule logs and ``json.loads`` every line on each request before filtering
+in Python. ``LogIndexHandler`` now sits next to each of those file handlers
+and appends the same entries to a ``log_entries`` table in
+``logs/log_index.db`` (or ``LOG_INDEX_PATH`` if set), with the filter columns (source, day, level, module,
+action) indexed and the full entry kept as JSON for display. Queries then
+read one page and aggregate stats in SQL.
+
+The index is a separate SQLite file, not the application database, so log
+writes never wait for the scheduler's write transactions. Rows are buffered
+and written in batches; errors and every read flush the buffer first.
+"""
+
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Log file written by each indexed source
+LOG_SOURCES = {
+    "user": "user_actions.log",
+    "error": "errors.log",
+    "schedule": "schedule.log",
+}
+
+RETENTION_DAYS = 30
+BATCH_SIZE = 100
+FLUSH_INTERVAL_SECONDS = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_entries (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    day TEXT NOT NULL,
+    level TEXT NOT NULL,
+    module TEXT,
+    action TEXT,
+    message TEXT,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_log_entries_source_timestamp
+    ON log_entries (source, timestamp);
+CREATE INDEX IF NOT EXISTS ix_log_entries_level_timestamp
+    ON log_entries (level, timestamp);
+CREATE INDEX IF NOT EXISTS ix_log_entries_day ON log_entries (day);
+"""
+
+_Row = Tuple[str, str, str, str, Optional[str], Optional[str], Optional[str], str]
+
+
+def _row(source: str, entry: Dict[str, Any]) -> _Row:
+    timestamp = str(entry.get("timestamp", ""))
+    return (
+        source,
+        timestamp,
+        timestamp[:10],
+        str(entry.get("level", "")).lower(),
+        entry.get("module"),
+        entry.get("action"),
+        str(entry.get("message", "")),
+        json.dumps(entry, default=str),
+    )
+
+
+class LogIndex:
+    """Buffered writer and query interface for ``log_entries``"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.created = not self.path.exists()
+        self._lock = threading.Lock()
+        self._pending: List[_Row] = []
+        self._last_flush = time.monotonic()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        atexit.register(self.flush)
+
+    # --- Writing ---
+
+    def append(self, source: str, entry: Dict[str, Any], urgent: bool = False) -> None:
+        with self._lock:
+            self._pending.append(_row(source, entry))
+            if (
+                urgent
+                or len(self._pending) >= BATCH_SIZE
+                or time.monotonic() - self._last_flush >= FLUSH_INTERVAL_SECONDS
+            ):
+                self._write_pending()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO log_entries "
+                "(source, timestamp, day, level, module, action, message, entry) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def import_file(self, path: Path, source: str) -> int:
+        """Index the JSON lines of an existing log file, skipping unparsable lines
+
+        The rotated backups ``<path>.1``, ``<path>.2``, ... are imported too,
+        oldest first.
+        """
+        rows = []
+        for log_file in _rotated_files(Path(path)):
+            with open(log_file, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(entry, dict):
+                        rows.append(_row(source, entry))
+        if not rows:
+            return 0
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO log_entries "
+                "(source, timestamp, day, level, module, action, message, entry) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def prune(self, before_day: str) -> None:
+        self.flush()
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM log_entries WHERE day < ?", (before_day,))
+
+    def clear(self, sources: Iterable[str]) -> None:
+        self.flush()
+        sources = list(sources)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"DELETE FROM log_entries WHERE source IN ({_placeholders(sources)})",
+                sources,
+            )
+
+    # --- Reading ---
+
+    def query(
+        self,
+        sources: Sequence[str],
+        since_day: str,
+        level: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: int = 1000,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """One page of entries, newest first, and the number of matches"""
+        where, params = self._filters(sources, since_day, level, search)
+        with self._read() as connection:
+            total = connection.execute(
+                f"SELECT COUNT(*) FROM log_entries WHERE {where}", params
+            ).fetchone()[0]
+            rows = connection.execute(
+                f"SELECT source, entry FROM log_entries WHERE {where} "
+                "ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        entries = []
+        for source, entry in rows:
+            entry = json.loads(entry)
+            entry["source_file"] = LOG_SOURCES.get(source, source)
+            entries.append(entry)
+        return entries, total
+
+    def counts(
+        self, sources: Sequence[str], since_day: str, level: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Match counts in total, per source, per level and per module"""
+        where, params = self._filters(sources, since_day, level, None)
+        with self._read() as connection:
+            grouped = connection.execute(
+                f"SELECT source, level, module, COUNT(*) FROM log_entries WHERE {where} "
+                "GROUP BY source, level, module",
+                params,
+            ).fetchall()
+        counts: Dict[str, Any] = {"total": 0, "by_source": {}, "by_level": {}, "by_module": {}}
+        for source, row_level, module, count in grouped:
+            counts["total"] += count
+            for key, value in (("by_source", source), ("by_level", row_level), ("by_module", module)):
+                counts[key][value] = counts[key].get(value, 0) + count
+        return counts
+
+    def stats(self, since_timestamp: str, recent_errors: int = 10) -> Dict[str, Any]:
+        """The aggregates of ``GET /logs/stats``"""
+        sources = list(LOG_SOURCES)
+        params = (*sources, since_timestamp)
+        where = f"source IN ({_placeholders(sources)}) AND timestamp >= ?"
+        stats: Dict[str, Any] = {
+            "total_logs": 0,
+            "errors": 0,
+            "warnings": 0,
+            "user_actions": 0,
+            "schedule_operations": 0,
+            "by_date": {},
+            "by_module": {},
+            "by_action": {},
+            "recent_errors": [],
+        }
+        with self._read() as connection:
+            for source, row_level, count in connection.execute(
+                f"SELECT source, level, COUNT(*) FROM log_entries WHERE {where} "
+                "GROUP BY source, level",
+                params,
+            ):
+                stats["total_logs"] += count
+                if row_level == "error":
+                    stats["errors"] += count
+                elif row_level == "warning":
+                    stats["warnings"] += count
+                if source == "user":
+                    stats["user_actions"] += count
+                elif source == "schedule":
+                    stats["schedule_operations"] += count
+            for column, key in (("day", "by_date"), ("module", "by_module"), ("action", "by_action")):
+                stats[key] = dict(
+                    connection.execute(
+                        f"SELECT {column}, COUNT(*) FROM log_entries "
+                        f"WHERE {where} AND {column} IS NOT NULL GROUP BY {column}",
+                        params,
+                    ).fetchall()
+                )
+            stats["recent_errors"] = [
+                json.loads(entry)
+                for (entry,) in connection.execute(
+                    f"SELECT entry FROM log_entries WHERE {where} AND level = 'error' "
+                    "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                    (*params, recent_errors),
+                )
+            ]
+        return stats
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """The shared connection, after writing buffered rows"""
+        self.flush()
+        with self._lock:
+            yield self._connection
+
+    @staticmethod
+    def _filters(
+        sources: Sequence[str], since_day: str, level: Optional[str], search: Optional[str]
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        clauses = [f"source IN ({_placeholders(sources)})", "day >= ?"]
+        params: List[Any] = [*sources, since_day]
+        if level:
+            clauses.append("level = ?")
+            params.append(level.lower())
+        if search:
+            clauses.append("(message LIKE ? OR module LIKE ? OR action LIKE ?)")
+            params.extend([f"%{search}%"] * 3)
+        return " AND ".join(clauses), tuple(params)
+
+
+def _rotated_files(path: Path) -> List[Path]:
+    """``path`` and its ``RotatingFileHandler`` backups, oldest first"""
+    backups = []
+    for candidate in path.parent.glob(f"{path.name}.*"):
+        suffix = candidate.name[len(path.name) + 1 :]
+        if suffix.isdigit():
+            backups.append((int(suffix), candidate))
+    files = [candidate for _, candidate in sorted(backups, reverse=True)]
+    if path.exists():
+        files.append(path)
+    return files
+
+
+def _placeholders(values: Sequence[Any]) -> str:
+    return ", ".join("?" * len(values)) or "NULL"
+
+
+class LogIndexHandler(logging.Handler):
+    """Appends the entries of one log file to the index"""
+
+    def __init__(self, index: LogIndex, source: str, formatter):
+        super().__init__()
+        self.index = index
+        self.source = source
+        # Same entry the JSON file handler writes (see CustomFormatter.to_entry)
+        self.entry_formatter = formatter
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            entry = self.entry_formatter.to_entry(record)
+            self.index.append(self.source, entry, urgent=record.levelno >= logging.ERROR)
+        except Exception:
+            self.handleError(record)
@@ -1,10 +1,13 @@
 import logging
 from logging.handlers import RotatingFileHandler
 import json
+import os
 from pathlib import Path
 import sys  # Import sys for stderr
 import traceback  # Import traceback
-from datetime import datetime
+from datetime import datetime, timedelta
+
+from .log_index import LOG_SOURCES, RETENTION_DAYS, LogIndex, LogIndexHandler
 
 # Get the root directory (two levels up from this file)
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
@@ -12,6 +15,10 @@ ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 
 class CustomFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(self.to_entry(record))
+
+    def to_entry(self, record: logging.LogRecord) -> dict:
+        """The log entry written for ``record``, as a dict"""
         # Add default values for custom fields
         if not hasattr(record, "user"):
             setattr(record, "user", "anonymous")
@@ -65,9 +72,7 @@ class CustomFormatter(logging.Formatter):
             "action": getattr(record, "action", "unknown"),
             "extra": json.loads(extra_data_str),
         }
-
-        # Convert to JSON string for the final log output
-        return json.dumps(log_entry)
+        return log_entry
 
 
 # Simple formatter for diagnostic logs
@@ -92,6 +97,7 @@ class Logger:
         self.console_handler = None  # Initialize handler attributes
         self.file_handler = None
         self.logger_name = "app"  # Default logger name
+        self.level = logging.DEBUG  # Messages below this level are dropped early
 
         # # print("!!! Logger __init__ started !!!", file=sys.stderr)  # DEBUG PRINT
         try:
@@ -114,6 +120,9 @@ class Logger:
             # Set up formatters
             formatter = CustomFormatter()
 
+            # Queryable index of the user, error and schedule logs (see log_index.py)
+            self.log_index = self._open_log_index()
+
             # User actions logger
             # # print("!!! Setting up user_logger...", file=sys.stderr)  # DEBUG PRINT
             self.user_logger = logging.getLogger("user_actions")
@@ -130,6 +139,9 @@ class Logger:
             if self.user_logger.hasHandlers():
                 self.user_logger.handlers.clear()
             self.user_logger.addHandler(user_handler)
+            self.user_logger.addHandler(
+                LogIndexHandler(self.log_index, "user", formatter)
+            )
             # print("!!! user_logger setup done.", file=sys.stderr)  # DEBUG PRINT
 
             # Error logger
@@ -148,6 +160,9 @@ class Logger:
             if self.error_logger.hasHandlers():
                 self.error_logger.handlers.clear()
             self.error_logger.addHandler(error_handler)
+            self.error_logger.addHandler(
+                LogIndexHandler(self.log_index, "error", formatter)
+            )
             # print("!!! error_logger setup done.", file=sys.stderr)  # DEBUG PRINT
 
             # Schedule logger
@@ -166,6 +181,9 @@ class Logger:
             if self.schedule_logger.hasHandlers():
                 self.schedule_logger.handlers.clear()
             self.schedule_logger.addHandler(schedule_handler)
+            self.schedule_logger.addHandler(
+                LogIndexHandler(self.log_index, "schedule", formatter)
+            )
             # print("!!! schedule_logger setup done.", file=sys.stderr)  # DEBUG PRINT
 
             # App logger for general application logs
@@ -216,6 +234,19 @@ class Logger:
             traceback.print_exc(file=sys.stderr)  # DEBUG PRINT
             raise  # Re-raise
 
+    def _open_log_index(self) -> LogIndex:
+        """Open the log index, indexing existing log files when it is new"""
+        index = LogIndex(
+            Path(os.environ.get("LOG_INDEX_PATH", self.logs_dir / "log_index.db"))
+        )
+        if index.created:
+            for source, filename in LOG_SOURCES.items():
+                index.import_file(self.logs_dir / filename, source)
+        index.prune(
+            (datetime.now() - timedelta(days=RETENTION_DAYS)).strftime("%Y-%m-%d")
+        )
+        return index
+
     def create_session_logger(self, session_id: str) -> logging.Logger:
         """Create a new logger for a specific session"""
         logger_name = f"session_{session_id}"
@@ -282,6 +313,13 @@ class Logger:
         diag_filename = f"schedule_diagnostic_{session_id}.log"
         return str(self.diagnostics_dir / diag_filename)
 
+    def setLevel(self, level):
+        """Drop messages below ``level`` before they are formatted"""
+        self.level = level
+
+    def isEnabledFor(self, level):
+        return level >= self.level
+
     def debug(self, message, event_type=None, details=None, status=None, extra=None):
         self.log_message(
             logging.DEBUG, message, event_type, details, status, extra=extra
@@ -361,6 +399,11 @@ class Logger:
         if not self.initialized:
             print("Logger not initialized, skipping log message.")
             return
+        if level < self.level:
+            return
+        # Messages may be passed as callables so that they are only built when logged
+        if callable(message):
+            message = message()
 
         # Construct a log entry dictionary
         log_entry = {
@@ -62,10 +62,14 @@ def handle_unsubscribe(data):
 
 
 def broadcast_event(event_type, data):
-    """Broadcast event to all subscribed clients"""
-    for client_id, client_info in connected_clients.items():
+    """Broadcast event to all subscribed clients
+
+    Uses the server-level emit so that it also works outside of a SocketIO
+    handler, e.g. from background generation jobs.
+    """
+    for client_id, client_info in list(connected_clients.items()):
         if event_type in client_info["subscriptions"]:
-            emit(event_type, data, room=client_id)
+            socketio.emit(event_type, data, to=client_id)
 
 
 # Event types
@@ -73,3 +77,4 @@ SCHEDULE_UPDATED = "schedule_updated"
 AVAILABILITY_UPDATED = "availability_updated"
 ABSENCE_UPDATED = "absence_updated"
 SETTINGS_UPDATED = "settings_updated"
+GENERATION_JOB_UPDATED = "generation_job_updated"
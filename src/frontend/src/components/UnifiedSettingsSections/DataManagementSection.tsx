@@ -147,7 +147,7 @@ const DataManagementSection: React.FC = () => {
       const url = window.URL.createObjectURL(blob);
       const a = document.createElement("a");
       a.href = url;
-      a.download = `backup_${new Date().toISOString().split("T")[0]}.json`;
+      a.download = `backup_${new Date().toISOString().split("T")[0]}.ndjson.gz`;
       document.body.appendChild(a);
       a.click();
       window.URL.revokeObjectURL(url);
@@ -290,7 +290,7 @@ const DataManagementSection: React.FC = () => {
             </Button>
             <input
               type="file"
-              accept=".json"
+              accept=".ndjson.gz,.ndjson,.json"
               onChange={handleRestoreChange}
               ref={fileInputRef}
               style={{ display: "none" }}
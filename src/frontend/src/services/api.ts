@@ -429,6 +429,44 @@ export const generateAiSchedule = async (
   }
 };
 
+export interface GenerationJob {
+  id: string;
+  kind: string;
+  status: "QUEUED" | "RUNNING" | "SUCCEEDED" | "FAILED" | "CANCELLED";
+  progress: Record<string, unknown> | null;
+  error: string | null;
+  created_at: string | null;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
+const GENERATION_JOB_POLL_MS = 1000;
+
+// Generation runs as a background job; poll it until it has finished
+export const waitForGenerationJob = async <T>(jobId: string): Promise<T> => {
+  for (;;) {
+    const response = await api.get<GenerationJob>(
+      `/api/v2/schedules/jobs/${jobId}`,
+    );
+    const job = response.data;
+    if (job.status === "SUCCEEDED") {
+      const result = await api.get<T>(`/api/v2/schedules/jobs/${jobId}/result`);
+      return result.data;
+    }
+    if (job.status === "FAILED" || job.status === "CANCELLED") {
+      throw new Error(job.error || `Generation job ${job.status.toLowerCase()}`);
+    }
+    await new Promise((resolve) => setTimeout(resolve, GENERATION_JOB_POLL_MS));
+  }
+};
+
+export const cancelGenerationJob = async (jobId: string): Promise<GenerationJob> => {
+  const response = await api.post<GenerationJob>(
+    `/api/v2/schedules/jobs/${jobId}/cancel`,
+  );
+  return response.data;
+};
+
 export const generateSchedule = async (
   startDate: string,
   endDate: string,
@@ -437,7 +475,7 @@ export const generateSchedule = async (
   enableDiagnostics: boolean = false,
 ): Promise<ScheduleResponse> => {
   try {
-    const response = await api.post<ScheduleResponse>(
+    const response = await api.post<GenerationJob>(
       "/api/v2/schedules/generate/",
       {
         start_date: startDate,
@@ -447,7 +485,7 @@ export const generateSchedule = async (
         enable_diagnostics: enableDiagnostics,
       },
     );
-    return response.data;
+    return await waitForGenerationJob<ScheduleResponse>(response.data.id);
   } catch (error) {
     if (error instanceof Error) {
       throw new Error(`Failed to generate schedule: ${error.message}`);
@@ -785,7 +823,7 @@ export const deleteAbsence = async (
 // Database backup and restore
 export const backupDatabase = async (): Promise<Blob> => {
   try {
-    const response = await api.get("/api/v2/db/backup", {
+    const response = await api.get("/api/v2/settings/backup", {
       responseType: "blob",
     });
     return response.data;
@@ -801,7 +839,7 @@ export const restoreDatabase = async (file: File): Promise<void> => {
   try {
     const formData = new FormData();
     formData.append("file", file);
-    await api.post("/api/v2/db/restore", formData, {
+    await api.post("/api/v2/settings/restore", formData, {
       headers: {
         "Content-Type": "multipart/form-data",
       },
@@ -0,0 +1,41 @@
+"""Add generation_jobs table for background schedule generation
+
+Revision ID: g1e2n3j4o5b6
+Revises: s1c2h3i4d5x6
+Create Date: 2025-07-08 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'g1e2n3j4o5b6'
+down_revision = 's1c2h3i4d5x6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'generation_jobs',
+        sa.Column('id', sa.String(36), primary_key=True),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum('QUEUED', 'RUNNING', 'SUCCEEDED', 'FAILED', 'CANCELLED', name='jobstatus'),
+            nullable=False,
+        ),
+        sa.Column('params', sa.JSON(), nullable=True),
+        sa.Column('progress', sa.JSON(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('owner', sa.String(64), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table('generation_jobs')
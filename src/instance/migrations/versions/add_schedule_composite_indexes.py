@@ -0,0 +1,43 @@
+"""Add composite indexes for schedule and version lookups
+
+Revision ID: s1c2h3i4d5x6
+Revises: wn1e2e3k4n5a
+Create Date: 2025-07-01 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 's1c2h3i4d5x6'
+down_revision = 'wn1e2e3k4n5a'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns); kept in sync with __table_args__ in models/schedule.py
+INDEXES = (
+    ('ix_schedules_version_date_employee', 'schedules', ['version', 'date', 'employee_id']),
+    ('ix_schedules_date_version', 'schedules', ['date', 'version']),
+    ('ix_schedules_employee_date', 'schedules', ['employee_id', 'date']),
+    ('ix_schedule_version_meta_date_range', 'schedule_version_meta', ['date_range_end', 'date_range_start']),
+    ('ix_schedule_version_meta_status_date_range', 'schedule_version_meta', ['status', 'date_range_end', 'date_range_start']),
+)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        existing = {index['name'] for index in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns)
+
+    # Refresh planner statistics so SQLite picks the new indexes
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('ANALYZE')
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)